@@ -0,0 +1 @@
+"""Speed and memory benchmarks of ddpc on synthetic production-size inputs."""
@@ -0,0 +1,134 @@
+"""Benchmarks of band and DOS reading, projection modes and export."""
+
+from __future__ import annotations
+
+import tempfile
+from pathlib import Path
+
+from benchmarks.generators import BAND_SIZES, DOS_SIZES, SPIN_TYPES, band_file, data_dir, dos_file
+from ddpc.data import read_band, read_dos, to_csv, to_npz
+from ddpc.data.processors import BAND_MODES, DOS_MODES
+
+SIZES = tuple(BAND_SIZES)
+
+
+class ReadBand:
+    """Read a projected band structure with the default projection mode."""
+
+    params = (("h5", "json"), SPIN_TYPES, SIZES)
+    param_names = ("fmt", "spin", "size")
+
+    def setup(self, fmt, spin, size):
+        self.path = band_file(data_dir(), spin=spin, fmt=fmt, **BAND_SIZES[size])
+
+    def time_read_band(self, fmt, spin, size):
+        read_band(self.path)
+
+    def time_read_band_total(self, fmt, spin, size):
+        read_band(self.path, mode=0)
+
+
+class ReadDos:
+    """Read a projected density of states with the default projection mode."""
+
+    params = (("h5", "json"), SPIN_TYPES, SIZES)
+    param_names = ("fmt", "spin", "size")
+
+    def setup(self, fmt, spin, size):
+        self.path = dos_file(data_dir(), spin=spin, fmt=fmt, **DOS_SIZES[size])
+
+    def time_read_dos(self, fmt, spin, size):
+        read_dos(self.path)
+
+    def time_read_dos_total(self, fmt, spin, size):
+        read_dos(self.path, mode=0)
+
+
+class BandModes:
+    """Aggregate band projections in each mode."""
+
+    params = (BAND_MODES, SIZES)
+    param_names = ("mode", "size")
+
+    def setup(self, mode, size):
+        self.path = band_file(data_dir(), spin="collinear", fmt="h5", **BAND_SIZES[size])
+
+    def time_mode(self, mode, size):
+        read_band(self.path, mode=mode)
+
+
+class DosModes:
+    """Aggregate DOS projections in each mode."""
+
+    params = (DOS_MODES, SIZES)
+    param_names = ("mode", "size")
+
+    def setup(self, mode, size):
+        self.path = dos_file(data_dir(), spin="collinear", fmt="h5", **DOS_SIZES[size])
+
+    def time_mode(self, mode, size):
+        read_dos(self.path, mode=mode)
+
+
+class DosAtomBlocks:
+    """Aggregate DOS projections all at once and one block of atoms at a time."""
+
+    params = ((None, 16, 64), (1, 5), SIZES)
+    param_names = ("atom_block", "mode", "size")
+
+    def setup(self, atom_block, mode, size):
+        self.path = dos_file(data_dir(), spin="collinear", fmt="h5", **DOS_SIZES[size])
+
+    def time_read_dos(self, atom_block, mode, size):
+        read_dos(self.path, mode=mode, atom_block=atom_block)
+
+
+class AllModes:
+    """Aggregate projections in every mode from a single read of the file."""
+
+    params = (("band", "dos"), SIZES)
+    param_names = ("kind", "size")
+
+    def setup(self, kind, size):
+        if kind == "band":
+            self.path = band_file(data_dir(), spin="collinear", fmt="h5", **BAND_SIZES[size])
+        else:
+            self.path = dos_file(data_dir(), spin="collinear", fmt="h5", **DOS_SIZES[size])
+
+    def time_read_modes(self, kind, size):
+        if kind == "band":
+            read_band(self.path, modes=BAND_MODES)
+        else:
+            read_dos(self.path, modes=DOS_MODES)
+
+
+class Export:
+    """Write projected band and DOS tables to CSV and NPZ."""
+
+    params = (("band", "dos"), SIZES)
+    param_names = ("kind", "size")
+
+    def setup(self, kind, size):
+        if kind == "band":
+            path = band_file(data_dir(), spin="collinear", fmt="h5", **BAND_SIZES[size])
+            self.data = read_band(path, mode=5)[0]
+        else:
+            path = dos_file(data_dir(), spin="collinear", fmt="h5", **DOS_SIZES[size])
+            self.data = read_dos(path, mode=5)[0]
+        self.tmp = tempfile.TemporaryDirectory()
+        self.out = Path(self.tmp.name)
+
+    def teardown(self, kind, size):
+        self.tmp.cleanup()
+
+    def time_to_csv(self, kind, size):
+        to_csv(self.data, self.out / "out.csv")
+
+    def time_to_csv_formatted(self, kind, size):
+        to_csv(self.data, self.out / "out.csv", float_format="8.3f")
+
+    def time_to_npz(self, kind, size):
+        to_npz(self.data, self.out / "out.npz")
+
+    def time_to_npz_uncompressed(self, kind, size):
+        to_npz(self.data, self.out / "out.npz", compressed=False)
@@ -0,0 +1,96 @@
+"""Benchmarks of structure reading and writing, trajectories and orthogonal supercells."""
+
+from __future__ import annotations
+
+import tempfile
+from pathlib import Path
+
+from ase.build import bulk
+
+from benchmarks.generators import (
+    STRUCTURE_FORMATS,
+    STRUCTURE_SIZES,
+    SUFFIXES,
+    TRAJECTORY_SIZES,
+    data_dir,
+    structure_file,
+)
+from ddpc.structure import find_orthogonal, read_structure, trajectory, write_structure
+
+SIZES = tuple(STRUCTURE_SIZES)
+LATTICES = {
+    "fcc": lambda: bulk("Cu", "fcc", a=3.6),
+    "hcp": lambda: bulk("Mg", "hcp", a=3.2, c=5.2),
+    "wurtzite": lambda: bulk("ZnO", "wurtzite", a=3.25, c=5.2, u=0.382),
+}
+ORTHOGONAL_KWARGS = {
+    "round": {"min_length": 10.0},
+    "hnf": {"method": "hnf", "min_length": 10.0, "max_atoms": 200},
+}
+
+
+class ReadStructure:
+    """Read one large structure, format detected from the content."""
+
+    params = (STRUCTURE_FORMATS, SIZES)
+    param_names = ("fmt", "size")
+
+    def setup(self, fmt, size):
+        self.path = structure_file(data_dir(), fmt=fmt, **STRUCTURE_SIZES[size])
+
+    def time_read_structure(self, fmt, size):
+        read_structure(self.path)
+
+
+class WriteStructure:
+    """Write one large structure with constraints and magnetic moments."""
+
+    params = ((*STRUCTURE_FORMATS, "vasp"), SIZES)
+    param_names = ("fmt", "size")
+
+    def setup(self, fmt, size):
+        self.atoms = read_structure(
+            structure_file(data_dir(), fmt="dspaw", **STRUCTURE_SIZES[size])
+        )
+        self.tmp = tempfile.TemporaryDirectory()
+        self.out = Path(self.tmp.name) / f"out{SUFFIXES.get(fmt, '')}"
+
+    def teardown(self, fmt, size):
+        self.tmp.cleanup()
+
+    def time_write_structure(self, fmt, size):
+        write_structure(self.out, self.atoms, format=fmt)
+
+
+class Trajectory:
+    """Index a long trajectory and read frames from it."""
+
+    params = (("dspaw", "rescu"), SIZES)
+    param_names = ("fmt", "size")
+
+    def setup(self, fmt, size):
+        self.path = structure_file(data_dir(), fmt=fmt, **TRAJECTORY_SIZES[size])
+        trajectory.frame_offsets(self.path, fmt)
+
+    def time_build_index(self, fmt, size):
+        trajectory.index_path(self.path).unlink()
+        trajectory.frame_offsets(self.path, fmt)
+
+    def time_read_last_frame(self, fmt, size):
+        read_structure(self.path, format=fmt, index=-1)
+
+    def time_read_every_tenth_frame(self, fmt, size):
+        read_structure(self.path, format=fmt, index="::10")
+
+
+class Orthogonal:
+    """Search the orthogonal supercell with the rounding heuristic and exhaustively."""
+
+    params = (tuple(LATTICES), tuple(ORTHOGONAL_KWARGS))
+    param_names = ("lattice", "method")
+
+    def setup(self, lattice, method):
+        self.atoms = LATTICES[lattice]()
+
+    def time_find_orthogonal(self, lattice, method):
+        find_orthogonal(self.atoms, **ORTHOGONAL_KWARGS[method])
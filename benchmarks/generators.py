@@ -0,0 +1,480 @@
+"""Synthetic DS-PAW band/DOS files and large structure files for benchmarks.
+
+The files follow the layout DS-PAW writes, as in ``tests/data/raw``: HDF5 files
+store strings as ``S1`` character arrays and scalars as one-element arrays, JSON
+files are indented by four spaces with one number per line and 12 decimals.
+Values are random but reproducible, so a file depends only on its parameters.
+
+Every generator writes into ``directory`` under a name built from its
+parameters and returns the existing file when it is already there, because the
+large JSON files take a while to write.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Sequence, Union
+
+import numpy as np
+
+# DS-PAW always lists 16 orbitals and stores the number used in OrbitIndexs
+ORBITALS = tuple("s;py;pz;px;dxy;dyz;dz2;dxz;dx2;f-3;f-2;f-1;f0;f1;f2;f3".split(";"))
+SPIN_TYPES = ("collinear", "noncollinear", "spinless")
+ELEMENTS = ("Ni", "O", "Bi", "Se")
+
+# problem sizes, "large" is about the size of a production calculation
+BAND_SIZES: Dict[str, Dict[str, int]] = {
+    "small": {"natom": 4, "nband": 24, "nkpt": 180},
+    "medium": {"natom": 16, "nband": 120, "nkpt": 300},
+    "large": {"natom": 64, "nband": 240, "nkpt": 400},
+}
+DOS_SIZES: Dict[str, Dict[str, int]] = {
+    "small": {"natom": 4, "nenergy": 401},
+    "medium": {"natom": 64, "nenergy": 4001},
+    "large": {"natom": 256, "nenergy": 20001},
+}
+STRUCTURE_SIZES: Dict[str, Dict[str, int]] = {
+    "small": {"natom": 1000},
+    "medium": {"natom": 20000},
+    "large": {"natom": 200000},
+}
+TRAJECTORY_SIZES: Dict[str, Dict[str, int]] = {
+    "small": {"natom": 100, "nframes": 100},
+    "medium": {"natom": 100, "nframes": 2000},
+    "large": {"natom": 500, "nframes": 10000},
+}
+STRUCTURE_FORMATS = ("dspaw", "rescu", "extxyz")
+SUFFIXES = {"dspaw": ".as", "rescu": ".xyz", "extxyz": ".xyz"}
+JSON_BLOCK = 1 << 16
+
+
+def data_dir() -> Path:
+    """Return the directory for generated files, ``DDPC_BENCH_DATA`` or ``benchmarks/.data``."""
+    env = os.environ.get("DDPC_BENCH_DATA")
+    path = Path(env) if env else Path(__file__).resolve().parent / ".data"
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def band_file(  # noqa: PLR0913
+    directory: Union[str, Path],
+    *,
+    natom: int,
+    nband: int,
+    nkpt: int,
+    spin: str = "collinear",
+    projected: bool = True,
+    norbital: int = 9,
+    fmt: str = "h5",
+) -> Path:
+    """Write a band structure file, projected on ``norbital`` orbitals of every atom.
+
+    Args:
+        directory: Output directory
+        natom: Number of atoms
+        nband: Number of bands
+        nkpt: Number of k-points
+        spin: ``"collinear"`` (two spin channels), ``"noncollinear"`` or ``"spinless"``
+        projected: Write ``ProjectBand`` data
+        norbital: Number of orbitals per atom, at most 16
+        fmt: ``"h5"`` or ``"json"``
+
+    Returns
+    -------
+        Path of the file
+    """
+    prefix = "pband" if projected else "band"
+    path = Path(directory) / f"{prefix}-{spin}-a{natom}-b{nband}-k{nkpt}-o{norbital}.{fmt}"
+    if path.exists():
+        return path
+
+    rng = np.random.default_rng([natom, nband, nkpt, norbital])
+    nspin = 2 if spin == "collinear" else 1
+    kpoints = _kpath(nkpt)
+    labels = ["G", "X", "M", "G", "R"]
+    label_index = np.linspace(1, nkpt, len(labels)).astype(int).tolist()
+    energies = np.sort(rng.uniform(-15, 20, (nspin, nband, nkpt)), axis=1)
+    projections = None
+    if projected:
+        weights = rng.random((nspin, natom, norbital, nband, nkpt))
+        projections = weights / weights.sum(axis=(1, 2), keepdims=True)
+    header = {
+        "EFermi": 5.0,
+        "IsProject": projected,
+        "NumberOfBand": nband,
+        "NumberOfKpoints": nkpt,
+        "SpinType": _spin_label(spin),
+        "SymmetryKPoints": labels,
+        "SymmetryKPointsIndex": label_index,
+        "BandGap": 0.5,
+        "CBM": 5.5,
+        "VBM": 5.0,
+    }
+
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    if fmt == "h5":
+        _write_band_h5(tmp, header, kpoints, energies, projections, natom, norbital)
+    else:
+        _write_band_json(tmp, header, kpoints, energies, projections, natom, norbital)
+    os.replace(tmp, path)
+    return path
+
+
+def dos_file(  # noqa: PLR0913
+    directory: Union[str, Path],
+    *,
+    natom: int,
+    nenergy: int,
+    spin: str = "collinear",
+    projected: bool = True,
+    norbital: int = 9,
+    fmt: str = "h5",
+) -> Path:
+    """Write a density of states file, projected on ``norbital`` orbitals of every atom.
+
+    Args:
+        directory: Output directory
+        natom: Number of atoms
+        nenergy: Number of energy points
+        spin: ``"collinear"`` (two spin channels), ``"noncollinear"`` or ``"spinless"``
+        projected: Write ``ProjectDos`` data
+        norbital: Number of orbitals per atom, at most 16
+        fmt: ``"h5"`` or ``"json"``
+
+    Returns
+    -------
+        Path of the file
+    """
+    prefix = "pdos" if projected else "dos"
+    path = Path(directory) / f"{prefix}-{spin}-a{natom}-e{nenergy}-o{norbital}.{fmt}"
+    if path.exists():
+        return path
+
+    rng = np.random.default_rng([natom, nenergy, norbital, 1])
+    nspin = 2 if spin == "collinear" else 1
+    grid = np.linspace(-20, 20, nenergy)
+    projections = rng.random((nspin, natom, norbital, nenergy)) if projected else None
+    if projections is not None:
+        total = projections.sum(axis=(1, 2))
+    else:
+        total = rng.random((nspin, nenergy)) * natom
+    header = {
+        "DosEnergy": grid,
+        "EFermi": 5.0,
+        "EnergyMax": float(grid[-1]),
+        "EnergyMin": float(grid[0]),
+        "NumberOfDos": nenergy,
+        "Project": projected,
+        "SpinType": _spin_label(spin),
+    }
+
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    if fmt == "h5":
+        _write_dos_h5(tmp, header, total, projections, natom, norbital)
+    else:
+        _write_dos_json(tmp, header, total, projections, natom, norbital)
+    os.replace(tmp, path)
+    return path
+
+
+def structure_file(
+    directory: Union[str, Path], *, natom: int, fmt: str = "dspaw", nframes: int = 1
+) -> Path:
+    """Write a structure, or a trajectory of ``nframes`` frames, of ``natom`` atoms.
+
+    DS-PAW .as atoms carry constraints and collinear moments, RESCU xyz atoms
+    moments and constraints, and extended xyz frames a cell.
+
+    Args:
+        directory: Output directory
+        natom: Number of atoms per frame
+        fmt: ``"dspaw"``, ``"rescu"`` or ``"extxyz"``
+        nframes: Number of frames
+
+    Returns
+    -------
+        Path of the file
+    """
+    path = Path(directory) / f"structure-{fmt}-a{natom}-f{nframes}{SUFFIXES[fmt]}"
+    if path.exists():
+        return path
+
+    rng = np.random.default_rng([natom, nframes])
+    length = (natom * 12.0) ** (1 / 3)
+    cell = np.diag([length, length * 1.1, length * 1.2])
+    symbols = np.array(ELEMENTS[:2])[rng.integers(0, 2, natom)]
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    if fmt == "extxyz":
+        _write_extxyz(tmp, symbols, cell, rng, nframes)
+    else:
+        with open(tmp, "w", encoding="utf-8") as fout:
+            for frame in range(nframes):
+                positions = rng.random((natom, 3)) @ cell
+                if frame:
+                    fout.write(f"# frame {frame + 1}\n")
+                if fmt == "dspaw":
+                    _write_as_frame(fout, symbols, cell, positions, rng)
+                else:
+                    _write_rescu_frame(fout, symbols, positions, rng)
+    os.replace(tmp, path)
+    return path
+
+
+def _kpath(nkpt: int) -> np.ndarray:
+    """Return ``nkpt`` k-points along G-X-M-G-R."""
+    corners = np.array([[0, 0, 0], [0.5, 0, 0], [0.5, 0.5, 0], [0, 0, 0], [0.5, 0.5, 0.5]])
+    t = np.linspace(0, len(corners) - 1, nkpt)
+    i = np.minimum(t.astype(int), len(corners) - 2)
+    return corners[i] + (t - i)[:, None] * (corners[i + 1] - corners[i])
+
+
+def _spin_label(spin: str) -> str:
+    return {"collinear": "collinear", "noncollinear": "non-collinear", "spinless": "none"}[spin]
+
+
+def _atom_elements(natom: int) -> List[str]:
+    return [ELEMENTS[i % len(ELEMENTS)] for i in range(natom)]
+
+
+# HDF5
+
+
+def _h5_str(values: Sequence[str]) -> np.ndarray:
+    return np.array(list(";".join(values)), dtype="S1")
+
+
+def _write_h5_header(h5, group, header: Dict[str, Any], natom: int, projected: bool) -> None:
+    """Write the scalar, string and atom datasets DS-PAW writes for every file."""
+    for key, value in header.items():
+        if isinstance(value, str):
+            group[key] = _h5_str([value])
+        elif isinstance(value, list) and isinstance(value[0], str):
+            group[key] = _h5_str(value)
+        elif isinstance(value, bool):
+            group[key] = np.array([value], dtype=np.uint8)
+        elif isinstance(value, int):
+            group[key] = np.array([value], dtype=np.int32)
+        else:
+            group[key] = np.atleast_1d(np.asarray(value))
+    if projected:
+        group["Orbit"] = _h5_str(ORBITALS)
+    h5["AtomInfo/Elements"] = _h5_str(_atom_elements(natom))
+    h5["AtomInfo/CoordinateType"] = _h5_str(["Direct"])
+    h5["AtomInfo/Lattice"] = np.eye(3).ravel() * 10
+    h5["AtomInfo/Position"] = np.linspace(0, 1, 3 * natom)
+
+
+def _fortran(arr: np.ndarray) -> np.ndarray:
+    """Return a ``(band, kpt)`` array as DS-PAW stores it, bands varying fastest."""
+    return arr.T.reshape(arr.shape)
+
+
+def _write_band_h5(  # noqa: PLR0913, PLR0917
+    path: Path,
+    header: Dict[str, Any],
+    kpoints: np.ndarray,
+    energies: np.ndarray,
+    projections: Any,
+    natom: int,
+    norbital: int,
+) -> None:
+    import h5py
+
+    with h5py.File(path, "w") as h5:
+        info = h5.create_group("BandInfo")
+        _write_h5_header(h5, info, header, natom, projections is not None)
+        # DS-PAW stores the flat k-point list with shape (3, nkpt)
+        info["CoordinatesOfKPoints"] = kpoints.reshape(3, -1)
+        for si, spin_energies in enumerate(energies):
+            spin = info.create_group(f"Spin{si + 1}")
+            spin["BandEnergies"] = _fortran(spin_energies)
+            if projections is None:
+                continue
+            spin["ProjectBand/AtomIndex"] = np.array([natom], dtype=np.int32)
+            spin["ProjectBand/OrbitIndexs"] = np.array([norbital], dtype=np.int32)
+            spin["ProjectBand/Nspins"] = np.array([1], dtype=np.int32)
+            for ai in range(natom):
+                for oi in range(norbital):
+                    spin[f"ProjectBand/1/{ai + 1}/{oi + 1}"] = _fortran(projections[si, ai, oi])
+
+
+def _write_dos_h5(  # noqa: PLR0913, PLR0917
+    path: Path,
+    header: Dict[str, Any],
+    total: np.ndarray,
+    projections: Any,
+    natom: int,
+    norbital: int,
+) -> None:
+    import h5py
+
+    with h5py.File(path, "w") as h5:
+        info = h5.create_group("DosInfo")
+        _write_h5_header(h5, info, header, natom, projections is not None)
+        for si, spin_total in enumerate(total):
+            spin = info.create_group(f"Spin{si + 1}")
+            spin["Dos"] = spin_total
+            if projections is None:
+                continue
+            spin["ProjectDos/AtomIndexs"] = np.array([natom], dtype=np.int32)
+            spin["ProjectDos/OrbitIndexs"] = np.array([norbital], dtype=np.int32)
+            for ai in range(natom):
+                for oi in range(norbital):
+                    spin[f"ProjectDos{ai + 1}/{oi + 1}"] = projections[si, ai, oi]
+
+
+# JSON
+
+
+class _Numbers:
+    """Placeholder for a numeric array in the JSON skeleton."""
+
+    def __init__(self, values: np.ndarray, integer: bool = False):
+        self.values = np.ravel(values)
+        self.integer = integer
+
+    def lines(self, indent: str) -> Iterator[str]:
+        if not len(self.values):
+            yield "[]"
+            return
+        template = "%d" if self.integer else "%.12f"
+        yield "[\n"
+        for start in range(0, len(self.values), JSON_BLOCK):
+            block = self.values[start : start + JSON_BLOCK]
+            sep = ",\n" if start + len(block) < len(self.values) else "\n"
+            yield indent + "    " + f",\n{indent}    ".join(template % v for v in block) + sep
+        yield indent + "]"
+
+
+def _write_json(path: Path, document: Dict[str, Any]) -> None:
+    """Write ``document`` as DS-PAW does, streaming the numeric arrays."""
+    arrays: List[_Numbers] = []
+
+    def placeholder(obj):
+        if isinstance(obj, _Numbers):
+            arrays.append(obj)
+            return f"@@{len(arrays) - 1}@@"
+        raise TypeError(type(obj))
+
+    skeleton = json.dumps(document, indent=4, sort_keys=True, default=placeholder)
+    with open(path, "w", encoding="utf-8") as fout:
+        for line in skeleton.split("\n"):
+            start = line.find('"@@')
+            if start < 0:
+                fout.write(line + "\n")
+                continue
+            end = line.index('@@"', start + 3)
+            indent = line[: len(line) - len(line.lstrip())]
+            fout.write(line[:start])
+            for chunk in arrays[int(line[start + 3 : end])].lines(indent):
+                fout.write(chunk)
+            fout.write(line[end + 3 :] + "\n")
+
+
+def _json_atoms(natom: int) -> Dict[str, Any]:
+    positions = np.linspace(0, 1, 3 * natom).reshape(natom, 3)
+    return {
+        "Atoms": [
+            {"Element": element, "Position": pos.tolist()}
+            for element, pos in zip(_atom_elements(natom), positions)
+        ],
+        "CoordinateType": "Direct",
+        "Grid": [36, 36, 36],
+        "Lattice": (np.eye(3).ravel() * 10).tolist(),
+    }
+
+
+def _write_band_json(  # noqa: PLR0913, PLR0917
+    path: Path,
+    header: Dict[str, Any],
+    kpoints: np.ndarray,
+    energies: np.ndarray,
+    projections: Any,
+    natom: int,
+    norbital: int,
+) -> None:
+    info: Dict[str, Any] = dict(header)
+    info["CoordinatesOfKPoints"] = _Numbers(kpoints)
+    if projections is not None:
+        info["Orbit"] = list(ORBITALS[:norbital])
+    for si, spin_energies in enumerate(energies):
+        # JSON arrays list the bands of one k-point after the other
+        spin: Dict[str, Any] = {"BandEnergies": _Numbers(spin_energies.T)}
+        if projections is not None:
+            spin["ProjectBand"] = [
+                {
+                    "AtomIndex": ai + 1,
+                    "Contribution": _Numbers(projections[si, ai, oi].T),
+                    "OrbitIndex": oi + 1,
+                }
+                for ai in range(natom)
+                for oi in range(norbital)
+            ]
+        info[f"Spin{si + 1}"] = spin
+    _write_json(path, {"AtomInfo": _json_atoms(natom), "BandInfo": info})
+
+
+def _write_dos_json(  # noqa: PLR0913, PLR0917
+    path: Path,
+    header: Dict[str, Any],
+    total: np.ndarray,
+    projections: Any,
+    natom: int,
+    norbital: int,
+) -> None:
+    info: Dict[str, Any] = dict(header)
+    info["DosEnergy"] = _Numbers(header["DosEnergy"])
+    if projections is not None:
+        info["Orbit"] = list(ORBITALS[:norbital])
+    for si, spin_total in enumerate(total):
+        spin: Dict[str, Any] = {"Dos": _Numbers(spin_total)}
+        if projections is not None:
+            spin["ProjectDos"] = [
+                {
+                    "AtomIndex": ai + 1,
+                    "Contribution": _Numbers(projections[si, ai, oi]),
+                    "OrbitIndex": oi + 1,
+                }
+                for ai in range(natom)
+                for oi in range(norbital)
+            ]
+        info[f"Spin{si + 1}"] = spin
+    _write_json(path, {"AtomInfo": _json_atoms(natom), "DosInfo": info})
+
+
+# structures
+
+
+def _flags(values: np.ndarray) -> np.ndarray:
+    return np.where(values, "T", "F")
+
+
+def _write_as_frame(fout, symbols: np.ndarray, cell: np.ndarray, positions, rng) -> None:
+    fout.write(f"Total number of atoms\n{len(symbols)}\nLattice\n")
+    np.savetxt(fout, cell, fmt="%.8f")
+    fout.write("Cartesian Fix_x Fix_y Fix_z Mag\n")
+    fix = _flags(rng.random((len(symbols), 3)) < 0.5)
+    mag = rng.uniform(-2, 2, len(symbols))
+    rows = np.column_stack([symbols, np.char.mod("%.8f", positions), fix, np.char.mod("%.3f", mag)])
+    np.savetxt(fout, rows, fmt="%s")
+
+
+def _write_rescu_frame(fout, symbols: np.ndarray, positions, rng) -> None:
+    fout.write(f"{len(symbols)}\nAtomType X Y Z\n")
+    fix = rng.integers(0, 2, (len(symbols), 3)).astype(str)
+    mag = rng.uniform(-2, 2, len(symbols))
+    rows = np.column_stack([symbols, np.char.mod("%.8f", positions), np.char.mod("%.2f", mag), fix])
+    np.savetxt(fout, rows, fmt="%s")
+
+
+def _write_extxyz(path: Path, symbols: np.ndarray, cell: np.ndarray, rng, nframes: int) -> None:
+    from ase.atoms import Atoms
+    from ase.io import write
+
+    frames = [
+        Atoms(symbols.tolist(), positions=rng.random((len(symbols), 3)) @ cell, cell=cell, pbc=True)
+        for _ in range(nframes)
+    ]
+    write(path, frames, format="extxyz")
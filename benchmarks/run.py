@@ -0,0 +1,408 @@
+"""Run the benchmarks and compare results between commits.
+
+Benchmarks are classes in the ``bench_*`` modules, written in the asv style: a
+class has ``params`` and ``param_names``, is prepared by ``setup`` (and cleaned
+up by ``teardown``) for every combination of parameters, and each ``time_*``
+method is one benchmark. Every benchmark is timed, and the peak memory
+allocated during one more call is measured with :mod:`tracemalloc` (numpy
+arrays included, memory held by HDF5 itself not).
+
+Results are stored as JSON per commit, ``benchmarks/results/<commit>.json`` by
+default, so runs of two commits can be compared::
+
+    python -m benchmarks.run run --sizes small,medium
+    git checkout other-branch
+    python -m benchmarks.run run --sizes small,medium
+    python -m benchmarks.run compare benchmarks/results/OLD.json benchmarks/results/NEW.json
+"""
+
+from __future__ import annotations
+
+import gc
+import itertools
+import json
+import os
+import platform
+import re
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from importlib import import_module
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+import click
+
+from ddpc.profiling import format_bytes, format_time
+
+MODULES = ("benchmarks.bench_data", "benchmarks.bench_structure")
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+RESULTS_VERSION = 1
+# a timing sample lasts at least this long, fast benchmarks are called several times
+MIN_SAMPLE_TIME = 0.05
+MAX_NUMBER = 1000
+
+
+class Case(NamedTuple):
+    """One benchmark method with one combination of parameters.
+
+    Attributes
+    ----------
+    name : str
+        ``module.Class.method``
+    cls : type
+        Benchmark class
+    method : str
+        Name of the ``time_*`` method
+    params : Dict[str, Any]
+        Parameter values by name
+    """
+
+    name: str
+    cls: type
+    method: str
+    params: Dict[str, Any]
+
+    @property
+    def key(self) -> str:
+        """Unique key of the case, e.g. ``bench_data.ReadBand.time_read_band(h5, collinear, small)``."""
+        return f"{self.name}({', '.join(str(v) for v in self.params.values())})"
+
+
+def discover(pattern: Optional[str] = None, sizes: Optional[Sequence[str]] = None) -> List[Case]:
+    """Return the benchmark cases whose key matches the regular expression ``pattern``.
+
+    Args:
+        pattern: Only keep cases whose key contains a match (default: all)
+        sizes: Only keep these values of a ``size`` parameter (default: all)
+
+    Returns
+    -------
+        Cases in module, class, parameter and method order
+    """
+    cases = []
+    for module_name in MODULES:
+        module = import_module(module_name)
+        short = module_name.rsplit(".", 1)[-1]
+        for cls in vars(module).values():
+            if not isinstance(cls, type) or cls.__module__ != module_name:
+                continue
+            methods = sorted(m for m in vars(cls) if m.startswith("time_"))
+            names = getattr(cls, "param_names", ())
+            for combo in itertools.product(*getattr(cls, "params", ())):
+                params = dict(zip(names, combo))
+                if sizes is not None and params.get("size", sizes[0]) not in sizes:
+                    continue
+                for method in methods:
+                    case = Case(f"{short}.{cls.__name__}.{method}", cls, method, params)
+                    if pattern is None or re.search(pattern, case.key):
+                        cases.append(case)
+    return cases
+
+
+def _grouped(cases: List[Case]) -> Iterator[Tuple[type, Dict[str, Any], List[Case]]]:
+    """Group consecutive cases sharing a class and parameters, which share one setup."""
+    for (cls, _), grouper in itertools.groupby(cases, lambda c: (c.cls, tuple(c.params.items()))):
+        group = list(grouper)
+        yield cls, group[0].params, group
+
+
+def measure(func: Callable[[], Any], repeat: int = 5, memory: bool = True) -> Dict[str, Any]:
+    """Time ``func`` and measure the peak memory it allocates.
+
+    Calls faster than ``MIN_SAMPLE_TIME`` are repeated within each sample, the
+    first call only warms up then; a slower first call counts as a sample.
+
+    Args:
+        func: Function to benchmark
+        repeat: Number of timing samples
+        memory: Also measure the peak traced memory of one call
+
+    Returns
+    -------
+        Dict with the ``min`` and ``median`` time per call in seconds, the
+        number of ``samples`` and of calls per sample (``number``), and
+        ``peak_memory`` in bytes (None without ``memory``)
+    """
+    start = time.perf_counter()
+    func()
+    first = time.perf_counter() - start
+    number = max(1, min(MAX_NUMBER, int(MIN_SAMPLE_TIME / max(first, 1e-9))))
+
+    # a slow first call already is a sample
+    samples = [first] if number == 1 else []
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        while len(samples) < repeat:
+            start = time.perf_counter()
+            for _ in range(number):
+                func()
+            samples.append((time.perf_counter() - start) / number)
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+    peak = None
+    if memory:
+        gc.collect()
+        tracemalloc.start()
+        try:
+            func()
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    return {
+        "min": min(samples),
+        "median": statistics.median(samples),
+        "samples": repeat,
+        "number": number,
+        "peak_memory": peak,
+    }
+
+
+def run_cases(
+    cases: List[Case],
+    repeat: int = 5,
+    memory: bool = True,
+    report: Callable[[Case, Dict[str, Any]], None] = lambda case, result: None,
+) -> Dict[str, Dict[str, Any]]:
+    """Run ``cases``, calling ``setup`` and ``teardown`` once per class and parameters.
+
+    A failing setup or benchmark is recorded with its ``error`` and does not
+    stop the run.
+
+    Returns
+    -------
+        Result of every case by key, see :func:`measure`
+    """
+    results = {}
+    for cls, params, group in _grouped(cases):
+        bench = cls()
+        args = tuple(params.values())
+        try:
+            if hasattr(bench, "setup"):
+                bench.setup(*args)
+        except Exception as e:
+            error = f"setup failed: {e!r}"
+            for case in group:
+                results[case.key] = {"benchmark": case.name, "params": params, "error": error}
+                report(case, results[case.key])
+            continue
+        try:
+            for case in group:
+                method = getattr(bench, case.method)
+                try:
+                    result = measure(lambda: method(*args), repeat, memory)  # noqa: B023
+                except Exception as e:
+                    result = {"error": repr(e)}
+                results[case.key] = {"benchmark": case.name, "params": params, **result}
+                report(case, results[case.key])
+        finally:
+            if hasattr(bench, "teardown"):
+                bench.teardown(*args)
+    return results
+
+
+def machine_info() -> Dict[str, Any]:
+    """Return the commit, interpreter, platform and library versions of this run."""
+    info: Dict[str, Any] = {
+        "commit": _git("rev-parse", "HEAD"),
+        "dirty": bool(_git("status", "--porcelain", "--untracked-files=no")),
+        "date": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.node(),
+        "cpu_count": os.cpu_count(),
+    }
+    for package in ("numpy", "h5py", "ase", "spglib"):
+        try:
+            info[package] = import_module(package).__version__
+        except ImportError:
+            info[package] = None
+    return info
+
+
+def _git(*args: str) -> str:
+    try:
+        return subprocess.run(
+            ["git", *args],
+            cwd=Path(__file__).resolve().parent,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def default_output(info: Dict[str, Any]) -> Path:
+    """Return ``results/<commit>.json``, with ``-dirty`` for uncommitted changes."""
+    name = info["commit"][:10] or "unknown"
+    if info["dirty"]:
+        name += "-dirty"
+    return RESULTS_DIR / f"{name}.json"
+
+
+def load_results(path: Path) -> Dict[str, Any]:
+    """Load a results file.
+
+    Raises
+    ------
+        ValueError: If the file was written by another results version
+    """
+    with open(path, encoding="utf-8") as fin:
+        data = json.load(fin)
+    if data.get("version") != RESULTS_VERSION:
+        raise ValueError(f"{path} has results version {data.get('version')}, not {RESULTS_VERSION}")
+    return data
+
+
+def save_results(path: Path, info: Dict[str, Any], results: Dict[str, Dict[str, Any]]) -> None:
+    """Write ``results`` to ``path``, keeping other results already stored for the same commit."""
+    stored: Dict[str, Any] = {}
+    if path.exists():
+        try:
+            previous = load_results(path)
+            if previous["info"]["commit"] == info["commit"]:
+                stored = previous["results"]
+        except (ValueError, KeyError, json.JSONDecodeError):
+            pass
+    stored.update(results)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as fout:
+        json.dump({"version": RESULTS_VERSION, "info": info, "results": stored}, fout, indent=2)
+
+
+def compare_results(
+    old: Dict[str, Dict[str, Any]], new: Dict[str, Dict[str, Any]], factor: float = 1.2
+) -> List[Tuple[str, str, Optional[float], Optional[float]]]:
+    """Compare the median times and peak memory of the cases in both results.
+
+    Args:
+        old: Results of the baseline
+        new: Results to check
+        factor: Ratio above which a case counts as slower (or using more
+            memory), below whose inverse it counts as faster
+
+    Returns
+    -------
+        ``(key, change, time ratio, memory ratio)`` for every case in both,
+        slowest first, where change is ``"slower"``, ``"faster"``, ``"more memory"``,
+        ``"less memory"``, ``"failed"``, ``"fixed"`` or ``""``
+    """
+    rows = []
+    for key in sorted(old.keys() & new.keys()):
+        before, after = old[key], new[key]
+        if "error" in before or "error" in after:
+            change = "" if "error" in before and "error" in after else "failed"
+            if "error" in before and "error" not in after:
+                change = "fixed"
+            rows.append((key, change, None, None))
+            continue
+        ratio = after["median"] / before["median"] if before["median"] else None
+        memory = None
+        if before.get("peak_memory") and after.get("peak_memory") is not None:
+            memory = after["peak_memory"] / before["peak_memory"]
+        change = ""
+        if ratio is not None and ratio > factor:
+            change = "slower"
+        elif memory is not None and memory > factor:
+            change = "more memory"
+        elif ratio is not None and ratio < 1 / factor:
+            change = "faster"
+        elif memory is not None and memory < 1 / factor:
+            change = "less memory"
+        rows.append((key, change, ratio, memory))
+    rows.sort(key=lambda row: -(row[2] or 0))
+    return rows
+
+
+def _echo_result(case: Case, result: Dict[str, Any]) -> None:
+    if "error" in result:
+        click.echo(f"{case.key:<80} FAILED {result['error']}")
+    else:
+        click.echo(
+            f"{case.key:<80} {format_time(result['median']):>10} "
+            f"{format_bytes(result['peak_memory']):>10}"
+        )
+
+
+def _sizes(value: str) -> Optional[List[str]]:
+    return None if value == "all" else [s.strip() for s in value.split(",")]
+
+
+@click.group()
+def cli():
+    """Benchmarks of ddpc on synthetic production-size inputs."""
+
+
+@cli.command("list")
+@click.option("-b", "--bench", "pattern", help="Regular expression selecting benchmarks")
+@click.option("--sizes", default="all", show_default=True, help="Comma-separated sizes")
+def list_(pattern, sizes):
+    """List the benchmarks."""
+    for case in discover(pattern, _sizes(sizes)):
+        click.echo(case.key)
+
+
+@cli.command()
+@click.option("-b", "--bench", "pattern", help="Regular expression selecting benchmarks")
+@click.option("--sizes", default="small", show_default=True, help="Comma-separated sizes, or 'all'")
+@click.option("-r", "--repeat", default=5, show_default=True, help="Timing samples per benchmark")
+@click.option("--no-memory", is_flag=True, help="Skip the peak memory measurement")
+@click.option(
+    "-o", "--output", type=click.Path(), help="Results file [default: results/<commit>.json]"
+)
+def run(pattern, sizes, repeat, no_memory, output):
+    """Run the benchmarks and store the results."""
+    cases = discover(pattern, _sizes(sizes))
+    if not cases:
+        raise click.ClickException("No benchmark matches")
+    info = machine_info()
+    path = Path(output) if output else default_output(info)
+    results = run_cases(cases, repeat=repeat, memory=not no_memory, report=_echo_result)
+    save_results(path, info, results)
+    click.echo(f"Saved {len(results)} results to {path}")
+
+
+@cli.command()
+@click.argument("old", type=click.Path(exists=True, dir_okay=False))
+@click.argument("new", type=click.Path(exists=True, dir_okay=False))
+@click.option("--factor", default=1.2, show_default=True, help="Ratio counted as a change")
+@click.option("--only-changed", is_flag=True, help="Only list benchmarks that changed")
+def compare(old, new, factor, only_changed):
+    """Compare two results files, exit with status 1 when a benchmark got slower."""
+    rows = compare_results(
+        load_results(Path(old))["results"], load_results(Path(new))["results"], factor
+    )
+    click.echo(f"{'benchmark':<80} {'time':>7} {'memory':>7}  change")
+    for key, change, ratio, memory in rows:
+        if only_changed and not change:
+            continue
+        time_ratio = f"{ratio:.2f}" if ratio is not None else "-"
+        memory_ratio = f"{memory:.2f}" if memory is not None else "-"
+        click.echo(f"{key:<80} {time_ratio:>7} {memory_ratio:>7}  {change}")
+    if any(change in ("slower", "more memory", "failed") for _, change, _, _ in rows):
+        sys.exit(1)
+
+
+@cli.command()
+@click.option("-b", "--bench", "pattern", help="Regular expression selecting benchmarks")
+@click.option("--sizes", default="small", show_default=True, help="Comma-separated sizes, or 'all'")
+def generate(pattern, sizes):
+    """Write the input files of the benchmarks without running them."""
+    for cls, params, _ in _grouped(discover(pattern, _sizes(sizes))):
+        bench = cls()
+        if hasattr(bench, "setup"):
+            bench.setup(*params.values())
+        if hasattr(bench, "teardown"):
+            bench.teardown(*params.values())
+        click.echo(f"{cls.__name__}({', '.join(str(v) for v in params.values())})")
+
+
+if __name__ == "__main__":
+    cli()
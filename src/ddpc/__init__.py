@@ -22,7 +22,19 @@ def _has_structure_deps():
 
 
 def __getattr__(name):
-    if name in ("read_band", "read_dos", "to_csv", "to_npz"):
+    if name in (
+        "BandData",
+        "BandSummary",
+        "DosSummary",
+        "probe_band",
+        "probe_dos",
+        "read_band",
+        "read_dos",
+        "to_arrow",
+        "to_csv",
+        "to_npz",
+        "to_parquet",
+    ):
         if not _has_data_deps():
             raise ImportError(f"Install ddpc[data] before using '{name}'")
         from ddpc import data
@@ -31,11 +43,15 @@ def __getattr__(name):
 
     if name in (
         "read_structure",
+        "iread_structures",
         "write_structure",
         "find_primitive",
         "find_orthogonal",
         "scale_positions",
         "get_symmetry",
+        "scan_symmetry",
+        "fingerprint",
+        "detect_format",
     ):
         if not _has_structure_deps():
             raise ImportError(f"Install ddpc[structure] before using '{name}'")
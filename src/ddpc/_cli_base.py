@@ -1,12 +1,52 @@
 """Shared CLI base classes for all DDPC packages."""
 
+import os
+import re
 import sys
 
 import click
-from rich.console import Console
 
-# Force UTF-8 encoding on Windows to handle Unicode characters
-console = Console(force_terminal=True, legacy_windows=False)
+# rich style tags used in messages, e.g. "[bold red]", "[/cyan]" or "[/]"
+_STYLE_TAG = re.compile(
+    r"(?<!\\)\[/?(?:(?:bold|dim|italic|underline|red|green|yellow|blue|magenta|cyan|white)\s*)*\]"
+)
+
+
+def _plain(text):
+    """Remove rich style tags and escapes from ``text``."""
+    return _STYLE_TAG.sub("", text).replace("\\[", "[")
+
+
+class LazyConsole:
+    """Stand-in for ``rich.console.Console`` that imports rich only when needed.
+
+    When stdout is not a terminal, plain strings are written with their style
+    tags removed, without importing rich; tables and other renderables, and all
+    output to a terminal, go through rich.
+    """
+
+    def __init__(self):
+        self._consoles = {}
+
+    def print(self, *objects, **kwargs):
+        """Print like ``Console.print``."""
+        tty = sys.stdout.isatty()
+        if not tty and not kwargs and all(isinstance(o, str) for o in objects):
+            click.echo(" ".join(_plain(o) for o in objects))
+            return
+        self.rich(tty).print(*objects, **kwargs)
+
+    def rich(self, tty=True):
+        """Return the rich console for terminal (``tty``) or redirected output."""
+        if tty not in self._consoles:
+            from rich.console import Console
+
+            # Force UTF-8 encoding on Windows to handle Unicode characters
+            self._consoles[tty] = Console(force_terminal=tty or None, legacy_windows=False)
+        return self._consoles[tty]
+
+
+console = LazyConsole()
 
 
 class FriendlyCommand(click.Command):
@@ -45,3 +85,80 @@ class FriendlyGroup(click.Group):
             else:
                 console.print(self.get_help(click.Context(self)))
             sys.exit(2)
+
+
+class ForwardingGroup(FriendlyGroup):
+    """FriendlyGroup that runs its command line in the ``ddpc serve`` daemon when one is listening.
+
+    Only a real command line (no ``args`` given) is forwarded, calls with
+    explicit arguments such as those of tests always run in-process. See
+    :mod:`ddpc.daemon`.
+    """
+
+    def main(self, args=None, **kwargs):
+        """Forward to the daemon, or run in-process if none is listening."""
+        if args is None and not os.environ.get("_DDPC_COMPLETE"):
+            from ddpc.daemon import forward
+
+            code = forward(sys.argv[1:])
+            if code is not None:
+                sys.exit(code)
+        return super().main(args, **kwargs)
+
+
+class LazyGroup(click.Group):
+    """Click Group whose commands come from a group in another module, imported on first use.
+
+    Listing or running a command imports the module; the commands then run
+    directly in this context, so arguments are parsed once and help shows the
+    full command path. Import errors, also those raised while a command runs,
+    are reported with a hint to install the optional dependencies.
+    """
+
+    def __init__(self, name, source, extra, **kwargs):
+        """Create the group.
+
+        Args:
+            name: Command name
+            source: ``"module:attribute"`` of the group providing the commands
+            extra: Optional dependency group suggested on import errors, e.g. ``"data"``
+            **kwargs: Passed to ``click.Group``
+        """
+        super().__init__(name, **kwargs)
+        self.source = source
+        self.extra = extra
+        self._group = None
+
+    def list_commands(self, ctx):
+        """List the commands of the source group."""
+        return self._load().list_commands(ctx)
+
+    def get_command(self, ctx, cmd_name):
+        """Return a command of the source group."""
+        return self._load().get_command(ctx, cmd_name)
+
+    def invoke(self, ctx):
+        """Run the command, reporting missing optional dependencies."""
+        try:
+            return super().invoke(ctx)
+        except ImportError as e:
+            self._missing(e)
+
+    def _load(self):
+        if self._group is None:
+            from importlib import import_module
+
+            module, attribute = self.source.split(":")
+            try:
+                self._group = getattr(import_module(module), attribute)
+            except ImportError as e:
+                self._missing(e)
+        return self._group
+
+    def _missing(self, error):
+        console.print(f"[bold red]Error:[/bold red] {error}")
+        console.print(
+            f"Install with: [cyan]pip install ddpc\\[{self.extra}][/cyan] "
+            f"or [cyan]pip install ddpc-{self.extra}[/cyan]"
+        )
+        sys.exit(1)
@@ -1,8 +1,12 @@
 """Common utility functions shared across ddpc modules."""
 
+import os
 import re
+from itertools import chain
 from pathlib import Path
-from typing import Union
+from typing import Optional, Sequence, TextIO, Union
+
+ROW_BLOCK = 4096
 
 
 def absf(p: Union[str, Path]) -> Path:
@@ -10,17 +14,42 @@ def absf(p: Union[str, Path]) -> Path:
     return Path(p).resolve()
 
 
+def user_cache_dir() -> Path:
+    """Return the ddpc cache directory from ``DDPC_CACHE_DIR`` or ``$XDG_CACHE_HOME/ddpc``."""
+    env = os.environ.get("DDPC_CACHE_DIR")
+    if env:
+        return Path(env)
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "ddpc"
+
+
 def remove_comments(p: Union[str, Path], comment: str = "#") -> list:
     """Remove comments from a text file and return non-empty lines."""
-    lines = []
     with open(p, encoding="utf-8") as file:
-        while True:
-            line = file.readline()
-            if line:
-                line = re.sub(comment + r".*$", "", line)
-                line = line.strip()
-                if line:
-                    lines.append(line)
-            else:
-                break
-    return lines
+        return strip_comments(file.read(), comment)
+
+
+def strip_comments(text: str, comment: str = "#") -> list:
+    """Remove comments from text and return non-empty lines."""
+    if comment in text:
+        text = re.sub(re.escape(comment) + r"[^\n]*", "", text)
+    stripped = (line.strip() for line in text.split("\n"))
+    return [line for line in stripped if line]
+
+
+def write_rows(
+    fout: TextIO, template: str, columns: Sequence[Sequence], block: Optional[int] = None
+) -> None:
+    """Write ``template % row`` for every row of ``columns`` to ``fout``.
+
+    Rows are formatted a block at a time with a single ``%`` on the repeated
+    template, so memory stays bounded and no Python code runs per row. Numpy
+    columns are converted to Python scalars one block at a time.
+    """
+    block = block or ROW_BLOCK
+    nrow = len(columns[0])
+    for start in range(0, nrow, block):
+        parts = [col[start : start + block] for col in columns]
+        parts = [part.tolist() if hasattr(part, "tolist") else part for part in parts]
+        rows = list(zip(*parts))
+        fout.write((template * len(rows)) % tuple(chain.from_iterable(rows)))
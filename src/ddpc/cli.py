@@ -1,4 +1,14 @@
-"""Unified CLI for DDPC packages."""
+"""Unified CLI for DDPC packages.
+
+The ``data`` and ``structure`` groups are :class:`~ddpc._cli_base.LazyGroup`
+instances: the subpackage CLI is imported only when one of its commands is
+used, and the command runs directly, without a second round of parsing. Rich
+is imported only for output to a terminal or for tables, so a plain
+``ddpc --help`` needs little more than click.
+
+When ``ddpc serve`` is running, command lines are forwarded to its warm
+workers instead (see :mod:`ddpc.daemon`).
+"""
 
 import os
 import sys
@@ -13,13 +23,11 @@ if sys.platform == "win32":
         sys.stderr.reconfigure(encoding="utf-8")
 
 import click
-from rich.console import Console
 
-# Force UTF-8 encoding on Windows to handle Unicode characters
-console = Console(force_terminal=True, legacy_windows=False)
+from ddpc._cli_base import ForwardingGroup, FriendlyCommand, LazyGroup, console
 
 
-@click.group()
+@click.group(cls=ForwardingGroup)
 @click.version_option(version="2026.1.0", prog_name="ddpc")
 def cli():
     """DDPC - Crystal structure and electronic data tools.
@@ -30,220 +38,75 @@ def cli():
     """
 
 
-@cli.group()
-def data():
-    """Electronic structure data commands (requires: ddpc[data])."""
-
-
-@cli.group()
-def structure():
-    """Crystal structure commands (requires: ddpc[structure])."""
-
-
-@data.group()
-def band():
-    """Band structure commands."""
-
-
-@data.group()
-def dos():
-    """Density of states commands."""
-
-
-def _safe_invoke_command(cli_group, command_name, ctx, package_name, group_name=None):
-    """Safely invoke a command from a CLI group with validation."""
-    if not hasattr(cli_group, "commands") or command_name not in cli_group.commands:
-        console.print(
-            f"[bold red]Error:[/bold red] Command [cyan]{command_name}[/cyan] is not available"
-        )
-        console.print()
-
-        # Show available commands
-        if hasattr(cli_group, "commands"):
-            available = list(cli_group.commands.keys())
-            if available:
-                console.print("[dim]Available commands:[/dim]")
-                for cmd in sorted(available):
-                    console.print(f"  • [cyan]{cmd}[/cyan]")
-                console.print()
-
-        # Show help tip
-        full_path = f"{package_name} {group_name}" if group_name else package_name
-        console.print(f"[dim]For more information, run:[/dim] [cyan]{full_path} --help[/cyan]")
-        sys.exit(2)
-
-    command_func = cli_group.commands[command_name]
-
-    # Build correct program name for help display
-    # e.g., "ddpc-structure convert" or "ddpc-data band read"
-    if group_name:
-        prog_name = f"{package_name} {group_name} {command_name}"
-    else:
-        prog_name = f"{package_name} {command_name}"
-
-    # Call command with correct program name
-    # This allows FriendlyCommand to display proper help on errors
-    try:
-        command_func.main(
-            args=ctx.args,
-            prog_name=prog_name,
-            standalone_mode=True,
-        )
-    except SystemExit:
-        # Re-raise SystemExit to preserve exit codes
-        raise
-
-
-@band.command(context_settings={"ignore_unknown_options": True, "allow_extra_args": True})
-@click.pass_context
-def read(ctx):
-    """Read band structure data (delegates to ddpc-data)."""
-    try:
-        from ddpc.data.cli import band as band_cli
-
-        _safe_invoke_command(band_cli, "read", ctx, "ddpc-data", "band")
-    except ImportError:
-        console.print("[bold red]Error:[/bold red] ddpc-data is not installed")
-        console.print(
-            "Install with: [cyan]pip install ddpc[data][/cyan] "
-            "or [cyan]pip install ddpc-data[/cyan]"
-        )
-        sys.exit(1)
-
-
-@band.command(context_settings={"ignore_unknown_options": True, "allow_extra_args": True})
-@click.pass_context
-def info(ctx):
-    """Show band structure info (delegates to ddpc-data)."""
-    try:
-        from ddpc.data.cli import band as band_cli
-
-        _safe_invoke_command(band_cli, "info", ctx, "ddpc-data", "band")
-    except ImportError:
-        console.print("[bold red]Error:[/bold red] ddpc-data is not installed")
-        console.print(
-            "Install with: [cyan]pip install ddpc[data][/cyan] "
-            "or [cyan]pip install ddpc-data[/cyan]"
-        )
-        sys.exit(1)
-
-
-@dos.command(context_settings={"ignore_unknown_options": True, "allow_extra_args": True})
-@click.pass_context
-def read(ctx):
-    """Read DOS data (delegates to ddpc-data)."""
-    try:
-        from ddpc.data.cli import dos as dos_cli
-
-        _safe_invoke_command(dos_cli, "read", ctx, "ddpc-data", "dos")
-    except ImportError:
-        console.print("[bold red]Error:[/bold red] ddpc-data is not installed")
-        console.print(
-            "Install with: [cyan]pip install ddpc[data][/cyan] "
-            "or [cyan]pip install ddpc-data[/cyan]"
-        )
-        sys.exit(1)
-
-
-@dos.command(context_settings={"ignore_unknown_options": True, "allow_extra_args": True})
-@click.pass_context
-def info(ctx):
-    """Show DOS info (delegates to ddpc-data)."""
-    try:
-        from ddpc.data.cli import dos as dos_cli
-
-        _safe_invoke_command(dos_cli, "info", ctx, "ddpc-data", "dos")
-    except ImportError:
-        console.print("[bold red]Error:[/bold red] ddpc-data is not installed")
-        console.print(
-            "Install with: [cyan]pip install ddpc[data][/cyan] "
-            "or [cyan]pip install ddpc-data[/cyan]"
-        )
-        sys.exit(1)
-
-
-@structure.command(context_settings={"ignore_unknown_options": True, "allow_extra_args": True})
-@click.pass_context
-def convert(ctx):
-    """Convert structure file formats (delegates to ddpc-structure)."""
-    try:
-        from ddpc.structure.cli import cli as structure_cli
-
-        _safe_invoke_command(structure_cli, "convert", ctx, "ddpc-structure")
-    except ImportError:
-        console.print("[bold red]Error:[/bold red] ddpc-structure is not installed")
-        console.print(
-            "Install with: [cyan]pip install ddpc[structure][/cyan] "
-            "or [cyan]pip install ddpc-structure[/cyan]"
-        )
-        sys.exit(1)
-
-
-@structure.command(context_settings={"ignore_unknown_options": True, "allow_extra_args": True})
-@click.pass_context
-def info(ctx):
-    """Show structure information (delegates to ddpc-structure)."""
-    try:
-        from ddpc.structure.cli import cli as structure_cli
-
-        _safe_invoke_command(structure_cli, "info", ctx, "ddpc-structure")
-    except ImportError:
-        console.print("[bold red]Error:[/bold red] ddpc-structure is not installed")
-        console.print(
-            "Install with: [cyan]pip install ddpc[structure][/cyan] "
-            "or [cyan]pip install ddpc-structure[/cyan]"
-        )
-        sys.exit(1)
-
-
-@structure.command(context_settings={"ignore_unknown_options": True, "allow_extra_args": True})
-@click.pass_context
-def primitive(ctx):
-    """Find primitive cell (delegates to ddpc-structure)."""
-    try:
-        from ddpc.structure.cli import cli as structure_cli
-
-        _safe_invoke_command(structure_cli, "primitive", ctx, "ddpc-structure")
-    except ImportError:
-        console.print("[bold red]Error:[/bold red] ddpc-structure is not installed")
-        console.print(
-            "Install with: [cyan]pip install ddpc[structure][/cyan] "
-            "or [cyan]pip install ddpc-structure[/cyan]"
-        )
-        sys.exit(1)
-
-
-@structure.command(context_settings={"ignore_unknown_options": True, "allow_extra_args": True})
-@click.pass_context
-def orthogonal(ctx):
-    """Find orthogonal supercell (delegates to ddpc-structure)."""
-    try:
-        from ddpc.structure.cli import cli as structure_cli
-
-        _safe_invoke_command(structure_cli, "orthogonal", ctx, "ddpc-structure")
-    except ImportError:
-        console.print("[bold red]Error:[/bold red] ddpc-structure is not installed")
+# subpackage CLIs are only imported when one of their commands is used
+cli.add_command(
+    LazyGroup(
+        "data",
+        source="ddpc.data.cli:cli",
+        extra="data",
+        help="Electronic structure data commands (requires: ddpc[data]).",
+    )
+)
+cli.add_command(
+    LazyGroup(
+        "structure",
+        source="ddpc.structure.cli:cli",
+        extra="structure",
+        help="Crystal structure commands (requires: ddpc[structure]).",
+    )
+)
+
+
+@cli.command(cls=FriendlyCommand)
+@click.option(
+    "--socket",
+    "socket_path",
+    type=click.Path(dir_okay=False),
+    help="Socket path [default: $DDPC_SOCKET, else $XDG_RUNTIME_DIR/ddpc.sock]",
+)
+@click.option("-j", "--workers", type=int, help="Worker processes [default: number of CPUs]")
+@click.option("-d", "--detach", is_flag=True, help="Run in the background once ready")
+@click.option("--status", "show_status", is_flag=True, help="Show the running daemon and exit")
+@click.option("--stop", "stop_daemon", is_flag=True, help="Stop the running daemon and exit")
+def serve(socket_path, workers, detach, show_status, stop_daemon):
+    """Serve ddpc commands from warm worker processes.
+
+    Imports numpy, h5py, ASE and spglib once; later ddpc calls run their
+    command in a worker instead of starting Python from scratch, and run
+    in-process again once the daemon stops. Set DDPC_NO_DAEMON=1 to bypass it.
+    """
+    from ddpc import daemon
+
+    path = socket_path or daemon.socket_path()
+    if show_status:
+        info = daemon.status(path)
+        if info is None:
+            console.print(f"No ddpc daemon is listening on {path}")
+            sys.exit(1)
         console.print(
-            "Install with: [cyan]pip install ddpc[structure][/cyan] "
-            "or [cyan]pip install ddpc-structure[/cyan]"
+            f"ddpc daemon on {path}: pid {info['pid']}, {info['workers']} workers, "
+            f"up {info['uptime']:.0f} s"
         )
-        sys.exit(1)
+        return
+    if stop_daemon:
+        if not daemon.stop(path):
+            console.print(f"No ddpc daemon is listening on {path}")
+            sys.exit(1)
+        console.print(f"[bold green]✓[/bold green] Stopped the ddpc daemon on {path}")
+        return
 
-
-@structure.command(context_settings={"ignore_unknown_options": True, "allow_extra_args": True})
-@click.pass_context
-def scale(ctx):
-    """Convert to fractional coordinates (delegates to ddpc-structure)."""
     try:
-        from ddpc.structure.cli import cli as structure_cli
-
-        _safe_invoke_command(structure_cli, "scale", ctx, "ddpc-structure")
-    except ImportError:
-        console.print("[bold red]Error:[/bold red] ddpc-structure is not installed")
-        console.print(
-            "Install with: [cyan]pip install ddpc[structure][/cyan] "
-            "or [cyan]pip install ddpc-structure[/cyan]"
-        )
+        if detach:
+            info = daemon.start_detached(path, workers)
+            console.print(
+                f"[bold green]✓[/bold green] ddpc daemon listening on {path} "
+                f"(pid {info['pid']}, {info['workers']} workers)"
+            )
+        else:
+            console.print(f"Serving ddpc commands on {path}, press Ctrl-C to stop")
+            daemon.serve(path, workers)
+    except RuntimeError as e:
+        console.print(f"[bold red]Error:[/bold red] {e}")
         sys.exit(1)
 
 
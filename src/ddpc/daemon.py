@@ -0,0 +1,603 @@
+"""Warm worker daemon for repeated ``ddpc`` invocations.
+
+``ddpc serve`` imports numpy, h5py, ASE, spglib and the subpackage CLIs once,
+then forks a pool of workers that accept commands on a Unix socket. Each
+worker runs one command at a time, in the working directory, environment and
+umask of the calling process, and streams its stdout and stderr back. A plain
+``ddpc ...`` call forwards its arguments to the daemon when the socket answers
+(see :func:`forward`) and runs in-process otherwise, so scripts work the same
+with or without the daemon, only without the import time.
+
+The socket is ``$DDPC_SOCKET``, else ``$XDG_RUNTIME_DIR/ddpc.sock``, else
+``ddpc-<uid>/ddpc.sock`` in the temporary directory; it is only accessible to
+its owner. Commands are only forwarded to, and a daemon only binds, a socket
+whose directory belongs to the current user and is closed to group and others,
+and whose listening process runs as the current user where the platform
+reports it. ``DDPC_NO_DAEMON=1`` disables forwarding. A daemon only serves
+clients of the same ddpc installation; restart it after upgrading ddpc.
+
+Messages are frames of one type byte, a 4-byte big-endian length and the
+payload. The client sends a JSON request, the worker answers with an accept
+or reject frame, then stdout and stderr frames, and an exit frame.
+"""
+
+from __future__ import annotations
+
+import io
+import os
+import struct
+import sys
+import time
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Tuple
+
+# socket, json and signal are imported on use: without a daemon, a ddpc call
+# only checks whether the socket file exists
+if TYPE_CHECKING:
+    import socket
+
+PROTOCOL = 1
+# modules imported before the workers are forked, missing optional ones are skipped
+PRELOAD = (
+    "numpy",
+    "h5py",
+    "ase",
+    "ase.io",
+    "spglib",
+    "rich.console",
+    "rich.table",
+    "ddpc.data.cli",
+    "ddpc.data.band",
+    "ddpc.data.dos",
+    "ddpc.data.export",
+    "ddpc.structure.cli",
+    "ddpc.structure.io",
+    "ddpc.structure.symmetry",
+    "ddpc.structure.primitive",
+    "ddpc.structure.orthogonal",
+)
+START_TIMEOUT = 60.0
+# a worker dying faster than this after its start is restarted only after a pause
+MIN_WORKER_LIFETIME = 1.0
+
+REQUEST = b"Q"
+ACCEPT = b"A"
+REJECT = b"R"
+STDOUT = b"O"
+STDERR = b"E"
+EXIT = b"X"
+_HEADER = struct.Struct(">cI")
+
+
+def socket_path() -> str:
+    """Return the daemon socket path, see the module docstring."""
+    env = os.environ.get("DDPC_SOCKET")
+    if env:
+        return env
+    runtime = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime:
+        return os.path.join(runtime, "ddpc.sock")
+    tmp = os.environ.get("TMPDIR") or "/tmp"
+    return os.path.join(tmp, f"ddpc-{os.getuid()}", "ddpc.sock")
+
+
+def supported() -> bool:
+    """Return whether this platform has Unix sockets and ``fork``."""
+    import socket
+
+    return hasattr(socket, "AF_UNIX") and hasattr(os, "fork")
+
+
+def _identity() -> str:
+    """Return the ddpc installation a daemon serves."""
+    import ddpc
+
+    return os.path.dirname(os.path.abspath(ddpc.__file__))
+
+
+def _send(sock: socket.socket, kind: bytes, payload: bytes = b"") -> None:
+    sock.sendall(_HEADER.pack(kind, len(payload)) + payload)
+
+
+def _recv_exact(sock: socket.socket, size: int) -> bytes:
+    chunks = []
+    while size:
+        chunk = sock.recv(min(size, 1 << 16))
+        if not chunk:
+            raise ConnectionError("connection closed")
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b"".join(chunks)
+
+
+def _recv(sock: socket.socket) -> Tuple[bytes, bytes]:
+    kind, size = _HEADER.unpack(_recv_exact(sock, _HEADER.size))
+    return kind, _recv_exact(sock, size)
+
+
+def _untrusted(path: str) -> Optional[str]:
+    """Return why the socket ``path`` may belong to another user, None if it cannot.
+
+    The directory of the socket must be a directory of the current user without
+    group or other permissions, and the socket, if it exists, a socket of the
+    current user. Otherwise another user could listen on it.
+    """
+    import stat
+
+    uid = os.getuid()
+    directory = os.path.dirname(os.path.abspath(path))
+    try:
+        st = os.lstat(directory)
+    except OSError:
+        return f"{directory} does not exist"
+    if not stat.S_ISDIR(st.st_mode) or st.st_uid != uid:
+        return f"{directory} is not a directory owned by the current user"
+    if st.st_mode & 0o077:
+        return f"{directory} is accessible by other users"
+    try:
+        st = os.lstat(path)
+    except FileNotFoundError:
+        return None
+    if not stat.S_ISSOCK(st.st_mode) or st.st_uid != uid:
+        return f"{path} is not a socket owned by the current user"
+    return None
+
+
+def _peer_uid(sock: socket.socket) -> Optional[int]:
+    """Return the user id of the process at the other end of ``sock``, None if unknown."""
+    import socket
+
+    if not hasattr(socket, "SO_PEERCRED"):
+        return None
+    creds = struct.Struct("3i")
+    _, uid, _ = creds.unpack(sock.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, creds.size))
+    return uid
+
+
+def _connect(path: str) -> Optional[socket.socket]:
+    """Connect to the daemon at ``path``, None if none is listening or it is not trusted."""
+    if not os.path.exists(path) or not supported() or _untrusted(path) is not None:
+        return None
+    import socket
+
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(path)
+        if _peer_uid(sock) not in {None, os.getuid()}:
+            raise PermissionError(f"{path} is served by another user")
+    except OSError:
+        sock.close()
+        return None
+    return sock
+
+
+def _call(sock: socket.socket, request: Dict[str, Any]) -> Optional[bytes]:
+    """Send ``request`` and return the accept payload, None if it was rejected."""
+    import json
+
+    request = {"protocol": PROTOCOL, "identity": _identity(), **request}
+    _send(sock, REQUEST, json.dumps(request).encode())
+    kind, payload = _recv(sock)
+    return payload if kind == ACCEPT else None
+
+
+def forward(argv: Sequence[str], path: Optional[str] = None) -> Optional[int]:
+    """Run a ddpc command in the daemon, writing its output to this process.
+
+    Args:
+        argv: Command line arguments after ``ddpc``
+        path: Socket path (default: :func:`socket_path`)
+
+    Returns
+    -------
+        Exit status of the command, None if it was not forwarded because no
+        daemon is listening, the daemon serves another ddpc installation, or
+        forwarding is disabled by ``DDPC_NO_DAEMON``
+    """
+    if os.environ.get("DDPC_NO_DAEMON") or (argv and argv[0] == "serve"):
+        return None
+    sock = _connect(path or socket_path())
+    if sock is None:
+        return None
+    with sock:
+        try:
+            if _call(sock, _run_request(argv)) is None:
+                return None
+        except (OSError, ValueError, struct.error):
+            return None
+        return _relay(sock)
+
+
+def _run_request(argv: Sequence[str]) -> Dict[str, Any]:
+    """Return the request running ``argv`` like this process would."""
+    env = dict(os.environ)
+    tty = [sys.stdout.isatty(), sys.stderr.isatty()]
+    if tty[0] and "COLUMNS" not in env:
+        try:
+            env["COLUMNS"] = str(os.get_terminal_size(sys.stdout.fileno()).columns)
+        except OSError:
+            pass
+    umask = os.umask(0)
+    os.umask(umask)
+    return {
+        "command": "run",
+        "argv": list(argv),
+        "prog_name": _program_name(),
+        "cwd": os.getcwd(),
+        "env": env,
+        "umask": umask,
+        "tty": tty,
+    }
+
+
+def _program_name() -> str:
+    """Return the program name click shows in usage messages of this process."""
+    main = sys.modules.get("__main__")
+    package = getattr(main, "__package__", None)
+    path = sys.argv[0]
+    if not package:
+        return os.path.basename(path)
+    # run with "python -m"
+    name = os.path.splitext(os.path.basename(path))[0]
+    module = package if name == "__main__" else f"{package}.{name}"
+    return f"python -m {module.lstrip('.')}"
+
+
+def _relay(sock: socket.socket) -> int:
+    """Write the output frames of a running command, return its exit status."""
+    streams = {STDOUT: sys.stdout, STDERR: sys.stderr}
+    try:
+        while True:
+            kind, payload = _recv(sock)
+            if kind == EXIT:
+                return int(payload)
+            stream = streams[kind]
+            buffer = getattr(stream, "buffer", None)
+            if buffer is None:
+                # replaced streams such as io.StringIO; each frame holds whole characters
+                stream.write(payload.decode("utf-8", "replace"))
+                continue
+            stream.flush()
+            buffer.write(payload)
+            buffer.flush()
+    except KeyboardInterrupt:
+        return 130
+    except (OSError, ValueError, KeyError, struct.error):
+        sys.stderr.write("ddpc: lost the connection to the daemon\n")
+        return 1
+
+
+def status(path: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """Return ``pid``, ``workers``, ``uptime`` and ``identity`` of the running daemon, None if none answers."""
+    sock = _connect(path or socket_path())
+    if sock is None:
+        return None
+    with sock:
+        try:
+            payload = _call(sock, {"command": "status"})
+        except (OSError, ValueError, struct.error):
+            return None
+    if payload is None:
+        return None
+    import json
+
+    return json.loads(payload)
+
+
+def stop(path: Optional[str] = None, timeout: float = 10.0) -> bool:
+    """Stop the running daemon and wait until its socket is gone.
+
+    Returns
+    -------
+        True if a daemon was stopped, False if none answered
+    """
+    path = path or socket_path()
+    sock = _connect(path)
+    if sock is None:
+        return False
+    with sock:
+        try:
+            if _call(sock, {"command": "stop"}) is None:
+                return False
+        except (OSError, ValueError, struct.error):
+            return False
+    deadline = time.monotonic() + timeout
+    while os.path.exists(path) and time.monotonic() < deadline:
+        time.sleep(0.05)
+    return True
+
+
+class _FrameWriter(io.TextIOBase):
+    """Text stream sending everything written as frames of one kind."""
+
+    encoding = "utf-8"
+    errors = "replace"
+
+    def __init__(self, sock: socket.socket, kind: bytes, tty: bool):
+        self._sock = sock
+        self._kind = kind
+        self._tty = tty
+
+    def writable(self) -> bool:
+        return True
+
+    def isatty(self) -> bool:
+        return self._tty
+
+    def write(self, text: str) -> int:
+        data = text.encode(self.encoding, self.errors)
+        if data:
+            _send(self._sock, self._kind, data)
+        return len(text)
+
+
+class _Worker:
+    """Loop of a forked worker: accept a connection, run its request, repeat."""
+
+    def __init__(self, server: socket.socket, parent: int, info: Dict[str, Any]):
+        self.server = server
+        self.parent = parent
+        self.info = info
+
+    def run(self) -> None:
+        import signal
+        import socket
+
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        # commands must not read the terminal of a daemon running in the foreground
+        devnull = os.open(os.devnull, os.O_RDONLY)
+        os.dup2(devnull, 0)
+        os.close(devnull)
+        # wake up regularly to notice a dead parent
+        self.server.settimeout(1.0)
+        while os.getppid() == self.parent:
+            try:
+                conn, _ = self.server.accept()
+            except socket.timeout:
+                continue
+            except OSError:
+                return
+            with conn:
+                try:
+                    self.handle(conn)
+                except (OSError, ValueError, struct.error):
+                    # the client went away
+                    pass
+
+    def handle(self, conn: socket.socket) -> None:
+        import json
+        import signal
+
+        if _peer_uid(conn) not in {None, os.getuid()}:
+            _send(conn, REJECT, b"client of another user")
+            return
+        kind, payload = _recv(conn)
+        request = json.loads(payload) if kind == REQUEST else {}
+        if request.get("protocol") != PROTOCOL or request.get("identity") != self.info["identity"]:
+            _send(conn, REJECT, b"incompatible client")
+            return
+        command = request.get("command")
+        if command == "status":
+            info = {**self.info, "uptime": time.time() - self.info["started"]}
+            _send(conn, ACCEPT, json.dumps(info).encode())
+        elif command == "stop":
+            _send(conn, ACCEPT)
+            os.kill(self.parent, signal.SIGTERM)
+        elif command == "run":
+            _send(conn, ACCEPT)
+            code = self.execute(conn, request)
+            _send(conn, EXIT, str(code).encode())
+        else:
+            _send(conn, REJECT, b"unknown command")
+
+    def execute(self, conn: socket.socket, request: Dict[str, Any]) -> int:
+        """Run the ddpc command of ``request`` as its own process would, return the exit status."""
+        import traceback
+
+        from ddpc.cli import cli
+
+        argv: List[str] = request["argv"]
+        sys.argv = ["ddpc", *argv]
+        _reset_consoles()
+        sys.stdout = _FrameWriter(conn, STDOUT, request["tty"][0])
+        sys.stderr = _FrameWriter(conn, STDERR, request["tty"][1])
+        try:
+            os.chdir(request["cwd"])
+            os.environ.clear()
+            os.environ.update(request["env"])
+            os.umask(request["umask"])
+            result = cli.main(args=argv, prog_name=request["prog_name"])
+            return result if isinstance(result, int) else 0
+        except SystemExit as e:
+            if e.code is None or isinstance(e.code, int):
+                return e.code or 0
+            print(e.code, file=sys.stderr)
+            return 1
+        except Exception:
+            # a lost client also shows up as an error of the command writing its output
+            if not _client_alive(conn):
+                raise
+            traceback.print_exc()
+            return 1
+        finally:
+            sys.stdout, sys.stderr = sys.__stdout__, sys.__stderr__
+
+
+def _client_alive(conn: socket.socket) -> bool:
+    try:
+        _send(conn, STDERR)
+    except OSError:
+        return False
+    return True
+
+
+def _reset_consoles() -> None:
+    """Drop the rich consoles of previous commands, which keep their terminal width."""
+    for name in ("ddpc._cli_base", "ddpc.data._cli_base", "ddpc.structure._cli_base"):
+        module = sys.modules.get(name)
+        if module is not None:
+            module.console._consoles.clear()
+
+
+def preload(modules: Sequence[str] = PRELOAD) -> List[str]:
+    """Import ``modules``, skipping those whose dependencies are missing.
+
+    Returns
+    -------
+        Names of the imported modules
+    """
+    from importlib import import_module
+
+    loaded = []
+    for name in modules:
+        try:
+            import_module(name)
+        except ImportError:
+            continue
+        loaded.append(name)
+    return loaded
+
+
+def _bind(path: str) -> socket.socket:
+    """Create the listening socket, replacing a stale socket file.
+
+    Raises
+    ------
+        RuntimeError: If a daemon is already listening on ``path``, or the
+            socket or its directory may belong to another user
+    """
+    import socket
+
+    directory = os.path.dirname(path)
+    if directory and not os.path.lexists(directory):
+        os.makedirs(directory, mode=0o700)
+    problem = _untrusted(path)
+    if problem is not None:
+        raise RuntimeError(f"Refusing to serve on {path}: {problem}")
+    if os.path.exists(path):
+        sock = _connect(path)
+        if sock is not None:
+            sock.close()
+            raise RuntimeError(f"A ddpc daemon is already listening on {path}")
+        os.unlink(path)
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    old_umask = os.umask(0o177)
+    try:
+        server.bind(path)
+    finally:
+        os.umask(old_umask)
+    server.listen(128)
+    return server
+
+
+def serve(path: Optional[str] = None, workers: Optional[int] = None) -> None:
+    """Preload the ddpc modules and serve commands on ``path`` until stopped.
+
+    Workers that exit are replaced. SIGTERM, SIGINT or :func:`stop` end the
+    daemon, its workers and the socket file.
+
+    Args:
+        path: Socket path (default: :func:`socket_path`)
+        workers: Number of worker processes (default: number of CPUs)
+
+    Raises
+    ------
+        RuntimeError: If the platform has no Unix sockets or ``fork``, or a
+            daemon already listens on ``path``
+    """
+    import signal
+
+    if not supported():
+        raise RuntimeError("ddpc serve requires Unix sockets and fork")
+    path = path or socket_path()
+    workers = max(1, workers or os.cpu_count() or 1)
+    preload()
+    server = _bind(path)
+    parent = os.getpid()
+    info = {
+        "pid": parent,
+        "workers": workers,
+        "started": time.time(),
+        "identity": _identity(),
+        "socket": path,
+    }
+
+    def spawn() -> int:
+        pid = os.fork()
+        if pid == 0:
+            try:
+                _Worker(server, parent, info).run()
+            finally:
+                os._exit(0)
+        return pid
+
+    def terminate(_signum, _frame):
+        raise SystemExit(0)
+
+    signal.signal(signal.SIGTERM, terminate)
+    started = {spawn(): time.monotonic() for _ in range(workers)}
+    try:
+        while True:
+            pid, _ = os.wait()
+            if pid not in started:
+                continue
+            if time.monotonic() - started.pop(pid) < MIN_WORKER_LIFETIME:
+                time.sleep(MIN_WORKER_LIFETIME)
+            started[spawn()] = time.monotonic()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        for pid in started:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+        for pid in started:
+            try:
+                os.waitpid(pid, 0)
+            except ChildProcessError:
+                pass
+        server.close()
+        if os.path.exists(path):
+            os.unlink(path)
+
+
+def start_detached(
+    path: Optional[str] = None, workers: Optional[int] = None, timeout: float = START_TIMEOUT
+) -> Dict[str, Any]:
+    """Start :func:`serve` in a background process and wait until it answers.
+
+    Returns
+    -------
+        :func:`status` of the new daemon
+
+    Raises
+    ------
+        RuntimeError: If a daemon already listens on ``path``, or the new one
+            does not answer within ``timeout`` seconds
+    """
+    path = path or socket_path()
+    if status(path) is not None:
+        raise RuntimeError(f"A ddpc daemon is already listening on {path}")
+    pid = os.fork()
+    if pid == 0:
+        # detach from the terminal and the calling process
+        os.setsid()
+        if os.fork():
+            os._exit(0)
+        devnull = os.open(os.devnull, os.O_RDWR)
+        for fd in (0, 1, 2):
+            os.dup2(devnull, fd)
+        try:
+            serve(path, workers)
+        finally:
+            os._exit(0)
+    os.waitpid(pid, 0)
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        info = status(path)
+        if info is not None:
+            return info
+        time.sleep(0.05)
+    raise RuntimeError(f"The ddpc daemon did not start listening on {path}")
@@ -1,16 +1,56 @@
 """Electronic structure data I/O tools for DDPC.
 
 This package provides functions to read and process band structure and
-density of states data from DFT calculations.
+density of states data from DFT calculations. Functions are imported from
+their modules on first use, so importing the package (e.g. to run the CLI)
+does not load numpy or h5py.
 """
 
-from ddpc.data.band import read_band
-from ddpc.data.dos import read_dos
-from ddpc.data.export import to_csv, to_npz
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from ddpc.data.band import probe_band, read_band
+    from ddpc.data.containers import BandData, BandSummary, DosSummary
+    from ddpc.data.dos import probe_dos, read_dos
+    from ddpc.data.export import to_arrow, to_csv, to_npz, to_parquet
+
+_EXPORTS = {
+    "BandData": "containers",
+    "BandSummary": "containers",
+    "DosSummary": "containers",
+    "probe_band": "band",
+    "probe_dos": "dos",
+    "read_band": "band",
+    "read_dos": "dos",
+    "to_arrow": "export",
+    "to_csv": "export",
+    "to_npz": "export",
+    "to_parquet": "export",
+}
 
 __all__ = [
+    "BandData",
+    "BandSummary",
+    "DosSummary",
+    "probe_band",
+    "probe_dos",
     "read_band",
     "read_dos",
+    "to_arrow",
     "to_csv",
     "to_npz",
+    "to_parquet",
 ]
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module 'ddpc.data' has no attribute '{name}'")
+    value = getattr(import_module(f"ddpc.data.{_EXPORTS[name]}"), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted({*globals(), *_EXPORTS})
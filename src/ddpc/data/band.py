@@ -1,22 +1,38 @@
 """Read band data from output files."""
 
 import sys
-from json import load
+import warnings
 from pathlib import Path
-from typing import Dict, List, Tuple, Union
+from typing import Dict, List, Optional, Sequence, Tuple, Union
 
 import numpy as np
 
 from ddpc._utils import absf
+from ddpc.data.containers import (
+    BandData,
+    BandSummary,
+    Selection,
+    kpath_distance,
+    kpoint_labels,
+)
 from ddpc.data.processors import _refactor_band
-from ddpc.data.utils import get_h5_str
+from ddpc.data.streaming import find_tail_string, load_json, read_array
+from ddpc.data.utils import get_h5_str, read_modes
+from ddpc.profiling import count_bytes, stage
 
 
-def read_band(
+def read_band(  # noqa: PLR0913, PLR0917
     p: Union[str, Path],
     mode: int = 5,
-    fmt: str = "8.3f",
-) -> Tuple[Dict[str, np.ndarray], float, bool]:
+    fmt: Optional[str] = None,
+    atoms: Optional[Sequence[int]] = None,
+    elements: Optional[Sequence[str]] = None,
+    orbitals: Optional[Sequence[str]] = None,
+    bands: Optional[Sequence[int]] = None,
+    energy_window: Optional[Sequence[float]] = None,
+    cache: bool = False,
+    modes: Optional[Sequence[int]] = None,
+) -> Tuple[Union[BandData, Dict[int, BandData]], float, bool]:
     """Read and process electronic band structure data from HDF5 or JSON files.
 
     Parameters
@@ -27,12 +43,36 @@ def read_band(
     mode : int, default 5
         Projection mode for projected band structure data. Only relevant when
         the file contains orbital-projected information.
+    fmt : str, optional
+        Deprecated and ignored: reading does not format values. Pass
+        ``float_format`` to :func:`~ddpc.data.to_csv` or ``--float-format``
+        on the command line instead.
+    atoms : sequence of int, optional
+        1-based indices of the atoms whose projections are read.
+    elements : sequence of str, optional
+        Only read projections of atoms of these elements.
+    orbitals : sequence of str, optional
+        Only read projections of these orbitals, either full names such as
+        ``"dxy"`` or shells such as ``"d"``.
+    bands : sequence of int, optional
+        1-based indices of the bands to keep.
+    energy_window : (float, float), optional
+        Only keep bands with at least one eigenvalue inside ``(emin, emax)`` eV.
+    cache : bool, default False
+        Reuse a previous result for the same file content, mode and selection
+        from the on-disk cache (see :mod:`ddpc.data.cache`). Cached arrays are
+        memory-mapped and read-only.
+    modes : sequence of int, optional
+        Several projection modes to compute from a single read of the file,
+        replacing ``mode``. The data is then returned as a dict keyed by mode.
 
     Returns
     -------
-    tuple of (Dict[str, np.ndarray], float, bool)
+    tuple of (BandData, float, bool)
 
-        - Dict mapping column names to numpy arrays with k-points and energies
+        - Band data; also a mapping from column names to numpy arrays with
+          k-points and energies (or projections when ``mode`` is not 0).
+          A dict of band data per mode when ``modes`` is given
         - Fermi energy in eV
         - Boolean indicating whether the data contains orbital projections
 
@@ -40,20 +80,123 @@ def read_band(
     ------
     TypeError
         If the input file is neither HDF5 nor JSON format.
+    ValueError
+        If a selection matches nothing in the file.
     """
+    if fmt is not None:
+        warnings.warn(
+            "read_band(fmt=...) is ignored and deprecated, pass float_format to to_csv instead",
+            DeprecationWarning,
+            stacklevel=2,
+        )
     absfile = str(absf(p))
+    selection = Selection.create(atoms, elements, orbitals, bands, energy_window)
 
-    if absfile.endswith(".h5"):
-        df, efermi, isproj = read_band_h5(absfile, mode)
-    elif absfile.endswith(".json"):
-        df, efermi, isproj = read_band_json(absfile, mode)
-    else:
+    if not absfile.endswith((".h5", ".json")):
         raise TypeError(f"{absfile} must be h5 or json file!")
+    if cache and modes is not None:
+        from ddpc.data.cache import cached_read_modes
+
+        return cached_read_modes(
+            "band", absfile, modes, (selection,), lambda ms: _read_band_file(absfile, ms, selection)
+        )
+    if cache:
+        from ddpc.data.cache import cached_read
+
+        return cached_read(
+            "band", absfile, (mode, selection), lambda: _read_band_file(absfile, mode, selection)
+        )
+    return _read_band_file(absfile, mode if modes is None else modes, selection)
+
+
+def probe_band(p: Union[str, Path]) -> BandSummary:
+    """Read the header of a band structure file without loading any band data.
+
+    Only scalars, names and dataset shapes are read. For JSON files the scan
+    stops at the first spin block, and ``SpinType``, which DS-PAW writes after
+    the spin blocks, is looked up in the last bytes of the file.
+
+    Parameters
+    ----------
+    p : str or pathlib.Path
+        Path to an HDF5 (.h5) or JSON (.json) band structure file.
+
+    Returns
+    -------
+    BandSummary
+        Fermi energy, projection flag, spin type and counts of the file
+
+    Raises
+    ------
+    TypeError
+        If the input file is neither HDF5 nor JSON format.
+    """
+    absfile = str(absf(p))
+    if absfile.endswith(".h5"):
+        return _probe_band_h5(absfile)
+    if absfile.endswith(".json"):
+        return _probe_band_json(absfile)
+    raise TypeError(f"{absfile} must be h5 or json file!")
+
+
+def _probe_band_h5(absfile: str) -> BandSummary:
+    try:
+        import h5py
+    except ImportError as err:
+        raise ImportError(
+            "Reading HDF5 files requires 'h5py'. Install with: pip install ddpc-data"
+        ) from err
 
-    return df, efermi, isproj
+    with h5py.File(absfile, "r") as band:
+        if "BandInfo" not in band:
+            raise TypeError("h5 file must contain 'BandInfo' group!")
+        info = band["BandInfo"]
+        orbitals = get_h5_str(band, "/BandInfo/Orbit") if "Orbit" in info else []
+        elements = get_h5_str(band, "/AtomInfo/Elements") if "AtomInfo/Elements" in band else []
+        return BandSummary(
+            efermi=float(info["EFermi"][0]),
+            is_projected=bool(info["IsProject"][0]),
+            spin_type=get_h5_str(band, "/BandInfo/SpinType")[0],
+            nspin=2 if "Spin2" in info else 1,
+            nband=int(info["NumberOfBand"][0]),
+            nkpt=int(info["NumberOfKpoints"][0]),
+            orbitals=tuple(orbitals),
+            elements=tuple(elements),
+        )
 
 
-def read_band_h5(absfile: str, mode: int) -> Tuple[Dict[str, np.ndarray], float, bool]:
+def _probe_band_json(absfile: str) -> BandSummary:
+    head = load_json(absfile, stop_at=("Spin1",))
+    info = head["BandInfo"]
+    spin_type = info.get("SpinType") or find_tail_string(absfile, "SpinType")
+    if spin_type is None:
+        spin_type = load_json(absfile)["BandInfo"]["SpinType"]
+    atoms = head.get("AtomInfo", {}).get("Atoms", [])
+    return BandSummary(
+        efermi=float(info["EFermi"]),
+        is_projected=bool(info["IsProject"]),
+        spin_type=spin_type,
+        nspin=2 if spin_type == "collinear" else 1,
+        nband=int(info["NumberOfBand"]),
+        nkpt=int(info["NumberOfKpoints"]),
+        orbitals=tuple(info.get("Orbit", ())),
+        elements=tuple(atom["Element"] for atom in atoms),
+    )
+
+
+def _read_band_file(
+    absfile: str, mode: Union[int, Sequence[int]], selection: Selection
+) -> Tuple[Union[BandData, Dict[int, BandData]], float, bool]:
+    """Dispatch to the HDF5 or JSON reader."""
+    with stage("read-band"):
+        if absfile.endswith(".h5"):
+            return read_band_h5(absfile, mode, selection)
+        return read_band_json(absfile, mode, selection)
+
+
+def read_band_h5(
+    absfile: str, mode: Union[int, Sequence[int]], selection: Optional[Selection] = None
+) -> Tuple[Union[BandData, Dict[int, BandData]], float, bool]:
     """Read band structure data from HDF5 file format.
 
     Lazy imports h5py to avoid unnecessary dependency loading.
@@ -65,7 +208,9 @@ def read_band_h5(absfile: str, mode: int) -> Tuple[Dict[str, np.ndarray], float,
             "Reading HDF5 files requires 'h5py'. Install with: pip install ddpc-data"
         ) from err
 
-    with h5py.File(absfile, "r") as band:
+    with stage("open"):
+        band = h5py.File(absfile, "r")
+    with band:
         bandinfo = band["BandInfo"]
         if isinstance(bandinfo, h5py.Group):
             efermi_list = bandinfo["EFermi"]
@@ -82,221 +227,226 @@ def read_band_h5(absfile: str, mode: int) -> Tuple[Dict[str, np.ndarray], float,
                 print("ERROR: cannot read /BandInfo/IsProject")
                 sys.exit(1)
 
-            if mode == 0:
-                df = read_tband(band)
-            elif iproj:
-                df = read_pband_h5(band, mode)
-            else:
-                df = read_tband(band)
+            df = read_modes(
+                mode,
+                iproj,
+                lambda: read_tband(band, selection=selection),
+                lambda modes: read_pband_h5(band, modes, selection),
+            )
         else:
             raise TypeError("h5 file must contain 'BandInfo' group!")
 
     return df, efermi, bool(iproj)
 
 
-def read_band_json(absfile: str, mode: int) -> Tuple[Dict[str, np.ndarray], float, bool]:
+def read_band_json(
+    absfile: str, mode: Union[int, Sequence[int]], selection: Optional[Selection] = None
+) -> Tuple[Union[BandData, Dict[int, BandData]], float, bool]:
     """Read band structure data from JSON file format."""
-    with open(absfile, encoding="utf-8") as fin:
-        band = load(fin)
-        efermi = band["BandInfo"]["EFermi"]
+    with stage("open"):
+        band = load_json(absfile)
+    efermi = band["BandInfo"]["EFermi"]
 
     iproj = band["BandInfo"]["IsProject"]
-    if mode == 0:
-        df = read_tband(band, h5=False)
-    elif iproj:
-        df = read_pband_json(band, mode)
-    else:
-        df = read_tband(band, h5=False)
+    df = read_modes(
+        mode,
+        iproj,
+        lambda: read_tband(band, h5=False, selection=selection),
+        lambda modes: read_pband_json(band, modes, selection),
+    )
 
     return df, efermi, bool(iproj)
 
 
-def read_tband(band, h5: bool = True) -> Dict[str, np.ndarray]:
+def read_tband(band, h5: bool = True, selection: Optional[Selection] = None) -> BandData:
     """Read total (non-projected) band structure data from file."""
-    kc: List[float] = band["BandInfo"]["CoordinatesOfKPoints"]
-    nok: int = band["BandInfo"]["NumberOfKpoints"]
-    if isinstance(nok, int):
-        nkpt = nok
-    else:
-        nkpt = nok[0]
-
+    selection = selection or Selection()
+    with stage("read-metadata"):
+        kcoords, labels, nband = _read_kpath(band, h5)
+        spins = _band_spins(band, h5)
+    with stage("read-totals"):
+        energies = np.stack(
+            [_read_band_energies(band, spin, nband, len(kcoords)) for spin in range(len(spins))]
+        )
+        if h5:
+            count_bytes(energies.nbytes)
+    band_pos = selection.band_positions(nband, energies)
+
+    return BandData(
+        kcoords,
+        labels,
+        kpath_distance(kcoords),
+        energies=_take_bands(energies, band_pos, nband),
+        spins=spins,
+        bands=band_pos + 1,
+    )
+
+
+def _refactor_band_modes(
+    data: BandData, elements: List[str], mode: Union[int, Sequence[int]]
+) -> Union[BandData, Dict[int, BandData]]:
+    """Aggregate raw projections for one mode, or for each of several modes."""
+    with stage("aggregate"):
+        if np.ndim(mode) == 0:
+            return _refactor_band(data, data.nkpt, data.nband, elements, mode)
+        return {m: _refactor_band(data, data.nkpt, data.nband, elements, m) for m in mode}
+
+
+def _take_bands(arr: np.ndarray, positions: np.ndarray, nband: int) -> np.ndarray:
+    """Select bands along the second-to-last axis, without copying when all are kept."""
+    if len(positions) == nband:
+        return arr
+    return arr[..., positions, :]
+
+
+def _read_kpath(band, h5: bool) -> Tuple[np.ndarray, np.ndarray, int]:
+    """Read k-point coordinates, high-symmetry labels and number of bands."""
+    nok = band["BandInfo"]["NumberOfKpoints"]
+    nkpt = nok if isinstance(nok, int) else int(nok[0])
     nob = band["BandInfo"]["NumberOfBand"]
-    if isinstance(nob, int):
-        nband = nob
-    else:
-        nband = nob[0]
-    kcoord = np.array(kc).reshape(nkpt, 3)
-    kx = kcoord[:, 0]
-    ky = kcoord[:, 1]
-    kz = kcoord[:, 2]
-    # distance should be sum of diff
-    diff = np.diff(kcoord, axis=0)  # n-1
-    dist = [0.0]
-    dist.extend(np.cumsum(np.linalg.norm(diff, axis=1)).tolist())
+    nband = nob if isinstance(nob, int) else int(nob[0])
 
+    kcoords = np.array(band["BandInfo"]["CoordinatesOfKPoints"]).reshape(nkpt, 3)
     if h5:
-        spin_type_list = get_h5_str(band, "/BandInfo/SpinType")
-        collinear = spin_type_list[0] == "collinear"
+        count_bytes(kcoords.nbytes)
         sk: List[str] = get_h5_str(band, "/BandInfo/SymmetryKPoints")
-        # h5py bands is a nband*nkpt 2d array with C order, have to flatten and reshape it
-        bands = (
-            np.asarray(band["BandInfo"]["Spin1"]["BandEnergies"])
-            .flatten()
-            .reshape(nband, nkpt, order="F")
-        )
     else:
-        collinear = band["BandInfo"]["SpinType"] == "collinear"
         sk = band["BandInfo"]["SymmetryKPoints"]
-        bands = np.asarray(band["BandInfo"]["Spin1"]["BandEnergies"]).reshape(
-            nband, nkpt, order="F"
-        )
-    ski = band["BandInfo"]["SymmetryKPointsIndex"]
-    sk_column = [""] * nkpt
-    for i, symbol in zip(ski, sk):
-        sk_column[i - 1] = symbol
-    data = {
-        "label": np.array(sk_column),
-        "kx": kx,
-        "ky": ky,
-        "kz": kz,
-        "dist": np.array(dist),
-    }
-
-    # only collinear system has Spin2
-    if collinear:
-        for i in range(bands.shape[0]):
-            data[f"band{i + 1}-up"] = bands[i, :]
-        bands = np.asarray(band["BandInfo"]["Spin2"]["BandEnergies"]).reshape(
-            nband, nkpt, order="F"
-        )
-        for i in range(bands.shape[0]):
-            data[f"band{i + 1}-down"] = bands[i, :]
-    else:
-        for i in range(bands.shape[0]):
-            data[f"band{i + 1}"] = bands[i, :]
-
-    return data
-
-
-def read_pband_h5(band, mode: int) -> Dict[str, np.ndarray]:
-    """Read orbital-projected band structure data from HDF5 file."""
-    kc = band["/BandInfo/CoordinatesOfKPoints"]
-    nkpt: int = band["/BandInfo/NumberOfKpoints"][0]
-    nband: int = band["/BandInfo/NumberOfBand"][0]
-    sk: List[str] = get_h5_str(band, "/BandInfo/SymmetryKPoints")
-    ski: List[int] = band["BandInfo/SymmetryKPointsIndex"]
-
-    sk_column = [""] * nkpt
-    for i, symbol in zip(ski, sk):
-        sk_column[i - 1] = symbol
-
-    kcoord = np.array(kc).reshape(nkpt, 3)
-    kx = kcoord[:, 0]
-    ky = kcoord[:, 1]
-    kz = kcoord[:, 2]
-    # distance should be sum of diff
-    diff = np.diff(kcoord, axis=0)  # n-1
-    dist = [0.0]
-    dist.extend(np.cumsum(np.linalg.norm(diff, axis=1)).tolist())
-
-    data = {
-        "label": np.array(sk_column),
-        "kx": kx,
-        "ky": ky,
-        "kz": kz,
-        "dist": np.array(dist),
-    }
-    orbitals: List[str] = get_h5_str(band, "/BandInfo/Orbit")
-    atom_index = band["/BandInfo/Spin1/ProjectBand/AtomIndex"][0]
-    orb_index = band["/BandInfo/Spin1/ProjectBand/OrbitIndexs"][0]
-
-    # only collinear system has Spin2
-    spin_type_list = get_h5_str(band, "/BandInfo/SpinType")
-    if spin_type_list[0] == "collinear":
-        for ai in range(atom_index):
-            for oi in range(orb_index):
-                data.update(
-                    {
-                        f"{ai + 1}{orbitals[oi]}-up": np.asarray(
-                            band[f"/BandInfo/Spin1/ProjectBand/{ai + 1}/{oi + 1}"]
-                        ).flatten()
-                    }
-                )
-                data.update(
-                    {
-                        f"{ai + 1}{orbitals[oi]}-down": np.asarray(
-                            band[f"/BandInfo/Spin2/ProjectBand/{ai + 1}/{oi + 1}"]
-                        ).flatten()
-                    }
-                )
-    else:
-        for ai in range(atom_index):
-            for oi in range(orb_index):
-                data.update(
-                    {
-                        f"{ai + 1}{orbitals[oi]}": np.asarray(
-                            band[f"/BandInfo/Spin1/ProjectBand/1/{ai + 1}/{oi + 1}"]
-                        ).flatten()
-                    }
-                )
+    ski: List[int] = band["BandInfo"]["SymmetryKPointsIndex"]
 
-    elements: List[str] = get_h5_str(band, "/AtomInfo/Elements")
-    _data = _refactor_band(data, nkpt, nband, elements, mode)
+    return kcoords, kpoint_labels(nkpt, ski, sk), nband
 
-    return _data
 
+def _band_spins(band, h5: bool) -> Tuple[str, ...]:
+    """Return column suffix per spin channel, only collinear systems have Spin2."""
+    if h5:
+        spin_type = get_h5_str(band, "/BandInfo/SpinType")[0]
+    else:
+        spin_type = band["BandInfo"]["SpinType"]
+    return ("up", "down") if spin_type == "collinear" else ("",)
 
-def read_pband_json(band: Dict, mode: int) -> Dict[str, np.ndarray]:
-    """Read orbital-projected band structure data from JSON file."""
-    kc: List[float] = band["BandInfo"]["CoordinatesOfKPoints"]
-    nkpt: int = band["BandInfo"]["NumberOfKpoints"]
-    nband: int = band["BandInfo"]["NumberOfBand"]
 
-    sk: List[str] = band["BandInfo"]["SymmetryKPoints"]
-    ski: List[int] = band["BandInfo"]["SymmetryKPointsIndex"]
-    sk_column = [""] * nkpt
-    for i, symbol in zip(ski, sk):
-        sk_column[i - 1] = symbol
-
-    kcoord = np.array(kc).reshape(nkpt, 3)
-    kx = kcoord[:, 0]
-    ky = kcoord[:, 1]
-    kz = kcoord[:, 2]
-    # distance should be sum of diff
-    diff = np.diff(kcoord, axis=0)  # n-1
-    dist = [0.0]
-    dist.extend(np.cumsum(np.linalg.norm(diff, axis=1)).tolist())
-
-    data = {
-        "label": np.array(sk_column),
-        "kx": kx,
-        "ky": ky,
-        "kz": kz,
-        "dist": np.array(dist),
-    }
-    orbitals: List[str] = band["BandInfo"]["Orbit"]
-    if band["BandInfo"]["SpinType"] == "collinear":
-        project1 = band["BandInfo"]["Spin1"]["ProjectBand"]
-        project2 = band["BandInfo"]["Spin2"]["ProjectBand"]
-        for p in project1:
-            atom_index = p["AtomIndex"]
-            orb_index = p["OrbitIndex"] - 1
-            contrib = p["Contribution"]
-            data.update({f"{atom_index}{orbitals[orb_index]}-up": contrib})
-        for p in project2:
-            atom_index = p["AtomIndex"]
-            orb_index = p["OrbitIndex"] - 1
-            contrib = p["Contribution"]
-            data.update({f"{atom_index}{orbitals[orb_index]}-down": contrib})
-    else:
-        project = band["BandInfo"]["Spin1"]["ProjectBand"]
-        for p in project:
-            atom_index = p["AtomIndex"]
-            orb_index = p["OrbitIndex"] - 1
-            contrib = p["Contribution"]
-            data.update({f"{atom_index}{orbitals[orb_index]}": contrib})
+def _read_band_energies(band, spin: int, nband: int, nkpt: int) -> np.ndarray:
+    """Read band energies of one spin channel as a ``(band, kpt)`` array."""
+    # h5py bands is a nband*nkpt 2d array with C order, have to flatten and reshape it
+    return (
+        np.asarray(band["BandInfo"][f"Spin{spin + 1}"]["BandEnergies"])
+        .flatten()
+        .reshape(nband, nkpt, order="F")
+    )
+
 
-    elements: List[str] = [atom["Element"] for atom in band["AtomInfo"]["Atoms"]]
-    _data = _refactor_band(data, nkpt, nband, elements, mode)
+def read_pband_h5(
+    band, mode: Union[int, Sequence[int]], selection: Optional[Selection] = None
+) -> Union[BandData, Dict[int, BandData]]:
+    """Read orbital-projected band structure data from HDF5 file.
 
-    return _data
+    Only the ``/ProjectBand`` datasets of selected atoms and orbitals are read.
+    When ``mode`` is a sequence, the projections are read once and a dict with
+    the result of every mode is returned.
+    """
+    selection = selection or Selection()
+    with stage("read-metadata"):
+        kcoords, labels, nband = _read_kpath(band, h5=True)
+        nkpt = len(kcoords)
+        spins = _band_spins(band, h5=True)
+        orbitals: List[str] = get_h5_str(band, "/BandInfo/Orbit")
+        elements: List[str] = get_h5_str(band, "/AtomInfo/Elements")
+        natom = int(band["/BandInfo/Spin1/ProjectBand/AtomIndex"][0])
+        norb = int(band["/BandInfo/Spin1/ProjectBand/OrbitIndexs"][0])
+
+    with stage("read-totals"):
+        energies = np.stack(
+            [_read_band_energies(band, si, nband, nkpt) for si in range(len(spins))]
+        )
+        count_bytes(energies.nbytes)
+    band_pos = selection.band_positions(nband, energies)
+    atom_pos = selection.atom_positions(natom, elements)
+    orb_pos = selection.orbital_positions(orbitals[:norb])
+
+    projections = np.empty((len(spins), len(atom_pos), len(orb_pos), len(band_pos), nkpt))
+    with stage("read-projections"):
+        for si in range(len(spins)):
+            for i, ai in enumerate(atom_pos):
+                for j, oi in enumerate(orb_pos):
+                    dataset = band[f"/BandInfo/Spin{si + 1}/ProjectBand/1/{ai + 1}/{oi + 1}"]
+                    column = np.asarray(dataset).flatten().reshape(nband, nkpt, order="F")
+                    count_bytes(column.nbytes)
+                    projections[si, i, j] = _take_bands(column, band_pos, nband)
+
+    data = BandData(
+        kcoords,
+        labels,
+        kpath_distance(kcoords),
+        energies=_take_bands(energies, band_pos, nband),
+        spins=spins,
+        projections=projections,
+        atoms=atom_pos + 1,
+        elements=[elements[ai] if ai < len(elements) else "" for ai in atom_pos],
+        orbitals=[orbitals[oi] for oi in orb_pos],
+        bands=band_pos + 1,
+    )
+
+    return _refactor_band_modes(data, elements, mode)
+
+
+def read_pband_json(
+    band: Dict, mode: Union[int, Sequence[int]], selection: Optional[Selection] = None
+) -> Union[BandData, Dict[int, BandData]]:
+    """Read orbital-projected band structure data from JSON file.
+
+    When ``mode`` is a sequence, a dict with the result of every mode is returned.
+    """
+    selection = selection or Selection()
+    with stage("read-metadata"):
+        kcoords, labels, nband = _read_kpath(band, h5=False)
+        nkpt = len(kcoords)
+        spins = _band_spins(band, h5=False)
+        orbitals: List[str] = band["BandInfo"]["Orbit"]
+        elements: List[str] = [atom["Element"] for atom in band["AtomInfo"]["Atoms"]]
+
+        records = [band["BandInfo"][f"Spin{si + 1}"]["ProjectBand"] for si in range(len(spins))]
+        natom = max((p["AtomIndex"] for p in records[0]), default=0)
+        norb = max((p["OrbitIndex"] for p in records[0]), default=0)
+
+    with stage("read-totals"):
+        energies = np.stack(
+            [
+                np.asarray(band["BandInfo"][f"Spin{si + 1}"]["BandEnergies"]).reshape(
+                    nband, nkpt, order="F"
+                )
+                for si in range(len(spins))
+            ]
+        )
+    band_pos = selection.band_positions(nband, energies)
+    atom_pos = selection.atom_positions(natom, elements)
+    orb_pos = selection.orbital_positions(orbitals[:norb])
+    atom_at = {a: i for i, a in enumerate(atom_pos)}
+    orb_at = {o: j for j, o in enumerate(orb_pos)}
+
+    projections = np.zeros((len(spins), len(atom_pos), len(orb_pos), len(band_pos), nkpt))
+    scratch = np.empty(nband * nkpt)
+    with stage("read-projections"):
+        for si, project in enumerate(records):
+            for p in project:
+                i = atom_at.get(p["AtomIndex"] - 1)
+                j = orb_at.get(p["OrbitIndex"] - 1)
+                if i is None or j is None:
+                    continue
+                column = read_array(p["Contribution"], scratch).reshape(nband, nkpt, order="F")
+                projections[si, i, j] = _take_bands(column, band_pos, nband)
+
+    data = BandData(
+        kcoords,
+        labels,
+        kpath_distance(kcoords),
+        energies=_take_bands(energies, band_pos, nband),
+        spins=spins,
+        projections=projections,
+        atoms=atom_pos + 1,
+        elements=[elements[ai] if ai < len(elements) else "" for ai in atom_pos],
+        orbitals=[orbitals[oi] for oi in orb_pos],
+        bands=band_pos + 1,
+    )
+
+    return _refactor_band_modes(data, elements, mode)
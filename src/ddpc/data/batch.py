@@ -0,0 +1,348 @@
+"""Batch processing of many band and DOS files over a process pool.
+
+Every input file is read with :func:`~ddpc.data.read_band` or
+:func:`~ddpc.data.read_dos` and exported by a worker process, so throughput
+scales with the number of cores. Only file names and small status records cross
+process boundaries; the data itself never leaves the worker.
+
+Results are yielded in completion order as soon as each file is done. A file
+that fails to read or export produces a :class:`BatchResult` carrying the error
+instead of aborting the run.
+"""
+
+import glob
+import os
+import time
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+BATCH_KINDS = ("band", "dos")
+INPUT_SUFFIXES = (".h5", ".json")
+
+
+class BatchJob(NamedTuple):
+    """Work order for a single input file, sent to a worker process.
+
+    Attributes
+    ----------
+        path: Input file
+        kind: ``"band"`` or ``"dos"``, None to guess it from the file
+        outputs: Output file per projection mode
+        format: Export format, one of ``ddpc.data.export.EXPORT_FORMATS``
+        float_format: CSV float format spec
+        cache: Reuse/store results in the on-disk cache
+    """
+
+    path: str
+    kind: Optional[str]
+    outputs: Dict[int, str]
+    format: str
+    float_format: Optional[str]
+    cache: bool
+
+
+class BatchResult(NamedTuple):
+    """Outcome of a single input file.
+
+    Attributes
+    ----------
+        path: Input file
+        kind: ``"band"`` or ``"dos"``, None if it could not be determined
+        outputs: Files written, empty on failure
+        efermi: Fermi energy in eV, None on failure
+        error: ``"ExceptionType: message"`` on failure, None on success
+        seconds: Wall time spent on the file
+    """
+
+    path: str
+    kind: Optional[str]
+    outputs: Tuple[str, ...]
+    efermi: Optional[float]
+    error: Optional[str]
+    seconds: float
+
+    @property
+    def ok(self) -> bool:
+        """Whether the file was processed without error."""
+        return self.error is None
+
+
+def expand_inputs(
+    patterns: Sequence[Union[str, Path]] = (), manifest: Optional[Union[str, Path]] = None
+) -> List[Path]:
+    """Expand paths, globs, directories and a manifest into a list of input files.
+
+    A directory stands for every ``.h5``/``.json`` file below it whose name
+    contains ``band`` or ``dos``. A manifest is a text file with one path, glob
+    or directory per line, relative to the manifest; blank lines and lines
+    starting with ``#`` are ignored. Paths that do not exist are kept, so they
+    are reported as failures rather than silently dropped.
+
+    Args:
+        patterns: Paths, globs (``**`` is recursive) or directories
+        manifest: Optional manifest file
+
+    Returns
+    -------
+        Input files in the given order, without duplicates
+    """
+    entries = [str(p) for p in patterns]
+    if manifest is not None:
+        manifest = Path(manifest)
+        for raw in manifest.read_text(encoding="utf-8").splitlines():
+            line = raw.strip()
+            if line and not line.startswith("#"):
+                entries.append(str(manifest.parent / line))
+
+    files: Dict[Path, None] = {}
+    for entry in entries:
+        if glob.has_magic(entry):
+            matches = [Path(m) for m in sorted(glob.glob(entry, recursive=True))]
+        else:
+            matches = [Path(entry)]
+        for match in matches:
+            if match.is_dir():
+                files.update(dict.fromkeys(_scan_directory(match)))
+            else:
+                files[match] = None
+    return list(files)
+
+
+def _scan_directory(directory: Path) -> List[Path]:
+    found = [
+        p
+        for p in directory.rglob("*")
+        if p.suffix.lower() in INPUT_SUFFIXES and _kind_from_name(p) is not None and p.is_file()
+    ]
+    return sorted(found)
+
+
+def _kind_from_name(path: Path) -> Optional[str]:
+    name = path.name.lower()
+    if "band" in name:
+        return "band"
+    if "dos" in name:
+        return "dos"
+    return None
+
+
+def guess_kind(path: Union[str, Path]) -> str:
+    """Tell band structure from DOS files by name, or by the root group of HDF5 files.
+
+    Returns
+    -------
+        ``"band"`` or ``"dos"``
+
+    Raises
+    ------
+        ValueError: If the kind cannot be determined
+    """
+    path = Path(path)
+    kind = _kind_from_name(path)
+    if kind is not None:
+        return kind
+    if path.suffix.lower() == ".h5":
+        import h5py
+
+        with h5py.File(path, "r") as f:
+            if "BandInfo" in f:
+                return "band"
+            if "DosInfo" in f:
+                return "dos"
+    raise ValueError(f"Cannot tell whether {path} holds band or DOS data, specify the kind")
+
+
+def output_paths(
+    inputs: Sequence[Path],
+    modes: Sequence[int],
+    format: str = "csv",
+    output_dir: Optional[Union[str, Path]] = None,
+) -> List[Dict[int, str]]:
+    """Return the output file per mode of every input.
+
+    Outputs are written next to each input, or below ``output_dir`` mirroring
+    the input paths relative to their common parent directory, so inputs with
+    the same name in different calculation directories do not collide. Inputs
+    differing only in their suffix, such as ``band.h5`` and ``band.json`` of one
+    calculation, keep it in the output name (``band_h5.csv``, ``band_json.csv``).
+    With several modes every output gets a ``_mode<N>`` suffix.
+
+    Returns
+    -------
+        One ``{mode: output path}`` dict per input
+
+    Raises
+    ------
+        ValueError: If two inputs would still write the same output file
+    """
+    root = None
+    if output_dir is not None and inputs:
+        root = Path(os.path.commonpath([os.path.abspath(p.parent) for p in inputs]))
+
+    stems = Counter(os.path.abspath(p.with_suffix("")) for p in inputs)
+    outputs = []
+    for path in inputs:
+        base = path.with_suffix(f".{format}")
+        if stems[os.path.abspath(path.with_suffix(""))] > 1:
+            base = path.with_name(f"{path.stem}_{path.suffix.lstrip('.')}.{format}")
+        if root is not None:
+            base = Path(output_dir) / Path(os.path.abspath(base)).relative_to(root)
+        if len(modes) == 1:
+            outputs.append({modes[0]: str(base)})
+        else:
+            outputs.append(
+                {m: str(base.with_name(f"{base.stem}_mode{m}{base.suffix}")) for m in modes}
+            )
+
+    written: Dict[str, Path] = {}
+    for path, files in zip(inputs, outputs):
+        for file in files.values():
+            other = written.setdefault(os.path.abspath(file), path)
+            if other is not path:
+                raise ValueError(f"{other} and {path} would both be exported to {file}")
+    return outputs
+
+
+def run_batch(  # noqa: PLR0913
+    inputs: Sequence[Union[str, Path]],
+    output_dir: Optional[Union[str, Path]] = None,
+    *,
+    kind: Optional[str] = None,
+    modes: Sequence[int] = (5,),
+    format: str = "csv",
+    float_format: Optional[str] = None,
+    cache: bool = False,
+    workers: Optional[int] = None,
+) -> Iterator[BatchResult]:
+    """Read and export many band/DOS files in parallel.
+
+    Args:
+        inputs: Input files, see :func:`expand_inputs` for globs and manifests
+        output_dir: Output directory, see :func:`output_paths` (default: next to inputs)
+        kind: ``"band"`` or ``"dos"`` for all inputs (default: guess per file)
+        modes: Projection modes, computed from a single read of each file (default: (5,))
+        format: ``"csv"``, ``"npz"`` or ``"parquet"`` (default: "csv")
+        float_format: CSV float format spec, e.g. ``".6f"``
+        cache: Reuse/store results in the on-disk cache (default: False)
+        workers: Number of worker processes (default: number of CPUs); with 1
+            every file is processed in the calling process
+
+    Returns
+    -------
+        Iterator of :class:`BatchResult`, one per input in completion order
+
+    Raises
+    ------
+        ValueError: If kind, modes or format are invalid, or two inputs would
+            be exported to the same file
+    """
+    from ddpc.data.export import EXPORT_FORMATS
+
+    if kind is not None and kind not in BATCH_KINDS:
+        raise ValueError(f"Unknown kind '{kind}', expected one of {BATCH_KINDS}")
+    if format not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format '{format}', expected one of {EXPORT_FORMATS}")
+    modes = tuple(dict.fromkeys(int(m) for m in modes))
+    if not modes:
+        raise ValueError("At least one mode is required")
+
+    paths = [Path(p) for p in inputs]
+    jobs = [
+        BatchJob(str(path), kind, outputs, format, float_format, cache)
+        for path, outputs in zip(paths, output_paths(paths, modes, format, output_dir))
+    ]
+    workers = min(workers or os.cpu_count() or 1, len(jobs))
+    if workers <= 1:
+        return map(process_job, jobs)
+    return _run_pool(jobs, workers)
+
+
+def _run_pool(jobs: List[BatchJob], workers: int) -> Iterator[BatchResult]:
+    """Run ``jobs`` on a process pool, keeping at most two jobs per worker queued.
+
+    A worker that dies (e.g. killed for running out of memory) breaks the pool and
+    every job still queued or running on it. Those jobs are retried one at a time,
+    each on its own single-worker pool, so only a job that kills its worker again
+    is reported as failed; a new pool then takes the rest.
+    """
+    todo = iter(jobs)
+    while True:
+        broken: List[BatchJob] = []
+        yield from _run_until_broken(todo, workers, broken)
+        if not broken:
+            return
+        for job in broken:
+            again: List[BatchJob] = []
+            yield from _run_until_broken(iter([job]), 1, again)
+            for failed in again:
+                yield _failed(failed, "BrokenProcessPool: worker process died", 0.0)
+
+
+def _run_until_broken(
+    todo: Iterator[BatchJob], workers: int, broken: List[BatchJob]
+) -> Iterator[BatchResult]:
+    """Run jobs from ``todo`` on one pool until they run out or the pool breaks.
+
+    Jobs lost with a broken pool are appended to ``broken`` instead of being reported.
+    """
+    pending: Dict[Future, BatchJob] = {}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        while True:
+            while not broken and len(pending) < 2 * workers:
+                job = next(todo, None)
+                if job is None:
+                    break
+                try:
+                    pending[pool.submit(process_job, job)] = job
+                except BrokenProcessPool:
+                    broken.append(job)
+            if not pending:
+                return
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                job = pending.pop(future)
+                try:
+                    yield future.result()
+                except BrokenProcessPool:
+                    broken.append(job)
+                except Exception as e:
+                    yield _failed(job, f"{type(e).__name__}: {e}", 0.0)
+
+
+def _failed(job: BatchJob, error: str, seconds: float, kind: Optional[str] = None) -> BatchResult:
+    return BatchResult(job.path, kind or job.kind, (), None, error, seconds)
+
+
+def process_job(job: BatchJob) -> BatchResult:
+    """Read and export a single file, turning any failure into an error result.
+
+    This is the worker function of :func:`run_batch`.
+    """
+    from ddpc.data import read_band, read_dos
+    from ddpc.data.export import save
+
+    start = time.perf_counter()
+    kind = job.kind
+    try:
+        kind = kind or guess_kind(job.path)
+        read = read_band if kind == "band" else read_dos
+        modes = list(job.outputs)
+        results, efermi, _ = read(job.path, modes=modes, cache=job.cache)
+        for m, output in job.outputs.items():
+            Path(output).parent.mkdir(parents=True, exist_ok=True)
+            metadata = {"efermi": float(efermi), "mode": m}
+            save(results[m], output, job.format, float_format=job.float_format, metadata=metadata)
+    except (Exception, SystemExit) as e:
+        # some readers exit on malformed files; that must not end the worker
+        return _failed(job, f"{type(e).__name__}: {e}", time.perf_counter() - start, kind)
+    return BatchResult(
+        job.path,
+        kind,
+        tuple(job.outputs.values()),
+        float(efermi),
+        None,
+        time.perf_counter() - start,
+    )
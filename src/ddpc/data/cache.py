@@ -0,0 +1,346 @@
+"""Opt-in on-disk cache of processed band and DOS results.
+
+Entries are keyed by the content digest of the input file plus the reader
+arguments (kind, mode and selection), so renaming or touching an unchanged file
+still hits the cache. To avoid hashing large files on every call, the digest is
+remembered per (path, size, mtime) in a small identity index, which keeps the
+:data:`MAX_IDENTITIES` most recently used files.
+
+Every entry is a directory of ``.npy`` arrays and a ``meta.json``. Arrays are
+opened with ``mmap_mode="r"`` on a hit, so a repeat read costs a few file opens
+regardless of the data size; the returned arrays are read-only. The total size
+is bounded by evicting least recently used entries. Band entries of a projection
+mode keep only the aggregated weights, not the raw projections, so a cached
+:class:`~ddpc.data.containers.BandData` cannot be aggregated into another mode.
+
+The cache directory defaults to ``$XDG_CACHE_HOME/ddpc`` (``~/.cache/ddpc``) and
+can be changed with the ``DDPC_CACHE_DIR`` environment variable or
+:func:`configure_cache`. The size limit defaults to 2 GiB and can be changed with
+``DDPC_CACHE_MAX_BYTES`` or :func:`configure_cache`.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from ddpc._utils import user_cache_dir
+from ddpc.data.containers import BandData
+
+CACHE_VERSION = 1
+DEFAULT_MAX_BYTES = 2 << 30
+# identity index files kept, the least recently used beyond this are removed
+MAX_IDENTITIES = 10000
+
+_settings: Dict[str, Any] = {"directory": None, "max_bytes": None}
+
+_BAND_ARRAYS = ("kcoords", "labels", "dist", "energies", "projections", "weights", "atoms", "bands")
+
+
+def configure_cache(
+    directory: Optional[Union[str, Path]] = None, max_bytes: Optional[int] = None
+) -> None:
+    """Set the cache directory and size limit for this process.
+
+    Args:
+        directory: Cache directory, None to fall back to the environment/default
+        max_bytes: Size limit in bytes, None to fall back to the environment/default
+    """
+    _settings["directory"] = None if directory is None else Path(directory)
+    _settings["max_bytes"] = max_bytes
+
+
+def cache_dir() -> Path:
+    """Return the cache directory in effect."""
+    if _settings["directory"] is not None:
+        return _settings["directory"]
+    return user_cache_dir()
+
+
+def max_cache_bytes() -> int:
+    """Return the cache size limit in effect."""
+    if _settings["max_bytes"] is not None:
+        return int(_settings["max_bytes"])
+    env = os.environ.get("DDPC_CACHE_MAX_BYTES")
+    return int(env) if env else DEFAULT_MAX_BYTES
+
+
+def _hash(text: str) -> str:
+    return hashlib.blake2b(text.encode(), digest_size=16).hexdigest()
+
+
+def file_digest(path: Union[str, Path]) -> str:
+    """Return the content digest of ``path``, hashing it only when it changed.
+
+    Returns
+    -------
+        Hex digest of the file content
+    """
+    path = Path(path).resolve()
+    stat = path.stat()
+    ids = cache_dir() / "ids"
+    identity = ids / _hash(f"{path}|{stat.st_size}|{stat.st_mtime_ns}")
+    try:
+        digest = identity.read_text(encoding="ascii")
+        os.utime(identity)
+        return digest
+    except OSError:
+        pass
+
+    hasher = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            hasher.update(chunk)
+    digest = hasher.hexdigest()
+
+    ids.mkdir(parents=True, exist_ok=True)
+    tmp = ids / f".{identity.name}.{os.getpid()}"
+    tmp.write_text(digest, encoding="ascii")
+    os.replace(tmp, identity)
+    return digest
+
+
+def cached_read(
+    kind: str,
+    path: Union[str, Path],
+    params: Tuple,
+    read: Callable[[], Tuple[Any, float, bool]],
+) -> Tuple[Any, float, bool]:
+    """Return the cached result of ``read()``, computing and storing it on a miss.
+
+    Args:
+        kind: ``"band"`` or ``"dos"``
+        path: Input file
+        params: Reader arguments that change the result, must be JSON serializable
+        read: Reader returning ``(data, efermi, isproj)``
+
+    Returns
+    -------
+        ``(data, efermi, isproj)`` as returned by ``read``, with memory-mapped
+        read-only arrays on a hit
+    """
+    entry = _entry_path(kind, file_digest(path), params)
+    result = _lookup(entry, kind)
+    if result is None:
+        result = read()
+        _store_entry(entry, kind, result)
+        _evict(max_cache_bytes())
+    return result
+
+
+def cached_read_modes(
+    kind: str,
+    path: Union[str, Path],
+    modes: Sequence[int],
+    params: Tuple,
+    read: Callable[[Tuple[int, ...]], Tuple[Dict[int, Any], float, bool]],
+) -> Tuple[Dict[int, Any], float, bool]:
+    """Multi-mode version of :func:`cached_read`.
+
+    Every mode is its own entry, shared with single-mode reads. The modes that
+    miss are read together with a single ``read(missing_modes)`` call.
+
+    Args:
+        kind: ``"band"`` or ``"dos"``
+        path: Input file
+        modes: Projection modes
+        params: Other reader arguments that change the result
+        read: Reader returning ``(dict of data per mode, efermi, isproj)``
+
+    Returns
+    -------
+        ``(dict of data per mode, efermi, isproj)``
+    """
+    digest = file_digest(path)
+    entries = {m: _entry_path(kind, digest, (m, *params)) for m in modes}
+    results = {m: _lookup(entry, kind) for m, entry in entries.items()}
+    missing = tuple(m for m, result in results.items() if result is None)
+    if missing:
+        data, efermi, isproj = read(missing)
+        for m in missing:
+            results[m] = (data[m], efermi, isproj)
+            _store_entry(entries[m], kind, results[m])
+        _evict(max_cache_bytes())
+
+    _, efermi, isproj = results[modes[0]]
+    return {m: results[m][0] for m in modes}, efermi, isproj
+
+
+def _entry_path(kind: str, digest: str, params: Tuple) -> Path:
+    key = _hash(json.dumps([CACHE_VERSION, kind, digest, list(params)]))
+    return cache_dir() / "entries" / key
+
+
+def _lookup(entry: Path, kind: str) -> Optional[Tuple[Any, float, bool]]:
+    """Load an entry and mark it as recently used, None on a miss."""
+    if not (entry / "meta.json").exists():
+        return None
+    try:
+        result = _load_entry(entry, kind)
+    except (OSError, ValueError, KeyError):
+        shutil.rmtree(entry, ignore_errors=True)
+        return None
+    os.utime(entry)
+    return result
+
+
+def _store_entry(entry: Path, kind: str, result: Tuple[Any, float, bool]) -> None:
+    """Write an entry into a temporary directory and move it into place."""
+    data, efermi, isproj = result
+    if kind == "band":
+        arrays, meta = _dump_band(data)
+    else:
+        arrays, meta = _dump_dos(data)
+        if arrays is None:
+            return
+    meta.update({"efermi": float(efermi), "isproj": bool(isproj)})
+
+    entry.parent.mkdir(parents=True, exist_ok=True)
+    tmp = entry.parent / f".{entry.name}.{os.getpid()}"
+    shutil.rmtree(tmp, ignore_errors=True)
+    tmp.mkdir()
+    for name, arr in arrays.items():
+        np.save(tmp / f"{name}.npy", np.asarray(arr), allow_pickle=False)
+    (tmp / "meta.json").write_text(json.dumps(meta), encoding="utf-8")
+    try:
+        os.replace(tmp, entry)
+    except OSError:
+        # another process stored the same entry first
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+def _load_entry(entry: Path, kind: str) -> Tuple[Any, float, bool]:
+    meta = json.loads((entry / "meta.json").read_text(encoding="utf-8"))
+    arrays = {
+        name: _load_array(entry / f"{name}.npy")
+        for name in meta["arrays"]
+        if (entry / f"{name}.npy").exists()
+    }
+    data = _restore_band(arrays, meta) if kind == "band" else _restore_dos(arrays, meta)
+    return data, meta["efermi"], meta["isproj"]
+
+
+def _load_array(path: Path) -> np.ndarray:
+    try:
+        return np.load(path, mmap_mode="r", allow_pickle=False)
+    except ValueError:
+        # empty arrays cannot be memory-mapped
+        return np.load(path, allow_pickle=False)
+
+
+def _dump_band(data: BandData) -> Tuple[Dict[str, np.ndarray], Dict[str, Any]]:
+    # the raw projections are as large as the input file, the weights are all a mode needs
+    names = [n for n in _BAND_ARRAYS if n != "projections" or data.mode == 0]
+    arrays = {name: getattr(data, name) for name in names}
+    arrays = {name: arr for name, arr in arrays.items() if arr is not None}
+    meta = {
+        "arrays": list(arrays),
+        "spins": list(data.spins),
+        "elements": list(data.elements),
+        "orbitals": list(data.orbitals),
+        "mode": data.mode,
+        "channels": list(data.channels),
+    }
+    return arrays, meta
+
+
+def _restore_band(arrays: Dict[str, np.ndarray], meta: Dict[str, Any]) -> BandData:
+    return BandData(
+        arrays["kcoords"],
+        arrays["labels"],
+        arrays["dist"],
+        energies=arrays.get("energies"),
+        spins=meta["spins"],
+        projections=arrays.get("projections"),
+        atoms=arrays.get("atoms"),
+        elements=meta["elements"],
+        orbitals=meta["orbitals"],
+        bands=arrays.get("bands"),
+        mode=meta["mode"],
+        channels=meta["channels"],
+        weights=arrays.get("weights"),
+    )
+
+
+def _dump_dos(
+    data: Dict[str, np.ndarray],
+) -> Tuple[Optional[Dict[str, np.ndarray]], Dict[str, Any]]:
+    """Stack all DOS columns into one array, None if they cannot be stacked."""
+    columns = [np.asarray(v) for v in data.values()]
+    if not columns or len({c.shape for c in columns}) != 1 or columns[0].ndim != 1:
+        return None, {}
+    return {"columns": np.stack(columns)}, {"arrays": ["columns"], "names": list(data)}
+
+
+def _restore_dos(arrays: Dict[str, np.ndarray], meta: Dict[str, Any]) -> Dict[str, np.ndarray]:
+    columns = arrays["columns"]
+    return {name: columns[i] for i, name in enumerate(meta["names"])}
+
+
+def _entry_size(entry: Path) -> int:
+    return sum(f.stat().st_size for f in entry.iterdir() if f.is_file())
+
+
+def _identities() -> List[Path]:
+    ids = cache_dir() / "ids"
+    if not ids.is_dir():
+        return []
+    return [f for f in ids.iterdir() if f.is_file() and not f.name.startswith(".")]
+
+
+def _evict(max_bytes: int, max_identities: int = MAX_IDENTITIES) -> None:
+    """Remove least recently used entries until the cache fits in ``max_bytes``.
+
+    The identity index is trimmed to its ``max_identities`` most recently used
+    files first; the rest of it counts towards ``max_bytes``.
+    """
+    identities = sorted(_identities(), key=lambda f: f.stat().st_mtime_ns)
+    stale = max(len(identities) - max_identities, 0)
+    for identity in identities[:stale]:
+        identity.unlink(missing_ok=True)
+    id_bytes = sum(f.stat().st_size for f in identities[stale:])
+
+    entries_dir = cache_dir() / "entries"
+    if not entries_dir.is_dir():
+        return
+    entries = [e for e in entries_dir.iterdir() if e.is_dir() and not e.name.startswith(".")]
+    sizes = {e: _entry_size(e) for e in entries}
+    total = id_bytes + sum(sizes.values())
+    for entry in sorted(entries, key=lambda e: e.stat().st_mtime_ns):
+        if total <= max_bytes:
+            break
+        shutil.rmtree(entry, ignore_errors=True)
+        total -= sizes[entry]
+
+
+def cache_stats() -> Dict[str, Any]:
+    """Return cache directory, number of entries and identity index files, total bytes and size limit."""
+    entries_dir = cache_dir() / "entries"
+    entries = []
+    if entries_dir.is_dir():
+        entries = [e for e in entries_dir.iterdir() if e.is_dir() and not e.name.startswith(".")]
+    identities = _identities()
+    return {
+        "directory": str(cache_dir()),
+        "entries": len(entries),
+        "identities": len(identities),
+        "bytes": sum(_entry_size(e) for e in entries) + sum(f.stat().st_size for f in identities),
+        "max_bytes": max_cache_bytes(),
+    }
+
+
+def clear_cache() -> int:
+    """Remove every cache entry and the identity index.
+
+    Returns
+    -------
+        Number of entries removed
+    """
+    removed = cache_stats()["entries"]
+    for name in ("entries", "ids"):
+        shutil.rmtree(cache_dir() / name, ignore_errors=True)
+    return removed
@@ -1,15 +1,12 @@
 """CLI commands for ddpc-data."""
 
+import sys
+import time
 from pathlib import Path
 
 import click
-from rich.console import Console
-from rich.table import Table
 
-from ddpc.data._cli_base import FriendlyCommand, FriendlyGroup
-
-# Force UTF-8 encoding on Windows to handle Unicode characters
-console = Console(force_terminal=True, legacy_windows=False)
+from ddpc.data._cli_base import FriendlyCommand, FriendlyGroup, console
 
 
 @click.group(cls=FriendlyGroup, invoke_without_command=True)
@@ -31,53 +28,106 @@ def dos():
     """Density of states commands."""
 
 
+@cli.group(cls=FriendlyGroup)
+def cache():
+    """Manage the processed result cache."""
+
+
+# keep in sync with ddpc.data.export.EXPORT_FORMATS (not imported to keep startup light)
+EXPORT_FORMATS = ("csv", "npz", "parquet")
+
+MODE_HELP = "Projection mode, or comma-separated modes such as 1,2,5 (default: 5)"
+
+
+def _parse_modes(ctx, param, value):
+    """Parse ``--mode 1,2,5`` into a tuple of unique modes."""
+    try:
+        modes = tuple(dict.fromkeys(int(m) for m in str(value).split(",") if m.strip()))
+    except ValueError:
+        raise click.BadParameter(
+            f"'{value}' is not a mode or a comma-separated list of modes"
+        ) from None
+    if not modes:
+        raise click.BadParameter("no mode given")
+    return modes
+
+
+def _mode_output(output: str, mode: int, multiple: bool) -> Path:
+    """Return the output path of ``mode``, adding a ``_mode<N>`` suffix for multiple modes."""
+    output_path = Path(output)
+    if multiple:
+        output_path = output_path.with_name(f"{output_path.stem}_mode{mode}{output_path.suffix}")
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    return output_path
+
+
 @band.command(cls=FriendlyCommand)
 @click.argument("input_file", type=click.Path(exists=True))
 @click.option("-o", "--output", help="Output file path (CSV format)")
-@click.option("--mode", default=5, type=int, help="Projection mode (default: 5)")
-@click.option("--format", default="csv", type=click.Choice(["csv", "npz"]), help="Output format")
-def read(input_file, output, mode, format):
+@click.option("--mode", default="5", callback=_parse_modes, help=MODE_HELP)
+@click.option(
+    "--format",
+    default="csv",
+    type=click.Choice(EXPORT_FORMATS),
+    help="Output format",
+)
+@click.option("--cache", is_flag=True, help="Reuse/store the result in the on-disk cache")
+@click.option("--float-format", help="CSV float format spec, e.g. .6f")
+def read(input_file, output, mode, format, cache, float_format):  # noqa: PLR0913, PLR0917
     """Read band structure data and export."""
-    from ddpc.data import read_band, to_csv, to_npz
+    from rich.table import Table
+
+    from ddpc.data import read_band
+    from ddpc.data.export import save
 
     console.print(f"[cyan]Reading band structure:[/cyan] {input_file}")
-    console.print(f"[cyan]Projection mode:[/cyan] {mode}")
+    console.print(f"[cyan]Projection mode:[/cyan] {','.join(map(str, mode))}")
 
     try:
-        data, efermi, isproj = read_band(input_file, mode=mode)
+        if len(mode) == 1:
+            data, efermi, isproj = read_band(input_file, mode=mode[0], cache=cache)
+            results = {mode[0]: data}
+        else:
+            results, efermi, isproj = read_band(input_file, modes=mode, cache=cache)
 
         console.print(f"[green]Fermi energy:[/green] {efermi:.4f} eV")
         console.print(f"[green]Has projections:[/green] {isproj}")
-        console.print(f"[green]Data columns:[/green] {len(data)}")
-        console.print(f"[green]K-points:[/green] {len(data.get('dist', []))}")
-
-        if output:
-            output_path = Path(output)
-            output_path.parent.mkdir(parents=True, exist_ok=True)
-
-            if format == "csv":
-                to_csv(data, output_path)
-            elif format == "npz":
-                to_npz(data, output_path)
 
-            console.print(f"[bold green]✓[/bold green] Saved to: {output_path}")
-        else:
-            # Show sample data
-            table = Table(title="Band Data Preview")
-            # Show first few columns
-            col_names = list(data.keys())[:5]
-            for col in col_names:
-                table.add_column(col, style="cyan")
-
-            # Show first 5 rows
-            for i in range(min(5, len(data.get("dist", [])))):
-                row = [
-                    str(data[col][i] if hasattr(data[col], "__getitem__") else data[col])
-                    for col in col_names
-                ]
-                table.add_row(*row)
-
-            console.print(table)
+        for m, data in results.items():
+            if len(results) > 1:
+                console.print(f"[cyan]Mode {m}:[/cyan]")
+            console.print(f"[green]Data columns:[/green] {len(data)}")
+            console.print(f"[green]K-points:[/green] {len(data.get('dist', []))}")
+
+            if output:
+                output_path = _mode_output(output, m, len(results) > 1)
+                save(
+                    data,
+                    output_path,
+                    format,
+                    float_format=float_format,
+                    metadata={"efermi": efermi, "mode": m},
+                )
+                console.print(f"[bold green]✓[/bold green] Saved to: {output_path}")
+            else:
+                # Show sample data
+                table = Table(title="Band Data Preview")
+                # Show first few columns
+                col_names = list(data.keys())[:5]
+                for col in col_names:
+                    table.add_column(col, style="cyan")
+
+                # Show first 5 rows
+                for i in range(min(5, len(data.get("dist", [])))):
+                    row = [
+                        str(data[col][i] if hasattr(data[col], "__getitem__") else data[col])
+                        for col in col_names
+                    ]
+                    table.add_row(*row)
+
+                console.print(table)
+
+        if not output:
             console.print("[yellow]Use -o/--output to save data[/yellow]")
 
     except Exception as e:
@@ -89,30 +139,29 @@ def read(input_file, output, mode, format):
 @click.argument("input_file", type=click.Path(exists=True))
 def info(input_file):
     """Display band structure metadata."""
-    from ddpc.data import read_band
+    from rich.table import Table
+
+    from ddpc.data import probe_band
 
     console.print(f"[cyan]Reading band structure info:[/cyan] {input_file}")
 
     try:
-        data, efermi, isproj = read_band(input_file, mode=0)  # mode=0 for total band
+        summary = probe_band(input_file)
 
         table = Table(title="Band Structure Information")
         table.add_column("Property", style="cyan")
         table.add_column("Value", style="green")
 
         table.add_row("File", str(input_file))
-        table.add_row("Fermi Energy", f"{efermi:.6f} eV")
-        table.add_row("Has Projections", str(isproj))
-        table.add_row("Total Columns", str(len(data)))
-
-        # Count k-points
-        if "dist" in data:
-            table.add_row("K-points", str(len(data["dist"])))
-
-        # Count bands
-        band_cols = [k for k in data.keys() if k.startswith("band")]
-        if band_cols:
-            table.add_row("Number of Bands", str(len(band_cols)))
+        table.add_row("Fermi Energy", f"{summary.efermi:.6f} eV")
+        table.add_row("Has Projections", str(summary.is_projected))
+        table.add_row("Spin Type", summary.spin_type)
+        table.add_row("K-points", str(summary.nkpt))
+        table.add_row("Number of Bands", str(summary.nband))
+        if summary.elements:
+            table.add_row("Elements", " ".join(dict.fromkeys(summary.elements)))
+        if summary.orbitals:
+            table.add_row("Orbitals", " ".join(summary.orbitals))
 
         console.print(table)
 
@@ -124,49 +173,80 @@ def info(input_file):
 @dos.command(cls=FriendlyCommand)
 @click.argument("input_file", type=click.Path(exists=True))
 @click.option("-o", "--output", help="Output file path (CSV format)")
-@click.option("--mode", default=5, type=int, help="Projection mode (default: 5)")
-@click.option("--format", default="csv", type=click.Choice(["csv", "npz"]), help="Output format")
-def read(input_file, output, mode, format):
+@click.option("--mode", default="5", callback=_parse_modes, help=MODE_HELP)
+@click.option(
+    "--format",
+    default="csv",
+    type=click.Choice(EXPORT_FORMATS),
+    help="Output format",
+)
+@click.option("--cache", is_flag=True, help="Reuse/store the result in the on-disk cache")
+@click.option("--float-format", help="CSV float format spec, e.g. .6f")
+@click.option(
+    "--atom-block",
+    type=click.IntRange(min=1),
+    help="Read and aggregate projections this many atoms at a time to bound memory",
+)
+def read(input_file, output, mode, format, cache, float_format, atom_block):  # noqa: PLR0913, PLR0917
     """Read density of states data and export."""
-    from ddpc.data import read_dos, to_csv, to_npz
+    from rich.table import Table
+
+    from ddpc.data import read_dos
+    from ddpc.data.export import save
 
     console.print(f"[cyan]Reading DOS:[/cyan] {input_file}")
-    console.print(f"[cyan]Projection mode:[/cyan] {mode}")
+    console.print(f"[cyan]Projection mode:[/cyan] {','.join(map(str, mode))}")
 
     try:
-        data, efermi, isproj = read_dos(input_file, mode=mode)
+        if len(mode) == 1:
+            data, efermi, isproj = read_dos(
+                input_file, mode=mode[0], cache=cache, atom_block=atom_block
+            )
+            results = {mode[0]: data}
+        else:
+            results, efermi, isproj = read_dos(
+                input_file, modes=mode, cache=cache, atom_block=atom_block
+            )
 
         console.print(f"[green]Fermi energy:[/green] {efermi:.4f} eV")
         console.print(f"[green]Has projections:[/green] {isproj}")
-        console.print(f"[green]Data columns:[/green] {len(data)}")
-        console.print(f"[green]Energy points:[/green] {len(data.get('energy', []))}")
-
-        if output:
-            output_path = Path(output)
-            output_path.parent.mkdir(parents=True, exist_ok=True)
 
-            if format == "csv":
-                to_csv(data, output_path)
-            elif format == "npz":
-                to_npz(data, output_path)
-
-            console.print(f"[bold green]✓[/bold green] Saved to: {output_path}")
-        else:
-            # Show sample data
-            table = Table(title="DOS Data Preview")
-            col_names = list(data.keys())[:5]
-            for col in col_names:
-                table.add_column(col, style="cyan")
-
-            # Show first 5 rows
-            for i in range(min(5, len(data.get("energy", [])))):
-                row = [
-                    f"{data[col][i]:.4f}" if hasattr(data[col], "__getitem__") else str(data[col])
-                    for col in col_names
-                ]
-                table.add_row(*row)
-
-            console.print(table)
+        for m, data in results.items():
+            if len(results) > 1:
+                console.print(f"[cyan]Mode {m}:[/cyan]")
+            console.print(f"[green]Data columns:[/green] {len(data)}")
+            console.print(f"[green]Energy points:[/green] {len(data.get('energy', []))}")
+
+            if output:
+                output_path = _mode_output(output, m, len(results) > 1)
+                save(
+                    data,
+                    output_path,
+                    format,
+                    float_format=float_format,
+                    metadata={"efermi": efermi, "mode": m},
+                )
+                console.print(f"[bold green]✓[/bold green] Saved to: {output_path}")
+            else:
+                # Show sample data
+                table = Table(title="DOS Data Preview")
+                col_names = list(data.keys())[:5]
+                for col in col_names:
+                    table.add_column(col, style="cyan")
+
+                # Show first 5 rows
+                for i in range(min(5, len(data.get("energy", [])))):
+                    row = [
+                        f"{data[col][i]:.4f}"
+                        if hasattr(data[col], "__getitem__")
+                        else str(data[col])
+                        for col in col_names
+                    ]
+                    table.add_row(*row)
+
+                console.print(table)
+
+        if not output:
             console.print("[yellow]Use -o/--output to save data[/yellow]")
 
     except Exception as e:
@@ -178,26 +258,29 @@ def read(input_file, output, mode, format):
 @click.argument("input_file", type=click.Path(exists=True))
 def info(input_file):
     """Display DOS metadata."""
-    from ddpc.data import read_dos
+    from rich.table import Table
+
+    from ddpc.data import probe_dos
 
     console.print(f"[cyan]Reading DOS info:[/cyan] {input_file}")
 
     try:
-        data, efermi, isproj = read_dos(input_file, mode=0)  # mode=0 for total DOS
+        summary = probe_dos(input_file)
 
         table = Table(title="DOS Information")
         table.add_column("Property", style="cyan")
         table.add_column("Value", style="green")
 
         table.add_row("File", str(input_file))
-        table.add_row("Fermi Energy", f"{efermi:.6f} eV")
-        table.add_row("Has Projections", str(isproj))
-        table.add_row("Total Columns", str(len(data)))
-
-        if "energy" in data:
-            energies = data["energy"]
-            table.add_row("Energy Points", str(len(energies)))
-            table.add_row("Energy Range", f"{energies.min():.2f} to {energies.max():.2f} eV")
+        table.add_row("Fermi Energy", f"{summary.efermi:.6f} eV")
+        table.add_row("Has Projections", str(summary.is_projected))
+        table.add_row("Spin Type", summary.spin_type)
+        table.add_row("Energy Points", str(summary.nenergy))
+        table.add_row("Energy Range", f"{summary.emin:.2f} to {summary.emax:.2f} eV")
+        if summary.elements:
+            table.add_row("Elements", " ".join(dict.fromkeys(summary.elements)))
+        if summary.orbitals:
+            table.add_row("Orbitals", " ".join(summary.orbitals))
 
         console.print(table)
 
@@ -206,5 +289,117 @@ def info(input_file):
         raise click.Abort from None
 
 
+@cli.command(cls=FriendlyCommand)
+@click.argument("inputs", nargs=-1)
+@click.option(
+    "--manifest",
+    type=click.Path(exists=True, dir_okay=False),
+    help="Text file listing one input path, glob or directory per line",
+)
+@click.option(
+    "-o",
+    "--output-dir",
+    type=click.Path(file_okay=False),
+    help="Output directory mirroring the input tree (default: next to each input)",
+)
+@click.option(
+    "--kind",
+    default="auto",
+    type=click.Choice(["auto", "band", "dos"]),
+    help="Input kind (default: guess from file name)",
+)
+@click.option("--mode", default="5", callback=_parse_modes, help=MODE_HELP)
+@click.option(
+    "--format",
+    default="csv",
+    type=click.Choice(EXPORT_FORMATS),
+    help="Output format",
+)
+@click.option("--float-format", help="CSV float format spec, e.g. .6f")
+@click.option("--cache", is_flag=True, help="Reuse/store results in the on-disk cache")
+@click.option(
+    "-j",
+    "--workers",
+    type=click.IntRange(min=1),
+    help="Number of worker processes (default: number of CPUs)",
+)
+def batch(  # noqa: PLR0913, PLR0917
+    inputs, manifest, output_dir, kind, mode, format, float_format, cache, workers
+):
+    """Read and export many band/DOS files in parallel.
+
+    INPUTS are files, globs (quote them, ** is recursive) or directories, which
+    stand for every band/DOS .h5/.json file below them.
+    """
+    from ddpc.data.batch import expand_inputs, run_batch
+
+    if not inputs and not manifest:
+        raise click.UsageError("Give input files, globs or directories, or --manifest")
+
+    files = expand_inputs(inputs, manifest)
+    if not files:
+        console.print("[yellow]No input files found[/yellow]")
+        return
+
+    console.print(f"[cyan]Processing {len(files)} files[/cyan]")
+    start = time.perf_counter()
+    failed = 0
+    results = run_batch(
+        files,
+        output_dir,
+        kind=None if kind == "auto" else kind,
+        modes=mode,
+        format=format,
+        float_format=float_format,
+        cache=cache,
+        workers=workers,
+    )
+    for result in results:
+        if result.ok:
+            outputs = ", ".join(result.outputs)
+            console.print(
+                f"[bold green]✓[/bold green] {result.path} → {outputs} "
+                f"[dim]({result.seconds:.2f} s)[/dim]"
+            )
+        else:
+            failed += 1
+            console.print(f"[bold red]✗[/bold red] {result.path}: {result.error}")
+
+    elapsed = time.perf_counter() - start
+    console.print(
+        f"[green]Done:[/green] {len(files) - failed} succeeded, {failed} failed in {elapsed:.2f} s"
+    )
+    if failed:
+        sys.exit(1)
+
+
+@cache.command(cls=FriendlyCommand)
+def stats():
+    """Display cache location, entries and size."""
+    from rich.table import Table
+
+    from ddpc.data.cache import cache_stats
+
+    info = cache_stats()
+    table = Table(title="Cache Information")
+    table.add_column("Property", style="cyan")
+    table.add_column("Value", style="green")
+    table.add_row("Directory", info["directory"])
+    table.add_row("Entries", str(info["entries"]))
+    table.add_row("Indexed Files", str(info["identities"]))
+    table.add_row("Size", f"{info['bytes'] / 2**20:.2f} MiB")
+    table.add_row("Size Limit", f"{info['max_bytes'] / 2**20:.2f} MiB")
+    console.print(table)
+
+
+@cache.command(cls=FriendlyCommand)
+def clear():
+    """Remove all cached results."""
+    from ddpc.data.cache import cache_dir, clear_cache
+
+    removed = clear_cache()
+    console.print(f"[bold green]✓[/bold green] Removed {removed} entries from: {cache_dir()}")
+
+
 if __name__ == "__main__":
     cli()
@@ -0,0 +1,459 @@
+"""Array-backed containers for electronic structure data."""
+
+from collections.abc import Mapping
+from typing import Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+KPOINT_COLUMNS = ("label", "kx", "ky", "kz", "dist")
+
+
+class BandData(Mapping):
+    """Band structure held as a few dense arrays instead of one array per column.
+
+    Energies are stored as one ``(spin, band, kpt)`` array and raw projections as
+    one ``(spin, atom, orbital, band, kpt)`` array. After a projection mode has been
+    applied, the aggregated weights are kept as ``(spin, channel, band, kpt)``.
+
+    The container also behaves as a read-only mapping with the legacy column names
+    (``"kx"``, ``"dist"``, ``"band3-up"``, ``"band3-Si-p"``, ...). Those columns are
+    never materialized up front: each lookup returns a view into the arrays above.
+    Use :meth:`to_dict` to get an ordinary dict.
+    """
+
+    def __init__(  # noqa: PLR0913, PLR0917
+        self,
+        kcoords: np.ndarray,
+        labels: np.ndarray,
+        dist: np.ndarray,
+        energies: Optional[np.ndarray] = None,
+        spins: Sequence[str] = ("",),
+        projections: Optional[np.ndarray] = None,
+        atoms: Optional[Sequence[int]] = None,
+        elements: Optional[Sequence[str]] = None,
+        orbitals: Optional[Sequence[str]] = None,
+        bands: Optional[Sequence[int]] = None,
+        mode: int = 0,
+        channels: Optional[Sequence[str]] = None,
+        weights: Optional[np.ndarray] = None,
+    ):
+        """Initialize band data container.
+
+        Args:
+            kcoords: K-point coordinates, shape ``(nkpt, 3)``
+            labels: High-symmetry label per k-point (empty string if none)
+            dist: Accumulated k-path distance per k-point
+            energies: Band energies, shape ``(spin, band, kpt)``
+            spins: Column suffix per spin channel, ``("up", "down")`` for
+                collinear systems and ``("",)`` otherwise
+            projections: Raw projections, shape ``(spin, atom, orbital, band, kpt)``
+            atoms: 1-based atom index for each entry of the atom axis
+            elements: Element symbol for each entry of the atom axis
+            orbitals: Orbital name for each entry of the orbital axis
+            bands: 1-based band index for each entry of the band axis
+            mode: Projection mode the mapping view represents, 0 for total bands
+            channels: Output channel names of ``mode``
+            weights: Aggregated projections, shape ``(spin, channel, band, kpt)``
+        """
+        self.kcoords = np.asarray(kcoords).reshape(-1, 3)
+        self.labels = np.asarray(labels)
+        self.dist = np.asarray(dist)
+        self.energies = energies
+        self.spins = tuple(spins)
+        self.projections = projections
+
+        nband = self._infer_nband(energies, projections, weights)
+        natom = 0 if projections is None else projections.shape[1]
+        norb = 0 if projections is None else projections.shape[2]
+        self.atoms = np.arange(1, natom + 1) if atoms is None else np.asarray(atoms, dtype=int)
+        self.elements = list(elements) if elements is not None else [""] * natom
+        self.orbitals = list(orbitals) if orbitals is not None else [""] * norb
+        self.bands = np.arange(1, nband + 1) if bands is None else np.asarray(bands, dtype=int)
+
+        self.mode = mode
+        self.channels = list(channels) if channels is not None else []
+        self.weights = weights
+        self._channel_index: Optional[Dict[str, int]] = None
+        self._band_index: Optional[Dict[str, int]] = None
+
+    @staticmethod
+    def _infer_nband(*arrays: Optional[np.ndarray]) -> int:
+        """Return the band-axis length of the first available array."""
+        for arr in arrays:
+            if arr is not None:
+                return arr.shape[-2]
+        return 0
+
+    @property
+    def nkpt(self) -> int:
+        """Number of k-points."""
+        return len(self.kcoords)
+
+    @property
+    def nband(self) -> int:
+        """Number of bands."""
+        return len(self.bands)
+
+    @property
+    def nspin(self) -> int:
+        """Number of spin channels."""
+        return len(self.spins)
+
+    @property
+    def is_projected(self) -> bool:
+        """Whether raw projections are available."""
+        return self.projections is not None
+
+    def with_mode(self, mode: int, channels: Sequence[str], weights: np.ndarray) -> "BandData":
+        """Return a new container sharing all arrays, with a different mode view."""
+        return BandData(
+            self.kcoords,
+            self.labels,
+            self.dist,
+            energies=self.energies,
+            spins=self.spins,
+            projections=self.projections,
+            atoms=self.atoms,
+            elements=self.elements,
+            orbitals=self.orbitals,
+            bands=self.bands,
+            mode=mode,
+            channels=channels,
+            weights=weights,
+        )
+
+    def to_dict(self) -> Dict[str, np.ndarray]:
+        """Materialize the legacy column dict."""
+        return dict(self.items())
+
+    # Mapping interface: the legacy string-keyed view
+    def _spin_suffixes(self) -> List[str]:
+        return [f"-{s}" if s else "" for s in self.spins]
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over column names in the legacy order."""
+        yield from KPOINT_COLUMNS
+        suffixes = self._spin_suffixes()
+        if self.mode == 0:
+            if self.energies is None:
+                return
+            for suffix in suffixes:
+                for b in self.bands:
+                    yield f"band{b}{suffix}"
+        else:
+            for channel in self.channels:
+                for suffix in suffixes:
+                    for b in self.bands:
+                        yield f"band{b}-{channel}{suffix}"
+
+    def __len__(self) -> int:
+        """Return number of columns."""
+        if self.mode == 0:
+            ncol = 0 if self.energies is None else self.nspin * self.nband
+        else:
+            ncol = len(self.channels) * self.nspin * self.nband
+        return len(KPOINT_COLUMNS) + ncol
+
+    def __getitem__(self, key: str) -> np.ndarray:
+        """Return the column ``key`` as a view into the underlying arrays."""
+        if key == "label":
+            return self.labels
+        if key in ("kx", "ky", "kz"):
+            return self.kcoords[:, "xyz".index(key[1])]
+        if key == "dist":
+            return self.dist
+        if not isinstance(key, str) or not key.startswith("band"):
+            raise KeyError(key)
+
+        ispin, rest = self._split_spin(key)
+        if self.mode == 0:
+            if self.energies is None:
+                raise KeyError(key)
+            return self.energies[ispin, self._band_position(rest, key)]
+
+        band_str, sep, channel = rest.partition("-")
+        if not sep:
+            raise KeyError(key)
+        if self._channel_index is None:
+            self._channel_index = {c: i for i, c in enumerate(self.channels)}
+        ichan = self._channel_index.get(channel)
+        if ichan is None or self.weights is None:
+            raise KeyError(key)
+        return self.weights[ispin, ichan, self._band_position(band_str, key)]
+
+    def _split_spin(self, key: str) -> Tuple[int, str]:
+        """Split ``key`` into spin index and the remainder without ``band``."""
+        body = key[len("band") :]
+        if self.nspin == 1:
+            return 0, body
+        body, sep, spin = body.rpartition("-")
+        if not sep or spin not in self.spins:
+            raise KeyError(key)
+        return self.spins.index(spin), body
+
+    def _band_position(self, band_str: str, key: str) -> int:
+        """Map a 1-based band number string to its position on the band axis."""
+        if self._band_index is None:
+            self._band_index = {str(b): i for i, b in enumerate(self.bands)}
+        position = self._band_index.get(band_str)
+        if position is None:
+            raise KeyError(key)
+        return position
+
+    def __repr__(self) -> str:
+        """Return a short summary."""
+        return (
+            f"BandData(nspin={self.nspin}, nband={self.nband}, nkpt={self.nkpt}, "
+            f"projected={self.is_projected}, mode={self.mode})"
+        )
+
+
+class BandSummary(NamedTuple):
+    """Header information of a band structure file, read without the band data.
+
+    Attributes
+    ----------
+        efermi: Fermi energy in eV
+        is_projected: Whether the file contains orbital projections
+        spin_type: ``"none"``, ``"collinear"`` or ``"non-collinear"``
+        nspin: Number of stored spin channels
+        nband: Number of bands
+        nkpt: Number of k-points
+        orbitals: Projected orbital names, empty without projections
+        elements: Element symbol per atom
+    """
+
+    efermi: float
+    is_projected: bool
+    spin_type: str
+    nspin: int
+    nband: int
+    nkpt: int
+    orbitals: Tuple[str, ...]
+    elements: Tuple[str, ...]
+
+    @property
+    def shape(self) -> Tuple[int, int, int]:
+        """Shape ``(spin, band, kpt)`` of the band energies."""
+        return self.nspin, self.nband, self.nkpt
+
+
+class DosSummary(NamedTuple):
+    """Header information of a density of states file, read without the DOS data.
+
+    Attributes
+    ----------
+        efermi: Fermi energy in eV
+        is_projected: Whether the file contains orbital projections
+        spin_type: ``"none"``, ``"collinear"`` or ``"non-collinear"``
+        nspin: Number of stored spin channels
+        nenergy: Number of energy points
+        emin: Lowest energy point in eV
+        emax: Highest energy point in eV
+        orbitals: Projected orbital names, empty without projections
+        elements: Element symbol per atom
+    """
+
+    efermi: float
+    is_projected: bool
+    spin_type: str
+    nspin: int
+    nenergy: int
+    emin: float
+    emax: float
+    orbitals: Tuple[str, ...]
+    elements: Tuple[str, ...]
+
+
+class Selection(NamedTuple):
+    """Subset of atoms, orbitals, bands and energies to read from a file.
+
+    Every field left as None selects everything along that axis. Selections are
+    applied by the readers before data is loaded wherever the file layout allows.
+
+    Attributes
+    ----------
+        atoms: 1-based atom indices
+        elements: Element symbols, selects every atom of these elements
+        orbitals: Orbital names (``"dxy"``) or shells (``"d"``)
+        bands: 1-based band indices
+        energy_window: ``(emin, emax)`` in eV; DOS keeps energy points inside the
+            window and band structures keep bands that enter it
+    """
+
+    atoms: Optional[Tuple[int, ...]] = None
+    elements: Optional[Tuple[str, ...]] = None
+    orbitals: Optional[Tuple[str, ...]] = None
+    bands: Optional[Tuple[int, ...]] = None
+    energy_window: Optional[Tuple[float, float]] = None
+
+    @classmethod
+    def create(
+        cls,
+        atoms: Optional[Sequence[int]] = None,
+        elements: Optional[Sequence[str]] = None,
+        orbitals: Optional[Sequence[str]] = None,
+        bands: Optional[Sequence[int]] = None,
+        energy_window: Optional[Sequence[float]] = None,
+    ) -> "Selection":
+        """Build a hashable selection from any sequences."""
+        if energy_window is not None:
+            emin, emax = (float(e) for e in energy_window)
+            if emin > emax:
+                raise ValueError(f"energy_window={energy_window} must be (emin, emax)")
+            energy_window = (emin, emax)
+        return cls(
+            atoms=None if atoms is None else tuple(int(a) for a in atoms),
+            elements=None if elements is None else tuple(elements),
+            orbitals=None if orbitals is None else tuple(orbitals),
+            bands=None if bands is None else tuple(int(b) for b in bands),
+            energy_window=energy_window,
+        )
+
+    def atom_positions(self, natom: int, elements: Sequence[str]) -> np.ndarray:
+        """Return sorted 0-based positions of the selected atoms.
+
+        Raises
+        ------
+            ValueError: If an atom index is out of range or nothing is selected
+        """
+        mask = np.ones(natom, dtype=bool)
+        if self.atoms is not None:
+            bad = [a for a in self.atoms if not 0 < a <= natom]
+            if bad:
+                raise ValueError(f"atoms={bad} out of range 1-{natom}")
+            mask[:] = False
+            mask[np.asarray(self.atoms, dtype=int) - 1] = True
+        if self.elements is not None:
+            symbols = list(elements[:natom]) + [""] * (natom - len(elements))
+            mask &= np.isin(np.asarray(symbols), self.elements)
+        positions = np.flatnonzero(mask)
+        if len(positions) == 0:
+            raise ValueError(f"no atoms match atoms={self.atoms}, elements={self.elements}")
+        return positions
+
+    def orbital_positions(self, orbitals: Sequence[str]) -> np.ndarray:
+        """Return sorted 0-based positions of the selected orbitals."""
+        if self.orbitals is None:
+            return np.arange(len(orbitals))
+        positions = np.array(
+            [i for i, o in enumerate(orbitals) if o in self.orbitals or o[:1] in self.orbitals],
+            dtype=int,
+        )
+        if len(positions) == 0:
+            raise ValueError(f"no orbitals match orbitals={self.orbitals}")
+        return positions
+
+    def band_positions(self, nband: int, energies: Optional[np.ndarray] = None) -> np.ndarray:
+        """Return sorted 0-based positions of the selected bands.
+
+        Args:
+            nband: Number of bands in the file
+            energies: Band energies of shape ``(spin, band, kpt)``, needed for
+                ``energy_window``
+        """
+        mask = np.ones(nband, dtype=bool)
+        if self.bands is not None:
+            bad = [b for b in self.bands if not 0 < b <= nband]
+            if bad:
+                raise ValueError(f"bands={bad} out of range 1-{nband}")
+            mask[:] = False
+            mask[np.asarray(self.bands, dtype=int) - 1] = True
+        if self.energy_window is not None and energies is not None:
+            emin, emax = self.energy_window
+            mask &= ((energies >= emin) & (energies <= emax)).any(axis=(0, 2))
+        positions = np.flatnonzero(mask)
+        if len(positions) == 0:
+            raise ValueError(
+                f"no bands match bands={self.bands}, energy_window={self.energy_window}"
+            )
+        return positions
+
+    def energy_slice(self, energies: np.ndarray) -> slice:
+        """Return the slice of an ascending energy grid inside ``energy_window``."""
+        if self.energy_window is None:
+            return slice(0, len(energies))
+        emin, emax = self.energy_window
+        start = np.searchsorted(energies, emin, side="left")
+        stop = np.searchsorted(energies, emax, side="right")
+        return slice(int(start), int(stop))
+
+
+def kpath_distance(kcoords: np.ndarray) -> np.ndarray:
+    """Return accumulated distance along a k-point path."""
+    diff = np.diff(kcoords, axis=0)
+    return np.concatenate(([0.0], np.cumsum(np.linalg.norm(diff, axis=1))))
+
+
+def kpoint_labels(nkpt: int, indices: Sequence[int], symbols: Sequence[str]) -> np.ndarray:
+    """Build the per-k-point label column from high-symmetry point indices."""
+    sk_column = [""] * nkpt
+    for i, symbol in zip(indices, symbols):
+        sk_column[i - 1] = symbol
+    return np.array(sk_column)
+
+
+def parse_projection_keys(
+    data: Dict[str, Union[np.ndarray, list]],
+) -> Tuple[List[Tuple[int, str, str, Union[np.ndarray, list]]], List[int], List[str], List[str]]:
+    """Parse legacy ``"1s-up"`` style projection keys.
+
+    Keys of k-point columns and ``tdos`` are skipped.
+
+    Returns
+    -------
+        Parsed ``(atom, orbital, spin, value)`` entries, sorted atom indices,
+        orbitals in order of appearance and spin suffixes (``["up", "down"]`` for
+        spin-polarized keys, ``[""]`` otherwise)
+    """
+    from ddpc.data.utils import _get_ao_spin, _split_atomindex_orbital
+
+    parsed = []
+    atoms: List[int] = []
+    orbitals: List[str] = []
+    spins: List[str] = []
+    for k, v in data.items():
+        if k.startswith(KPOINT_COLUMNS) or k.startswith("tdos"):
+            continue
+        ao, updown = _get_ao_spin(k)
+        a, o = _split_atomindex_orbital(ao)
+        parsed.append((a, o, updown, v))
+        if a not in atoms:
+            atoms.append(a)
+        if o not in orbitals:
+            orbitals.append(o)
+        if updown not in spins:
+            spins.append(updown)
+
+    atoms.sort()
+    if not spins:
+        spins = [""]
+    elif "" not in spins:
+        spins = ["up", "down"]
+    return parsed, atoms, orbitals, spins
+
+
+def stack_band_dict(
+    data: Dict[str, Union[np.ndarray, list]], nkpt: int, nband: int, elements: List[str]
+) -> BandData:
+    """Convert a legacy ``{"1s-up": ..., "kx": ...}`` projection dict into BandData.
+
+    Projections missing from ``data`` are left as zeros.
+    """
+    parsed, atoms, orbitals, spins = parse_projection_keys(data)
+    projections = np.zeros((len(spins), len(atoms), len(orbitals), nband, nkpt))
+    for a, o, updown, v in parsed:
+        column = np.asarray(v).reshape(nband, nkpt, order="F")
+        projections[spins.index(updown), atoms.index(a), orbitals.index(o)] = column
+
+    kcoords = np.column_stack([np.asarray(data[c]) for c in ("kx", "ky", "kz")])
+    return BandData(
+        kcoords,
+        np.asarray(data["label"]),
+        np.asarray(data["dist"]),
+        spins=spins,
+        projections=projections,
+        atoms=atoms,
+        elements=[elements[a - 1] if a <= len(elements) else "" for a in atoms],
+        orbitals=orbitals,
+    )
@@ -1,21 +1,30 @@
 """Read density of states data from output files."""
 
 import sys
-from json import load
 from pathlib import Path
-from typing import Dict, List, Tuple, Union
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
 
 import numpy as np
 
 from ddpc._utils import absf
-from ddpc.data.processors import _refactor_dos
-from ddpc.data.utils import get_h5_str
+from ddpc.data.containers import DosSummary, Selection
+from ddpc.data.processors import _DosBlockAggregator, _refactor_dos_arrays
+from ddpc.data.streaming import find_tail_string, load_json, read_array
+from ddpc.data.utils import get_h5_str, read_modes
+from ddpc.profiling import count_bytes, stage
 
 
-def read_dos(
+def read_dos(  # noqa: PLR0913, PLR0917
     p: Union[str, Path],
     mode: int = 5,
-) -> Tuple[Dict[str, np.ndarray], float, bool]:
+    atoms: Optional[Sequence[int]] = None,
+    elements: Optional[Sequence[str]] = None,
+    orbitals: Optional[Sequence[str]] = None,
+    energy_window: Optional[Sequence[float]] = None,
+    cache: bool = False,
+    modes: Optional[Sequence[int]] = None,
+    atom_block: Optional[int] = None,
+) -> Tuple[Union[Dict[str, np.ndarray], Dict[int, Dict[str, np.ndarray]]], float, bool]:
     """Read and process electronic density of states data from HDF5 or JSON files.
 
     Parameters
@@ -25,12 +34,33 @@ def read_dos(
         JSON (.json) files from DFT calculations.
     mode : int, default 5
         Projection mode for projected density of states data.
+    atoms : sequence of int, optional
+        1-based indices of the atoms whose projections are read.
+    elements : sequence of str, optional
+        Only read projections of atoms of these elements.
+    orbitals : sequence of str, optional
+        Only read projections of these orbitals, either full names such as
+        ``"dxy"`` or shells such as ``"d"``.
+    energy_window : (float, float), optional
+        Only read energy points inside ``(emin, emax)`` eV.
+    cache : bool, default False
+        Reuse a previous result for the same file content, mode and selection
+        from the on-disk cache (see :mod:`ddpc.data.cache`). Cached arrays are
+        memory-mapped and read-only.
+    modes : sequence of int, optional
+        Several projection modes to compute from a single read of the file,
+        replacing ``mode``. The data is then returned as a dict keyed by mode.
+    atom_block : int, optional
+        Read and aggregate the projections this many atoms at a time, so that
+        only the output channels and one block are held in memory instead of
+        all projections. The result is the same; use it for very large systems.
 
     Returns
     -------
     tuple of (Dict[str, np.ndarray], float, bool)
 
-        - Dict mapping column names to numpy arrays with energy and DOS values
+        - Dict mapping column names to numpy arrays with energy and DOS values.
+          A dict of such dicts per mode when ``modes`` is given
         - Fermi energy in eV
         - Boolean indicating whether the data contains orbital projections
 
@@ -38,20 +68,136 @@ def read_dos(
     ------
     TypeError
         If the input file is neither HDF5 nor JSON format.
+    ValueError
+        If a selection matches nothing in the file, or ``atom_block`` is not positive.
     """
     absfile = str(absf(p))
+    selection = Selection.create(atoms, elements, orbitals, energy_window=energy_window)
 
-    if absfile.endswith(".h5"):
-        df, efermi, isproj = read_dos_h5(absfile, mode)
-    elif absfile.endswith(".json"):
-        df, efermi, isproj = read_dos_json(absfile, mode)
-    else:
+    if not absfile.endswith((".h5", ".json")):
         raise TypeError(f"{absfile} must be h5 or json file!")
+    if atom_block is not None and atom_block < 1:
+        raise ValueError(f"atom_block must be positive, got {atom_block}")
+    if cache and modes is not None:
+        from ddpc.data.cache import cached_read_modes
+
+        return cached_read_modes(
+            "dos",
+            absfile,
+            modes,
+            (selection,),
+            lambda ms: _read_dos_file(absfile, ms, selection, atom_block),
+        )
+    if cache:
+        from ddpc.data.cache import cached_read
+
+        return cached_read(
+            "dos",
+            absfile,
+            (mode, selection),
+            lambda: _read_dos_file(absfile, mode, selection, atom_block),
+        )
+    return _read_dos_file(absfile, mode if modes is None else modes, selection, atom_block)
+
+
+def probe_dos(p: Union[str, Path]) -> DosSummary:
+    """Read the header of a DOS file without loading any DOS data.
+
+    Only scalars, names and the energy grid are read. For JSON files the scan
+    stops at the first spin block, and ``SpinType``, which DS-PAW writes after
+    the spin blocks, is looked up in the last bytes of the file.
+
+    Parameters
+    ----------
+    p : str or pathlib.Path
+        Path to an HDF5 (.h5) or JSON (.json) DOS file.
+
+    Returns
+    -------
+    DosSummary
+        Fermi energy, projection flag, spin type and energy grid of the file
+
+    Raises
+    ------
+    TypeError
+        If the input file is neither HDF5 nor JSON format.
+    """
+    absfile = str(absf(p))
+    if absfile.endswith(".h5"):
+        return _probe_dos_h5(absfile)
+    if absfile.endswith(".json"):
+        return _probe_dos_json(absfile)
+    raise TypeError(f"{absfile} must be h5 or json file!")
+
+
+def _probe_dos_h5(absfile: str) -> DosSummary:
+    try:
+        import h5py
+    except ImportError as err:
+        raise ImportError(
+            "Reading HDF5 files requires 'h5py'. Install with: pip install ddpc-data"
+        ) from err
 
-    return df, efermi, isproj
+    with h5py.File(absfile, "r") as dos:
+        if "DosInfo" not in dos:
+            raise TypeError("h5 file must contain 'DosInfo' group!")
+        info = dos["DosInfo"]
+        energies = np.asarray(info["DosEnergy"])
+        orbitals = get_h5_str(dos, "/DosInfo/Orbit") if "Orbit" in info else []
+        elements = get_h5_str(dos, "/AtomInfo/Elements") if "AtomInfo/Elements" in dos else []
+        return DosSummary(
+            efermi=float(info["EFermi"][0]),
+            is_projected=bool(info["Project"][0]),
+            spin_type=get_h5_str(dos, "/DosInfo/SpinType")[0],
+            nspin=2 if "Spin2" in info else 1,
+            nenergy=len(energies),
+            emin=float(energies.min()) if len(energies) else np.nan,
+            emax=float(energies.max()) if len(energies) else np.nan,
+            orbitals=tuple(orbitals),
+            elements=tuple(elements),
+        )
 
 
-def read_dos_h5(absfile: str, mode: int) -> Tuple[Dict[str, np.ndarray], float, bool]:
+def _probe_dos_json(absfile: str) -> DosSummary:
+    head = load_json(absfile, stop_at=("Spin1",))
+    info = head["DosInfo"]
+    spin_type = info.get("SpinType") or find_tail_string(absfile, "SpinType")
+    if spin_type is None:
+        spin_type = load_json(absfile)["DosInfo"]["SpinType"]
+    energies = np.asarray(info["DosEnergy"], dtype=float)
+    atoms = head.get("AtomInfo", {}).get("Atoms", [])
+    return DosSummary(
+        efermi=float(info["EFermi"]),
+        is_projected=bool(info["Project"]),
+        spin_type=spin_type,
+        nspin=2 if spin_type == "collinear" else 1,
+        nenergy=len(energies),
+        emin=float(energies.min()) if len(energies) else np.nan,
+        emax=float(energies.max()) if len(energies) else np.nan,
+        orbitals=tuple(info.get("Orbit", ())),
+        elements=tuple(atom["Element"] for atom in atoms),
+    )
+
+
+def _read_dos_file(
+    absfile: str,
+    mode: Union[int, Sequence[int]],
+    selection: Selection,
+    atom_block: Optional[int] = None,
+) -> Tuple[Union[Dict[str, np.ndarray], Dict[int, Dict[str, np.ndarray]]], float, bool]:
+    """Dispatch to the HDF5 or JSON reader."""
+    with stage("read-dos"):
+        if absfile.endswith(".h5"):
+            return read_dos_h5(absfile, mode, selection, atom_block)
+        return read_dos_json(absfile, mode, selection, atom_block)
+
+
+def read_dos_h5(
+    absfile: str,
+    mode: Union[int, Sequence[int]],
+    selection: Optional[Selection] = None,
+    atom_block: Optional[int] = None,
+) -> Tuple[Union[Dict[str, np.ndarray], Dict[int, Dict[str, np.ndarray]]], float, bool]:
     """Read density of states data from HDF5 file format.
 
     Lazy imports h5py to avoid unnecessary dependency loading.
@@ -63,7 +209,9 @@ def read_dos_h5(absfile: str, mode: int) -> Tuple[Dict[str, np.ndarray], float,
             "Reading HDF5 files requires 'h5py'. Install with: pip install ddpc-data"
         ) from err
 
-    with h5py.File(absfile, "r") as dos:
+    with stage("open"):
+        dos = h5py.File(absfile, "r")
+    with dos:
         dosinfo = dos["DosInfo"]
         if isinstance(dosinfo, h5py.Group):
             efermi_list = dosinfo["EFermi"]
@@ -79,149 +227,279 @@ def read_dos_h5(absfile: str, mode: int) -> Tuple[Dict[str, np.ndarray], float,
             else:
                 print("ERROR: cannot read /DosInfo/Project")
                 sys.exit(1)
-            if mode == 0:
-                df = read_tdos(dos)
-            elif iproj:
-                df = read_pdos_h5(dos, mode)
-            else:
-                df = read_tdos(dos)
+            df = read_modes(
+                mode,
+                iproj,
+                lambda: read_tdos(dos, selection=selection),
+                lambda modes: read_pdos_h5(dos, modes, selection, atom_block),
+            )
         else:
             raise TypeError("h5 file must contain 'DosInfo' group!")
 
     return df, efermi, bool(iproj)
 
 
-def read_dos_json(absfile: str, mode: int) -> Tuple[Dict[str, np.ndarray], float, bool]:
+def read_dos_json(
+    absfile: str,
+    mode: Union[int, Sequence[int]],
+    selection: Optional[Selection] = None,
+    atom_block: Optional[int] = None,
+) -> Tuple[Union[Dict[str, np.ndarray], Dict[int, Dict[str, np.ndarray]]], float, bool]:
     """Read density of states data from JSON file format."""
-    with open(absfile, encoding="utf-8") as fin:
-        dos = load(fin)
-        efermi = dos["DosInfo"]["EFermi"]
+    with stage("open"):
+        dos = load_json(absfile)
+    efermi = dos["DosInfo"]["EFermi"]
     iproj = dos["DosInfo"]["Project"]
-    if mode == 0:
-        df = read_tdos(dos, h5=False)
-    elif iproj:
-        df = read_pdos_json(dos, mode)
-    else:
-        df = read_tdos(dos, h5=False)
+    df = read_modes(
+        mode,
+        iproj,
+        lambda: read_tdos(dos, h5=False, selection=selection),
+        lambda modes: read_pdos_json(dos, modes, selection, atom_block),
+    )
 
     return df, efermi, bool(iproj)
 
 
-def read_tdos(dos, h5: bool = True) -> Dict[str, np.ndarray]:
+def _aggregate_blocks(
+    read_block: Callable[[np.ndarray, int], None],
+    aggregator: _DosBlockAggregator,
+    shape: Tuple[int, int, int, int],
+    atom_block: int,
+) -> None:
+    """Read projections ``atom_block`` atoms at a time and add each block to ``aggregator``.
+
+    Args:
+        read_block: Fills a ``(spin, atom, orbital, energy)`` buffer with the
+            projections of the atoms from the given position on
+        aggregator: Receives every block
+        shape: Shape of all projections, ``(spin, atom, orbital, energy)``
+        atom_block: Number of atoms per block
+    """
+    nspin, natom, norb, nenergy = shape
+    block = np.empty((nspin, min(atom_block, natom), norb, nenergy))
+    for start in range(0, natom, atom_block):
+        projections = block[:, : natom - start]
+        read_block(projections, start)
+        with stage("aggregate"):
+            aggregator.add(start, projections)
+
+
+def read_tdos(dos, h5: bool = True, selection: Optional[Selection] = None) -> Dict[str, np.ndarray]:
     """Read total (non-projected) density of states data."""
-    energies = np.asarray(dos["DosInfo"]["DosEnergy"])
-
-    if h5:
-        spin_type = dos["DosInfo"]["SpinType"][0]
-    else:
-        spin_type = dos["DosInfo"]["SpinType"]
-
-    if spin_type == "collinear":
-        densities = {
-            "energy": energies,
-            "up": np.asarray(dos["DosInfo"]["Spin1"]["Dos"]),
-            "down": np.asarray(dos["DosInfo"]["Spin2"]["Dos"]),
-        }
-    else:
-        densities = {
-            "energy": energies,
-            "dos": np.asarray(dos["DosInfo"]["Spin1"]["Dos"]),
-        }
+    selection = selection or Selection()
+    with stage("read-metadata"):
+        energies = np.asarray(dos["DosInfo"]["DosEnergy"])
+        window = selection.energy_slice(energies)
+
+        if h5:
+            count_bytes(energies.nbytes)
+            spin_type = dos["DosInfo"]["SpinType"][0]
+        else:
+            spin_type = dos["DosInfo"]["SpinType"]
+
+    with stage("read-totals"):
+        if spin_type == "collinear":
+            densities = {
+                "energy": energies[window],
+                "up": np.asarray(dos["DosInfo"]["Spin1"]["Dos"][window]),
+                "down": np.asarray(dos["DosInfo"]["Spin2"]["Dos"][window]),
+            }
+        else:
+            densities = {
+                "energy": energies[window],
+                "dos": np.asarray(dos["DosInfo"]["Spin1"]["Dos"][window]),
+            }
+        if h5:
+            count_bytes(sum(arr.nbytes for key, arr in densities.items() if key != "energy"))
     return densities
 
 
-def read_pdos_h5(dos, mode: int) -> Dict[str, np.ndarray]:
-    """Read orbital-projected density of states data from HDF5 file."""
-    energies: List[float] = dos["/DosInfo/DosEnergy"]
-    data = {}
-    orbitals: List[str] = get_h5_str(dos, "/DosInfo/Orbit")
-
-    atom_index: int = dos["/DosInfo/Spin1/ProjectDos/AtomIndexs"][0]  # 2
-    orb_index: int = dos["/DosInfo/Spin1/ProjectDos/OrbitIndexs"][0]  # 9
-    spin_type_list = get_h5_str(dos, "/DosInfo/SpinType")
-    if spin_type_list[0] == "collinear":
-        data.update(
-            {
-                "tdos-up": np.asarray(dos["/DosInfo/Spin1/Dos"]),
-                "tdos-down": np.asarray(dos["/DosInfo/Spin2/Dos"]),
-            },
-        )
-        for ai in range(atom_index):
-            for oi in range(orb_index):
-                data.update(
-                    {
-                        f"{ai + 1}{orbitals[oi]}-up": dos[
-                            f"/DosInfo/Spin1/ProjectDos{ai + 1}/{oi + 1}"
-                        ]
-                    }
-                )
-                data.update(
-                    {
-                        f"{ai + 1}{orbitals[oi]}-down": dos[
-                            f"/DosInfo/Spin2/ProjectDos{ai + 1}/{oi + 1}"
-                        ]
-                    }
-                )
-    else:
-        data.update(
-            {"tdos": np.asarray(dos["/DosInfo/Spin1/Dos"])},
-        )
-        for ai in range(atom_index):
-            for oi in range(orb_index):
-                data.update(
-                    {f"{ai + 1}{orbitals[oi]}": dos[f"/DosInfo/Spin1/ProjectDos{ai + 1}/{oi + 1}"]}
-                )
-
-    if mode == 3:
-        elements: List[str] = get_h5_str(dos, "/AtomInfo/Elements")
-    else:
-        elements = []
-    _data = _refactor_dos(energies, data, mode, elements)
-
-    return _data
-
-
-def read_pdos_json(dos: Dict, mode: int) -> Dict[str, np.ndarray]:
-    """Read orbital-projected density of states data from JSON file."""
-    energies: List[float] = dos["DosInfo"]["DosEnergy"]
-    data = {}
-    orbitals: List[str] = dos["DosInfo"]["Orbit"]
-
-    if dos["DosInfo"]["SpinType"] == "collinear":
-        data.update(
-            {
-                "tdos-up": dos["DosInfo"]["Spin1"]["Dos"],
-                "tdos-down": dos["DosInfo"]["Spin2"]["Dos"],
-            },
+def read_pdos_h5(
+    dos,
+    mode: Union[int, Sequence[int]],
+    selection: Optional[Selection] = None,
+    atom_block: Optional[int] = None,
+) -> Union[Dict[str, np.ndarray], Dict[int, Dict[str, np.ndarray]]]:
+    """Read orbital-projected density of states data from HDF5 file.
+
+    Only the ``/ProjectDos`` datasets of selected atoms and orbitals are read, and
+    only the hyperslab inside the energy window. When ``mode`` is a sequence, the
+    projections are read once and a dict with the result of every mode is returned.
+    With ``atom_block``, the projections are read and aggregated that many atoms
+    at a time.
+    """
+    selection = selection or Selection()
+    with stage("read-metadata"):
+        energies = np.asarray(dos["/DosInfo/DosEnergy"])
+        count_bytes(energies.nbytes)
+        window = selection.energy_slice(energies)
+        orbitals: List[str] = get_h5_str(dos, "/DosInfo/Orbit")
+        if 3 in np.ravel(mode) or selection.elements is not None:
+            elements: List[str] = get_h5_str(dos, "/AtomInfo/Elements")
+        else:
+            elements = []
+
+        natom = int(dos["/DosInfo/Spin1/ProjectDos/AtomIndexs"][0])
+        norb = int(dos["/DosInfo/Spin1/ProjectDos/OrbitIndexs"][0])
+        spin_type_list = get_h5_str(dos, "/DosInfo/SpinType")
+
+    with stage("read-totals"):
+        if spin_type_list[0] == "collinear":
+            spins: Tuple[str, ...] = ("up", "down")
+            tdos = {
+                "tdos-up": np.asarray(dos["/DosInfo/Spin1/Dos"][window]),
+                "tdos-down": np.asarray(dos["/DosInfo/Spin2/Dos"][window]),
+            }
+        else:
+            spins = ("",)
+            tdos = {"tdos": np.asarray(dos["/DosInfo/Spin1/Dos"][window])}
+        count_bytes(sum(arr.nbytes for arr in tdos.values()))
+
+    atom_pos = selection.atom_positions(natom, elements)
+    orb_pos = selection.orbital_positions(orbitals[:norb])
+    nenergy = window.stop - window.start
+
+    def read_block(projections: np.ndarray, start: int) -> None:
+        with stage("read-projections"):
+            for si in range(len(spins)):
+                for i, ai in enumerate(atom_pos[start : start + projections.shape[1]]):
+                    for j, oi in enumerate(orb_pos):
+                        dos[f"/DosInfo/Spin{si + 1}/ProjectDos{ai + 1}/{oi + 1}"].read_direct(
+                            projections[si, i, j], source_sel=window
+                        )
+            count_bytes(projections.nbytes)
+
+    if atom_block is not None:
+        aggregator = _DosBlockAggregator(
+            np.ravel(mode).tolist(),
+            spins,
+            [orbitals[oi] for oi in orb_pos],
+            elements,
+            atom_pos + 1,
+            nenergy,
         )
-        project = dos["DosInfo"]["Spin1"]["ProjectDos"]
-        for p in project:
-            atom_index = p["AtomIndex"]
-            orb_index = p["OrbitIndex"] - 1
-            contrib = p["Contribution"]
-            data.update({f"{atom_index}{orbitals[orb_index]}-up": contrib})
-        project = dos["DosInfo"]["Spin2"]["ProjectDos"]
-        for p in project:
-            atom_index = p["AtomIndex"]
-            orb_index = p["OrbitIndex"] - 1
-            contrib = p["Contribution"]
-            data.update({f"{atom_index}{orbitals[orb_index]}-down": contrib})
-
-    else:
-        data.update(
-            {"tdos": dos["DosInfo"]["Spin1"]["Dos"]},
+        shape = (len(spins), len(atom_pos), len(orb_pos), nenergy)
+        _aggregate_blocks(read_block, aggregator, shape, atom_block)
+        with stage("aggregate"):
+            results = aggregator.result(energies[window], tdos)
+        return results[int(mode)] if np.ndim(mode) == 0 else results
+
+    projections = np.empty((len(spins), len(atom_pos), len(orb_pos), nenergy))
+    read_block(projections, 0)
+
+    def refactor(m: int) -> Dict[str, np.ndarray]:
+        return _refactor_dos_arrays(
+            energies[window],
+            tdos,
+            projections,
+            spins,
+            [orbitals[oi] for oi in orb_pos],
+            m,
+            elements if m == 3 else [],
+            atoms=atom_pos + 1,
         )
-        project = dos["DosInfo"]["Spin1"]["ProjectDos"]
-        for p in project:
-            atom_index = p["AtomIndex"]
-            orb_index = p["OrbitIndex"] - 1
-            contrib = p["Contribution"]
-            data.update({f"{atom_index}{orbitals[orb_index]}": contrib})
 
-    if mode == 3:
+    with stage("aggregate"):
+        return refactor(mode) if np.ndim(mode) == 0 else {m: refactor(m) for m in mode}
+
+
+def read_pdos_json(
+    dos: Dict,
+    mode: Union[int, Sequence[int]],
+    selection: Optional[Selection] = None,
+    atom_block: Optional[int] = None,
+) -> Union[Dict[str, np.ndarray], Dict[int, Dict[str, np.ndarray]]]:
+    """Read orbital-projected density of states data from JSON file.
+
+    When ``mode`` is a sequence, a dict with the result of every mode is returned.
+    With ``atom_block``, the projections are read and aggregated that many atoms
+    at a time.
+    """
+    selection = selection or Selection()
+    with stage("read-metadata"):
+        energies = np.asarray(dos["DosInfo"]["DosEnergy"])
+        window = selection.energy_slice(energies)
+        orbitals: List[str] = dos["DosInfo"]["Orbit"]
         elements: List[str] = [atom["Element"] for atom in dos["AtomInfo"]["Atoms"]]
-    else:
-        elements = []
-    _data = _refactor_dos(energies, data, mode, elements)
+        collinear = dos["DosInfo"]["SpinType"] == "collinear"
+        spins: Tuple[str, ...] = ("up", "down") if collinear else ("",)
+
+        records = [dos["DosInfo"][f"Spin{si + 1}"]["ProjectDos"] for si in range(len(spins))]
+        natom = max((p["AtomIndex"] for p in records[0]), default=0)
+        norb = max((p["OrbitIndex"] for p in records[0]), default=0)
+
+    with stage("read-totals"):
+        if collinear:
+            tdos = {
+                "tdos-up": np.asarray(dos["DosInfo"]["Spin1"]["Dos"][window]),
+                "tdos-down": np.asarray(dos["DosInfo"]["Spin2"]["Dos"][window]),
+            }
+        else:
+            tdos = {"tdos": np.asarray(dos["DosInfo"]["Spin1"]["Dos"][window])}
+    atom_pos = selection.atom_positions(natom, elements)
+    orb_pos = selection.orbital_positions(orbitals[:norb])
+    atom_at = {a: i for i, a in enumerate(atom_pos)}
+    orb_at = {o: j for j, o in enumerate(orb_pos)}
+
+    # (spin, atom position, orbital position, record) of every selected projection
+    selected: List[Tuple[int, int, int, Dict]] = []
+    present = np.zeros((len(atom_pos), len(orb_pos)), dtype=bool)
+    for si, project in enumerate(records):
+        for p in project:
+            i = atom_at.get(p["AtomIndex"] - 1)
+            j = orb_at.get(p["OrbitIndex"] - 1)
+            if i is None or j is None:
+                continue
+            selected.append((si, i, j, p))
+            present[i, j] = True
+    mask = tuple(present.ravel().tolist())
+
+    nenergy = window.stop - window.start
+    scratch = np.empty(len(energies))
+
+    # selected projections grouped by block of atoms, a single block without atom_block
+    size = atom_block or max(len(atom_pos), 1)
+    blocks: List[list] = [[] for _ in range(0, max(len(atom_pos), 1), size)]
+    for entry in selected:
+        blocks[entry[1] // size].append(entry)
+
+    def read_block(projections: np.ndarray, start: int) -> None:
+        with stage("read-projections"):
+            projections[...] = 0
+            for si, i, j, p in blocks[start // size]:
+                projections[si, i - start, j] = read_array(p["Contribution"], scratch)[window]
+
+    if atom_block is not None:
+        aggregator = _DosBlockAggregator(
+            np.ravel(mode).tolist(),
+            spins,
+            [orbitals[oi] for oi in orb_pos],
+            elements,
+            atom_pos + 1,
+            nenergy,
+            present=mask,
+        )
+        shape = (len(spins), len(atom_pos), len(orb_pos), nenergy)
+        _aggregate_blocks(read_block, aggregator, shape, atom_block)
+        with stage("aggregate"):
+            results = aggregator.result(energies[window], tdos)
+        return results[int(mode)] if np.ndim(mode) == 0 else results
+
+    projections = np.empty((len(spins), len(atom_pos), len(orb_pos), nenergy))
+    read_block(projections, 0)
+
+    def refactor(m: int) -> Dict[str, np.ndarray]:
+        return _refactor_dos_arrays(
+            energies[window],
+            tdos,
+            projections,
+            spins,
+            [orbitals[oi] for oi in orb_pos],
+            m,
+            elements if m == 3 else [],
+            atoms=atom_pos + 1,
+            present=mask,
+        )
 
-    return _data
+    with stage("aggregate"):
+        return refactor(mode) if np.ndim(mode) == 0 else {m: refactor(m) for m in mode}
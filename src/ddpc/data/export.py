@@ -1,36 +1,98 @@
 """Export data to various formats."""
 
+import json
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, Union
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, List, Optional, Union
 
 import numpy as np
 
+from ddpc.data.containers import BandData
+from ddpc.profiling import stage
 
-def to_csv(
+CSV_CHUNK_CELLS = 1 << 18
+PARQUET_ROW_GROUP_SIZE = 1 << 16
+EXPORT_FORMATS = ("csv", "npz", "parquet")
+
+
+def to_csv(  # noqa: PLR0913
     data: Dict[str, np.ndarray],
     path: Union[str, Path],
     *,
     delimiter: str = ",",
     header: bool = True,
+    float_format: Optional[str] = None,
+    threads: int = 1,
 ) -> None:
     """Export data dict to CSV file.
 
+    Rows are formatted column-wise in blocks of about ``CSV_CHUNK_CELLS`` values
+    and streamed to the file, so memory stays bounded for very wide tables. With
+    the default ``float_format`` every value is written as ``str(arr[i])``.
+
     Args:
         data: Dict with numpy arrays of same length
         path: Output CSV file path
         delimiter: Column separator (default: ",")
         header: Include column names (default: True)
+        float_format: Format spec for float columns, e.g. ``".6f"`` or ``"8.3f"``
+            (default: shortest round-trip representation)
+        threads: Number of threads formatting blocks concurrently (default: 1)
 
     Raises
     ------
-        ValueError: If arrays have inconsistent shapes
+        ValueError: If arrays have inconsistent shapes or float_format is invalid
         IOError: If cannot write to path
     """
     path = Path(path)
+    flat_data = _flatten_columns(data, "CSV")
+    arrays = list(flat_data.values())
+    format_float = _float_formatter(float_format)
+    n_rows = len(arrays[0])
+    step = max(1, CSV_CHUNK_CELLS // len(arrays))
+
+    floats = [i for i, arr in enumerate(arrays) if _is_float(arr, format_float)]
+    others = [i for i, arr in enumerate(arrays) if not _is_float(arr, format_float)]
+
+    def format_block(start: int) -> str:
+        columns: List[List[str]] = [[]] * len(arrays)
+        if floats:
+            block = np.stack([arrays[i][start : start + step] for i in floats])
+            for i, col in zip(floats, _format_floats(block, format_float)):
+                columns[i] = col
+        for i in others:
+            columns[i] = _format_column(arrays[i][start : start + step])
+        return "\n".join(map(delimiter.join, zip(*columns)))
+
+    starts = range(0, n_rows, step)
+    if threads > 1:
+        blocks = _ordered_map(format_block, starts, threads)
+    else:
+        blocks = map(format_block, starts)
+
+    with stage("export"), open(path, "w", encoding="utf-8") as fout:
+        sep = ""
+        if header:
+            fout.write(delimiter.join(flat_data.keys()))
+            sep = "\n"
+        for block in blocks:
+            fout.write(sep)
+            fout.write(block)
+            sep = "\n"
+
+
+def _flatten_columns(data: Dict[str, np.ndarray], target: str) -> Dict[str, np.ndarray]:
+    """Expand 2-D arrays into numbered columns and check all columns have one length.
+
+    Raises
+    ------
+        ValueError: If data is empty, an array has more than 2 dimensions, or
+            lengths differ
+    """
     if not data:
         raise ValueError("Empty data dict")
 
-    # Flatten data structure for CSV
     flat_data = {}
     for key, arr in data.items():
         if arr.ndim == 1:
@@ -40,27 +102,61 @@ def to_csv(
             for j in range(arr.shape[1]):
                 flat_data[f"{key}{j}"] = arr[:, j]
         else:
-            raise ValueError(f"Cannot export {arr.ndim}D array '{key}' to CSV")
+            raise ValueError(f"Cannot export {arr.ndim}D array '{key}' to {target}")
 
-    # Check consistency
-    arrays = list(flat_data.values())
-    lengths = [len(arr) for arr in arrays]
+    lengths = [len(arr) for arr in flat_data.values()]
     if len(set(lengths)) > 1:
-        raise ValueError(
-            f"Inconsistent array lengths: {dict(zip(flat_data.keys(), lengths))}"
-        )
+        raise ValueError(f"Inconsistent array lengths: {dict(zip(flat_data.keys(), lengths))}")
+    return flat_data
+
+
+def _float_formatter(spec: Optional[str]) -> Callable[[float], str]:
+    """Return the formatter for float values, ``repr`` when ``spec`` is None."""
+    if spec is None:
+        # repr of a Python float is identical to str of a numpy float64
+        return repr
+    try:
+        format(0.0, spec)
+    except ValueError as err:
+        raise ValueError(f"Invalid float_format {spec!r}: {err}") from None
+    return ("{:" + spec + "}").format
 
-    # Build CSV lines
-    lines = []
-    if header:
-        lines.append(delimiter.join(flat_data.keys()))
 
-    n_rows = lengths[0]
-    for i in range(n_rows):
-        row = [str(arr[i]) for arr in arrays]
-        lines.append(delimiter.join(row))
+def _is_float(arr: np.ndarray, format_float: Callable[[float], str]) -> bool:
+    """Whether ``arr`` is written with ``format_float``, other columns use ``str``."""
+    return arr.dtype == np.float64 or (arr.dtype.kind == "f" and format_float is not repr)
 
-    path.write_text("\n".join(lines), encoding="utf-8")
+
+def _format_floats(block: np.ndarray, format_float: Callable[[float], str]) -> List[List[str]]:
+    """Format a 2-D float block row by row, formatting each distinct value once.
+
+    Projections and eigenvalues repeat a lot, and formatting dominates the cost,
+    so values are deduplicated on their bit pattern (keeping ``-0.0`` apart from
+    ``0.0``) and the strings are gathered back with one take.
+    """
+    bits = np.ascontiguousarray(block, dtype=np.float64).view(np.uint64)
+    unique, inverse = np.unique(bits, return_inverse=True)
+    strings = np.array(list(map(format_float, unique.view(np.float64).tolist())), dtype=object)
+    return strings[inverse.reshape(block.shape)].tolist()
+
+
+def _format_column(arr: np.ndarray) -> List[str]:
+    """Format a non-float column block as strings."""
+    if arr.dtype.kind in "iubU":
+        return list(map(str, arr.tolist()))
+    return [str(v) for v in arr]
+
+
+def _ordered_map(func: Callable[[int], str], items: Iterable[int], threads: int) -> Iterator[str]:
+    """Map ``func`` over ``items`` in a thread pool, keeping a bounded window in flight."""
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        pending: Deque[Future] = deque()
+        for item in items:
+            pending.append(pool.submit(func, item))
+            if len(pending) >= 2 * threads:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
 
 
 def to_npz(
@@ -81,7 +177,154 @@ def to_npz(
         IOError: If cannot write to path
     """
     path = Path(path)
-    if compressed:
-        np.savez_compressed(path, **data)
+    with stage("export"):
+        if compressed:
+            np.savez_compressed(path, **data)
+        else:
+            np.savez(path, **data)
+
+
+def to_arrow(data: Dict[str, np.ndarray], *, metadata: Optional[Dict[str, Any]] = None):
+    """Convert data dict to a ``pyarrow.Table``.
+
+    Contiguous numeric columns are handed to Arrow without copying, so the table
+    shares memory with ``data``. Strided columns (such as those of a 2-D array)
+    and string columns are copied.
+
+    Args:
+        data: Dict with numpy arrays of same length
+        metadata: Extra values for the schema metadata, e.g. ``{"efermi": 5.2}``.
+            For :class:`~ddpc.data.containers.BandData` the projection mode,
+            spins, elements and channels are added automatically.
+
+    Returns
+    -------
+        ``pyarrow.Table`` with one column per (expanded) array; every metadata
+        value is stored JSON encoded
+
+    Raises
+    ------
+        ImportError: If pyarrow is not installed
+        ValueError: If arrays have inconsistent shapes
+    """
+    pa = _import_pyarrow()
+    flat_data = _flatten_columns(data, "Arrow")
+    columns = [_to_arrow_array(pa, arr) for arr in flat_data.values()]
+    schema = pa.schema(
+        [pa.field(name, col.type) for name, col in zip(flat_data, columns)],
+        metadata=_schema_metadata(data, metadata),
+    )
+    return pa.Table.from_arrays(columns, schema=schema)
+
+
+def to_parquet(
+    data: Dict[str, np.ndarray],
+    path: Union[str, Path],
+    *,
+    metadata: Optional[Dict[str, Any]] = None,
+    row_group_size: int = PARQUET_ROW_GROUP_SIZE,
+    compression: str = "snappy",
+) -> None:
+    """Export data dict to Parquet file.
+
+    Rows are converted and written one row group at a time, so only one group
+    is held in Arrow memory. Readers can load single columns without parsing
+    the rest of the file.
+
+    Args:
+        data: Dict with numpy arrays of same length
+        path: Output Parquet file path
+        metadata: Extra values for the schema metadata, see :func:`to_arrow`
+        row_group_size: Maximum rows per row group (default: 65536)
+        compression: Parquet compression codec (default: "snappy")
+
+    Raises
+    ------
+        ImportError: If pyarrow is not installed
+        ValueError: If arrays have inconsistent shapes
+        IOError: If cannot write to path
+    """
+    pa = _import_pyarrow()
+    import pyarrow.parquet as pq
+
+    path = Path(path)
+    flat_data = _flatten_columns(data, "Parquet")
+    arrays = list(flat_data.values())
+    schema = pa.schema(
+        [pa.field(name, _to_arrow_array(pa, arr[:0]).type) for name, arr in flat_data.items()],
+        metadata=_schema_metadata(data, metadata),
+    )
+
+    with stage("export"), pq.ParquetWriter(str(path), schema, compression=compression) as writer:
+        for start in range(0, len(arrays[0]), max(1, row_group_size)):
+            stop = start + row_group_size
+            columns = [_to_arrow_array(pa, arr[start:stop]) for arr in arrays]
+            writer.write_table(pa.Table.from_arrays(columns, schema=schema))
+
+
+def save(
+    data: Dict[str, np.ndarray],
+    path: Union[str, Path],
+    format: str = "csv",
+    *,
+    float_format: Optional[str] = None,
+    metadata: Optional[Dict[str, Any]] = None,
+) -> None:
+    """Export data dict in one of ``EXPORT_FORMATS``.
+
+    Args:
+        data: Dict with numpy arrays of same length
+        path: Output file path
+        format: ``"csv"``, ``"npz"`` or ``"parquet"`` (default: "csv")
+        float_format: CSV float format spec, see :func:`to_csv`
+        metadata: Parquet schema metadata, see :func:`to_arrow`
+
+    Raises
+    ------
+        ValueError: If format is unknown
+    """
+    if format == "csv":
+        to_csv(data, path, float_format=float_format)
+    elif format == "npz":
+        to_npz(data, path)
+    elif format == "parquet":
+        to_parquet(data, path, metadata=metadata)
     else:
-        np.savez(path, **data)
+        raise ValueError(f"Unknown export format '{format}', expected one of {EXPORT_FORMATS}")
+
+
+def _import_pyarrow():
+    try:
+        import pyarrow as pa
+    except ImportError as err:
+        raise ImportError(
+            "Exporting Arrow/Parquet requires 'pyarrow'. Install with: pip install ddpc[arrow]"
+        ) from err
+    return pa
+
+
+def _to_arrow_array(pa, arr: np.ndarray):
+    """Wrap a column as an Arrow array, zero-copy when it is contiguous and numeric."""
+    if arr.dtype.kind in "iufb":
+        return pa.array(np.ascontiguousarray(arr))
+    if arr.dtype.kind == "U":
+        return pa.array(arr.tolist(), type=pa.string())
+    return pa.array(arr.tolist())
+
+
+def _schema_metadata(
+    data: Dict[str, np.ndarray], metadata: Optional[Dict[str, Any]]
+) -> Dict[str, str]:
+    """Collect schema metadata, JSON encoding every value."""
+    meta: Dict[str, Any] = {}
+    if isinstance(data, BandData):
+        meta.update(
+            {
+                "mode": data.mode,
+                "spins": [spin for spin in data.spins if spin],
+                "elements": list(dict.fromkeys(e for e in data.elements if e)),
+                "channels": list(data.channels),
+            }
+        )
+    meta.update(metadata or {})
+    return {key: json.dumps(value) for key, value in meta.items()}
@@ -1,107 +1,177 @@
-"""Projection mode processing for band and DOS data, internal use only."""
+"""Projection mode processing for band and DOS data, internal use only.
 
-from typing import List, Union
+Every projection mode sums the raw ``(atom, orbital)`` projections into a set of
+output channels. The grouping is described by a sparse 0/1 aggregation matrix of
+shape ``(channel, atom * orbital)`` that is built once per (atoms, elements,
+orbitals, mode) and applied to the stacked projection tensor in a single call.
+DOS projections of very large systems can instead be reduced one atom block at a
+time with :class:`_DosBlockAggregator`, which gives the same result.
+"""
+
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
 
 import numpy as np
 
-from ddpc.data.utils import (
-    _get_ao_spin,
-    _inplace_update_data,
-    _split_atomindex_orbital,
-)
+from ddpc.data.containers import BandData, parse_projection_keys, stack_band_dict
+
+BAND_MODES = (1, 2, 3, 4, 5)
+DOS_MODES = (1, 2, 3, 4, 5, 6, 7)
+
+T2G_ORBITALS = ("dxy", "dxz", "dyz")
+EG_ORBITALS = ("dz2", "dx2y2")
+
+
+# Aggregation engine
+def _band_channel(mode: int, atom: int, element: str, orbital: str) -> str:
+    """Return the output channel name of one (atom, orbital) pair in band ``mode``."""
+    if mode == 1:
+        return element
+    if mode == 2:
+        return f"{element}-{orbital[0]}"
+    if mode == 3:
+        return f"{element}-{orbital}"
+    if mode == 4:
+        return f"{atom}-{orbital[0]}"
+    return f"{atom}-{orbital}"
+
+
+def _dos_channel(mode: int, atom: int, element: str, orbital: str) -> Optional[str]:  # noqa: PLR0911
+    """Return the output channel name of one (atom, orbital) pair in DOS ``mode``.
+
+    ``None`` means the pair does not contribute to any channel.
+    """
+    if mode == 1:
+        return orbital[0]
+    if mode == 2:
+        return orbital
+    if mode == 3:
+        return element
+    if mode == 4:
+        return f"{atom}{orbital[0]}"
+    if mode == 5:
+        return f"{atom}{orbital}"
+    if mode == 6:
+        if orbital in T2G_ORBITALS:
+            return f"{atom}t2g"
+        if orbital in EG_ORBITALS:
+            return f"{atom}eg"
+        return None
+    return f"{atom}"
+
+
+@lru_cache(maxsize=128)
+def _aggregation_matrix(  # noqa: PLR0913, PLR0917
+    kind: str,
+    mode: int,
+    atoms: Tuple[int, ...],
+    elements: Tuple[str, ...],
+    orbitals: Tuple[str, ...],
+    present: Optional[Tuple[bool, ...]] = None,
+) -> Tuple[Tuple[str, ...], np.ndarray, np.ndarray]:
+    """Build the sparse ``(channel, atom * orbital)`` aggregation matrix of a mode.
+
+    The matrix only holds ones, so it is stored in CSR form without a data array.
+
+    Args:
+        kind: ``"band"`` or ``"dos"``, selects the channel naming scheme
+        mode: Projection mode
+        atoms: 1-based atom index for each entry of the atom axis
+        elements: Element symbol for each entry of the atom axis
+        orbitals: Orbital name for each entry of the orbital axis
+        present: Whether each flattened (atom, orbital) pair holds data, all pairs
+            are used when None
+
+    Returns
+    -------
+        Channel names in order of first appearance, the flattened (atom, orbital)
+        column of every nonzero grouped by channel, and the offsets of each
+        channel's nonzeros (``nchannel + 1`` entries)
+    """
+    channel_of = _band_channel if kind == "band" else _dos_channel
+    members: Dict[str, List[int]] = {}
+    norb = len(orbitals)
+    for ia, (atom, element) in enumerate(zip(atoms, elements)):
+        for io, orbital in enumerate(orbitals):
+            column = ia * norb + io
+            if present is not None and not present[column]:
+                continue
+            channel = channel_of(mode, atom, element, orbital)
+            if channel is not None:
+                members.setdefault(channel, []).append(column)
+
+    indices = np.fromiter((c for cols in members.values() for c in cols), dtype=np.intp, count=-1)
+    indptr = np.cumsum([0] + [len(cols) for cols in members.values()], dtype=np.intp)
+    indices.setflags(write=False)
+    indptr.setflags(write=False)
+    return tuple(members), indices, indptr
+
+
+def _aggregate(projections: np.ndarray, indices: np.ndarray, indptr: np.ndarray) -> np.ndarray:
+    """Apply an aggregation matrix to a ``(spin, atom, orbital, ...)`` projection tensor.
+
+    Members of each channel are added in their original order, one vectorized pass
+    per member position, so the result is bit-for-bit equal to accumulating the
+    columns one by one.
+
+    Returns
+    -------
+        Array of shape ``(spin, channel, ...)``
+    """
+    nspin, natom, norb = projections.shape[:3]
+    trailing = projections.shape[3:]
+    if len(indptr) < 2:
+        return np.zeros((nspin, 0, *trailing), dtype=projections.dtype)
+
+    flat = projections.reshape(nspin, natom * norb, *trailing)
+    starts = indptr[:-1]
+    sizes = np.diff(indptr)
+    summed = flat[:, indices[starts]]
+    for j in range(1, int(sizes.max())):
+        rows = np.flatnonzero(sizes > j)
+        summed[:, rows] += flat[:, indices[starts[rows] + j]]
+    return summed
+
+
+def _atom_elements(atoms: Sequence[int], elements: Optional[Sequence[str]]) -> Tuple[str, ...]:
+    """Return the element of each 1-based atom index, empty string when unknown."""
+    elements = elements or []
+    return tuple(elements[a - 1] if 0 < a <= len(elements) else "" for a in atoms)
 
 
 # Band processing functions
 def _band_ele(data: dict, nkpt: int, nband: int, elements: List[str], _data: dict) -> None:
     """Process band data in element-resolved mode (mode 1)."""
-    for k, v in data.items():
-        if k.startswith(("k", "label", "dist")):
-            _data[k] = v
-        else:
-            cont = np.asarray(v).reshape(nband, nkpt, order="F")
-            ao, updown = _get_ao_spin(k)
-            a, _ = _split_atomindex_orbital(ao)
-            for b in range(nband):
-                if updown:
-                    key = f"band{b + 1}-{elements[a - 1]}-{updown}"
-                else:
-                    key = f"band{b + 1}-{elements[a - 1]}"
-                _inplace_update_data(_data, key, cont[b])
+    _data.update(_refactor_band(data, nkpt, nband, elements, 1))
 
 
 def _band_elespdf(data: dict, nkpt: int, nband: int, elements: List[str], _data: dict) -> None:
     """Process band data in element + spdf mode (mode 2)."""
-    for k, v in data.items():
-        if k.startswith(("k", "label", "dist")):
-            _data[k] = v
-        else:
-            cont = np.asarray(v).reshape(nband, nkpt, order="F")
-            ao, updown = _get_ao_spin(k)
-            a, o = _split_atomindex_orbital(ao)
-            for b in range(nband):
-                if updown:
-                    key = f"band{b + 1}-{elements[a - 1]}-{o[0]}-{updown}"
-                else:
-                    key = f"band{b + 1}-{elements[a - 1]}-{o[0]}"
-                _inplace_update_data(_data, key, cont[b])
+    _data.update(_refactor_band(data, nkpt, nband, elements, 2))
 
 
 def _band_elepxpy(data: dict, nkpt: int, nband: int, elements: List[str], _data: dict) -> None:
     """Process band data in element + detailed orbital mode (mode 3)."""
-    for k, v in data.items():
-        if k.startswith(("k", "label", "dist")):
-            _data[k] = v
-        else:
-            cont = np.asarray(v).reshape(nband, nkpt, order="F")
-            ao, updown = _get_ao_spin(k)
-            a, o = _split_atomindex_orbital(ao)
-            for b in range(nband):
-                if updown:
-                    key = f"band{b + 1}-{elements[a - 1]}-{o}-{updown}"
-                else:
-                    key = f"band{b + 1}-{elements[a - 1]}-{o}"
-                _inplace_update_data(_data, key, cont[b])
+    _data.update(_refactor_band(data, nkpt, nband, elements, 3))
 
 
 def _band_atomspdf(data: dict, nkpt: int, nband: int, _data: dict) -> None:
     """Process band data in atom + spdf mode (mode 4)."""
-    for k, v in data.items():
-        if k.startswith(("k", "label", "dist")):
-            _data[k] = v
-        else:
-            cont = np.asarray(v).reshape(nband, nkpt, order="F")
-            ao, updown = _get_ao_spin(k)
-            a, o = _split_atomindex_orbital(ao)
-            for b in range(nband):
-                if updown:
-                    key = f"band{b + 1}-{a}-{o[0]}-{updown}"
-                else:
-                    key = f"band{b + 1}-{a}-{o[0]}"
-                _inplace_update_data(_data, key, cont[b])
+    _data.update(_refactor_band(data, nkpt, nband, [], 4))
 
 
 def _band_atompxpy(data: dict, nkpt: int, nband: int, _data: dict) -> None:
     """Process band data in atom + detailed orbital mode (mode 5)."""
-    for k, v in data.items():
-        if k.startswith(("k", "label", "dist")):
-            _data[k] = v
-        else:
-            cont = np.asarray(v).reshape(nband, nkpt, order="F")
-            ao, updown = _get_ao_spin(k)
-            a, o = _split_atomindex_orbital(ao)
-            for b in range(nband):
-                if updown:
-                    key = f"band{b + 1}-{a}-{o}-{updown}"
-                else:
-                    key = f"band{b + 1}-{a}-{o}"
-                _inplace_update_data(_data, key, cont[b])
+    _data.update(_refactor_band(data, nkpt, nband, [], 5))
 
 
-def _refactor_band(data: dict, nkpt: int, nband: int, elements: List[str], mode: int) -> dict:
+def _refactor_band(
+    data: Union[BandData, dict], nkpt: int, nband: int, elements: List[str], mode: int
+) -> BandData:
     """Refactor band data based on projection mode.
 
     Args:
-        data: Raw band data dict
+        data: Band data with raw projections, or a legacy ``{"1s-up": ...}`` dict
         nkpt: Number of k-points
         nband: Number of bands
         elements: List of element symbols
@@ -109,141 +179,90 @@ def _refactor_band(data: dict, nkpt: int, nband: int, elements: List[str], mode:
 
     Returns
     -------
-        Processed band data dict
+        Band data whose mapping view holds the projections summed per channel
 
     Raises
     ------
         RuntimeError: If mode is not supported
     """
-    _data: dict = {}
-    if mode == 1:
-        _band_ele(data, nkpt, nband, elements, _data)
-    elif mode == 2:
-        _band_elespdf(data, nkpt, nband, elements, _data)
-    elif mode == 3:
-        _band_elepxpy(data, nkpt, nband, elements, _data)
-    elif mode == 4:
-        _band_atomspdf(data, nkpt, nband, _data)
-    elif mode == 5:
-        _band_atompxpy(data, nkpt, nband, _data)
-    else:
+    if mode not in BAND_MODES:
         print(f"mode={mode} not supported yet")
         raise RuntimeError(f"Unsupported mode: {mode}")
 
-    return _data
+    present = None
+    if not isinstance(data, BandData):
+        parsed, atoms, orbitals, _ = parse_projection_keys(data)
+        keys = {(a, o) for a, o, _, _ in parsed}
+        present = tuple((a, o) in keys for a in atoms for o in orbitals)
+        data = stack_band_dict(data, nkpt, nband, elements)
+    if data.projections is None:
+        raise ValueError("Band data has no projections")
+
+    channels, indices, indptr = _aggregation_matrix(
+        "band",
+        mode,
+        tuple(int(a) for a in data.atoms),
+        tuple(data.elements),
+        tuple(data.orbitals),
+        present,
+    )
+    weights = _aggregate(data.projections, indices, indptr)
+    return data.with_mode(mode, channels, weights)
 
 
 # DOS processing functions
 def _dos_spdf(data: dict, energies: np.ndarray) -> dict:
     """Process DOS data in spdf mode (mode 1)."""
-    _data = {"energy": energies}
-    for k, v in data.items():
-        if k.startswith("tdos"):
-            _data[k] = v
-            continue
-        ao, updown = _get_ao_spin(k)
-        _, o = _split_atomindex_orbital(ao)
-        if updown:
-            key = f"{o[0]}-{updown}"
-        else:
-            key = f"{o[0]}"
-        _inplace_update_data(_data, key, v)
-    return _data
+    return _refactor_dos(energies, data, 1)
 
 
 def _dos_spxpy(data: dict, energies: np.ndarray) -> dict:
     """Process DOS data in detailed orbital mode (mode 2)."""
-    _data = {"energy": energies}
-    for k, v in data.items():
-        if k.startswith("tdos"):
-            _data[k] = v
-            continue
-        ao, updown = _get_ao_spin(k)
-        _, o = _split_atomindex_orbital(ao)
-        if updown:
-            key = f"{o}-{updown}"
-        else:
-            key = f"{o}"
-        _inplace_update_data(_data, key, v)
-    return _data
+    return _refactor_dos(energies, data, 2)
 
 
 def _dos_element(data: dict, elements: Union[List[str], None], energies: np.ndarray) -> dict:
     """Process DOS data in element-resolved mode (mode 3)."""
-    if not elements:
-        raise ValueError(f"elements={elements}")
-    _data = {"energy": energies}
-    for k, v in data.items():
-        if k.startswith("tdos"):
-            _data[k] = v
-            continue
-        ao, updown = _get_ao_spin(k)
-        a, _ = _split_atomindex_orbital(ao)
-        if updown:
-            key = f"{elements[a - 1]}-{updown}"
-        else:
-            key = f"{elements[a - 1]}"
-        _inplace_update_data(_data, key, v)
-    return _data
+    return _refactor_dos(energies, data, 3, elements)
 
 
 def _dos_atomspdf(data: dict, energies: np.ndarray) -> dict:
     """Process DOS data in atom + spdf mode (mode 4)."""
-    _data = {"energy": energies}
-    for k, v in data.items():
-        if k.startswith("tdos"):
-            _data[k] = v
-            continue
-        ao, updown = _get_ao_spin(k)
-        a, o = _split_atomindex_orbital(ao)
-        if updown:
-            key = f"{a}{o[0]}-{updown}"
-        else:
-            key = f"{a}{o[0]}"
-        _inplace_update_data(_data, key, v)
-    return _data
+    return _refactor_dos(energies, data, 4)
 
 
 def _dos_atomt2geg(data: dict, energies: np.ndarray) -> dict:
     """Process DOS data in atom + t2g/eg mode (mode 6)."""
-    _data = {"energy": energies}
-    for k, v in data.items():
-        if k.startswith("tdos"):
-            _data[k] = v
-            continue
-        ao, updown = _get_ao_spin(k)
-        a, o = _split_atomindex_orbital(ao)
-        if o in ["dxy", "dxz", "dyz"]:
-            if updown:
-                key = f"{a}t2g-{updown}"
-            else:
-                key = f"{a}t2g"
-            _inplace_update_data(_data, key, v)
-        elif o in ["dz2", "dx2y2"]:
-            if updown:
-                key = f"{a}eg-{updown}"
-            else:
-                key = f"{a}eg"
-            _inplace_update_data(_data, key, v)
-
-    return _data
+    return _refactor_dos(energies, data, 6)
 
 
 def _dos_atom(data: dict, energies: np.ndarray) -> dict:
     """Process DOS data in atom-projected mode (mode 7) - sum all orbitals per atom."""
-    _data = {"energy": energies}
-    for k, v in data.items():
-        if k.startswith("tdos"):
-            _data[k] = v
-            continue
-        ao, updown = _get_ao_spin(k)
-        a, _ = _split_atomindex_orbital(ao)
-        if updown:
-            key = f"{a}-{updown}"
-        else:
-            key = f"{a}"
-        _inplace_update_data(_data, key, v)
-    return _data
+    return _refactor_dos(energies, data, 7)
+
+
+def _stack_dos_dict(
+    data: dict,
+) -> Tuple[Dict[str, np.ndarray], np.ndarray, List[int], List[str], List[str], Tuple[bool, ...]]:
+    """Stack a legacy ``{"tdos": ..., "1s-up": ...}`` DOS dict.
+
+    Returns
+    -------
+        Total DOS columns, projections of shape ``(spin, atom, orbital, energy)``,
+        atom indices, orbitals, spin suffixes and the presence mask of each
+        flattened (atom, orbital) pair
+    """
+    tdos = {k: np.asarray(v) for k, v in data.items() if k.startswith("tdos")}
+    parsed, atoms, orbitals, spins = parse_projection_keys(data)
+    nenergy = len(parsed[0][3]) if parsed else 0
+    dtype = np.result_type(*(np.asarray(v).dtype for _, _, _, v in parsed)) if parsed else float
+    projections = np.zeros((len(spins), len(atoms), len(orbitals), nenergy), dtype=dtype)
+    present = np.zeros((len(atoms), len(orbitals)), dtype=bool)
+    for a, o, updown, v in parsed:
+        ia, io = atoms.index(a), orbitals.index(o)
+        projections[spins.index(updown), ia, io] = v
+        present[ia, io] = True
+    return tdos, projections, atoms, orbitals, spins, tuple(present.ravel().tolist())
 
 
 def _refactor_dos(
@@ -268,23 +287,177 @@ def _refactor_dos(
     ------
         RuntimeError: If mode is not supported
     """
-    energies = np.asarray(energies)
-    if mode == 1:  # spdf
-        _data = _dos_spdf(data, energies)
-    elif mode == 2:  # spxpy...
-        _data = _dos_spxpy(data, energies)
-    elif mode == 3:  # element
-        _data = _dos_element(data, elements, energies)
-    elif mode == 4:  # atom+spdf
-        _data = _dos_atomspdf(data, energies)
-    elif mode == 5:  # atom+spxpy...
-        _data = {**{"energy": energies}, **{key: dataset[:] for key, dataset in data.items()}}
-    elif mode == 6:  # atom+t2g/eg
-        _data = _dos_atomt2geg(data, energies)
-    elif mode == 7:  # atom-projected (sum all orbitals per atom)
-        _data = _dos_atom(data, energies)
-    else:
+    if mode not in DOS_MODES:
+        print(f"mode={mode} not supported yet")
+        raise RuntimeError(f"Unsupported mode: {mode}")
+
+    tdos, projections, atoms, orbitals, spins, present = _stack_dos_dict(data)
+    return _refactor_dos_arrays(
+        energies, tdos, projections, spins, orbitals, mode, elements, atoms, present
+    )
+
+
+def _refactor_dos_arrays(  # noqa: PLR0913, PLR0917
+    energies: Union[list, np.ndarray],
+    tdos: Dict[str, np.ndarray],
+    projections: np.ndarray,
+    spins: Sequence[str],
+    orbitals: Sequence[str],
+    mode: int,
+    elements: Union[List[str], None] = None,
+    atoms: Optional[Sequence[int]] = None,
+    present: Optional[Tuple[bool, ...]] = None,
+) -> dict:
+    """Refactor stacked DOS projections based on projection mode.
+
+    Args:
+        energies: Energy points
+        tdos: Total DOS columns, copied to the output as they are
+        projections: Raw projections, shape ``(spin, atom, orbital, energy)``
+        spins: Column suffix per spin channel
+        orbitals: Orbital name for each entry of the orbital axis
+        mode: Projection mode (1-7)
+        elements: List of element symbols indexed by atom (required for mode 3)
+        atoms: 1-based atom index for each entry of the atom axis
+        present: Presence mask of each flattened (atom, orbital) pair
+
+    Returns
+    -------
+        Processed DOS data dict
+
+    Raises
+    ------
+        RuntimeError: If mode is not supported
+    """
+    _check_dos_mode(mode, elements)
+    if atoms is None:
+        atoms = range(1, projections.shape[1] + 1)
+    atoms = tuple(int(a) for a in atoms)
+    channels, indices, indptr = _aggregation_matrix(
+        "dos", mode, atoms, _atom_elements(atoms, elements), tuple(orbitals), present
+    )
+    summed = _aggregate(projections, indices, indptr)
+    return _dos_columns(energies, tdos, spins, channels, summed)
+
+
+def _check_dos_mode(mode: int, elements: Union[List[str], None]) -> None:
+    """Reject unsupported DOS modes, and mode 3 without elements.
+
+    Raises
+    ------
+        RuntimeError: If mode is not supported
+        ValueError: If mode is 3 and no elements are given
+    """
+    if mode not in DOS_MODES:
         print(f"mode={mode} not supported yet")
         raise RuntimeError(f"Unsupported mode: {mode}")
+    if mode == 3 and not elements:
+        raise ValueError(f"elements={elements}")
 
+
+def _dos_columns(
+    energies: Union[list, np.ndarray],
+    tdos: Dict[str, np.ndarray],
+    spins: Sequence[str],
+    channels: Sequence[str],
+    summed: np.ndarray,
+) -> dict:
+    """Return the DOS dict of summed channels of shape ``(spin, channel, energy)``."""
+    _data = {"energy": np.asarray(energies)}
+    _data.update(tdos)
+    suffixes = [f"-{s}" if s else "" for s in spins]
+    for ic, channel in enumerate(channels):
+        for si, suffix in enumerate(suffixes):
+            _data[f"{channel}{suffix}"] = summed[si, ic]
     return _data
+
+
+class _DosBlockAggregator:
+    """Reduce DOS projections into the channels of several modes, one atom block at a time.
+
+    Only the channel sums are kept, so memory is bounded by the output size plus
+    the block being added. Blocks must be added in order along the atom axis;
+    members of each channel are then added in the same order as by
+    :func:`_aggregate`, so the result is bit-for-bit equal to the in-memory path.
+
+    Args:
+        modes: Projection modes (1-7)
+        spins: Column suffix per spin channel
+        orbitals: Orbital name for each entry of the orbital axis
+        elements: List of element symbols indexed by atom (required for mode 3)
+        atoms: 1-based atom index for each entry of the atom axis
+        nenergy: Number of energy points of each projection
+        present: Presence mask of each flattened (atom, orbital) pair
+
+    Raises
+    ------
+        RuntimeError: If a mode is not supported
+    """
+
+    def __init__(  # noqa: PLR0913, PLR0917
+        self,
+        modes: Iterable[int],
+        spins: Sequence[str],
+        orbitals: Sequence[str],
+        elements: Union[List[str], None],
+        atoms: Sequence[int],
+        nenergy: int,
+        present: Optional[Tuple[bool, ...]] = None,
+    ):
+        self.spins = tuple(spins)
+        self.norb = len(orbitals)
+        atoms = tuple(int(a) for a in atoms)
+        # per mode: channels, channel sums, and the channel row and member position
+        # of every nonzero, all ordered by the flattened (atom, orbital) column
+        self.plans: Dict[int, tuple] = {}
+        for mode in modes:
+            _check_dos_mode(mode, elements)
+            mode_elements = _atom_elements(atoms, elements if mode == 3 else [])
+            channels, indices, indptr = _aggregation_matrix(
+                "dos", mode, atoms, mode_elements, tuple(orbitals), present
+            )
+            rows = np.repeat(np.arange(len(channels)), np.diff(indptr))
+            positions = np.arange(len(indices)) - indptr[rows]
+            order = np.argsort(indices, kind="stable")
+            summed = np.zeros((len(self.spins), len(channels), nenergy))
+            self.plans[mode] = (
+                channels,
+                summed,
+                indices[order],
+                rows[order],
+                positions[order],
+            )
+
+    def add(self, start: int, block: np.ndarray) -> None:
+        """Add the projections of the atoms ``start`` to ``start + len(block[0])``.
+
+        Args:
+            start: Position of the first atom of the block on the atom axis
+            block: Projections, shape ``(spin, atom, orbital, energy)``
+        """
+        nspin, natom, norb = block.shape[:3]
+        flat = block.reshape(nspin, natom * norb, *block.shape[3:])
+        lo, hi = start * self.norb, (start + natom) * self.norb
+        for _, summed, columns, rows, positions in self.plans.values():
+            first, last = np.searchsorted(columns, (lo, hi))
+            if first == last:
+                continue
+            cols = columns[first:last] - lo
+            rows_in, pos_in = rows[first:last], positions[first:last]
+            # one vectorized pass per member position, each channel once per pass
+            by_position = np.argsort(pos_in, kind="stable")
+            steps, starts = np.unique(pos_in[by_position], return_index=True)
+            for step, sel in zip(steps, np.split(by_position, starts[1:])):
+                if step == 0:
+                    summed[:, rows_in[sel]] = flat[:, cols[sel]]
+                else:
+                    summed[:, rows_in[sel]] += flat[:, cols[sel]]
+
+    def result(
+        self, energies: Union[list, np.ndarray], tdos: Dict[str, np.ndarray]
+    ) -> Dict[int, dict]:
+        """Return the processed DOS data dict of every mode."""
+        return {
+            mode: _dos_columns(energies, tdos, self.spins, plan[0], plan[1])
+            for mode, plan in self.plans.items()
+        }
@@ -0,0 +1,311 @@
+"""Bounded-memory reader for large DS-PAW JSON outputs, internal use only.
+
+``json.load`` turns every number of a projected band or DOS file into a Python
+float, so loading needs about ten times the file size in memory. :func:`load_json`
+instead scans the file once in fixed-size chunks and returns the usual nested
+dicts and lists, except that large numeric arrays are left on disk as
+:class:`ArraySpan` offsets. A span is parsed only when the reader asks for it,
+straight into a preallocated numpy buffer.
+"""
+
+import json
+import re
+import warnings
+from typing import Any, Collection, Dict, List, Optional, Union
+
+import numpy as np
+
+from ddpc.profiling import count_bytes
+
+CHUNK_SIZE = 1 << 20
+SPAN_THRESHOLD = 1 << 12
+TAIL_SIZE = 1 << 16
+
+_WHITESPACE = re.compile(rb"[ \t\r\n]*")
+_SCALAR = re.compile(rb"-?(?:0|[1-9][0-9]*)(?:\.[0-9]+)?(?:[eE][+-]?[0-9]+)?|true|false|null")
+_NUMBER_START = frozenset(b"-0123456789")
+
+
+class ArraySpan:
+    """Numeric JSON array left on disk, parsed on demand.
+
+    Behaves like an array for ``np.asarray`` and slicing, both of which parse the
+    whole span. Use :meth:`read` with ``out`` to parse into an existing buffer.
+    """
+
+    def __init__(self, path: str, start: int, end: int):
+        """Initialize span.
+
+        Args:
+            path: JSON file path
+            start: Byte offset just after the opening ``[``
+            end: Byte offset of the closing ``]``
+        """
+        self.path = path
+        self.start = start
+        self.end = end
+
+    def read(self, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Parse the array as float64, into the 1-D buffer ``out`` when given.
+
+        Raises
+        ------
+            ValueError: If the span is not a flat numeric array, or its length
+                does not match ``out``
+        """
+        pieces: List[np.ndarray] = []
+        filled = 0
+        with open(self.path, "rb") as f:
+            f.seek(self.start)
+            remaining = self.end - self.start
+            carry = b""
+            while remaining > 0:
+                data = f.read(min(CHUNK_SIZE, remaining))
+                if not data:
+                    raise ValueError(f"{self.path} ended inside a JSON array")
+                count_bytes(len(data))
+                remaining -= len(data)
+                text = carry + data
+                if remaining > 0:
+                    # only parse complete numbers, keep the tail for the next chunk
+                    cut = text.rfind(b",")
+                    if cut < 0:
+                        carry = text
+                        continue
+                    text, carry = text[:cut], text[cut + 1 :]
+                try:
+                    values = _parse_numbers(text)
+                except ValueError as err:
+                    raise ValueError(f"{self.path}: JSON array at byte {self.start} {err}") from err
+                if out is None:
+                    pieces.append(values)
+                else:
+                    if filled + len(values) > len(out):
+                        raise ValueError(f"array at byte {self.start} longer than {len(out)}")
+                    out[filled : filled + len(values)] = values
+                filled += len(values)
+
+        if out is None:
+            return np.concatenate(pieces) if pieces else np.empty(0)
+        if filled != len(out):
+            raise ValueError(f"array at byte {self.start} has {filled} values, expected {len(out)}")
+        return out
+
+    def __array__(self, dtype=None, copy=None) -> np.ndarray:
+        """Parse the span for ``np.asarray``."""
+        arr = self.read()
+        return arr if dtype is None else arr.astype(dtype, copy=False)
+
+    def __getitem__(self, key) -> np.ndarray:
+        """Parse the span and index it."""
+        return self.read()[key]
+
+    def __repr__(self) -> str:
+        """Return file offsets."""
+        return f"ArraySpan({self.path!r}, {self.start}, {self.end})"
+
+
+def _parse_numbers(text: bytes) -> np.ndarray:
+    """Parse comma separated numbers, raising ValueError on anything else."""
+    if not text.strip():
+        return np.empty(0)
+    with warnings.catch_warnings():
+        # older numpy only warns about unparsable trailing data
+        warnings.simplefilter("error", DeprecationWarning)
+        try:
+            return np.fromstring(text.decode("ascii"), sep=",")
+        except (DeprecationWarning, UnicodeDecodeError, ValueError) as err:
+            raise ValueError("is not a flat list of numbers") from err
+
+
+def read_array(value: Union[ArraySpan, list, np.ndarray], out: np.ndarray) -> np.ndarray:
+    """Copy a JSON array, on disk or already loaded, into the 1-D buffer ``out``."""
+    if isinstance(value, ArraySpan):
+        return value.read(out)
+    out[:] = value
+    return out
+
+
+class _Scanner:
+    """Recursive-descent JSON scanner over a chunked binary file."""
+
+    def __init__(self, fp, path: str, threshold: int, stop_at: Collection[str] = ()):
+        self.fp = fp
+        self.path = path
+        self.threshold = threshold
+        self.stop_at = stop_at
+        self.stopped = False
+        self.buf = b""
+        self.pos = 0
+        self.base = 0  # file offset of buf[0]
+
+    def _fill(self) -> bool:
+        """Drop consumed bytes and append the next chunk."""
+        data = self.fp.read(CHUNK_SIZE)
+        if not data:
+            return False
+        count_bytes(len(data))
+        self.buf = self.buf[self.pos :] + data
+        self.base += self.pos
+        self.pos = 0
+        return True
+
+    def _peek(self) -> int:
+        """Skip whitespace and return the next byte without consuming it."""
+        while True:
+            self.pos = _WHITESPACE.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill():
+                raise ValueError(f"{self.path}: unexpected end of JSON")
+
+    def _expect(self, char: bytes) -> None:
+        if self._peek() != char[0]:
+            raise ValueError(f"{self.path}: expected {char!r} at byte {self.base + self.pos}")
+        self.pos += 1
+
+    def value(self) -> Any:
+        """Parse the next value."""
+        char = self._peek()
+        if char == ord("{"):
+            return self._object()
+        if char == ord("["):
+            return self._array()
+        if char == ord('"'):
+            return self._string()
+        return self._scalar()
+
+    def _object(self) -> Dict[str, Any]:
+        self.pos += 1
+        obj: Dict[str, Any] = {}
+        if self._peek() == ord("}"):
+            self.pos += 1
+            return obj
+        while True:
+            key = self._string()
+            if key in self.stop_at:
+                self.stopped = True
+                return obj
+            self._expect(b":")
+            obj[key] = self.value()
+            if self.stopped:
+                return obj
+            if self._peek() == ord(","):
+                self.pos += 1
+                continue
+            self._expect(b"}")
+            return obj
+
+    def _array(self) -> Union[list, ArraySpan]:
+        self.pos += 1
+        char = self._peek()
+        if char == ord("]"):
+            self.pos += 1
+            return []
+        if char in _NUMBER_START:
+            return self._numeric_array()
+        items = []
+        while True:
+            items.append(self.value())
+            if self.stopped:
+                return items
+            if self._peek() == ord(","):
+                self.pos += 1
+                continue
+            self._expect(b"]")
+            return items
+
+    def _numeric_array(self) -> Union[list, ArraySpan]:
+        """Find the end of a flat numeric array, keeping its text only if small."""
+        start = self.base + self.pos
+        pieces: Optional[List[bytes]] = []
+        size = 0
+        while True:
+            end = self.buf.find(b"]", self.pos)
+            stop = len(self.buf) if end < 0 else end
+            if pieces is not None:
+                pieces.append(self.buf[self.pos : stop])
+                size += stop - self.pos
+                if size > self.threshold:
+                    pieces = None
+            if end >= 0:
+                self.pos = end + 1
+                break
+            self.pos = stop
+            if not self._fill():
+                raise ValueError(f"{self.path}: unexpected end of JSON")
+
+        if pieces is None:
+            return ArraySpan(self.path, start, self.base + self.pos - 1)
+        return json.loads(b"[" + b"".join(pieces) + b"]")
+
+    def _string(self) -> str:
+        if self._peek() != ord('"'):
+            raise ValueError(f"{self.path}: expected string at byte {self.base + self.pos}")
+        search = self.pos + 1
+        while True:
+            end = self.buf.find(b'"', search)
+            if end < 0:
+                offset = len(self.buf) - self.pos
+                if not self._fill():
+                    raise ValueError(f"{self.path}: unexpected end of JSON")
+                search = offset
+                continue
+            first = end
+            while first > self.pos and self.buf[first - 1] == ord("\\"):
+                first -= 1
+            if (end - first) % 2 == 0:
+                break
+            search = end + 1
+        text = self.buf[self.pos : end + 1]
+        self.pos = end + 1
+        return json.loads(text)
+
+    def _scalar(self) -> Any:
+        while len(self.buf) - self.pos < 64 and self._fill():
+            pass
+        match = _SCALAR.match(self.buf, self.pos)
+        if match is None:
+            raise ValueError(f"{self.path}: invalid JSON at byte {self.base + self.pos}")
+        self.pos = match.end()
+        return json.loads(match.group())
+
+
+def load_json(path: str, threshold: int = SPAN_THRESHOLD, stop_at: Collection[str] = ()) -> Any:
+    """Load a JSON file, leaving numeric arrays longer than ``threshold`` bytes on disk.
+
+    Args:
+        path: JSON file path
+        threshold: Size in bytes above which a flat numeric array is returned as
+            an :class:`ArraySpan` instead of a list
+        stop_at: Object keys at which scanning stops. The first such key ends
+            the document: it and everything after it are left out, so only the
+            head of the file is read.
+
+    Returns
+    -------
+        The decoded document
+    """
+    with open(path, "rb") as fp:
+        return _Scanner(fp, str(path), threshold, stop_at).value()
+
+
+def find_tail_string(path: str, key: str, size: int = TAIL_SIZE) -> Optional[str]:
+    """Return the string value of the last ``"key": "..."`` in the last ``size`` bytes.
+
+    DS-PAW writes keys in alphabetical order, so small values such as
+    ``SpinType`` come after the large ``Spin1``/``Spin2`` blocks. Looking them
+    up in the tail avoids scanning the data.
+
+    Returns
+    -------
+        The decoded value, None if the key is not in the tail
+    """
+    with open(path, "rb") as fp:
+        fp.seek(0, 2)
+        fp.seek(max(0, fp.tell() - size))
+        tail = fp.read()
+    count_bytes(len(tail))
+    pattern = rb'"' + re.escape(key.encode()) + rb'"\s*:\s*("(?:[^"\\]|\\.)*")'
+    matches = re.findall(pattern, tail)
+    return json.loads(matches[-1]) if matches else None
@@ -2,7 +2,7 @@
 
 import os
 import sys
-from typing import Tuple, Union, cast
+from typing import Any, Callable, Dict, Sequence, Tuple, Union, cast
 
 import numpy as np
 
@@ -35,6 +35,43 @@ def get_h5_str(f: str, key: str) -> list:
     return tempdata_str.split(";")
 
 
+def read_modes(
+    mode: Union[int, Sequence[int]],
+    iproj: bool,
+    read_total: Callable[[], Any],
+    read_projected: Callable[[Tuple[int, ...]], Dict[int, Any]],
+) -> Any:
+    """Read one or several projection modes, reading each kind of data at most once.
+
+    Args:
+        mode: Projection mode, or a sequence of modes
+        iproj: Whether the file contains projections
+        read_total: Reads the total (non-projected) data, used for mode 0 and
+            for files without projections
+        read_projected: Reads the projections once and returns a dict with the
+            result of every requested mode
+
+    Returns
+    -------
+        The result of ``mode`` if it is a single mode, otherwise a dict mapping
+        each mode to its result in the requested order
+    """
+    if np.ndim(mode) == 0:
+        modes: Tuple[int, ...] = (int(mode),)  # type: ignore[arg-type]
+    else:
+        modes = tuple(dict.fromkeys(int(m) for m in mode))  # type: ignore[union-attr]
+
+    projected = tuple(m for m in modes if m != 0) if iproj else ()
+    results = read_projected(projected) if projected else {}
+    if len(results) < len(modes):
+        total = read_total()
+        results.update({m: total for m in modes if m not in results})
+
+    if np.ndim(mode) == 0:
+        return results[modes[0]]
+    return {m: results[m] for m in modes}
+
+
 def _split_atomindex_orbital(s: str) -> Tuple[int, str]:
     """Split a string into atom index and orbital designation."""
     first_letter_index = -1
@@ -59,11 +96,3 @@ def _get_ao_spin(k: str) -> Tuple[str, str]:
         return ls[0], ls[1]
     print(f"get_ao_spin error: {k=}")
     sys.exit(1)
-
-
-def _inplace_update_data(_data: dict, key: str, v: Union[np.ndarray, list]) -> None:
-    """Update data dictionary by adding values to existing keys or creating new ones."""
-    if key in _data:
-        _data[key] += np.asarray(v)
-    else:
-        _data[key] = np.asarray(v)
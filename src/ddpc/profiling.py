@@ -0,0 +1,308 @@
+"""Stage-level timing and memory instrumentation.
+
+Library code marks its stages with :func:`stage` and reports file reads with
+:func:`count_bytes`::
+
+    with stage("read-projections"):
+        ...
+        count_bytes(arr.nbytes)
+
+Nothing is recorded unless a :func:`profile` is active or a hook is registered.
+Otherwise :func:`stage` returns a shared no-op context manager and
+:func:`count_bytes` returns at once, so instrumented code runs at full speed.
+
+Inside ``with profile() as report``, every finished stage is recorded with its
+wall time, the bytes read and the peak memory allocated while it ran (traced
+with :mod:`tracemalloc`, which includes numpy arrays). Stages nest: times,
+bytes and peaks of a stage include those of the stages inside it. Hooks added
+with :func:`add_hook` are called with every finished stage. Profiling is
+process-wide, stages of other threads are attributed to the stages open in the
+profiling thread.
+"""
+
+from __future__ import annotations
+
+import json
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+# tracemalloc can only measure the peak of each stage if its peak can be reset (Python 3.9+)
+MEMORY_SUPPORTED = hasattr(tracemalloc, "reset_peak")
+
+
+class StageRecord(NamedTuple):
+    """One finished stage.
+
+    Attributes
+    ----------
+    name : str
+        Stage name, e.g. ``"read-projections"``
+    path : Tuple[str, ...]
+        Names of the enclosing stages and of this one
+    seconds : float
+        Wall time
+    bytes_read : int
+        Bytes read from files
+    peak_memory : int or None
+        Peak memory allocated above the memory in use when the stage started,
+        None if memory is not traced
+    """
+
+    name: str
+    path: Tuple[str, ...]
+    seconds: float
+    bytes_read: int
+    peak_memory: Optional[int]
+
+
+class StageSummary(NamedTuple):
+    """All records of one stage path in a profile.
+
+    Attributes
+    ----------
+    path : Tuple[str, ...]
+        Names of the enclosing stages and of the stage
+    calls : int
+        Number of records
+    seconds : float
+        Total wall time
+    bytes_read : int
+        Total bytes read
+    peak_memory : int or None
+        Largest peak of the records, None if memory is not traced
+    """
+
+    path: Tuple[str, ...]
+    calls: int
+    seconds: float
+    bytes_read: int
+    peak_memory: Optional[int]
+
+
+class Profile:
+    """Records of the stages finished while a :func:`profile` is active.
+
+    Attributes
+    ----------
+    records : List[StageRecord]
+        Finished stages, in the order they finished
+    seconds : float
+        Wall time of the whole profile, set when it ends
+    """
+
+    def __init__(self):
+        """Create an empty profile."""
+        self.records: List[StageRecord] = []
+        self.seconds = 0.0
+
+    def summary(self) -> List[StageSummary]:
+        """Return the records merged by stage path, in the order the stages started."""
+        merged: Dict[Tuple[str, ...], StageSummary] = {}
+        # a stage finishes after the stages inside it, so order by first start instead
+        order: Dict[Tuple[str, ...], int] = {}
+        for i, record in enumerate(self.records):
+            for depth in range(1, len(record.path) + 1):
+                order.setdefault(record.path[:depth], i)
+            old = merged.get(record.path)
+            if old is None:
+                merged[record.path] = StageSummary(
+                    record.path, 1, record.seconds, record.bytes_read, record.peak_memory
+                )
+                continue
+            peak = old.peak_memory
+            if record.peak_memory is not None:
+                peak = max(peak or 0, record.peak_memory)
+            merged[record.path] = StageSummary(
+                record.path,
+                old.calls + 1,
+                old.seconds + record.seconds,
+                old.bytes_read + record.bytes_read,
+                peak,
+            )
+        return sorted(
+            merged.values(),
+            key=lambda s: [order[s.path[:depth]] for depth in range(1, len(s.path) + 1)],
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the summary as JSON-serializable dict."""
+        return {
+            "seconds": self.seconds,
+            "stages": [
+                {
+                    "stage": "/".join(s.path),
+                    "calls": s.calls,
+                    "seconds": s.seconds,
+                    "bytes_read": s.bytes_read,
+                    "peak_memory": s.peak_memory,
+                }
+                for s in self.summary()
+            ],
+        }
+
+    def to_json(self) -> str:
+        """Return :meth:`to_dict` as JSON text."""
+        return json.dumps(self.to_dict(), indent=2)
+
+    def format(self) -> str:
+        """Return the summary as a text table, nested stages indented.
+
+        Time outside any stage (imports, console output) is listed as ``other``.
+        """
+        rows = [("stage", "time", "share", "read", "peak memory", "calls")]
+        summary = self.summary()
+        other = self.seconds - sum(s.seconds for s in summary if len(s.path) == 1)
+        for s in [*summary, StageSummary(("other",), 0, max(other, 0.0), 0, None)]:
+            share = s.seconds / self.seconds if self.seconds else 0.0
+            rows.append(
+                (
+                    "  " * (len(s.path) - 1) + s.path[-1],
+                    format_time(s.seconds),
+                    f"{share:.1%}",
+                    format_bytes(s.bytes_read) if s.calls else "",
+                    format_bytes(s.peak_memory) if s.calls else "",
+                    str(s.calls) if s.calls else "",
+                )
+            )
+        rows.append(("total", format_time(self.seconds), "100.0%", "", "", ""))
+        widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+        lines = [
+            "  ".join(
+                cell.ljust(width) if i == 0 else cell.rjust(width)
+                for i, (cell, width) in enumerate(zip(row, widths))
+            ).rstrip()
+            for row in rows
+        ]
+        return "\n".join(lines)
+
+
+class _Stage:
+    """Context manager measuring one stage."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.bytes_read = 0
+        self.peak = 0
+        self.base = 0
+
+    def __enter__(self) -> None:
+        if _tracers:
+            _fold_peak()
+            self.base = tracemalloc.get_traced_memory()[0]
+        _open.append(self)
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc) -> None:
+        seconds = time.perf_counter() - self.start
+        peak = None
+        if _tracers:
+            _fold_peak()
+            peak = self.peak
+        path = tuple(s.name for s in _open)
+        _open.pop()
+        if _open:
+            _open[-1].bytes_read += self.bytes_read
+        record = StageRecord(self.name, path, seconds, self.bytes_read, peak)
+        for report in _profiles:
+            report.records.append(record)
+        for hook in list(_hooks):
+            hook(record)
+
+
+_NULL_STAGE = nullcontext()
+_open: List[_Stage] = []
+_profiles: List[Profile] = []
+_hooks: List[Callable[[StageRecord], None]] = []
+# profiles that started tracemalloc, memory is measured while there is one
+_tracers: List[Profile] = []
+
+
+def _fold_peak() -> None:
+    """Add the traced peak since the last call to every open stage and reset it."""
+    peak = tracemalloc.get_traced_memory()[1]
+    for s in _open:
+        s.peak = max(s.peak, peak - s.base)
+    tracemalloc.reset_peak()
+
+
+def stage(name: str):
+    """Return a context manager recording the stage ``name``.
+
+    Costs one check when nothing is recorded.
+    """
+    if not _profiles and not _hooks:
+        return _NULL_STAGE
+    return _Stage(name)
+
+
+def count_bytes(n: int) -> None:
+    """Add ``n`` bytes read to the innermost open stage."""
+    if _open:
+        _open[-1].bytes_read += n
+
+
+@contextmanager
+def profile(memory: bool = True) -> Iterator[Profile]:
+    """Record the stages that finish inside the ``with`` block.
+
+    Args:
+        memory: Trace allocated memory with :mod:`tracemalloc`. Tracing slows
+            down code creating many Python objects; it is skipped on Python
+            versions before 3.9 and when tracemalloc is already tracing.
+
+    Yields
+    ------
+        The :class:`Profile`, complete when the block ends
+    """
+    report = Profile()
+    start_tracing = memory and MEMORY_SUPPORTED and not tracemalloc.is_tracing()
+    if start_tracing:
+        tracemalloc.start()
+        _tracers.append(report)
+    _profiles.append(report)
+    start = time.perf_counter()
+    try:
+        yield report
+    finally:
+        report.seconds = time.perf_counter() - start
+        _profiles.remove(report)
+        if start_tracing:
+            _tracers.remove(report)
+            tracemalloc.stop()
+
+
+def add_hook(hook: Callable[[StageRecord], None]) -> None:
+    """Call ``hook`` with the :class:`StageRecord` of every finished stage."""
+    _hooks.append(hook)
+
+
+def remove_hook(hook: Callable[[StageRecord], None]) -> None:
+    """Stop calling ``hook``.
+
+    Raises
+    ------
+        ValueError: If ``hook`` was not added
+    """
+    _hooks.remove(hook)
+
+
+def format_time(seconds: float) -> str:
+    """Format seconds with a unit, e.g. ``"12.3 ms"``."""
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.3g} {unit}"
+    return f"{seconds / 1e-9:.3g} ns"
+
+
+def format_bytes(size: Optional[int]) -> str:
+    """Format a byte count with a binary unit, e.g. ``"1.5 MiB"``, ``"-"`` for None."""
+    if size is None:
+        return "-"
+    value = float(size)
+    for unit in ("B", "KiB", "MiB"):
+        if value < 1024:
+            return f"{value:.3g} {unit}"
+        value /= 1024
+    return f"{value:.3g} GiB"
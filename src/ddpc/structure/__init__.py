@@ -1,16 +1,54 @@
-"""Crystal structure I/O and manipulation tools."""
+"""Crystal structure I/O and manipulation tools.
 
-from ddpc.structure.io import read_structure, write_structure
-from ddpc.structure.orthogonal import find_orthogonal
-from ddpc.structure.primitive import find_primitive
-from ddpc.structure.symmetry import get_symmetry
-from ddpc.structure.transform import scale_positions
+Functions are imported from their modules on first use, so importing the
+package (e.g. to run the CLI) does not load numpy, ase or spglib.
+"""
+
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from ddpc.structure.dedup import fingerprint
+    from ddpc.structure.io import detect_format, iread_structures, read_structure, write_structure
+    from ddpc.structure.orthogonal import find_orthogonal
+    from ddpc.structure.primitive import find_primitive
+    from ddpc.structure.symmetry import get_symmetry, scan_symmetry
+    from ddpc.structure.transform import scale_positions
+
+_EXPORTS = {
+    "detect_format": "io",
+    "find_orthogonal": "orthogonal",
+    "find_primitive": "primitive",
+    "fingerprint": "dedup",
+    "get_symmetry": "symmetry",
+    "iread_structures": "io",
+    "read_structure": "io",
+    "scale_positions": "transform",
+    "scan_symmetry": "symmetry",
+    "write_structure": "io",
+}
 
 __all__ = [
+    "detect_format",
     "find_orthogonal",
     "find_primitive",
+    "fingerprint",
     "get_symmetry",
+    "iread_structures",
     "read_structure",
     "scale_positions",
+    "scan_symmetry",
     "write_structure",
 ]
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module 'ddpc.structure' has no attribute '{name}'")
+    value = getattr(import_module(f"ddpc.structure.{_EXPORTS[name]}"), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted({*globals(), *_EXPORTS})
@@ -1,16 +1,102 @@
 """Shared CLI base classes for all DDPC packages."""
 
+import re
 import sys
 
 import click
-from rich.console import Console
 
-# Force UTF-8 encoding on Windows to handle Unicode characters
-console = Console(force_terminal=True, legacy_windows=False)
+# rich style tags used in messages, e.g. "[bold red]", "[/cyan]" or "[/]"
+_STYLE_TAG = re.compile(
+    r"(?<!\\)\[/?(?:(?:bold|dim|italic|underline|red|green|yellow|blue|magenta|cyan|white)\s*)*\]"
+)
+
+
+def _plain(text):
+    """Remove rich style tags and escapes from ``text``."""
+    return _STYLE_TAG.sub("", text).replace("\\[", "[")
+
+
+class LazyConsole:
+    """Stand-in for ``rich.console.Console`` that imports rich only when needed.
+
+    When stdout is not a terminal, plain strings are written with their style
+    tags removed, without importing rich; tables and other renderables, and all
+    output to a terminal, go through rich.
+    """
+
+    def __init__(self):
+        self._consoles = {}
+
+    def print(self, *objects, **kwargs):
+        """Print like ``Console.print``."""
+        tty = sys.stdout.isatty()
+        if not tty and not kwargs and all(isinstance(o, str) for o in objects):
+            click.echo(" ".join(_plain(o) for o in objects))
+            return
+        self.rich(tty).print(*objects, **kwargs)
+
+    def rich(self, tty=True):
+        """Return the rich console for terminal (``tty``) or redirected output."""
+        if tty not in self._consoles:
+            from rich.console import Console
+
+            # Force UTF-8 encoding on Windows to handle Unicode characters
+            self._consoles[tty] = Console(force_terminal=tty or None, legacy_windows=False)
+        return self._consoles[tty]
+
+
+console = LazyConsole()
 
 
 class FriendlyCommand(click.Command):
-    """Custom Click Command that shows help instead of error on incorrect parameters."""
+    """Custom Click Command that shows help instead of error on incorrect parameters.
+
+    Every command also gets ``--profile``, printing time, bytes read and peak
+    memory per stage (see :mod:`ddpc.profiling`) to stderr, and
+    ``--profile-json PATH`` writing the same report as JSON.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.params.extend(
+            [
+                click.Option(
+                    ["--profile", "profile_report"],
+                    is_flag=True,
+                    help="Print time, bytes read and peak memory per stage to stderr",
+                ),
+                click.Option(
+                    ["--profile-json", "profile_json"],
+                    type=click.Path(dir_okay=False, allow_dash=True),
+                    metavar="PATH",
+                    help="Write the stage profile as JSON to PATH ('-' for stderr)",
+                ),
+            ]
+        )
+
+    def invoke(self, ctx):
+        """Run the command, profiled when ``--profile`` or ``--profile-json`` is given."""
+        show = ctx.params.pop("profile_report", False)
+        json_path = ctx.params.pop("profile_json", None)
+        if not show and json_path is None:
+            return super().invoke(ctx)
+
+        from ddpc.profiling import profile
+
+        report = None
+        try:
+            with profile() as report:
+                return super().invoke(ctx)
+        finally:
+            if report is not None:
+                if show:
+                    click.echo(report.format(), err=True)
+                # stdout holds the command's own output
+                if json_path == "-":
+                    click.echo(report.to_json(), err=True)
+                elif json_path is not None:
+                    with open(json_path, "w", encoding="utf-8") as fout:
+                        fout.write(report.to_json())
 
     def main(self, *args, **kwargs):
         """Override main to catch usage errors and show help instead."""
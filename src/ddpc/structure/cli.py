@@ -1,15 +1,11 @@
 """CLI commands for ddpc-structure."""
 
+import time
 from pathlib import Path
 
 import click
-from rich.console import Console
-from rich.table import Table
 
-from ddpc.structure._cli_base import FriendlyCommand, FriendlyGroup
-
-# Force UTF-8 encoding on Windows to handle Unicode characters
-console = Console(force_terminal=True, legacy_windows=False)
+from ddpc.structure._cli_base import FriendlyCommand, FriendlyGroup, console
 
 
 @click.group(cls=FriendlyGroup, invoke_without_command=True)
@@ -57,9 +53,28 @@ def convert(input_file, output_file, format, vasp5, direct):
     "--symbol-type", default=0, help="Symbol type: 0=international, 1=Schoenflies (default: 0)"
 )
 @click.option("--show-symmetry", is_flag=True, help="Display symmetry information")
-def info(input_file, symprec, angle_tolerance, hall_number, symbol_type, show_symmetry):  # noqa: PLR0913
+@click.option("--cache", is_flag=True, help="Reuse/store the result in the on-disk cache")
+@click.option(
+    "--symprec-scan",
+    is_flag=True,
+    help="Also show the space group for symprec from 1e-5 to 1e-1",
+)
+@click.option("-j", "--workers", default=1, help="Processes for --symprec-scan (default: 1)")
+def info(  # noqa: PLR0913, PLR0917
+    input_file,
+    symprec,
+    angle_tolerance,
+    hall_number,
+    symbol_type,
+    show_symmetry,
+    cache,
+    symprec_scan,
+    workers,
+):
     """Display structure information."""
-    from ddpc.structure import get_symmetry, read_structure
+    from rich.table import Table
+
+    from ddpc.structure import get_symmetry, read_structure, scan_symmetry
 
     atoms = read_structure(input_file)
 
@@ -90,6 +105,7 @@ def info(input_file, symprec, angle_tolerance, hall_number, symbol_type, show_sy
                 angle_tolerance=angle_tolerance,
                 hall_number=hall_number,
                 symbol_type=symbol_type,
+                cache=cache,
             )
             table.add_row("Space group", f"{sym['spacegroup']} (#{sym['spacegroup_number']})")
             table.add_row("Crystal system", sym["crystal_system"])
@@ -98,6 +114,25 @@ def info(input_file, symprec, angle_tolerance, hall_number, symbol_type, show_sy
 
     console.print(table)
 
+    if symprec_scan:
+        scan = scan_symmetry(atoms, angle_tolerance=angle_tolerance, workers=workers, cache=cache)
+        scan_table = Table(title="Symmetry vs. Tolerance")
+        scan_table.add_column("symprec (Å)", style="cyan")
+        scan_table.add_column("Space group", style="green")
+        scan_table.add_column("Hall", style="green")
+        scan_table.add_column("Primitive atoms", style="green")
+        for row in scan:
+            if row.spacegroup is None:
+                scan_table.add_row(f"{row.symprec:g}", "failed", "-", "-")
+            else:
+                scan_table.add_row(
+                    f"{row.symprec:g}",
+                    row.spacegroup,
+                    str(row.hall_number),
+                    str(row.primitive_atoms),
+                )
+        console.print(scan_table)
+
 
 @cli.command(cls=FriendlyCommand)
 @click.argument("input_file", type=click.Path(exists=True))
@@ -107,15 +142,18 @@ def info(input_file, symprec, angle_tolerance, hall_number, symbol_type, show_sy
     "--angle-tolerance", default=-1.0, help="Angle tolerance in degrees (default: -1.0, auto)"
 )
 @click.option("--format", help="Output format")
-def primitive(input_file, output, symprec, angle_tolerance, format):
+@click.option("--cache", is_flag=True, help="Reuse/store the result in the on-disk cache")
+def primitive(input_file, output, symprec, angle_tolerance, format, cache):  # noqa: PLR0913, PLR0917
     """Find primitive cell."""
+    from rich.table import Table
+
     from ddpc.structure import find_primitive, read_structure, write_structure
 
     console.print(f"[cyan]Finding primitive cell:[/cyan] {input_file}")
     console.print(f"[cyan]Symmetry precision:[/cyan] {symprec}")
 
     atoms = read_structure(input_file)
-    prim = find_primitive(atoms, symprec=symprec, angle_tolerance=angle_tolerance)
+    prim = find_primitive(atoms, symprec=symprec, angle_tolerance=angle_tolerance, cache=cache)
 
     table = Table()
     table.add_column("Structure", style="cyan")
@@ -158,6 +196,12 @@ def primitive(input_file, output, symprec, angle_tolerance, format):
 @click.option("--allow-orthorhombic", is_flag=True, help="Allow orthorhombic cells")
 @click.option("--angle-tolerance", default=0.001, help="Angle tolerance (default: 0.001)")
 @click.option("--step-size", default=0.1, help="Step size for search (default: 0.1)")
+@click.option(
+    "--method",
+    type=click.Choice(["round", "hnf"]),
+    default="round",
+    help="round: fast heuristic; hnf: exhaustive search for the fewest atoms (default: round)",
+)
 @click.option("--format", help="Output format")
 def orthogonal(  # noqa: PLR0913
     input_file,
@@ -171,9 +215,13 @@ def orthogonal(  # noqa: PLR0913
     allow_orthorhombic,
     angle_tolerance,
     step_size,
+    *,
+    method,
     format,
 ):
     """Find orthogonal supercell."""
+    from rich.table import Table
+
     from ddpc.structure import find_orthogonal, read_structure, write_structure
 
     console.print(f"[cyan]Finding orthogonal supercell:[/cyan] {input_file}")
@@ -187,6 +235,7 @@ def orthogonal(  # noqa: PLR0913
         "max_length": max_length,
         "angle_tolerance": angle_tolerance,
         "step_size": step_size,
+        "method": method,
     }
     if min_atoms is not None:
         kwargs["min_atoms"] = min_atoms
@@ -250,5 +299,52 @@ def scale(input_file, output):
     console.print(f"[bold green]✓[/bold green] Saved to: {output}")
 
 
+@cli.command(cls=FriendlyCommand)
+@click.argument("directory", type=click.Path(exists=True, file_okay=False))
+@click.option("--symprec", default=1e-3, help="Symmetry precision (default: 1e-3)")
+@click.option("--tol", default=1e-2, help="Rounding step in Angstrom (default: 1e-2)")
+@click.option(
+    "-j",
+    "--workers",
+    type=click.IntRange(min=1),
+    help="Number of worker processes (default: number of CPUs)",
+)
+@click.option("--no-index", is_flag=True, help="Do not save the fingerprint index")
+def dedup(directory, symprec, tol, workers, no_index):
+    """Find duplicate structures below a directory.
+
+    Every .as/.cif/.vasp/.xyz/POSCAR/CONTCAR file is fingerprinted (see
+    ddpc.structure.fingerprint); unchanged files reuse the fingerprints saved in
+    DIRECTORY/.ddpc-fingerprints.json.
+    """
+    from rich.table import Table
+
+    from ddpc.structure.dedup import duplicate_groups, fingerprint_index
+
+    start = time.perf_counter()
+    entries = fingerprint_index(directory, symprec, tol, workers=workers, save=not no_index)
+    groups = duplicate_groups(entries)
+
+    for path, entry in entries.items():
+        if entry.error is not None:
+            console.print(f"[yellow]Warning:[/yellow] {path}: {entry.error}")
+
+    if groups:
+        table = Table(title="Duplicate Structures")
+        table.add_column("Group", style="cyan")
+        table.add_column("Fingerprint", style="green")
+        table.add_column("Files", style="green")
+        for i, paths in enumerate(groups, 1):
+            table.add_row(str(i), entries[paths[0]].fingerprint, "\n".join(paths))
+        console.print(table)
+
+    failed = sum(entry.error is not None for entry in entries.values())
+    duplicates = sum(len(paths) - 1 for paths in groups)
+    console.print(
+        f"[green]Done:[/green] {len(entries)} files, {len(groups)} duplicate groups, "
+        f"{duplicates} redundant files, {failed} failed in {time.perf_counter() - start:.2f} s"
+    )
+
+
 if __name__ == "__main__":
     cli()
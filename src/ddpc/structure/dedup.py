@@ -0,0 +1,267 @@
+"""Structure fingerprints and duplicate detection in large structure collections.
+
+A fingerprint identifies a crystal independently of its setting: the cell
+choice, supercell, orientation, origin and atom order do not change it. The
+structure is reduced to its idealized primitive cell with
+:func:`~ddpc.structure.find_primitive`, the lattice is Niggli reduced, and the
+species and fractional coordinates are rounded to ``tol`` Angstrom and put in a
+canonical order: the smallest of the orderings obtained from every lattice
+symmetry of the reduced cell and every atom of the rarest species as origin.
+Mirror images share a fingerprint.
+
+Duplicates are found by grouping equal fingerprints, so the cost is linear in
+the number of structures. Fingerprints of a directory are kept in an index file
+(:data:`INDEX_NAME`) and only recomputed for files whose size or modification
+time changed, and new files are fingerprinted in parallel processes.
+
+Rounding makes the fingerprint exact for idealized positions but splits
+structures whose free coordinates or cell lengths differ by about ``tol``
+across a rounding step; such near-duplicates may be reported apart.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from ase.atoms import Atoms
+
+INDEX_NAME = ".ddpc-fingerprints.json"
+INDEX_VERSION = 1
+ANGLE_STEP = 0.1
+STRUCTURE_SUFFIXES = (".as", ".cif", ".vasp", ".poscar", ".xyz")
+STRUCTURE_NAMES = ("POSCAR", "CONTCAR")
+
+
+class IndexEntry(NamedTuple):
+    """Fingerprint of one file in a :func:`fingerprint_index`.
+
+    Attributes
+    ----------
+        size: File size in bytes when it was fingerprinted
+        mtime_ns: Modification time in nanoseconds when it was fingerprinted
+        fingerprint: The fingerprint, None if the file could not be analysed
+        error: ``"ExceptionType: message"`` on failure, None on success
+    """
+
+    size: int
+    mtime_ns: int
+    fingerprint: Optional[str]
+    error: Optional[str]
+
+
+def fingerprint(
+    atoms: Atoms,
+    symprec: float = 1e-3,
+    tol: float = 1e-2,
+    angle_tolerance: float = -1.0,
+    *,
+    cache: bool = False,
+) -> str:
+    """Return a fingerprint that is equal for equal crystals.
+
+    Args:
+        atoms: Input structure, magnetic moments are ignored
+        symprec: Symmetry precision in Angstrom for finding the primitive cell
+        tol: Rounding step in Angstrom for cell lengths and positions
+        angle_tolerance: Angle tolerance in degrees, negative for spglib's default
+        cache: Also reuse/store the symmetry results in the on-disk cache
+
+    Returns
+    -------
+        ``"<formula>-<space group number>-<hash>"``, e.g. ``"Si2-227-..."``
+
+    Raises
+    ------
+        ImportError: If spglib not installed
+        ValueError: If structure invalid
+    """
+    from ddpc.structure.primitive import find_primitive
+    from ddpc.structure.symmetry import get_symmetry
+
+    number = get_symmetry(atoms, symprec, angle_tolerance, cache=cache)["spacegroup_number"]
+    prim = find_primitive(atoms, symprec, angle_tolerance, cache=cache)
+    cell, _ = prim.cell.niggli_reduce()
+    lattice = cell.array
+    frac = np.linalg.solve(lattice.T, prim.positions.T).T
+
+    lengths = np.linalg.norm(lattice, axis=1)
+    grid = np.maximum(np.rint(lengths / tol), 1).astype(np.int64)
+    cell_key = np.rint(np.concatenate([lengths / tol, cell.angles() / ANGLE_STEP]))
+    atoms_key = _canonical_sites(lattice, frac, prim.numbers, grid, tol)
+
+    hasher = hashlib.blake2b(digest_size=16)
+    hasher.update(np.float64(tol).tobytes())
+    for arr in (cell_key.astype(np.int64), atoms_key):
+        hasher.update(arr.tobytes())
+    return f"{prim.get_chemical_formula()}-{number}-{hasher.hexdigest()}"
+
+
+def _canonical_sites(
+    lattice: np.ndarray, frac: np.ndarray, numbers: np.ndarray, grid: np.ndarray, tol: float
+) -> np.ndarray:
+    """Return the smallest sorted site keys over lattice symmetries and origins.
+
+    A site key packs the atomic number and the fractional coordinates, rounded
+    to ``grid`` steps per axis, into one integer. The keys of every candidate
+    setting are sorted and the lexicographically smallest sequence is kept.
+    """
+    from ddpc.structure.orthogonal import _lattice_point_group
+
+    lengths = np.linalg.norm(lattice, axis=1)
+    rotations = _lattice_point_group(lattice, tol=2 * tol / lengths.min())
+    species, counts = np.unique(numbers, return_counts=True)
+    origins = frac[numbers == species[np.argmin(counts)]]
+
+    # (rotation, origin, atom, axis), the grid is the same along symmetric axes
+    shifted = frac[None, :, :] - origins[:, None, :]
+    coords = np.einsum("oaj,rji->roai", shifted, rotations)
+    steps = np.mod(np.rint(coords * grid), grid).astype(np.int64)
+    keys = (numbers.astype(np.int64) * grid[0] + steps[..., 0]) * grid[1] + steps[..., 1]
+    keys = np.sort((keys * grid[2] + steps[..., 2]).reshape(-1, len(numbers)), axis=1)
+    return keys[np.lexsort(keys.T[::-1])[0]]
+
+
+def find_structure_files(directory: Union[str, Path]) -> List[Path]:
+    """Return the structure files below ``directory``, sorted.
+
+    Files with a suffix in :data:`STRUCTURE_SUFFIXES` or a name starting with
+    one of :data:`STRUCTURE_NAMES` are structure files; hidden files are skipped.
+    """
+    found = []
+    for path in Path(directory).rglob("*"):
+        name = path.name
+        if name.startswith("."):
+            continue
+        if path.suffix.lower() in STRUCTURE_SUFFIXES or name.startswith(STRUCTURE_NAMES):
+            if path.is_file():
+                found.append(path)
+    return sorted(found)
+
+
+def fingerprint_files(
+    paths: Sequence[Union[str, Path]],
+    symprec: float = 1e-3,
+    tol: float = 1e-2,
+    *,
+    workers: Optional[int] = None,
+) -> Iterator[Tuple[Optional[str], Optional[str]]]:
+    """Fingerprint many structure files in parallel.
+
+    Args:
+        paths: Structure files, read with :func:`~ddpc.structure.read_structure`
+        symprec: Symmetry precision in Angstrom, see :func:`fingerprint`
+        tol: Rounding step in Angstrom, see :func:`fingerprint`
+        workers: Number of worker processes (default: number of CPUs); with 1
+            every file is processed in the calling process
+
+    Returns
+    -------
+        Iterator of ``(fingerprint, error)`` pairs in the order of ``paths``,
+        with exactly one of them None
+    """
+    jobs = [(str(p), symprec, tol) for p in paths]
+    workers = min(workers or os.cpu_count() or 1, len(jobs))
+    if workers <= 1:
+        yield from (_fingerprint_file(*job) for job in jobs)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        chunksize = max(1, min(64, len(jobs) // (4 * workers)))
+        yield from pool.map(_fingerprint_file, *zip(*jobs), chunksize=chunksize)
+
+
+def _fingerprint_file(path: str, symprec: float, tol: float) -> Tuple[Optional[str], Optional[str]]:
+    """Worker function of :func:`fingerprint_files`, turning failures into errors."""
+    from ddpc.structure.io import read_structure
+
+    try:
+        return fingerprint(read_structure(path), symprec, tol), None
+    except (Exception, SystemExit) as e:
+        # some readers exit on malformed files; that must not end the worker
+        return None, f"{type(e).__name__}: {e}"
+
+
+def fingerprint_index(
+    directory: Union[str, Path],
+    symprec: float = 1e-3,
+    tol: float = 1e-2,
+    *,
+    workers: Optional[int] = None,
+    save: bool = True,
+) -> Dict[str, IndexEntry]:
+    """Fingerprint every structure file below ``directory``, reusing the saved index.
+
+    The index is saved as :data:`INDEX_NAME` in ``directory``. Entries of files
+    whose size and modification time are unchanged are reused; an index made
+    with other ``symprec``/``tol`` values is discarded. If the directory is not
+    writable the index is only kept for this call.
+
+    Args:
+        directory: Directory searched recursively, see :func:`find_structure_files`
+        symprec: Symmetry precision in Angstrom, see :func:`fingerprint`
+        tol: Rounding step in Angstrom, see :func:`fingerprint`
+        workers: Number of worker processes for new files (default: number of CPUs)
+        save: Write the updated index (default: True)
+
+    Returns
+    -------
+        ``{path relative to directory: IndexEntry}`` in path order
+    """
+    directory = Path(directory)
+    index_file = directory / INDEX_NAME
+    settings = {"version": INDEX_VERSION, "symprec": symprec, "tol": tol}
+    saved: Dict[str, List] = {}
+    try:
+        content = json.loads(index_file.read_text(encoding="utf-8"))
+        if content["settings"] == settings:
+            saved = content["entries"]
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+
+    entries: Dict[str, IndexEntry] = {}
+    todo: List[Tuple[str, os.stat_result]] = []
+    for path in find_structure_files(directory):
+        rel = path.relative_to(directory).as_posix()
+        stat = path.stat()
+        old = saved.get(rel)
+        if old is not None and old[:2] == [stat.st_size, stat.st_mtime_ns]:
+            entries[rel] = IndexEntry(*old)
+        else:
+            entries[rel] = None  # keeps the path order
+            todo.append((rel, stat))
+
+    results = fingerprint_files([directory / rel for rel, _ in todo], symprec, tol, workers=workers)
+    for (rel, stat), (fp, error) in zip(todo, results):
+        entries[rel] = IndexEntry(stat.st_size, stat.st_mtime_ns, fp, error)
+
+    if save and (todo or len(saved) != len(entries)):
+        try:
+            tmp = index_file.with_name(f"{INDEX_NAME}.{os.getpid()}.tmp")
+            tmp.write_text(json.dumps({"settings": settings, "entries": entries}), encoding="utf-8")
+            os.replace(tmp, index_file)
+        except OSError:
+            pass
+    return entries
+
+
+def duplicate_groups(entries: Dict[str, IndexEntry]) -> List[List[str]]:
+    """Group the paths of an index by fingerprint.
+
+    Returns
+    -------
+        Groups of two or more paths with the same fingerprint, largest first,
+        then in path order; failed files are left out
+    """
+    groups: Dict[str, List[str]] = {}
+    for path, entry in entries.items():
+        if entry.fingerprint is not None:
+            groups.setdefault(entry.fingerprint, []).append(path)
+    found = [sorted(paths) for paths in groups.values() if len(paths) > 1]
+    return sorted(found, key=lambda paths: (-len(paths), paths))
@@ -2,46 +2,224 @@
 
 from __future__ import annotations
 
+import os
 from pathlib import Path
-from typing import TYPE_CHECKING, Union
+from typing import TYPE_CHECKING, Iterator, List, Optional, Union
+
+from ddpc.profiling import count_bytes, stage
 
 if TYPE_CHECKING:
     from ase.atoms import Atoms
 
+SNIFF_BYTES = 4096
+
 
-def read_structure(file: Union[str, Path], format: Union[str, None] = None) -> Atoms:
+def read_structure(
+    file: Union[str, Path],
+    format: Union[str, None] = None,
+    index: Union[int, slice, str, None] = None,
+) -> Union[Atoms, List[Atoms]]:
     """Read crystal structure from file.
 
     Args:
         file: Path to structure file
-        format: File format (auto-detected if None)
+        format: File format (detected from the content if None, see
+            :func:`detect_format`)
+        index: Frame(s) of a multi-frame file: an int, a slice or an ASE-style
+            string such as ``"-1"`` or ``"::10"``. DS-PAW .as and xyz frames are
+            located through a persisted offset index (see
+            :mod:`ddpc.structure.trajectory`). None reads the file as a single
+            structure.
 
     Returns
     -------
-        ase.Atoms object with structure
+        ase.Atoms object with structure, or a list of them if ``index`` is a slice
 
     Raises
     ------
         ImportError: If required parser not installed
         FileNotFoundError: If file does not exist
+        IndexError: If the frame index is out of range
         ValueError: If unsupported format or corrupt file
     """
     from ase.io import read
 
     from ddpc.structure.readers import dspaw_as, rescu_xyz
+    from ddpc.structure.trajectory import normalize_index
 
-    fn = str(file)
-    if format == "dspaw" or fn.endswith(".as"):
-        return dspaw_as.read(fn)
-    if format == "rescu":
-        return rescu_xyz.read(fn)
-    if fn.endswith(".xyz"):
-        # Try standard XYZ first, fallback to RESCU format
-        try:
-            return read(fn, format="xyz")
-        except Exception:
+    with stage("read"):
+        if index is not None:
+            index, single = normalize_index(index)
+            images = list(iread_structures(file, format, index=index))
+            return images[0] if single else images
+
+        fn = str(file)
+        format = _resolve_format(fn, format)
+        count_bytes(os.path.getsize(fn))
+        if format == "dspaw":
+            return dspaw_as.read(fn)
+        if format == "rescu":
             return rescu_xyz.read(fn)
-    return read(fn, format=format)
+        if format == "xyz":
+            # comments beyond the sniffed head only show up when parsing
+            try:
+                return read(fn, format="xyz")
+            except Exception:
+                return rescu_xyz.read(fn)
+        return read(fn, format=format)
+
+
+def iread_structures(
+    file: Union[str, Path],
+    format: Optional[str] = None,
+    index: Union[int, slice, str] = ":",
+) -> Iterator[Atoms]:
+    """Iterate over the frames of a multi-frame structure file.
+
+    DS-PAW .as and xyz (including RESCU) files are read frame by frame through
+    a persisted offset index, so selecting late frames does not parse earlier
+    ones. Other formats are delegated to ``ase.io.iread``.
+
+    Args:
+        file: Path to structure file
+        format: File format (detected from the content if None, see
+            :func:`detect_format`)
+        index: Frames to read, an int, a slice or an ASE-style string (default: all)
+
+    Returns
+    -------
+        Generator of ase.Atoms, one per selected frame
+
+    Raises
+    ------
+        ImportError: If required parser not installed
+        FileNotFoundError: If file does not exist
+        IndexError: If an integer frame index is out of range
+        ValueError: If unsupported format or corrupt file
+    """
+    from ddpc.structure.trajectory import iread_frames, normalize_index
+
+    index, _ = normalize_index(index)
+    fn = str(file)
+    format = _resolve_format(fn, format)
+    if format in ("dspaw", "rescu", "xyz"):
+        return iread_frames(fn, format, index)
+
+    from ase.io import iread
+
+    return iread(fn, index=index, format=format)
+
+
+def detect_format(file: Union[str, Path]) -> Optional[str]:
+    """Tell the format of a structure file from its first :data:`SNIFF_BYTES` bytes.
+
+    Recognized signatures:
+
+    - ``"dspaw"``: an atom count on the second and ``Lattice`` on the third line
+    - ``"cif"``: a ``data_`` block or ``_cell_length_a`` tag
+    - ``"extxyz"``: an xyz title line with ``Lattice=`` or ``Properties=``
+    - ``"rescu"``: an xyz file with ``#``/``%`` comments, or atom lines of 8 or
+      10 columns ending in three integer constraint flags
+    - ``"xyz"``: any other xyz file (atom count, title line, atom lines)
+    - ``"vasp"``: a comment, a scale factor, three lattice vectors and a
+      species or count line
+
+    Args:
+        file: Path to structure file
+
+    Returns
+    -------
+        The format, or None if no signature matches (ASE guesses it then)
+
+    Raises
+    ------
+        FileNotFoundError: If file does not exist
+    """
+    with open(file, "rb") as fin:
+        head = fin.read(SNIFF_BYTES)
+        if len(head) == SNIFF_BYTES and fin.read(1):
+            # drop the line cut off by the read
+            head = head[: head.rfind(b"\n") + 1]
+    if b"\0" in head:
+        return None
+    lines = head.decode("utf-8", errors="replace").splitlines()
+    content = [line.split() for line in lines if line.strip() and not line.lstrip().startswith("#")]
+    if not content:
+        return None
+
+    if content[0][0].startswith("data_") or any(words[0] == "_cell_length_a" for words in content):
+        return "cif"
+    if len(content) >= 3 and _is_int(content[1][0]) and content[2][0].lower() == "lattice":
+        return "dspaw"
+    xyz = _sniff_xyz(lines)
+    if xyz is None and _looks_like_poscar(lines):
+        return "vasp"
+    return xyz
+
+
+def _sniff_xyz(lines: List[str]) -> Optional[str]:
+    """Return the xyz flavour of ``lines``, None if they are not xyz."""
+    starts = [i for i, line in enumerate(lines) if line.strip() and not _is_comment(line)]
+    if not starts or len(lines[starts[0]].split()) != 1 or not _is_int(lines[starts[0]]):
+        return None
+    title = starts[0] + 1
+    if title < len(lines) and ("Lattice=" in lines[title] or "Properties=" in lines[title]):
+        return "extxyz"
+    atoms = [lines[i].split() for i in starts[1:] if i > title]
+    if atoms and not (len(atoms[0]) >= 4 and _is_float(atoms[0][1])):
+        return None
+    commented = any(_is_comment(line) or "#" in line for i, line in enumerate(lines) if i != title)
+    if commented or any(_is_rescu_row(words) for words in atoms[:1]):
+        return "rescu"
+    return "xyz"
+
+
+def _is_rescu_row(words: List[str]) -> bool:
+    return len(words) in (8, 10) and all(_is_int(w) for w in words[-3:])
+
+
+def _is_comment(line: str) -> bool:
+    return line.lstrip().startswith(("#", "%"))
+
+
+def _looks_like_poscar(lines: List[str]) -> bool:
+    if len(lines) < 7:
+        return False
+    rows = [line.split() for line in lines[1:6]]
+    return (
+        len(rows[0]) in (1, 3)
+        and all(map(_is_float, rows[0]))
+        and all(len(row) >= 3 and all(map(_is_float, row[:3])) for row in rows[1:4])
+        and bool(rows[4])
+        and (all(map(_is_int, rows[4])) or all(w.isalpha() for w in rows[4]))
+    )
+
+
+def _is_int(text: str) -> bool:
+    try:
+        int(text)
+    except ValueError:
+        return False
+    return True
+
+
+def _is_float(text: str) -> bool:
+    try:
+        float(text)
+    except ValueError:
+        return False
+    return True
+
+
+def _resolve_format(fn: str, format: Optional[str]) -> Optional[str]:
+    """Return ``format``, or the detected one, or ``"dspaw"`` for unrecognized .as files."""
+    if format is not None:
+        return format
+    detected = detect_format(fn)
+    if detected is None and fn.endswith(".as"):
+        # let the .as reader report what is wrong
+        return "dspaw"
+    return detected
 
 
 def write_structure(
@@ -69,11 +247,10 @@ def write_structure(
     from ddpc.structure.writers import dspaw_as, rescu_xyz
 
     fn = str(file)
-    if format == "dspaw" or fn.endswith(".as"):
-        dspaw_as.write(fn, atoms)
-        return
-    if format == "rescu" or (format == "xyz" and "atom_fix" in atoms.info):
-        rescu_xyz.write(fn, atoms)
-        return
-
-    write(fn, atoms, format=format, **kwargs)
+    with stage("write"):
+        if format == "dspaw" or fn.endswith(".as"):
+            dspaw_as.write(fn, atoms)
+        elif format == "rescu" or (format == "xyz" and "atom_fix" in atoms.info):
+            rescu_xyz.write(fn, atoms)
+        else:
+            write(fn, atoms, format=format, **kwargs)
@@ -3,15 +3,22 @@
 from __future__ import annotations
 
 import math
-from typing import TYPE_CHECKING, Union
+from functools import lru_cache
+from itertools import permutations
+from typing import TYPE_CHECKING, Iterator, List, Tuple, Union
 
 import numpy as np
 from numpy.typing import NDArray
 
+from ddpc.profiling import stage
+
 if TYPE_CHECKING:
     from ase.atoms import Atoms
 
 
+SEARCH_METHODS = ("round", "hnf")
+
+
 def find_orthogonal(atoms: Atoms, **kwargs) -> Atoms:
     """Find minimal orthogonal supercell.
 
@@ -27,6 +34,8 @@ def find_orthogonal(atoms: Atoms, **kwargs) -> Atoms:
             - allow_orthorhombic: Allow orthorhombic cells instead of cubic
             - angle_tolerance: Tolerance for 90 degree angles (default: 1e-3)
             - step_size: Step size for increasing supercell size (default: 0.1)
+            - method: ``"round"`` (default) for the rounding heuristic, ``"hnf"``
+              for the exhaustive search of the smallest orthogonal supercell
 
     Returns
     -------
@@ -41,7 +50,8 @@ def find_orthogonal(atoms: Atoms, **kwargs) -> Atoms:
         raise ValueError("Input structure has no cell information")
 
     try:
-        orthed_s = CubicSupercellTransformation(**kwargs).apply_transformation(atoms)
+        with stage("orthogonal"):
+            orthed_s = CubicSupercellTransformation(**kwargs).apply_transformation(atoms)
     except AttributeError:
         # Re-raise AttributeError as it indicates configuration issues, not algorithmic failures
         raise
@@ -146,6 +156,244 @@ def _round_and_make_arr_singular(arr: np.ndarray) -> np.ndarray:
     return arr_rounded.astype(int)
 
 
+def _round_matrices(arrs: np.ndarray) -> np.ndarray:
+    """Apply :func:`_round_and_make_arr_singular` to a stack of matrices.
+
+    Matrices that round without zero rows or columns are rounded in one
+    vectorized step; only the others go through the scalar function.
+    """
+    rounded = np.around(arrs)
+    singular = (~rounded.any(axis=-1)).any(axis=-1) | (~rounded.any(axis=-2)).any(axis=-1)
+    rounded = rounded.astype(int)
+    for i in np.flatnonzero(singular):
+        rounded[i] = _round_and_make_arr_singular(arrs[i])
+    return rounded
+
+
+def _inscribed_length_vecs(lat: np.ndarray) -> np.ndarray:
+    """Return the six in-plane heights of a cell (or stack of cells) as vectors.
+
+    For each pair of lattice vectors, the component of one perpendicular to the
+    other; their norms bound the largest cube that fits in the cell.
+    """
+    # (c, a), (a, c): a-c plane; (b, a), (a, b): b-a plane; (b, c), (c, b): b-c plane
+    v = lat[..., [2, 0, 1, 0, 1, 2], :]
+    w = lat[..., [0, 2, 0, 1, 2, 1], :]
+    scale = np.einsum("...i,...i->...", v, w) / np.einsum("...i,...i->...", w, w)
+    return v - scale[..., None] * w
+
+
+def _cell_angles(lat: np.ndarray) -> np.ndarray:
+    """Return the cell angles alpha, beta, gamma in degrees, as ``ase.geometry.cell_to_cellpar``.
+
+    Works on a single cell or on a stack of cells.
+    """
+    lengths = np.linalg.norm(lat, axis=-1)
+    j, k = [2, 0, 1], [1, 2, 0]
+    ll = lengths[..., j] * lengths[..., k]
+    dots = np.einsum("...i,...i->...", lat[..., j, :], lat[..., k, :])
+    with np.errstate(invalid="ignore"):
+        angles = 180.0 / np.pi * np.arccos(dots / np.where(ll > 1e-16, ll, 1.0))
+    return np.where(ll > 1e-16, angles, 90.0)
+
+
+def _reduce_bases(lat: np.ndarray, eps: float = 1e-9) -> Tuple[np.ndarray, np.ndarray]:
+    """Reduce a stack of lattice bases to short, nearly orthogonal ones.
+
+    Every basis vector is shortened by integer multiples of each other vector
+    and by ``±1`` combinations of the other two, until no vector gets shorter.
+    In three dimensions this yields a Minkowski-reduced basis (up to order), so
+    a lattice that has an orthogonal basis is reduced to that basis.
+
+    Args:
+        lat: Bases as rows, shape ``(m, 3, 3)``
+        eps: Relative length decrease below which a step is not taken
+
+    Returns
+    -------
+        Unimodular integer matrices ``U`` and the reduced bases ``U @ lat``
+    """
+    b = np.array(lat, dtype=float)
+    u = np.broadcast_to(np.eye(3, dtype=np.int64), b.shape).copy()
+    signs = np.array([[1, 1], [1, -1], [-1, 1], [-1, -1]])
+    for _ in range(100):
+        changed = False
+        for i, j in permutations(range(3), 2):
+            mu = np.einsum("...i,...i->...", b[:, i], b[:, j]) / np.einsum(
+                "...i,...i->...", b[:, j], b[:, j]
+            )
+            k = np.where(np.abs(mu) > 0.5 + eps, np.rint(mu), 0).astype(np.int64)
+            if k.any():
+                b[:, i] -= k[:, None] * b[:, j]
+                u[:, i] -= k[:, None] * u[:, j]
+                changed = True
+        for i in range(3):
+            j, k = [x for x in range(3) if x != i]
+            combos = b[:, None, i] + signs[:, :1] * b[:, None, j] + signs[:, 1:] * b[:, None, k]
+            norms = np.einsum("...i,...i->...", combos, combos)
+            best = norms.argmin(axis=1)
+            rows = np.arange(len(b))
+            shorter = norms[rows, best] < np.einsum("...i,...i->...", b[:, i], b[:, i]) * (1 - eps)
+            if shorter.any():
+                s_j, s_k = signs[best[shorter]].T
+                u[shorter, i] += s_j[:, None] * u[shorter, j] + s_k[:, None] * u[shorter, k]
+                b[shorter, i] = combos[rows[shorter], best[shorter]]
+                changed = True
+        if not changed:
+            break
+    return u, u @ lat
+
+
+def _lattice_point_group(lat: np.ndarray, tol: float = 1e-6) -> np.ndarray:
+    """Return the integer rotations ``W`` of a reduced basis with ``W G W^T = G``.
+
+    ``G`` is the metric tensor; for a reduced basis all its symmetries have
+    entries in ``{-1, 0, 1}``.
+    """
+    metric = lat @ lat.T
+    candidates = _unimodular_candidates()
+    transformed = candidates @ metric @ candidates.transpose(0, 2, 1)
+    keep = np.all(np.abs(transformed - metric) <= tol * np.abs(metric).max(), axis=(1, 2))
+    return candidates[keep]
+
+
+@lru_cache(maxsize=None)
+def _unimodular_candidates() -> np.ndarray:
+    """Return the matrices with entries in ``{-1, 0, 1}`` and determinant +-1."""
+    entries = np.array(np.meshgrid(*[[-1, 0, 1]] * 9, indexing="ij")).reshape(9, -1).T
+    candidates = entries.reshape(-1, 3, 3)
+    candidates = candidates[np.abs(np.rint(np.linalg.det(candidates))) == 1]
+    candidates.flags.writeable = False
+    return candidates
+
+
+def _hnf_matrices(n: int) -> np.ndarray:
+    """Return all Hermite normal forms of determinant ``n``.
+
+    The matrices are lower triangular, ``[[a, 0, 0], [b, c, 0], [d, e, f]]`` with
+    ``a c f = n``, ``0 <= b, d < a`` and ``0 <= e < c``; each one stands for a
+    different sublattice of index ``n``.
+    """
+    blocks: List[np.ndarray] = []
+    for a in range(1, n + 1):
+        if n % a:
+            continue
+        for c in range(1, n // a + 1):
+            if (n // a) % c:
+                continue
+            f = n // a // c
+            b, d, e = (x.ravel() for x in np.meshgrid(range(a), range(a), range(c), indexing="ij"))
+            block = np.zeros((len(b), 3, 3), dtype=np.int64)
+            block[:, 0, 0], block[:, 1, 1], block[:, 2, 2] = a, c, f
+            block[:, 1, 0], block[:, 2, 0], block[:, 2, 1] = b, d, e
+            blocks.append(block)
+    return np.concatenate(blocks)
+
+
+def _hnf(m: np.ndarray) -> np.ndarray:
+    """Return the Hermite normal form of a stack of nonsingular integer matrices.
+
+    Row operations only, so the rows of the result span the same lattice.
+    """
+    h = np.array(m, dtype=np.int64)
+    for col in (2, 1, 0):
+        # Euclid on this column over the rows above the finished ones, only
+        # for the matrices with more than one nonzero entry left
+        top = col + 1
+        active = np.flatnonzero(np.count_nonzero(h[:, :top, col], axis=1) > 1)
+        while len(active):
+            sub = h[active, :top]
+            v = sub[:, :, col]
+            rows = np.arange(len(active))
+            pivot = np.where(v != 0, np.abs(v), np.iinfo(np.int64).max).argmin(axis=1)
+            q = v // v[rows, pivot][:, None]
+            q[rows, pivot] = 0
+            sub -= q[:, :, None] * sub[rows, pivot][:, None, :]
+            h[active, :top] = sub
+            active = active[np.count_nonzero(sub[:, :, col], axis=1) > 1]
+        rows = np.arange(len(h))
+        pivot = np.abs(h[:, :top, col]).argmax(axis=1)
+        pivot_row = h[rows, pivot]
+        h[rows, pivot] = h[:, col]
+        h[:, col] = pivot_row * np.sign(pivot_row[:, col])[:, None]
+    h[:, 2] -= (h[:, 2, 1] // h[:, 1, 1])[:, None] * h[:, 1]
+    h[:, 2] -= (h[:, 2, 0] // h[:, 0, 0])[:, None] * h[:, 0]
+    h[:, 1] -= (h[:, 1, 0] // h[:, 0, 0])[:, None] * h[:, 0]
+    return h
+
+
+def _generators(rotations: np.ndarray) -> List[np.ndarray]:
+    """Return a small set of rotations that generates the whole group."""
+    identity = np.eye(3, dtype=np.int64)
+    generators: List[np.ndarray] = []
+    group = {identity.tobytes(): identity}
+    for w in rotations:
+        if w.tobytes() in group:
+            continue
+        generators.append(w)
+        todo = list(group.values())
+        while todo:
+            g = todo.pop()
+            for h in generators:
+                gh = g @ h
+                if gh.tobytes() not in group:
+                    group[gh.tobytes()] = gh
+                    todo.append(gh)
+    return generators
+
+
+def _symmetry_distinct(hnfs: np.ndarray, rotations: np.ndarray) -> np.ndarray:
+    """Keep one Hermite normal form per orbit of the lattice point group.
+
+    Sublattices related by a symmetry of the parent lattice are congruent, so
+    only the first form of each orbit (in the order of :func:`_hnf_matrices`)
+    is kept. Orbits are found by following the images under the generators of
+    the group.
+    """
+    generators = _generators(rotations)
+    if not generators:
+        return hnfs
+
+    # every entry is at most the determinant
+    radix = int(hnfs[0, 0, 0] * hnfs[0, 1, 1] * hnfs[0, 2, 2]) + 1
+
+    def position(h: np.ndarray) -> np.ndarray:
+        # _hnf_matrices orders by (a, c, b, d, e)
+        key = h[:, 0, 0]
+        for r, c in ((1, 1), (1, 0), (2, 0), (2, 1)):
+            key = key * radix + h[:, r, c]
+        return key
+
+    order = position(hnfs)
+    images = np.stack([np.searchsorted(order, position(_hnf(hnfs @ w))) for w in generators])
+    label = np.arange(len(hnfs))
+    while True:
+        new = np.minimum(label, label[images].min(axis=0))
+        if (new == label).all():
+            break
+        label = new
+    return hnfs[label == np.arange(len(hnfs))]
+
+
+def _orient(matrix: np.ndarray, lat: np.ndarray) -> np.ndarray:
+    """Order and flip the rows of a supercell matrix to follow the input axes.
+
+    Row ``i`` becomes the supercell vector most parallel to lattice vector
+    ``i``, pointing the same way; the result is right-handed.
+    """
+    sc = matrix @ lat
+    cos = np.abs(
+        (sc / np.linalg.norm(sc, axis=1)[:, None]) @ (lat / np.linalg.norm(lat, axis=1)[:, None]).T
+    )
+    perm = max(permutations(range(3)), key=lambda p: sum(cos[p[i], i] for i in range(3)))
+    matrix = matrix[list(perm)]
+    signs = np.where(np.einsum("ij,ij->i", matrix @ lat, lat) < 0, -1, 1)
+    matrix = matrix * signs[:, None]
+    if np.linalg.det(matrix) < 0:
+        matrix[2] *= -1
+    return matrix
+
+
 class CubicSupercellTransformation:
     """Generate nearly cubic supercell structures from input structures.
 
@@ -161,6 +409,10 @@ class CubicSupercellTransformation:
     until the largest inscribed cube's side length is at least 'min_length'
     and the number of atoms in the supercell falls in the range
     ``min_atoms < n < max_atoms``.
+
+    Candidates are judged from the integer matrix alone (atom count from its
+    determinant, lengths and angles from the supercell lattice); the supercell
+    structure is only built once, for the accepted matrix.
     """
 
     def __init__(  # noqa: PLR0913
@@ -174,6 +426,8 @@ class CubicSupercellTransformation:
         allow_orthorhombic: bool = False,
         angle_tolerance: float = 1e-3,
         step_size: float = 0.1,
+        *,
+        method: str = "round",
     ):
         """Initialize cubic supercell transformation parameters.
 
@@ -194,6 +448,13 @@ class CubicSupercellTransformation:
                 If allow_orthorhombic and force_90_degrees is both set to True,
                 the chosen step_size will be automatically multiplied by 5 to
                 prevent a too long search for the possible supercell.
+            method: "round" rounds the transformation towards a target cell
+                (fast, but may miss smaller cells and breaks ties at random).
+                "hnf" enumerates all supercells by increasing size and returns
+                the one with the fewest atoms whose angles are 90 degrees within
+                angle_tolerance and whose lengths are at least min_length. It
+                needs max_atoms or max_length to bound the search and ignores
+                force_diagonal, force_90_degrees, allow_orthorhombic and step_size.
         """
         self.min_atoms = min_atoms or -np.inf
         self.max_atoms = max_atoms or np.inf
@@ -205,8 +466,9 @@ class CubicSupercellTransformation:
         self.angle_tolerance = angle_tolerance
         self.transformation_matrix = None
         self.step_size = step_size
+        self.method = method
 
-    def apply_transformation(self, atoms: Atoms) -> Atoms:
+    def apply_transformation(self, atoms: Atoms) -> Atoms:  # noqa: PLR0912
         """Apply cubic supercell transformation to input structure.
 
         The algorithm solves for a transformation matrix that makes the
@@ -226,15 +488,20 @@ class CubicSupercellTransformation:
         """
         lat_vecs = atoms.cell.array
 
+        if self.method not in SEARCH_METHODS:
+            raise AttributeError(
+                f"Unknown method '{self.method}', expected one of {SEARCH_METHODS}"
+            )
+        if self.method == "hnf":
+            return self._apply_hnf(atoms)
+
         if self.max_length is None and self.allow_orthorhombic:
             raise AttributeError("max_length is required for orthorhombic cells")
 
         if self.force_diagonal:
             scale = self.min_length / np.array(atoms.cell.lengths())
             self.transformation_matrix = np.diag(np.ceil(scale).astype(int))
-            from ase.build import make_supercell
-
-            return make_supercell(atoms, self.transformation_matrix)
+            return self._build(atoms)
 
         if not self.allow_orthorhombic:
             # boolean for if a sufficiently large supercell has been created
@@ -244,16 +511,16 @@ class CubicSupercellTransformation:
             target_sc_size = self.min_length
             while sc_not_found:
                 target_sc_lat_vecs = np.eye(3, 3) * target_sc_size
-                length_vecs, n_atoms, superstructure, self.transformation_matrix = (
-                    self.get_possible_supercell(lat_vecs, atoms, target_sc_lat_vecs)
+                length_vecs, n_atoms, sc_lat_vecs, self.transformation_matrix = (
+                    self.get_possible_supercell(lat_vecs, len(atoms), target_sc_lat_vecs)
                 )
                 # Check if constraints are satisfied
                 if self.check_constraints(
                     length_vecs=length_vecs,
                     n_atoms=n_atoms,
-                    superstructure=superstructure,
+                    sc_lat_vecs=sc_lat_vecs,
                 ):
-                    return superstructure
+                    return self._build(atoms)
 
                 # Increase threshold until proposed supercell meets requirements
                 target_sc_size += self.step_size
@@ -265,28 +532,121 @@ class CubicSupercellTransformation:
             # prevent a too long search for the supercell
             self.step_size *= 5
 
-        combined_list = [
-            [size_a, size_b, size_c]
-            for size_a in np.arange(self.min_length, self.max_length, self.step_size)
-            for size_b in np.arange(self.min_length, self.max_length, self.step_size)
-            for size_c in np.arange(self.min_length, self.max_length, self.step_size)
-        ]
-        combined_list = sorted(combined_list, key=sum)
-
-        for size_a, size_b, size_c in combined_list:
-            target_sc_lat_vecs = np.array([[size_a, 0, 0], [0, size_b, 0], [0, 0, size_c]])
-            length_vecs, n_atoms, superstructure, self.transformation_matrix = (
-                self.get_possible_supercell(lat_vecs, atoms, target_sc_lat_vecs)
+        inv_lat = np.linalg.inv(lat_vecs)
+        tried = set()
+        for sizes in self._orthorhombic_sizes():
+            # row i of T is size_i times row i of inv(lat), see get_possible_supercell
+            matrices = _round_matrices(sizes[:, :, None] * inv_lat)
+            # the same integer matrix always gives the same outcome, so test it once
+            new = []
+            for i, matrix in enumerate(matrices):
+                key = matrix.tobytes()
+                if key not in tried:
+                    tried.add(key)
+                    new.append(i)
+            if not new:
+                continue
+            matrices = matrices[new]
+            sc_lat_vecs = matrices @ lat_vecs
+            length_vecs = _inscribed_length_vecs(sc_lat_vecs)
+            n_atoms = np.rint(np.abs(np.linalg.det(matrices))).astype(int) * len(atoms)
+            passed = self.check_constraints(length_vecs, n_atoms, sc_lat_vecs)
+            failed = (n_atoms > self.max_atoms) | (
+                np.linalg.norm(length_vecs, axis=-1).max(axis=-1) >= self.max_length
             )
-            # Check if constraints are satisfied
-            if self.check_constraints(
-                length_vecs=length_vecs, n_atoms=n_atoms, superstructure=superstructure
-            ):
-                return superstructure
-
-            self.check_exceptions(length_vecs, n_atoms)
+            hits = np.flatnonzero(passed | failed)
+            if not len(hits):
+                self.transformation_matrix = matrices[-1]
+                continue
+            # the first candidate in order decides, as in a one-by-one search
+            i = hits[0]
+            self.transformation_matrix = matrices[i]
+            if passed[i]:
+                return self._build(atoms)
+            self.check_exceptions(length_vecs[i], n_atoms[i])
         raise AttributeError("Unable to find orthorhombic supercell")
 
+    def _orthorhombic_sizes(self) -> Iterator[np.ndarray]:
+        """Yield target sizes ``(a, b, c)`` in batches, ordered by ``a + b + c``.
+
+        Sizes are taken from ``np.arange(min_length, max_length, step_size)``.
+        Each batch holds the sizes whose grid indices have the same sum, so
+        batches come in increasing order; within a batch they are stably sorted
+        by their float sum, giving the order of sorting the full product.
+        """
+        values = np.arange(self.min_length, self.max_length, self.step_size)
+        n = len(values)
+        for total in range(3 * n - 2):
+            # only index ranges that can add up to total, so early batches are cheap
+            lo, hi = max(0, total - 2 * (n - 1)), min(total, n - 1)
+            grid_i = np.arange(lo, hi + 1)
+            grid_j = np.arange(max(0, total - hi - (n - 1)), min(total - lo, n - 1) + 1)
+            k = total - grid_i[:, None] - grid_j[None, :]
+            i, j = np.nonzero((k >= 0) & (k < n))
+            k = k[i, j]
+            i, j = grid_i[i], grid_j[j]
+            sizes = np.stack([values[i], values[j], values[k]], axis=1)
+            order = np.argsort(sizes[:, 0] + sizes[:, 1] + sizes[:, 2], kind="stable")
+            yield sizes[order]
+
+    def _apply_hnf(self, atoms: Atoms) -> Atoms:
+        """Find the orthogonal supercell with the fewest atoms.
+
+        Supercells of N cells are enumerated as the Hermite normal forms of
+        determinant N, with N increasing from the smallest volume that can hold
+        ``min_length`` in every direction. Sublattices related by a lattice
+        symmetry are scored once. Each candidate basis is reduced and accepted
+        if its angles are 90 degrees within ``angle_tolerance`` and its lengths
+        lie in ``[min_length, max_length]``; of the accepted cells with the
+        smallest N the most cubic one wins, so the result is deterministic.
+        """
+        if self.max_atoms == np.inf and self.max_length is None:
+            raise AttributeError("max_atoms or max_length is required for method 'hnf'")
+
+        natoms = len(atoms)
+        reduce_u, reduced = _reduce_bases(atoms.cell.array[None])
+        reduce_u, reduced = reduce_u[0], reduced[0]
+        volume = abs(np.linalg.det(reduced))
+        rotations = _lattice_point_group(reduced)
+
+        # an almost orthogonal cell with lengths >= min_length has at least this volume
+        slack = max(0.5, 1 - 3 * math.sin(math.radians(self.angle_tolerance)))
+        first = max(1, math.floor(self.min_length**3 * slack / volume))
+        if self.min_atoms > 0:
+            first = max(first, math.ceil(self.min_atoms / natoms))
+        last = math.inf if self.max_atoms == np.inf else math.floor(self.max_atoms / natoms)
+        if self.max_length is not None:
+            last = min(last, math.floor(self.max_length**3 / volume * (1 + 1e-9)))
+
+        n = first
+        while n <= last:
+            hnfs = _symmetry_distinct(_hnf_matrices(n), rotations)
+            unimodular, cells = _reduce_bases(hnfs @ reduced)
+            lengths = np.linalg.norm(cells, axis=-1)
+            passed = np.all(np.absolute(_cell_angles(cells) - 90) < self.angle_tolerance, axis=-1)
+            passed &= np.linalg.norm(_inscribed_length_vecs(cells), axis=-1).min(-1) >= (
+                self.min_length
+            )
+            if self.max_length is not None:
+                passed &= lengths.max(axis=-1) <= self.max_length
+            if passed.any():
+                candidates = np.flatnonzero(passed)
+                best = candidates[np.argmin(lengths[candidates].max(axis=-1))]
+                matrix = unimodular[best] @ hnfs[best] @ reduce_u
+                self.transformation_matrix = _orient(matrix, atoms.cell.array)
+                return self._build(atoms)
+            n += 1
+        raise ValueError(
+            "While trying to solve for the supercell, no orthogonal supercell "
+            "was found within the atom and length limits."
+        )
+
+    def _build(self, atoms: Atoms) -> Atoms:
+        """Build the supercell of the current transformation matrix."""
+        from ase.build import make_supercell
+
+        return make_supercell(atoms, self.transformation_matrix)
+
     def check_exceptions(self, length_vecs, n_atoms):
         """Check supercell exceptions."""
         if n_atoms > self.max_atoms:
@@ -303,64 +663,42 @@ class CubicSupercellTransformation:
                 "While trying to solve for the supercell, the max length was exceeded."
             )
 
-    def check_constraints(self, length_vecs, n_atoms, superstructure):
+    def check_constraints(self, length_vecs, n_atoms, sc_lat_vecs):
         """
         Check if the supercell constraints are met.
 
+        Also accepts stacks of candidates (leading axes on every argument).
+
         Returns
         -------
-            bool
+            bool, or a bool array for stacked candidates
 
         """
-        return bool(
-            (
-                np.min(np.linalg.norm(length_vecs, axis=1)) >= self.min_length
-                and self.min_atoms <= n_atoms <= self.max_atoms
-            )
-            and (
-                not self.force_90_degrees
-                or np.all(
-                    np.absolute(np.array(superstructure.cell.angles()) - 90) < self.angle_tolerance
-                )
-            )
+        passed = (np.linalg.norm(length_vecs, axis=-1).min(axis=-1) >= self.min_length) & (
+            (self.min_atoms <= n_atoms) & (n_atoms <= self.max_atoms)
         )
+        if self.force_90_degrees:
+            angles = _cell_angles(sc_lat_vecs)
+            passed &= np.all(np.absolute(angles - 90) < self.angle_tolerance, axis=-1)
+        return passed if np.ndim(passed) else bool(passed)
 
     @staticmethod
-    def get_possible_supercell(lat_vecs, atoms, target_sc_lat_vecs):
+    def get_possible_supercell(lat_vecs, n_atoms, target_sc_lat_vecs):
         """
         Get the supercell possible with the set conditions.
 
+        Nothing is built: the atom count is ``|det(T)| * n_atoms`` and the
+        supercell lattice is ``T @ lat_vecs``.
+
         Returns
         -------
-            length_vecs, n_atoms, superstructure, transformation_matrix
+            length_vecs, n_atoms, sc_lat_vecs, transformation_matrix
         """
-        from ase.build import make_supercell
-
         transformation_matrix = target_sc_lat_vecs @ np.linalg.inv(lat_vecs)
         # round the entries of T and force T to be non-singular
         transformation_matrix = _round_and_make_arr_singular(transformation_matrix)
         proposed_sc_lat_vecs = transformation_matrix @ lat_vecs
-        # Find the shortest dimension length and direction
-        a = proposed_sc_lat_vecs[0]
-        b = proposed_sc_lat_vecs[1]
-        c = proposed_sc_lat_vecs[2]
-        length1_vec = c - _proj(c, a)  # a-c plane
-        length2_vec = a - _proj(a, c)
-        length3_vec = b - _proj(b, a)  # b-a plane
-        length4_vec = a - _proj(a, b)
-        length5_vec = b - _proj(b, c)  # b-c plane
-        length6_vec = c - _proj(c, b)
-        length_vecs = np.array(
-            [
-                length1_vec,
-                length2_vec,
-                length3_vec,
-                length4_vec,
-                length5_vec,
-                length6_vec,
-            ]
-        )
+        length_vecs = _inscribed_length_vecs(proposed_sc_lat_vecs)
         # Get number of atoms
-        superstructure = make_supercell(atoms, transformation_matrix)
-        n_atoms = len(superstructure)
-        return length_vecs, n_atoms, superstructure, transformation_matrix
+        n_atoms = round(abs(np.linalg.det(transformation_matrix))) * n_atoms
+        return length_vecs, n_atoms, proposed_sc_lat_vecs, transformation_matrix
@@ -2,14 +2,22 @@
 
 from ase.atoms import Atoms
 
+from ddpc.profiling import stage
+from ddpc.structure.symmetry import memoized, structure_key
 
-def find_primitive(atoms: Atoms, symprec: float = 1e-5, angle_tolerance: float = -1.0) -> Atoms:
+
+def find_primitive(
+    atoms: Atoms, symprec: float = 1e-5, angle_tolerance: float = -1.0, *, cache: bool = False
+) -> Atoms:
     """Find primitive cell of crystal structure.
 
+    The result is memoized like :func:`ddpc.structure.get_symmetry`.
+
     Args:
         atoms: Input structure (may be supercell)
         symprec: Symmetry precision in Angstrom
         angle_tolerance : Symmetry search tolerance in the unit of angle deg. If negative, an internally optimized routine is used to judge symmetry.
+        cache: Also reuse/store the result in the on-disk symmetry cache (default: False)
 
     Returns
     -------
@@ -21,7 +29,7 @@ def find_primitive(atoms: Atoms, symprec: float = 1e-5, angle_tolerance: float =
         ValueError: If structure invalid
     """
     try:
-        from spglib import find_primitive as spg_find_prim
+        import spglib  # noqa: F401
     except ImportError as e:
         raise ImportError(
             "'find_primitive' requires 'spglib'.\nInstall with: pip install ddpc-structure"
@@ -30,6 +38,21 @@ def find_primitive(atoms: Atoms, symprec: float = 1e-5, angle_tolerance: float =
     if not atoms.cell.array.any():
         raise ValueError("Input structure has no cell information")
 
+    # the atom order of the primitive cell follows the input
+    key = ("primitive", structure_key(atoms, symprec, ordered=True), symprec, angle_tolerance)
+    with stage("primitive"):
+        prim = memoized(key, lambda: _find_primitive(atoms, symprec, angle_tolerance), cache)
+
+    return Atoms(
+        numbers=prim["numbers"],
+        cell=prim["cell"],
+        scaled_positions=prim["scaled_positions"],
+    )
+
+
+def _find_primitive(atoms: Atoms, symprec: float, angle_tolerance: float) -> dict:
+    from spglib import find_primitive as spg_find_prim
+
     lat = tuple(atoms.cell.array)
     spo = tuple(atoms.get_scaled_positions())
     num = tuple(atoms.numbers)
@@ -41,10 +64,8 @@ def find_primitive(atoms: Atoms, symprec: float = 1e-5, angle_tolerance: float =
     else:
         raise ValueError("spglib failed to find primitive cell")
 
-    prim = Atoms(
-        numbers=numbers,
-        cell=lattice,
-        scaled_positions=scaled_positions,
-    )
-
-    return prim
+    return {
+        "cell": lattice.tolist(),
+        "scaled_positions": scaled_positions.tolist(),
+        "numbers": numbers.tolist(),
+    }
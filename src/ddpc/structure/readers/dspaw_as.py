@@ -2,7 +2,6 @@
 
 from __future__ import annotations
 
-import re
 from pathlib import Path
 from typing import TYPE_CHECKING, Any, Dict, List, Tuple, Union
 
@@ -14,45 +13,91 @@ if TYPE_CHECKING:
     from ase.atoms import Atoms
 
 
+# values per atom of every Mag/Fix column in the coordinate header line
+ATOM_COLUMNS = {
+    "Mag": 1,
+    "Mag_x": 1,
+    "Mag_y": 1,
+    "Mag_z": 1,
+    "Fix": 3,
+    "Fix_x": 1,
+    "Fix_y": 1,
+    "Fix_z": 1,
+}
+
+
 def read(p: Union[Path, str] = "structure.as") -> Atoms:
     """Read DS-PAW .as format and convert to ASE Atoms.
 
     Supports lattice constraints, atomic constraints, and magnetic moments.
+    The atom block is tokenized once into columns, and each column is
+    converted in a single pass, so large structures read in linear time.
     """
-    from ase.atoms import Atoms
-
     absfile = absf(p)
-    lines = remove_comments(absfile, "#")
+    return parse(remove_comments(absfile, "#"))
+
+
+def parse(lines: List[str]) -> Atoms:
+    """Build ASE Atoms from the comment-free, non-empty lines of a .as file."""
+    from ase.atoms import Atoms
 
     natom = int(lines[1])
     lattice = _get_lat(lines)
     lat_fixs = _get_latfixs(lines)
-    elements, coords = _get_ele_pos(lines, natom)
-    atom_fix, mag = _get_mag_fix(lines, natom)
+    header = lines[6].split()
+    columns = header[1:]
+    table = _get_atom_table(lines[7 : 7 + natom], 4 + _column_width(columns))
+    elements = [e.replace("_", "") for e in table[0]]
+    coords = np.stack([_to_floats(col) for col in table[1:4]], axis=1)
+    atom_fix, mag = _get_mag_fix(table[4:], columns)
 
     if "Mag" in mag:
         magmoms = mag.pop("Mag")
     elif "Mag_x" in mag and "Mag_y" in mag and "Mag_z" in mag:
-        magmoms = np.array([mag.pop("Mag_x"), mag.pop("Mag_y"), mag.pop("Mag_z")]).T.tolist()
+        magmoms = np.stack([mag.pop("Mag_x"), mag.pop("Mag_y"), mag.pop("Mag_z")], axis=1)
     else:
         magmoms = None
 
-    freedom = {**{"lat": lat_fixs}, **atom_fix} if any(lat_fixs) else atom_fix
-    atoms = Atoms(symbols=elements, cell=lattice, info=freedom, magmoms=magmoms, pbc=True)
-    cd = lines[6].strip().split()[0]
-    _set_poses(atoms, cd, coords)
+    freedom = {"lat": lat_fixs, **atom_fix} if any(lat_fixs) else atom_fix
+    if header[0] == "Direct":
+        positions = {"scaled_positions": coords}
+    elif header[0] == "Cartesian":
+        positions = {"positions": coords}
+    else:
+        raise ValueError("Structure file format error!")
 
-    return atoms
+    return Atoms(
+        symbols=elements, cell=lattice, info=freedom, magmoms=magmoms, pbc=True, **positions
+    )
+
+
+def _column_width(columns: List[str]) -> int:
+    """Return the number of values per atom for the ``Mag``/``Fix`` columns."""
+    for item in columns:
+        if item not in ATOM_COLUMNS:
+            raise ValueError(f"Unknown atom column '{item}' in structure file!")
+    return sum(ATOM_COLUMNS[item] for item in columns)
+
+
+def _get_atom_table(atom_lines: List[str], ncol: int) -> List[List[str]]:
+    """Split the atom block into ``ncol`` columns of strings, ignoring extra values."""
+    tokens = " ".join(atom_lines).split()
+    width = len(atom_lines[0].split()) if atom_lines else ncol
+    if width < ncol or len(tokens) != width * len(atom_lines):
+        # ragged rows, split them one by one
+        rows = [line.split() for line in atom_lines]
+        for i, row in enumerate(rows):
+            if len(row) < ncol:
+                raise ValueError(
+                    f"Structure file format error: atom {i + 1} has fewer than {ncol} values!"
+                )
+        tokens = [value for row in rows for value in row[:ncol]]
+        width = ncol
+    return [tokens[j::width] for j in range(ncol)]
 
 
-def _set_poses(atoms: Atoms, cd: str, coords: np.ndarray) -> None:
-    """Set atomic positions based on coordinate type."""
-    if cd == "Direct":
-        atoms.set_scaled_positions(coords)
-    elif cd == "Cartesian":
-        atoms.set_positions(coords)
-    else:
-        raise ValueError("Structure file format error!")
+def _to_floats(column: List[str]) -> np.ndarray:
+    return np.fromiter(map(float, column), dtype=float, count=len(column))
 
 
 def _get_latfixs(lines: List[str]) -> List[bool]:
@@ -90,62 +135,29 @@ def _get_lat(lines: List[str]) -> np.ndarray:
     return np.asarray(lattice).reshape(3, 3)
 
 
-def _get_ele_pos(lines: List[str], natom: int) -> Tuple[List[str], np.ndarray]:
-    """Extract element symbols and positions."""
-    elements = []
-    positions = []
-    for i in range(natom):
-        atom_data = lines[i + 7].strip().split()
-        elements.append(atom_data[0])
-        positions.extend([float(atom_data[1]), float(atom_data[2]), float(atom_data[3])])
-    coords = np.asarray(positions).reshape(-1, 3)
-    elements = [re.sub(r"_", "", e) for e in elements]
-
-    return elements, coords
-
-
-def _get_mag_fix(lines: List[str], natom: int) -> Tuple[Dict, Dict]:
-    """Extract magnetic moments and atomic constraints."""
-    l6 = lines[6].strip()
-    mf_info = l6.split()[1:]
-    for item in mf_info:
-        assert item in [
-            "Mag",
-            "Mag_x",
-            "Mag_y",
-            "Mag_z",
-            "Fix",
-            "Fix_x",
-            "Fix_y",
-            "Fix_z",
-        ]
-
-    def handle_fix_value(val_str):
-        return val_str.startswith("T")
-
-    mag_fix_dict: Dict[str, List] = {}
-    for mf_index, item in enumerate(mf_info):
-        values: List[Any] = []
-        for i in range(natom):
-            atom_data = lines[i + 7].strip().split()
-            mf_data = atom_data[4:]
-
-            if item == "Fix":
-                values.append(
-                    [
-                        handle_fix_value(mf_data[mf_index]),
-                        handle_fix_value(mf_data[mf_index + 1]),
-                        handle_fix_value(mf_data[mf_index + 2]),
-                    ]
-                )
-            elif item.startswith("Fix_"):
-                values.append(handle_fix_value(mf_data[mf_index]))
-            else:
-                values.append(float(mf_data[mf_index]))
+def _get_mag_fix(
+    columns_data: List[List[str]], columns: List[str]
+) -> Tuple[Dict[str, List[Any]], Dict[str, np.ndarray]]:
+    """Decode the ``Fix``/``Mag`` columns of the atom table.
 
-        mag_fix_dict[item] = values
+    A ``Fix`` column spans three values (x, y, z); every other column one.
 
-    atom_fix = {k: v for k, v in mag_fix_dict.items() if k.startswith("Fix")}
-    mag = {k: v for k, v in mag_fix_dict.items() if k.startswith("Mag")}
+    Returns
+    -------
+        Atomic constraints as lists of bools, and magnetic moments as arrays
+    """
+    atom_fix: Dict[str, List[Any]] = {}
+    mag: Dict[str, np.ndarray] = {}
+    offset = 0
+    for item in columns:
+        width = ATOM_COLUMNS[item]
+        if item.startswith("Fix"):
+            fixed = [
+                [v.startswith("T") for v in col] for col in columns_data[offset : offset + width]
+            ]
+            atom_fix[item] = list(map(list, zip(*fixed))) if width > 1 else fixed[0]
+        else:
+            mag[item] = _to_floats(columns_data[offset])
+        offset += width
 
     return atom_fix, mag
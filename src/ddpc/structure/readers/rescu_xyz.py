@@ -18,10 +18,13 @@ def read(p: Union[str, Path]) -> Atoms:
 
     Supports magnetic moments and position constraints.
     """
-    from ase.atoms import Atoms
-
     absfile = absf(p)
-    lines = remove_comments(absfile, "#")
+    return parse(remove_comments(absfile, "#"))
+
+
+def parse(lines: List[str]) -> Atoms:
+    """Build ASE Atoms from the comment-free, non-empty lines of a RESCU XYZ file."""
+    from ase.atoms import Atoms
 
     (
         nele,
@@ -1,19 +1,49 @@
-"""Symmetry analysis for crystal structures."""
+"""Symmetry analysis for crystal structures.
+
+Results are memoized under a canonical hash of the structure (lattice, wrapped
+positions and atomic numbers, rounded to a tenth of ``symprec`` and independent
+of the atom order), so analysing the same structure again is free. The most
+recent :data:`MEMORY_ENTRIES` results are kept in memory; with ``cache=True`` they
+are also stored as small JSON files in ``$DDPC_CACHE_DIR/symmetry`` (default
+``~/.cache/ddpc/symmetry``) and shared between processes.
+"""
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+import hashlib
+import json
+import os
+import shutil
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
+from functools import lru_cache
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ddpc._utils import user_cache_dir
+from ddpc.profiling import stage
 
 if TYPE_CHECKING:
     from ase.atoms import Atoms
 
+SYMMETRY_CACHE_VERSION = 2
+MEMORY_ENTRIES = 256
+SCAN_SYMPRECS = (1e-5, 3e-5, 1e-4, 3e-4, 1e-3, 3e-3, 1e-2, 3e-2, 1e-1)
 
-def get_symmetry(
+_memory: OrderedDict[Tuple, Any] = OrderedDict()
+
+
+def get_symmetry(  # noqa: PLR0913
     atoms: Atoms,
     symprec: float = 1e-5,
     angle_tolerance: float = -1.0,
     hall_number: int = 0,
     symbol_type: int = 0,
+    *,
+    cache: bool = False,
 ) -> dict:
     """Get symmetry information using spglib.
 
@@ -29,6 +59,7 @@ def get_symmetry(
             `origin shift`, `wyckoffs`, `std_lattice`, `std_positions`, `std_types` and `std_rotation_matrix`, but not to `rotations`
             and `translations` since the later set is defined with respect to the basis vectors of user's input (the `cell` argument).
         symbol_type: With ``symbol_type=1``, Schoenflies symbol is given instead of international symbol.
+        cache: Also reuse/store the result in the on-disk symmetry cache (default: False)
 
     Returns
     -------
@@ -38,6 +69,7 @@ def get_symmetry(
         - point_group: Point group symbol (str)
         - crystal_system: Crystal system (str)
         - hall_number: Hall symbol number (int)
+        - primitive_atoms: Number of atoms in the primitive cell (int)
 
     Raises
     ------
@@ -45,7 +77,7 @@ def get_symmetry(
         ValueError: If structure invalid
     """
     try:
-        from spglib import get_spacegroup, get_symmetry_dataset
+        import spglib  # noqa: F401
     except ImportError as e:
         raise ImportError(
             "'get_symmetry' requires 'spglib'.\nInstall with: pip install ddpc-structure"
@@ -54,33 +86,316 @@ def get_symmetry(
     if not atoms.cell.array.any():
         raise ValueError("Input structure has no cell information")
 
+    key = ("symmetry", structure_key(atoms, symprec), symprec, angle_tolerance, hall_number)
+    with stage("symmetry"):
+        result = memoized(
+            key, lambda: _analyse(atoms, symprec, angle_tolerance, hall_number), cache
+        )
+    symbols = result.pop("symbols")
+    return {"spacegroup": symbols[symbol_type == 1], **result}
+
+
+def _analyse(atoms: Atoms, symprec: float, angle_tolerance: float, hall_number: int) -> dict:
+    """Run spglib once and derive every reported value from its dataset."""
+    from spglib import get_symmetry_dataset
+
     cell = (atoms.cell.array, atoms.get_scaled_positions(), atoms.numbers)
     dataset = get_symmetry_dataset(cell, symprec, angle_tolerance, hall_number)
 
     if dataset is None:
         raise ValueError("spglib failed to determine symmetry")
 
-    spacegroup_str = get_spacegroup(cell, symprec, angle_tolerance, symbol_type)
-
     # Handle different spglib versions - older versions return dict, newer return object
-    if isinstance(dataset, dict):
-        spacegroup_number = dataset["number"]
-        point_group = dataset["pointgroup"]
-        hall_number = dataset["hall_number"]
-    else:
-        spacegroup_number = dataset.number
-        point_group = dataset.pointgroup
-        hall_number = dataset.hall_number
+    spacegroup_number = _field(dataset, "number")
+    point_group = _field(dataset, "pointgroup")
+    hall_number = _field(dataset, "hall_number")
+    primitive_atoms = len(np.unique(_field(dataset, "mapping_to_primitive")))
 
+    # symbols of the default setting, whatever hall_number was requested
+    international, schoenflies = _spacegroup_symbols(spacegroup_number)
     return {
-        "spacegroup": spacegroup_str,
-        "spacegroup_number": spacegroup_number,
-        "point_group": point_group,
+        "symbols": [
+            f"{international} ({spacegroup_number})",
+            f"{schoenflies} ({spacegroup_number})",
+        ],
+        "spacegroup_number": int(spacegroup_number),
+        "point_group": str(point_group),
         "crystal_system": _get_crystal_system(spacegroup_number),
-        "hall_number": hall_number,
+        "hall_number": int(hall_number),
+        "primitive_atoms": primitive_atoms,
     }
 
 
+class SymmetryScan(NamedTuple):
+    """Symmetry found at one tolerance of :func:`scan_symmetry`.
+
+    Attributes
+    ----------
+        symprec: Symmetry precision in Angstrom
+        spacegroup: International symbol and number, None if spglib failed
+        spacegroup_number: Space group number, None if spglib failed
+        hall_number: Hall symbol number, None if spglib failed
+        primitive_atoms: Number of atoms in the primitive cell, None if spglib failed
+        evaluated: False if taken from the equal results at neighbouring tolerances
+    """
+
+    symprec: float
+    spacegroup: Optional[str]
+    spacegroup_number: Optional[int]
+    hall_number: Optional[int]
+    primitive_atoms: Optional[int]
+    evaluated: bool
+
+
+def scan_symmetry(  # noqa: PLR0913
+    atoms: Atoms,
+    symprecs: Sequence[float] = SCAN_SYMPRECS,
+    angle_tolerance: float = -1.0,
+    *,
+    exhaustive: bool = False,
+    workers: int = 1,
+    cache: bool = False,
+) -> List[SymmetryScan]:
+    """Find how the space group changes with the symmetry tolerance.
+
+    The space group is piecewise constant in ``symprec``, so the sorted
+    tolerances are bisected: when two tolerances give the same space group,
+    Hall number and primitive size, the tolerances between them are assumed
+    to give it too and are not evaluated. A sweep with few transitions costs a
+    few :func:`get_symmetry` calls; each round of bisection points can run in
+    parallel processes. Results go through the same memoization as
+    :func:`get_symmetry`.
+
+    Args:
+        atoms: Input structure
+        symprecs: Tolerances in Angstrom (default: 1e-5 to 1e-1, two per decade)
+        angle_tolerance: Angle tolerance in degrees, negative for spglib's default
+        exhaustive: Evaluate every tolerance instead of bisecting (default: False)
+        workers: Number of processes evaluating a round of tolerances (default: 1);
+            only worthwhile for large cells
+        cache: Also reuse/store results in the on-disk symmetry cache (default: False)
+
+    Returns
+    -------
+        One :class:`SymmetryScan` per distinct tolerance, in increasing order
+
+    Raises
+    ------
+        ImportError: If spglib not installed
+        ValueError: If structure invalid or no tolerance is given
+    """
+    try:
+        import spglib  # noqa: F401
+    except ImportError as e:
+        raise ImportError(
+            "'scan_symmetry' requires 'spglib'.\nInstall with: pip install ddpc-structure"
+        ) from e
+
+    if not atoms.cell.array.any():
+        raise ValueError("Input structure has no cell information")
+    tolerances = sorted({float(t) for t in symprecs})
+    if not tolerances:
+        raise ValueError("At least one symprec is required")
+
+    keys = [
+        ("symmetry", structure_key(atoms, symprec), symprec, angle_tolerance, 0)
+        for symprec in tolerances
+    ]
+    results: Dict[int, Optional[dict]] = {}
+
+    with ExitStack() as stack:
+        pool: Optional[ProcessPoolExecutor] = None
+
+        def evaluate(indices: List[int]) -> None:
+            nonlocal pool
+            missing = []
+            for i in indices:
+                results[i] = _lookup(keys[i], cache)
+                if results[i] is None:
+                    missing.append(i)
+            jobs = [(atoms, tolerances[i], angle_tolerance) for i in missing]
+            if workers > 1 and len(jobs) > 1:
+                if pool is None:
+                    pool = stack.enter_context(ProcessPoolExecutor(max_workers=workers))
+                computed = list(pool.map(_scan_one, *zip(*jobs)))
+            else:
+                computed = [_scan_one(*job) for job in jobs]
+            for i, result in zip(missing, computed):
+                # spglib failures are not memoized
+                results[i] = (
+                    None if result is None else memoized(keys[i], lambda r=result: r, cache)
+                )
+
+        if exhaustive:
+            evaluate(list(range(len(tolerances))))
+            return [_scan_row(tolerances[i], results[i], True) for i in range(len(tolerances))]
+
+        last = len(tolerances) - 1
+        evaluate(sorted({0, last}))
+        inferred: Dict[int, int] = {}
+        pending = [(0, last)] if last > 1 else []
+        while pending:
+            splits = []
+            for lo, hi in pending:
+                if _summary(results[lo]) == _summary(results[hi]):
+                    inferred.update(dict.fromkeys(range(lo + 1, hi), lo))
+                else:
+                    splits.append((lo, (lo + hi) // 2, hi))
+            evaluate([mid for _, mid, _ in splits])
+            pending = [
+                (a, b) for lo, mid, hi in splits for a, b in ((lo, mid), (mid, hi)) if b - a > 1
+            ]
+
+    return [
+        _scan_row(tolerances[i], results[inferred.get(i, i)], i not in inferred)
+        for i in range(len(tolerances))
+    ]
+
+
+def _scan_one(atoms: Atoms, symprec: float, angle_tolerance: float) -> Optional[dict]:
+    """Analyse one tolerance of a scan, None if spglib fails."""
+    try:
+        return _analyse(atoms, symprec, angle_tolerance, 0)
+    except ValueError:
+        return None
+
+
+def _summary(result: Optional[dict]) -> Tuple:
+    """Values compared between tolerances of a scan."""
+    if result is None:
+        return (None, None, None)
+    return (result["spacegroup_number"], result["hall_number"], result["primitive_atoms"])
+
+
+def _scan_row(symprec: float, result: Optional[dict], evaluated: bool) -> SymmetryScan:
+    number, hall, nprim = _summary(result)
+    symbol = None if result is None else result["symbols"][0]
+    return SymmetryScan(symprec, symbol, number, hall, nprim, evaluated)
+
+
+@lru_cache(maxsize=None)
+def _spacegroup_symbols(number: int) -> Tuple[str, str]:
+    """Return the short international and Schoenflies symbols of a space group type.
+
+    The first Hall number of a space group is its default setting, as chosen
+    by spglib when no Hall number is given.
+    """
+    from spglib import get_spacegroup_type
+
+    for hall in range(1, 531):
+        spg_type = get_spacegroup_type(hall)
+        if spg_type is not None and _field(spg_type, "number") == number:
+            return _field(spg_type, "international_short"), _field(spg_type, "schoenflies")
+    raise ValueError(f"Unknown space group number {number}")
+
+
+def _field(record: Any, name: str) -> Any:
+    return record[name] if isinstance(record, dict) else getattr(record, name)
+
+
+def structure_key(atoms: Atoms, symprec: float = 1e-5, ordered: bool = False) -> str:
+    """Return a hash identifying a structure for symmetry analysis.
+
+    The lattice and Cartesian positions (of the wrapped fractional coordinates)
+    are rounded to ``symprec / 10`` and atoms are sorted, so the key does not
+    depend on the atom order or on noise well below ``symprec``.
+
+    Args:
+        atoms: Structure
+        symprec: Symmetry precision in Angstrom
+        ordered: Keep the atom order, for results that depend on it
+
+    Returns
+    -------
+        Hex digest
+    """
+    step = symprec / 10
+    lattice = atoms.cell.array
+    cart = np.mod(atoms.get_scaled_positions(wrap=False), 1.0) @ lattice
+    cart = np.rint(cart / step).astype(np.int64)
+    numbers = np.asarray(atoms.numbers, dtype=np.int64)
+    order = slice(None) if ordered else np.lexsort((cart[:, 2], cart[:, 1], cart[:, 0], numbers))
+    hasher = hashlib.blake2b(digest_size=16)
+    for arr in (np.rint(lattice / step).astype(np.int64), numbers[order], cart[order]):
+        hasher.update(np.ascontiguousarray(arr).tobytes())
+    return hasher.hexdigest()
+
+
+def memoized(key: Tuple, compute: Callable[[], Dict], cache: bool = False) -> Dict:
+    """Return ``compute()`` for ``key``, from memory or the on-disk store if possible.
+
+    Args:
+        key: JSON-serializable tuple identifying the result
+        compute: Function computing the result, a JSON-serializable dict
+        cache: Also reuse/store the result on disk
+
+    Returns
+    -------
+        A copy of the result, safe to modify
+    """
+    result = _lookup(key, cache)
+    if result is None:
+        result = compute()
+        if cache:
+            _store(_entry_path(key), result)
+    _memory[key] = result
+    while len(_memory) > MEMORY_ENTRIES:
+        _memory.popitem(last=False)
+    return _copy(result)
+
+
+def _lookup(key: Tuple, cache: bool) -> Any:
+    """Return the stored result for ``key`` (not a copy), None if there is none."""
+    if key in _memory:
+        _memory.move_to_end(key)
+        return _memory[key]
+    return _load(_entry_path(key)) if cache else None
+
+
+def _copy(result: Dict) -> Dict:
+    return json.loads(json.dumps(result))
+
+
+def _entry_path(key: Tuple) -> Path:
+    text = json.dumps([SYMMETRY_CACHE_VERSION, *key])
+    return (
+        symmetry_cache_dir() / f"{hashlib.blake2b(text.encode(), digest_size=16).hexdigest()}.json"
+    )
+
+
+def _load(entry: Path) -> Any:
+    try:
+        return json.loads(entry.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+def _store(entry: Path, result: Dict) -> None:
+    try:
+        entry.parent.mkdir(parents=True, exist_ok=True)
+        tmp = entry.with_name(f".{entry.name}.{os.getpid()}")
+        tmp.write_text(json.dumps(result), encoding="utf-8")
+        os.replace(tmp, entry)
+    except OSError:
+        pass
+
+
+def symmetry_cache_dir() -> Path:
+    """Return the directory of the on-disk symmetry cache."""
+    return user_cache_dir() / "symmetry"
+
+
+def clear_symmetry_cache(disk: bool = False) -> None:
+    """Forget memoized symmetry results.
+
+    Args:
+        disk: Also remove the on-disk store
+    """
+    _memory.clear()
+    if disk:
+        shutil.rmtree(symmetry_cache_dir(), ignore_errors=True)
+
+
 def _get_crystal_system(spacegroup_number: int) -> str:
     """Map space group number to crystal system."""
     crystal_systems = [
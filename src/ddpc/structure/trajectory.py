@@ -0,0 +1,256 @@
+"""Multi-frame DS-PAW .as and xyz files with random frame access.
+
+Frames are located through a byte-offset index built by one vectorized scan of
+the file and persisted beside it as ``.<name>.frames.npy``, so reading frame N
+later seeks straight to it without parsing frames 0 to N-1. The index stores the
+file size and modification time and is rebuilt when either changes; if the
+directory is not writable it is only kept for the current call.
+
+Every frame is parsed exactly as a file holding only that frame would be, so
+``read_frame(path, 0)`` of a single-frame file equals ``read_structure(path)``.
+"""
+
+from __future__ import annotations
+
+import io
+import mmap
+import os
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Dict, Iterator, List, Tuple, Union
+
+import numpy as np
+
+from ddpc._utils import strip_comments
+
+if TYPE_CHECKING:
+    from ase.atoms import Atoms
+
+INDEX_VERSION = 1
+SCAN_CHUNK = 1 << 24
+
+# characters starting a comment line that is not part of a frame
+_COMMENTS = {"dspaw": b"#", "rescu": b"#%", "xyz": b"#%"}
+_SPACE = np.zeros(256, dtype=bool)
+_SPACE[list(b" \t\n\r\x0b\x0c")] = True
+
+FrameIndex = Union[int, slice]
+
+
+def index_path(path: Union[str, Path]) -> Path:
+    """Return the file holding the frame index of ``path``."""
+    path = Path(path)
+    return path.with_name(f".{path.name}.frames.npy")
+
+
+def frame_offsets(path: Union[str, Path], kind: str) -> np.ndarray:
+    """Return the byte range of every frame, from its first to its last line.
+
+    The persisted index is reused when it matches the file size and
+    modification time, otherwise the file is scanned and the index saved.
+
+    Args:
+        path: Trajectory file
+        kind: ``"dspaw"`` for .as files, ``"rescu"`` or ``"xyz"`` for xyz files
+
+    Returns
+    -------
+        int64 array of shape ``(nframes, 2)`` with the start and end offsets
+
+    Raises
+    ------
+        ValueError: If a frame does not start with an atom count
+    """
+    path = Path(path)
+    stat = path.stat()
+    layout = 0 if kind == "dspaw" else 1
+    stamp = [INDEX_VERSION, layout, stat.st_size, stat.st_mtime_ns]
+    cache = index_path(path)
+    try:
+        saved = np.load(cache, allow_pickle=False)
+        if saved[:4].tolist() == stamp:
+            return saved[4:].reshape(-1, 2)
+    except (OSError, ValueError):
+        pass
+
+    offsets = _scan(path, kind)
+    try:
+        tmp = cache.with_name(f"{cache.name}.{os.getpid()}.tmp")
+        with open(tmp, "wb") as fout:
+            np.save(fout, np.concatenate([np.array(stamp, dtype=np.int64), offsets.ravel()]))
+        os.replace(tmp, cache)
+    except OSError:
+        pass
+    return offsets
+
+
+def count_frames(path: Union[str, Path], kind: str = "xyz") -> int:
+    """Return the number of complete frames in ``path``."""
+    return len(frame_offsets(path, kind))
+
+
+def iread_frames(
+    path: Union[str, Path], kind: str, index: FrameIndex = slice(None)
+) -> Iterator[Atoms]:
+    """Yield the frames selected by ``index`` (an int or a slice).
+
+    Args:
+        path: Trajectory file
+        kind: ``"dspaw"``, ``"rescu"`` (RESCU parser) or ``"xyz"`` (ASE xyz
+            parser with RESCU fallback, as :func:`ddpc.structure.read_structure`)
+        index: Frame number or slice, negative values count from the end
+
+    Raises
+    ------
+        IndexError: If an integer index is out of range
+        ValueError: If the file or a frame is malformed
+    """
+    offsets = frame_offsets(path, kind)
+    parse = _parser(kind)
+    selected = range(len(offsets))
+    if isinstance(index, slice):
+        selected = selected[index]
+    else:
+        selected = [selected[index]]
+
+    with open(path, "rb") as fin:
+        for i in selected:
+            start, end = offsets[i]
+            fin.seek(start)
+            text = fin.read(int(end - start)).decode("utf-8")
+            yield parse(text)
+
+
+def read_frame(path: Union[str, Path], i: int, kind: str) -> Atoms:
+    """Read frame ``i``, see :func:`iread_frames`."""
+    return next(iread_frames(path, kind, i))
+
+
+def _parser(kind: str) -> Callable[[str], Atoms]:
+    from ddpc.structure.readers import dspaw_as, rescu_xyz
+
+    def parse_xyz(text: str) -> Atoms:
+        from ase.io import read
+
+        try:
+            return read(io.StringIO(text), format="xyz")
+        except Exception:
+            return rescu_xyz.parse(strip_comments(text, "#"))
+
+    parsers: Dict[str, Callable[[str], Atoms]] = {
+        "dspaw": lambda text: dspaw_as.parse(strip_comments(text, "#")),
+        "rescu": lambda text: rescu_xyz.parse(strip_comments(text, "#")),
+        "xyz": parse_xyz,
+    }
+    if kind not in parsers:
+        raise ValueError(f"Unknown trajectory kind '{kind}', expected one of {list(parsers)}")
+    return parsers[kind]
+
+
+def _scan(path: Path, kind: str) -> np.ndarray:
+    """Find frame offsets from the positions of content lines."""
+    if kind not in _COMMENTS:
+        raise ValueError(f"Unknown trajectory kind '{kind}', expected one of {list(_COMMENTS)}")
+    size = path.stat().st_size
+    if size == 0:
+        return np.zeros((0, 2), dtype=np.int64)
+
+    with open(path, "rb") as fin, mmap.mmap(fin.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        lines = _content_lines(mm, _COMMENTS[kind])
+        frames = _walk_as(mm, lines) if kind == "dspaw" else _walk_xyz(mm, lines)
+    return np.array(frames, dtype=np.int64).reshape(-1, 2)
+
+
+def _content_lines(mm: mmap.mmap, comments: bytes) -> np.ndarray:
+    """Return the start offset of every line that is neither blank nor a comment."""
+    comment = np.zeros(256, dtype=bool)
+    comment[list(comments)] = True
+    found: List[np.ndarray] = []
+    pos, size = 0, len(mm)
+    while pos < size:
+        stop = min(pos + SCAN_CHUNK, size)
+        if stop < size:
+            # end the block at a line break
+            nl = mm.rfind(b"\n", pos, stop)
+            stop = nl + 1 if nl >= 0 else (mm.find(b"\n", stop) + 1 or size)
+        block = np.frombuffer(mm, dtype=np.uint8, count=stop - pos, offset=pos)
+        breaks = np.flatnonzero(block == ord("\n"))
+        starts = np.concatenate(([0], breaks + 1))
+        starts = starts[starts < len(block)]
+        ends = np.append(breaks, len(block))[: len(starts)]
+        nonspace = np.flatnonzero(~_SPACE[block])
+        first = np.searchsorted(nonspace, starts)
+        first_pos = np.append(nonspace, len(block))[first]
+        content = first_pos < ends
+        content[content] &= ~comment[block[first_pos[content]]]
+        found.append(starts[content] + pos)
+        del block
+        pos = stop
+    return np.concatenate(found) if found else np.zeros(0, dtype=np.int64)
+
+
+def _line_end(mm: mmap.mmap, start: int) -> int:
+    """Return the offset just past the line starting at ``start``."""
+    return mm.find(b"\n", start) + 1 or len(mm)
+
+
+def _line_int(mm: mmap.mmap, start: int, frame: int) -> int:
+    line = mm[start : _line_end(mm, start)].split(b"#")[0]
+    try:
+        return int(line)
+    except ValueError:
+        raise ValueError(
+            f"Frame {frame} does not start with an atom count: {line[:40]!r}"
+        ) from None
+
+
+def _walk_as(mm: mmap.mmap, lines: np.ndarray) -> List[Tuple[int, int]]:
+    """Frames are 7 header lines (atom count on the second) plus one line per atom.
+
+    An incomplete last frame (e.g. still being written) is left out.
+    """
+    frames: List[Tuple[int, int]] = []
+    k = 0
+    while k + 1 < len(lines):
+        natom = _line_int(mm, int(lines[k + 1]), len(frames))
+        last = k + 6 + natom
+        if last >= len(lines):
+            break
+        frames.append((int(lines[k]), _line_end(mm, int(lines[last]))))
+        k = last + 1
+    return frames
+
+
+def _walk_xyz(mm: mmap.mmap, lines: np.ndarray) -> List[Tuple[int, int]]:
+    """Frames are an atom count, one title line (possibly blank) and one line per atom.
+
+    An incomplete last frame (e.g. still being written) is left out.
+    """
+    frames: List[Tuple[int, int]] = []
+    k = 0
+    while k < len(lines):
+        start = int(lines[k])
+        natom = _line_int(mm, start, len(frames))
+        title = _line_end(mm, start)
+        # first atom line, skipping the title whether it is blank or not
+        j = int(np.searchsorted(lines, title, side="right"))
+        last = j + natom - 1
+        if title == len(mm) or last >= len(lines):
+            break
+        end = _line_end(mm, int(lines[last])) if natom else _line_end(mm, title)
+        frames.append((start, end))
+        k = last + 1
+    return frames
+
+
+def normalize_index(index: Union[int, slice, str]) -> Tuple[FrameIndex, bool]:
+    """Turn an ASE-style index (``3``, ``-1``, ``"::10"``) into an int or slice.
+
+    Returns
+    -------
+        The index, and whether it selects a single frame
+    """
+    if isinstance(index, str):
+        from ase.io.formats import string2index
+
+        index = string2index(index)
+    return index, not isinstance(index, slice)
@@ -2,11 +2,12 @@
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+import io
+from typing import TYPE_CHECKING, Dict, List, Optional, TextIO
 
 import numpy as np
 
-from ddpc._utils import absf
+from ddpc._utils import absf, write_rows
 
 if TYPE_CHECKING:
     from ase.atoms import Atoms
@@ -16,94 +17,79 @@ def write(p: str, atoms: Atoms) -> str:
     """Write ASE Atoms to DS-PAW .as format.
 
     Preserves lattice constraints, atomic constraints, and magnetic moments.
+    Atom lines are formatted in blocks and streamed to the file, so memory use
+    does not grow with the number of atoms.
+
+    Returns
+    -------
+        The file content if ``p`` is empty or ``"-"`` (nothing is written),
+        otherwise an empty string
     """
-    lines = "Total number of atoms\n"
-    lines += "%d\n" % len(atoms)
-
-    freedom = atoms.info
-    lines = _add_lat_lines(freedom, lines, atoms)
-    lines = _add_atom_lines(freedom, lines, atoms)
-    lines = _write_to_file(p, lines)
-
-    return lines
-
-
-def _add_lat_lines(freedom: dict, lines: str, atoms: Atoms) -> str:
-    """Add lattice vector lines."""
-    if "lat" in freedom:
-        lat_fix = freedom.pop("lat")
-        lines += "Lattice Fix_x Fix_y Fix_z\n"
-        formatted_fts = []
-        for ft in lat_fix:
-            ft_formatted = "T" if ft else "F"
-            formatted_fts.append(ft_formatted)
-        fix_str1 = " ".join(formatted_fts[:3])
-        fix_str2 = " ".join(formatted_fts[3:6])
-        fix_str3 = " ".join(formatted_fts[6:9])
-        fix_strs = [fix_str1, fix_str2, fix_str3]
+    if not p or p == "-":
+        buffer = io.StringIO()
+        _write_lines(buffer, atoms)
+        return buffer.getvalue()
+
+    absfile = absf(p)
+    absfile.parent.mkdir(parents=True, exist_ok=True)
+    with open(absfile, "w", encoding="utf-8") as fout:
+        _write_lines(fout, atoms)
+    return ""
+
+
+def _write_lines(fout: TextIO, atoms: Atoms) -> None:
+    fout.write("Total number of atoms\n")
+    fout.write("%d\n" % len(atoms))
+
+    freedom = dict(atoms.info)
+    lat_fix = freedom.pop("lat", None)
+    _write_lat_lines(fout, atoms, lat_fix)
+    _write_atom_lines(fout, atoms, freedom)
+
+
+def _write_lat_lines(fout: TextIO, atoms: Atoms, lat_fix: Optional[List[bool]]) -> None:
+    """Write lattice vector lines."""
+    if lat_fix is not None:
+        fout.write("Lattice Fix_x Fix_y Fix_z\n")
+        formatted_fts = ["T" if ft else "F" for ft in lat_fix]
+        fix_strs = [" ".join(formatted_fts[i : i + 3]) for i in (0, 3, 6)]
         for v, fs in zip(atoms.cell.array, fix_strs):
-            lines += f"{v[0]: 10.4f} {v[1]: 10.4f} {v[2]: 10.4f} {fs}\n"
-
+            fout.write(f"{v[0]: 10.4f} {v[1]: 10.4f} {v[2]: 10.4f} {fs}\n")
     else:
-        lines += "Lattice\n"
+        fout.write("Lattice\n")
         for v in atoms.cell.array:
-            lines += f"{v[0]: 10.4f} {v[1]: 10.4f} {v[2]: 10.4f}\n"
-
-    return lines
+            fout.write(f"{v[0]: 10.4f} {v[1]: 10.4f} {v[2]: 10.4f}\n")
 
 
-def _add_atom_lines(freedom, lines, atoms):
-    """Add atomic information lines."""
+def _write_atom_lines(fout: TextIO, atoms: Atoms, freedom: Dict) -> None:
+    """Write the coordinate header and atom lines, one T/F value per constraint."""
+    natom = len(atoms)
     key_str = " ".join(freedom.keys())
     magmoms = atoms.get_initial_magnetic_moments()
-    init_mag = True
-    if len(magmoms.shape) == 1:
-        if not any(magmoms):
-            init_mag = False
+    if magmoms.ndim == 1:
+        if not magmoms.any():
+            mag_template, mag_columns = "", []
         else:
             key_str += " Mag"
+            # zero moments (including -0.0) are written as "  0.000"
+            mag_template, mag_columns = "% 7.3f", [magmoms + 0.0]
     else:
         key_str += " Mag_x Mag_y Mag_z"
-    lines += f"Cartesian {key_str}\n"
-    elements = atoms.symbols
-    positions = atoms.positions
-    atom_fix = []
-    for i in range(len(atoms.symbols)):
-        raw = ""
-        for val_column in freedom.values():
-            if val_column[i]:
-                raw += "T "
-            else:
-                raw += "F "
-        atom_fix.append(raw.strip())
-
-    for ele, pos, af, magmom in zip(elements, positions, atom_fix, magmoms):
-        if isinstance(magmom, np.ndarray):
-            init_magmom = np.array2string(
-                magmom,
-                formatter={"float_kind": lambda x: f"{x:7.3f}"},
-            ).strip("[]")
-        elif magmom:
-            init_magmom = f"{float(magmom): 7.3f}"
-        else:
-            init_magmom = "  0.000" if init_mag else ""
-        lines += f"{ele:<2} {pos[0]: 10.4f} {pos[1]: 10.4f} {pos[2]: 10.4f} {af} {init_magmom}\n"
-
-    return lines
-
-
-def _write_to_file(filename, lines) -> str:
-    """Write content to file or return as string."""
-    if not filename:
-        return lines
-
-    if filename == "-":
-        pass
-    else:
-        absfile = absf(filename)
-        absfile.parent.mkdir(parents=True, exist_ok=True)
-
-        with open(absfile, "w", encoding="utf-8") as file:
-            file.write(lines)
-
-    return lines
+        mag_template, mag_columns = "%7.3f %7.3f %7.3f", list(magmoms.T)
+    fout.write(f"Cartesian {key_str}\n")
+
+    fix_columns = [np.where(_truth(values, natom), "T", "F") for values in freedom.values()]
+    template = "%-2s % 10.4f % 10.4f % 10.4f "
+    template += " ".join(["%s"] * len(fix_columns)) + " " + mag_template + "\n"
+    columns = [atoms.get_chemical_symbols(), *atoms.positions.T, *fix_columns, *mag_columns]
+    write_rows(fout, template, columns)
+
+
+def _truth(values, natom: int) -> np.ndarray:
+    """Return the truth value of the first ``natom`` entries of a constraint column."""
+    arr = np.asarray(values)
+    if len(arr) < natom:
+        raise ValueError(f"Constraint has {len(arr)} values for {natom} atoms")
+    if arr.ndim == 1 and arr.dtype.kind in "biuf":
+        return arr[:natom].astype(bool)
+    return np.fromiter((bool(values[i]) for i in range(natom)), dtype=bool, count=natom)
@@ -1,5 +1,6 @@
 """CLI command tests: Test command line interface using Click CliRunner."""
 
+import json
 import tempfile
 from pathlib import Path
 
@@ -154,6 +155,38 @@ class TestBandCommands:
         assert "Projection mode:" in result.output
         assert "0" in result.output
 
+    def test_band_read_multiple_modes(self, runner, band_dos_dir, tmp_path):
+        """Test --mode 1,2,5 writes one output per mode."""
+        output_file = tmp_path / "band.csv"
+        result = runner.invoke(
+            cli,
+            [
+                "band",
+                "read",
+                str(band_dos_dir / "spinless_pband.h5"),
+                "--mode",
+                "1,2,5",
+                "-o",
+                str(output_file),
+            ],
+        )
+
+        assert result.exit_code == 0
+        assert sorted(p.name for p in tmp_path.iterdir()) == [
+            "band_mode1.csv",
+            "band_mode2.csv",
+            "band_mode5.csv",
+        ]
+        header = (tmp_path / "band_mode1.csv").read_text(encoding="utf-8").splitlines()[0]
+        assert "band1-Si" in header.split(",")
+
+    def test_band_read_invalid_mode(self, runner, sample_band_file):
+        """Test a malformed mode list is rejected."""
+        result = runner.invoke(cli, ["band", "read", str(sample_band_file), "--mode", "1,x"])
+
+        assert result.exit_code == 2
+        assert "comma-separated" in result.output
+
     def test_band_info(self, runner, sample_band_file):
         """Test band info command."""
         result = runner.invoke(cli, ["band", "info", str(sample_band_file)])
@@ -162,6 +195,8 @@ class TestBandCommands:
         assert "Band Structure Information" in result.output
         assert "Fermi Energy" in result.output
         assert "5.0" in result.output
+        assert "Spin Type" in result.output
+        assert "Number of Bands" in result.output
 
     def test_band_read_nonexistent_file(self, runner):
         """Test reading nonexistent file."""
@@ -252,6 +287,82 @@ class TestDOSCommands:
             assert output_file.exists()
             assert "Saved to" in result.output
 
+    def test_dos_read_profile(self, runner, sample_dos_file, tmp_path):
+        """Test --profile and --profile-json report the reader and export stages."""
+        output_file = tmp_path / "dos.csv"
+        profile_file = tmp_path / "profile.json"
+
+        result = runner.invoke(
+            cli,
+            [
+                "dos",
+                "read",
+                str(sample_dos_file),
+                "-o",
+                str(output_file),
+                "--profile",
+                "--profile-json",
+                str(profile_file),
+            ],
+        )
+
+        assert result.exit_code == 0
+        assert "read-totals" in result.output
+        report = json.loads(profile_file.read_text(encoding="utf-8"))
+        assert [s["stage"] for s in report["stages"]] == [
+            "read-dos",
+            "read-dos/open",
+            "read-dos/read-metadata",
+            "read-dos/read-totals",
+            "export",
+        ]
+        assert report["stages"][0]["bytes_read"] > 0
+
+    def test_dos_read_atom_block(self, runner, band_dos_dir, tmp_path):
+        """Test --atom-block exports the same table as the default read."""
+        path = str(band_dos_dir / "collinear_pdos.h5")
+        default, blocked = tmp_path / "default.csv", tmp_path / "blocked.csv"
+
+        result = runner.invoke(cli, ["dos", "read", path, "--mode", "1", "-o", str(default)])
+        assert result.exit_code == 0
+        result = runner.invoke(
+            cli,
+            ["dos", "read", path, "--mode", "1", "-o", str(blocked), "--atom-block", "1"],
+        )
+        assert result.exit_code == 0
+        assert blocked.read_text() == default.read_text()
+
+        result = runner.invoke(cli, ["dos", "read", path, "--atom-block", "0"])
+        assert result.exit_code != 0
+
+    def test_dos_read_export_csv_float_format(self, runner, sample_dos_file, tmp_path):
+        """Test CSV export with a float format."""
+        output_file = tmp_path / "dos.csv"
+
+        result = runner.invoke(
+            cli,
+            ["dos", "read", str(sample_dos_file), "-o", str(output_file), "--float-format", ".2f"],
+        )
+
+        assert result.exit_code == 0
+        row = output_file.read_text(encoding="utf-8").splitlines()[1]
+        assert all(len(value.split(".")[1]) == 2 for value in row.split(","))
+
+    def test_dos_read_export_parquet(self, runner, sample_dos_file, tmp_path):
+        """Test reading DOS data and export to Parquet."""
+        pq = pytest.importorskip("pyarrow.parquet")
+        output_file = tmp_path / "dos.parquet"
+
+        result = runner.invoke(
+            cli,
+            ["dos", "read", str(sample_dos_file), "-o", str(output_file), "--format", "parquet"],
+        )
+
+        assert result.exit_code == 0
+        metadata = pq.read_schema(output_file).metadata
+        assert float(metadata[b"efermi"]) == pytest.approx(5.5)
+        assert metadata[b"mode"] == b"5"
+
     def test_dos_read_export_npz(self, runner, sample_dos_file):
         """Test reading DOS data and export to NPZ."""
         with tempfile.TemporaryDirectory() as tmpdir:
@@ -300,6 +411,83 @@ class TestDOSCommands:
         assert "-10" in result.output or "10" in result.output
 
 
+class TestCacheCommands:
+    """Test cache command group."""
+
+    @pytest.fixture
+    def runner(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("DDPC_CACHE_DIR", str(tmp_path / "cache"))
+        return CliRunner()
+
+    def test_cache_help(self, runner):
+        """Test cache --help."""
+        result = runner.invoke(cli, ["cache", "--help"])
+        assert result.exit_code == 0
+        assert "stats" in result.output
+        assert "clear" in result.output
+
+    def test_read_cache_stats_clear(self, runner, band_dos_dir, tmp_path):
+        """Test --cache stores an entry that stats reports and clear removes."""
+        band_file = band_dos_dir / "spinless_band.h5"
+        result = runner.invoke(cli, ["band", "read", str(band_file), "--mode", "0", "--cache"])
+        assert result.exit_code == 0
+
+        result = runner.invoke(cli, ["cache", "stats"])
+        assert result.exit_code == 0
+        assert "Entries" in result.output
+
+        result = runner.invoke(cli, ["cache", "clear"])
+        assert result.exit_code == 0
+        assert "Removed" in result.output
+        assert not (tmp_path / "cache" / "entries").exists()
+
+
+class TestBatchCommand:
+    """Test batch command."""
+
+    @pytest.fixture
+    def runner(self):
+        return CliRunner()
+
+    def test_batch_exports_and_reports_errors(self, runner, band_dos_dir, tmp_path):
+        """Test good files are exported and a bad one fails the run at the end."""
+        manifest = tmp_path / "manifest.txt"
+        raw = band_dos_dir.resolve()
+        manifest.write_text(
+            f"{raw / 'spinless_band.h5'}\n{raw / 'noncollinear_pdos.json'}\n", encoding="utf-8"
+        )
+        result = runner.invoke(
+            cli,
+            [
+                "batch",
+                str(band_dos_dir / "collinear_pdos.h5"),
+                "--manifest",
+                str(manifest),
+                "-o",
+                str(tmp_path / "out"),
+                "--mode",
+                "1,2",
+                "-j",
+                "1",
+            ],
+        )
+
+        assert result.exit_code == 1
+        assert "✗" in result.output
+        assert "noncollinear_pdos.json" in result.output
+        assert sorted(p.name for p in (tmp_path / "out").rglob("*.csv")) == [
+            "collinear_pdos_mode1.csv",
+            "collinear_pdos_mode2.csv",
+            "spinless_band_mode1.csv",
+            "spinless_band_mode2.csv",
+        ]
+
+    def test_batch_without_inputs(self, runner):
+        """Test missing inputs show help."""
+        result = runner.invoke(cli, ["batch"])
+        assert result.exit_code == 2
+
+
 class TestCLIErrorHandling:
     """Test CLI error handling."""
 
@@ -1,9 +1,11 @@
 """Test read functions in band.py module."""
 
+from collections.abc import Mapping
+
 import numpy as np
 import pytest
 
-from ddpc.data.band import read_band, read_band_h5, read_band_json
+from ddpc.data.band import probe_band, read_band, read_band_h5, read_band_json
 
 
 class TestReadBand:
@@ -14,7 +16,7 @@ class TestReadBand:
         h5_file = band_dos_dir / "spinless_band.h5"
         data, efermi, isproj = read_band(h5_file, mode=0)
 
-        assert isinstance(data, dict)
+        assert isinstance(data, Mapping)
         assert isinstance(efermi, float)
         assert isinstance(isproj, bool)
         assert "kx" in data
@@ -29,7 +31,7 @@ class TestReadBand:
         json_file = band_dos_dir / "spinless_band.json"
         data, efermi, isproj = read_band(json_file, mode=0)
 
-        assert isinstance(data, dict)
+        assert isinstance(data, Mapping)
         assert isinstance(efermi, float)
         assert isinstance(isproj, bool)
         assert "kx" in data
@@ -40,7 +42,7 @@ class TestReadBand:
         h5_file = band_dos_dir / "collinear_band.h5"
         data, _efermi, _isproj = read_band(h5_file, mode=0)
 
-        assert isinstance(data, dict)
+        assert isinstance(data, Mapping)
         # Spin-polarized system should have up and down bands
         band_keys = [k for k in data.keys() if k.startswith("band")]
         has_spin = any("-up" in k or "-down" in k for k in band_keys)
@@ -51,7 +53,7 @@ class TestReadBand:
         json_file = band_dos_dir / "collinear_band.json"
         data, efermi, _isproj = read_band(json_file, mode=0)
 
-        assert isinstance(data, dict)
+        assert isinstance(data, Mapping)
         assert "kx" in data
         assert isinstance(efermi, float)
 
@@ -97,7 +99,7 @@ class TestReadBandH5:
         data, _efermi, isproj = read_band_h5(h5_file, mode=5)
 
         assert isproj is True
-        assert isinstance(data, dict)
+        assert isinstance(data, Mapping)
         assert "kx" in data
         # Projected data should contain atom and orbital information
         proj_keys = [k for k in data.keys() if not k.startswith(("k", "label", "dist"))]
@@ -123,7 +125,7 @@ class TestReadBandH5:
         data, _efermi, isproj = read_band_h5(h5_file, mode=0)
 
         # Should have basic k-point data
-        assert isinstance(data, dict)
+        assert isinstance(data, Mapping)
         assert "kx" in data
         # For projected files, isproj should be True
         assert isproj is True
@@ -159,7 +161,7 @@ class TestReadBandJSON:
         data, _efermi, isproj = read_band_json(json_file, mode=5)
 
         assert isproj is True
-        assert isinstance(data, dict)
+        assert isinstance(data, Mapping)
         assert "kx" in data
 
     def test_read_band_json_collinear_spin2(self, band_dos_dir):
@@ -236,8 +238,8 @@ class TestBandDataStructure:
         # mode 5 should have additional columns when projection data exists
         # Note: if file has projection, keys5 should have more
         # Here we just verify both return dictionaries
-        assert isinstance(data0, dict)
-        assert isinstance(data5, dict)
+        assert isinstance(data0, Mapping)
+        assert isinstance(data5, Mapping)
 
 
 class TestBandEdgeCases:
@@ -262,3 +264,149 @@ class TestBandEdgeCases:
         pband_file = band_dos_dir / "spinless_pband.h5"
         _, _, isproj_p = read_band(pband_file, mode=5)
         assert isinstance(isproj_p, bool)
+
+
+class TestBandSelection:
+    """Test atom/orbital/band selectors."""
+
+    @pytest.mark.parametrize("name", ["spinless_pband.h5", "spinless_pband.json"])
+    def test_select_atoms_orbitals(self, band_dos_dir, name):
+        """Test selected projections equal the same columns of a full read."""
+        full, _, _ = read_band(band_dos_dir / name, mode=5)
+        data, _, _ = read_band(band_dos_dir / name, mode=5, atoms=[2], orbitals=["p"])
+
+        assert data.projections.shape[1:3] == (1, 3)
+        assert data.channels == ["2-py", "2-pz", "2-px"]
+        for key in ("band1-2-py", "band12-2-px"):
+            np.testing.assert_array_equal(data[key], full[key])
+
+    def test_select_bands(self, band_dos_dir):
+        """Test band selection keeps original band numbers."""
+        full, _, _ = read_band(band_dos_dir / "spinless_band.h5", mode=0)
+        data, _, _ = read_band(band_dos_dir / "spinless_band.h5", mode=0, bands=[2, 5])
+
+        assert [k for k in data if k.startswith("band")] == ["band2", "band5"]
+        np.testing.assert_array_equal(data["band5"], full["band5"])
+
+    def test_select_energy_window(self, band_dos_dir):
+        """Test energy window keeps only bands entering it."""
+        full, _, _ = read_band(band_dos_dir / "spinless_band.h5", mode=0)
+        emin, emax = full.energies[0, 3].min(), full.energies[0, 3].max()
+        data, _, _ = read_band(
+            band_dos_dir / "spinless_band.h5", mode=0, energy_window=(emin, emax)
+        )
+
+        assert 4 in data.bands
+        assert ((data.energies >= emin) & (data.energies <= emax)).any(axis=(0, 2)).all()
+
+    def test_select_elements(self, band_dos_dir):
+        """Test element selection on projected bands."""
+        data, _, _ = read_band(band_dos_dir / "collinear_pband.h5", mode=1, elements=["O"])
+
+        assert data.channels == ["O"]
+        assert set(data.elements) == {"O"}
+
+    def test_select_nothing(self, band_dos_dir):
+        """Test out-of-range selections raise ValueError."""
+        with pytest.raises(ValueError, match="out of range"):
+            read_band(band_dos_dir / "spinless_pband.h5", mode=5, atoms=[99])
+        with pytest.raises(ValueError, match="no orbitals"):
+            read_band(band_dos_dir / "spinless_pband.h5", mode=5, orbitals=["g"])
+
+
+class TestBandModes:
+    """Test reading several projection modes at once."""
+
+    @pytest.mark.parametrize("name", ["collinear_pband.h5", "spinless_pband.json"])
+    def test_modes_match_single_reads(self, band_dos_dir, name):
+        """Test every mode of a multi-mode read equals a single-mode read."""
+        results, efermi, isproj = read_band(band_dos_dir / name, modes=[5, 0, 1, 3])
+
+        assert list(results) == [5, 0, 1, 3]
+        assert isproj
+        for mode, data in results.items():
+            expected, expected_efermi, _ = read_band(band_dos_dir / name, mode=mode)
+            assert efermi == expected_efermi
+            assert list(data) == list(expected)
+            for key in expected:
+                np.testing.assert_array_equal(data[key], expected[key])
+
+    def test_projections_read_once(self, band_dos_dir, monkeypatch):
+        """Test the projected datasets are read by a single call."""
+        from ddpc.data import band
+
+        calls = []
+        read_pband_h5 = band.read_pband_h5
+        monkeypatch.setattr(
+            band, "read_pband_h5", lambda *args: calls.append(args[1]) or read_pband_h5(*args)
+        )
+
+        read_band(band_dos_dir / "spinless_pband.h5", modes=[1, 2, 3, 4, 5])
+
+        assert calls == [(1, 2, 3, 4, 5)]
+
+    def test_modes_without_projections(self, band_dos_dir):
+        """Test files without projections return total bands for every mode."""
+        results, _, isproj = read_band(band_dos_dir / "spinless_band.h5", modes=[0, 2])
+
+        assert not isproj
+        assert results[0] is results[2]
+
+
+def test_fmt_is_deprecated(band_dos_dir):
+    """Test the ignored fmt argument warns and does not change the result."""
+    expected, _, _ = read_band(band_dos_dir / "spinless_band.h5", mode=0)
+
+    with pytest.warns(DeprecationWarning, match="float_format"):
+        data, _, _ = read_band(band_dos_dir / "spinless_band.h5", 0, "8.3f")
+
+    assert list(data) == list(expected)
+
+
+class TestProbeBand:
+    """Test header-only band file probing."""
+
+    @pytest.mark.parametrize(
+        "name",
+        [
+            "spinless_pband.h5",
+            "spinless_pband.json",
+            "collinear_band.h5",
+            "collinear_band.json",
+            "noncollinear_band.json",
+        ],
+    )
+    def test_matches_read(self, band_dos_dir, name):
+        """Test the header agrees with a full read."""
+        data, efermi, isproj = read_band(band_dos_dir / name, mode=0)
+
+        summary = probe_band(band_dos_dir / name)
+
+        assert summary.efermi == pytest.approx(efermi)
+        assert summary.is_projected == isproj
+        assert summary.shape == data.energies.shape
+        assert summary.nspin == len(data.spins)
+
+    def test_header_fields(self, band_dos_dir):
+        summary = probe_band(band_dos_dir / "collinear_pband.h5")
+
+        assert summary.spin_type == "collinear"
+        assert summary.elements == ("Ni", "Ni", "O", "O")
+        assert summary.orbitals[:4] == ("s", "py", "pz", "px")
+
+    def test_json_skips_band_data(self, band_dos_dir, tmp_path):
+        """Test the spin blocks of a JSON file are never parsed."""
+        text = (band_dos_dir / "spinless_band.json").read_text(encoding="utf-8")
+        start = text.index('"Spin1"')
+        end = text.index('"SpinType"')
+        path = tmp_path / "band.json"
+        path.write_text(text[:start] + '"Spin1": {not json}, ' + text[end:], encoding="utf-8")
+
+        summary = probe_band(path)
+
+        assert summary.spin_type == "none"
+        assert summary.nband == 12
+
+    def test_invalid_format(self, tmp_path):
+        with pytest.raises(TypeError, match="must be h5 or json"):
+            probe_band(tmp_path / "band.txt")
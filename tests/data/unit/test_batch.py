@@ -0,0 +1,175 @@
+"""Test process-pool batch processing in batch.py module."""
+
+import multiprocessing
+import os
+import shutil
+import time
+
+import numpy as np
+import pytest
+
+from ddpc.data import batch, read_band, read_dos
+from ddpc.data.batch import (
+    BatchJob,
+    BatchResult,
+    expand_inputs,
+    guess_kind,
+    output_paths,
+    run_batch,
+)
+
+
+@pytest.fixture
+def calc_tree(band_dos_dir, tmp_path):
+    """Two calculation directories with identically named inputs."""
+    root = tmp_path / "calcs"
+    for name in ("a", "b"):
+        (root / name).mkdir(parents=True)
+        shutil.copy(band_dos_dir / "spinless_pband.h5", root / name / "band.h5")
+    shutil.copy(band_dos_dir / "collinear_pdos.json", root / "b" / "dos.json")
+    (root / "b" / "notes.json").write_text("{}", encoding="utf-8")
+    return root
+
+
+def crashing_job(job):
+    """Stand-in for process_job whose worker dies on the job named ``crash``."""
+    if job.path == "crash":
+        os._exit(1)
+    time.sleep(0.05)
+    return BatchResult(job.path, "band", (), 0.0, None, 0.0)
+
+
+class TestExpandInputs:
+    """Test globs, directories and manifests."""
+
+    def test_directory_and_glob(self, calc_tree):
+        files = expand_inputs([str(calc_tree), str(calc_tree / "*" / "band.h5")])
+
+        assert [p.relative_to(calc_tree).as_posix() for p in files] == [
+            "a/band.h5",
+            "b/band.h5",
+            "b/dos.json",
+        ]
+
+    def test_manifest(self, calc_tree):
+        manifest = calc_tree / "manifest.txt"
+        manifest.write_text("# inputs\n\nb/dos.json\na/*.h5\nmissing.h5\n", encoding="utf-8")
+
+        files = expand_inputs(manifest=manifest)
+
+        assert [p.name for p in files] == ["dos.json", "band.h5", "missing.h5"]
+
+
+class TestGuessKind:
+    """Test band/DOS detection."""
+
+    def test_by_name(self):
+        assert guess_kind("calc/PBAND.json") == "band"
+        assert guess_kind("calc/tdos.h5") == "dos"
+
+    def test_by_h5_group(self, band_dos_dir, tmp_path):
+        path = tmp_path / "result.h5"
+        shutil.copy(band_dos_dir / "spinless_pdos.h5", path)
+        assert guess_kind(path) == "dos"
+
+    def test_unknown(self, tmp_path):
+        with pytest.raises(ValueError, match="specify the kind"):
+            guess_kind(tmp_path / "result.json")
+
+
+def test_output_paths_mirror_tree(calc_tree, tmp_path):
+    inputs = [calc_tree / "a" / "band.h5", calc_tree / "b" / "band.h5"]
+
+    outputs = output_paths(inputs, [1, 5], "npz", tmp_path / "out")
+
+    assert outputs[1] == {
+        1: str(tmp_path / "out" / "b" / "band_mode1.npz"),
+        5: str(tmp_path / "out" / "b" / "band_mode5.npz"),
+    }
+    assert output_paths(inputs, [5])[0] == {5: str(calc_tree / "a" / "band.csv")}
+
+
+def test_output_paths_keep_suffix_of_pairs(calc_tree, tmp_path):
+    shutil.copy(calc_tree / "b" / "dos.json", calc_tree / "b" / "dos.h5")
+    inputs = expand_inputs([calc_tree])
+
+    outputs = output_paths(inputs, [5])
+
+    assert [os.path.relpath(o[5], calc_tree) for o in outputs] == [
+        os.path.join("a", "band.csv"),
+        os.path.join("b", "band.csv"),
+        os.path.join("b", "dos_h5.csv"),
+        os.path.join("b", "dos_json.csv"),
+    ]
+    mirrored = output_paths(inputs, [1, 5], "npz", tmp_path / "out")
+    assert len({f for o in mirrored for f in o.values()}) == 8
+
+
+def test_output_paths_reject_collisions(calc_tree):
+    inputs = [calc_tree / "b" / name for name in ("dos.json", "dos.h5", "dos_json.h5")]
+
+    with pytest.raises(ValueError, match="would both be exported"):
+        output_paths(inputs, [5])
+
+
+class TestRunBatch:
+    """Test results of serial and pooled runs."""
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_outputs_match_readers(self, calc_tree, tmp_path, workers):
+        files = expand_inputs([calc_tree])
+
+        results = list(run_batch(files, tmp_path / "out", modes=[3], format="npz", workers=workers))
+
+        assert sorted(r.path for r in results) == sorted(map(str, files))
+        assert all(r.ok for r in results)
+        by_kind = {r.kind: r for r in results}
+        band, efermi, _ = read_band(calc_tree / "a" / "band.h5", mode=3)
+        dos, _, _ = read_dos(calc_tree / "b" / "dos.json", mode=3)
+        with np.load(tmp_path / "out" / "a" / "band.npz") as saved:
+            assert list(saved) == list(band)
+            np.testing.assert_array_equal(saved["dist"], band["dist"])
+        with np.load(by_kind["dos"].outputs[0]) as saved:
+            for key in dos:
+                np.testing.assert_array_equal(saved[key], dos[key])
+        assert by_kind["band"].efermi == efermi
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_errors_do_not_abort(self, band_dos_dir, tmp_path, workers):
+        files = [
+            band_dos_dir / "noncollinear_pdos.json",
+            tmp_path / "missing_band.h5",
+            band_dos_dir / "spinless_band.h5",
+        ]
+
+        results = {r.path: r for r in run_batch(files, tmp_path / "out", workers=workers)}
+
+        assert results[str(files[0])].error.startswith("ValueError")
+        assert results[str(files[1])].error.startswith(("FileNotFoundError", "OSError"))
+        assert results[str(files[1])].outputs == ()
+        assert results[str(files[2])].ok
+        assert all(map(os.path.exists, results[str(files[2])].outputs))
+
+    @pytest.mark.skipif(
+        multiprocessing.get_start_method() != "fork", reason="workers must see the patched job"
+    )
+    def test_dead_worker_fails_only_its_job(self, monkeypatch):
+        monkeypatch.setattr(batch, "process_job", crashing_job)
+        jobs = [
+            BatchJob(name, "band", {}, "csv", None, False)
+            for name in ["f0", "f1", "crash", *(f"f{i}" for i in range(2, 12))]
+        ]
+
+        results = list(batch._run_pool(jobs, 2))
+
+        assert sorted(r.path for r in results) == sorted(job.path for job in jobs)
+        failed = [r for r in results if not r.ok]
+        assert [(r.path, r.error) for r in failed] == [
+            ("crash", "BrokenProcessPool: worker process died")
+        ]
+
+    def test_invalid_arguments(self, band_dos_dir):
+        with pytest.raises(ValueError, match="Unknown export format"):
+            run_batch([band_dos_dir / "spinless_band.h5"], format="xlsx")
+        with pytest.raises(ValueError, match="Unknown kind"):
+            run_batch([band_dos_dir / "spinless_band.h5"], kind="phonon")
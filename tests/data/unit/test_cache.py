@@ -0,0 +1,164 @@
+"""Test on-disk result cache in cache.py module."""
+
+import os
+import shutil
+
+import numpy as np
+import pytest
+
+from ddpc.data import cache, read_band, read_dos
+from ddpc.data.cache import cache_stats, clear_cache, configure_cache
+
+
+@pytest.fixture(autouse=True)
+def cache_in_tmp(tmp_path, monkeypatch):
+    """Point the cache at a temporary directory."""
+    monkeypatch.setenv("DDPC_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.delenv("DDPC_CACHE_MAX_BYTES", raising=False)
+    yield
+    configure_cache()
+
+
+class TestCachedRead:
+    """Test cache hits return the same results."""
+
+    def test_band_hit(self, band_dos_dir):
+        path = band_dos_dir / "spinless_pband.h5"
+        expected, efermi, isproj = read_band(path, mode=3)
+
+        first = read_band(path, mode=3, cache=True)
+        second = read_band(path, mode=3, cache=True)
+
+        assert cache_stats()["entries"] == 1
+        data, cached_efermi, cached_isproj = second
+        assert (cached_efermi, cached_isproj) == (efermi, isproj)
+        assert first[0].channels == data.channels == expected.channels
+        assert list(data) == list(expected)
+        for key in expected:
+            np.testing.assert_array_equal(data[key], expected[key])
+        assert isinstance(data.weights, np.memmap)
+
+    def test_dos_hit(self, band_dos_dir):
+        path = band_dos_dir / "collinear_pdos.json"
+        expected, efermi, _ = read_dos(path, mode=6, atoms=[1])
+
+        read_dos(path, mode=6, atoms=[1], cache=True)
+        data, cached_efermi, _ = read_dos(path, mode=6, atoms=[1], cache=True)
+
+        assert cached_efermi == efermi
+        assert list(data) == list(expected)
+        for key in expected:
+            np.testing.assert_array_equal(data[key], expected[key])
+            assert not data[key].flags.writeable
+
+    def test_key_includes_mode_and_selection(self, band_dos_dir):
+        path = band_dos_dir / "spinless_pdos.h5"
+        read_dos(path, mode=1, cache=True)
+        read_dos(path, mode=2, cache=True)
+        read_dos(path, mode=2, orbitals=["s"], cache=True)
+
+        assert cache_stats()["entries"] == 3
+
+    def test_modes_share_entries(self, band_dos_dir):
+        path = band_dos_dir / "spinless_pdos.h5"
+        read_dos(path, mode=2, cache=True)
+
+        results, _, _ = read_dos(path, modes=[1, 2], cache=True)
+        again, efermi, _ = read_dos(path, modes=[2, 1], cache=True)
+
+        assert cache_stats()["entries"] == 2
+        assert list(again) == [2, 1]
+        expected, expected_efermi, _ = read_dos(path, mode=1)
+        assert efermi == expected_efermi
+        for key in expected:
+            np.testing.assert_array_equal(again[1][key], expected[key])
+            np.testing.assert_array_equal(results[1][key], expected[key])
+
+    def test_changed_file_misses(self, band_dos_dir, tmp_path):
+        path = tmp_path / "band.h5"
+        shutil.copy(band_dos_dir / "spinless_band.h5", path)
+        read_band(path, mode=0, cache=True)
+
+        shutil.copy(band_dos_dir / "collinear_band.h5", path)
+        os.utime(path, ns=(0, 0))
+        data, _, _ = read_band(path, mode=0, cache=True)
+
+        assert data.spins == ("up", "down")
+        assert cache_stats()["entries"] == 2
+
+    def test_unchanged_copy_hits(self, band_dos_dir, tmp_path):
+        path = tmp_path / "copy.h5"
+        shutil.copy(band_dos_dir / "spinless_band.h5", path)
+        read_band(band_dos_dir / "spinless_band.h5", mode=0, cache=True)
+        read_band(path, mode=0, cache=True)
+
+        assert cache_stats()["entries"] == 1
+
+    def test_band_entries_without_projections(self, band_dos_dir):
+        path = band_dos_dir / "spinless_pband.h5"
+        read_band(path, mode=1, atoms=[1], orbitals=["s"], cache=True)
+        small = cache_stats()["bytes"]
+        clear_cache()
+
+        read_band(path, modes=[1, 2, 3, 4, 5], cache=True)
+        data, _, _ = read_band(path, mode=1, cache=True)
+
+        entries = list((cache.cache_dir() / "entries").iterdir())
+        assert len(entries) == 5
+        assert not any((e / "projections.npy").exists() for e in entries)
+        full = next(e for e in entries if '"mode": 1' in (e / "meta.json").read_text())
+        # 2 atoms x 9 orbitals of projections would add more than 250 KB
+        assert cache._entry_size(full) - small < 1024
+        assert data.projections is None
+        assert data.channels == ["Si"]
+        assert list(data.atoms) == [1, 2]
+
+
+class TestCacheMaintenance:
+    """Test eviction, stats and clearing."""
+
+    def test_lru_eviction(self, band_dos_dir):
+        path = band_dos_dir / "spinless_pdos.h5"
+        read_dos(path, mode=1, cache=True)
+        read_dos(path, mode=7, cache=True)
+        entries = list((cache.cache_dir() / "entries").iterdir())
+        spdf = next(e for e in entries if '"d"' in (e / "meta.json").read_text())
+        os.utime(spdf, ns=(1, 1))
+        configure_cache(max_bytes=cache_stats()["bytes"])
+
+        read_dos(path, mode=1, orbitals=["s"], cache=True)
+
+        assert cache_stats()["entries"] == 2
+        assert not spdf.exists()
+
+    def test_identity_index_is_trimmed(self, band_dos_dir, tmp_path):
+        paths = []
+        for i in range(4):
+            paths.append(tmp_path / f"dos{i}.h5")
+            shutil.copy(band_dos_dir / "spinless_dos.h5", paths[-1])
+            os.utime(paths[-1], ns=(i, i))
+            cache.file_digest(paths[-1])
+        ids = sorted(cache._identities(), key=lambda f: f.stat().st_mtime_ns)
+        os.utime(ids[0], ns=(1, 1))
+        cache.file_digest(paths[0])
+
+        assert cache_stats()["identities"] == 4
+        assert cache_stats()["bytes"] > 0
+        cache._evict(cache_stats()["bytes"], max_identities=2)
+
+        assert cache_stats()["identities"] == 2
+        assert ids[0] in cache._identities()
+
+    def test_clear(self, band_dos_dir):
+        read_band(band_dos_dir / "spinless_band.h5", mode=0, cache=True)
+
+        assert clear_cache() == 1
+        assert cache_stats()["entries"] == 0
+        assert cache_stats()["bytes"] == 0
+
+    def test_configure_directory(self, tmp_path):
+        configure_cache(directory=tmp_path / "elsewhere", max_bytes=1024)
+
+        info = cache_stats()
+        assert info["directory"] == str(tmp_path / "elsewhere")
+        assert info["max_bytes"] == 1024
@@ -0,0 +1,125 @@
+"""Test BandData container in containers.py module."""
+
+import numpy as np
+import pytest
+
+from ddpc.data.band import read_band
+from ddpc.data.containers import BandData, Selection, kpath_distance, stack_band_dict
+
+
+@pytest.fixture
+def band_data():
+    """Create a small spin-polarized band data container."""
+    nkpt, nband = 4, 3
+    kcoords = np.column_stack([np.linspace(0, 1, nkpt), np.zeros(nkpt), np.zeros(nkpt)])
+    energies = np.arange(2 * nband * nkpt, dtype=float).reshape(2, nband, nkpt)
+    return BandData(
+        kcoords,
+        np.array(["G", "", "", "X"]),
+        kpath_distance(kcoords),
+        energies=energies,
+        spins=("up", "down"),
+    )
+
+
+class TestBandData:
+    """Test the mapping view of BandData."""
+
+    def test_total_band_columns(self, band_data):
+        keys = list(band_data)
+        assert keys[:5] == ["label", "kx", "ky", "kz", "dist"]
+        assert keys[5:8] == ["band1-up", "band2-up", "band3-up"]
+        assert keys[-1] == "band3-down"
+        assert len(band_data) == len(keys)
+
+    def test_columns_are_views(self, band_data):
+        column = band_data["band2-down"]
+        np.testing.assert_array_equal(column, band_data.energies[1, 1])
+        assert np.shares_memory(column, band_data.energies)
+
+    def test_missing_columns(self, band_data):
+        assert "band4-up" not in band_data
+        assert "band1" not in band_data
+        assert "band1-left" not in band_data
+        with pytest.raises(KeyError):
+            band_data["energy"]
+
+    def test_to_dict(self, band_data):
+        data = band_data.to_dict()
+        assert isinstance(data, dict)
+        assert list(data) == list(band_data)
+
+    def test_stack_band_dict(self):
+        nkpt, nband = 5, 2
+        legacy = {
+            "kx": np.zeros(nkpt),
+            "ky": np.zeros(nkpt),
+            "kz": np.zeros(nkpt),
+            "dist": np.zeros(nkpt),
+            "label": np.array([""] * nkpt),
+            "1s-up": np.arange(nband * nkpt, dtype=float),
+            "1s-down": np.ones(nband * nkpt),
+        }
+        data = stack_band_dict(legacy, nkpt, nband, ["Si"])
+
+        assert data.projections.shape == (2, 1, 1, nband, nkpt)
+        assert data.spins == ("up", "down")
+        np.testing.assert_array_equal(
+            data.projections[0, 0, 0], legacy["1s-up"].reshape(nband, nkpt, order="F")
+        )
+
+
+class TestReadBandData:
+    """Test that readers produce BandData natively."""
+
+    def test_projected_arrays(self, band_dos_dir):
+        data, _, _ = read_band(band_dos_dir / "spinless_pband.h5", mode=5)
+
+        assert isinstance(data, BandData)
+        assert data.energies.shape == (1, 12, 150)
+        assert data.projections.shape == (1, 2, 9, 12, 150)
+        assert data.weights.shape == (1, 18, 12, 150)
+        np.testing.assert_array_equal(data["band3-2-px"], data.projections[0, 1, 3, 2])
+
+    def test_h5_json_projections_match(self, band_dos_dir):
+        h5_data, _, _ = read_band(band_dos_dir / "spinless_pband.h5", mode=2)
+        json_data, _, _ = read_band(band_dos_dir / "spinless_pband.json", mode=2)
+
+        assert list(h5_data) == list(json_data)
+        np.testing.assert_allclose(h5_data.weights, json_data.weights, atol=1e-6)
+
+    def test_collinear_spin_down_energies(self, band_dos_dir):
+        h5_data, _, _ = read_band(band_dos_dir / "collinear_band.h5", mode=0)
+        json_data, _, _ = read_band(band_dos_dir / "collinear_band.json", mode=0)
+
+        np.testing.assert_allclose(h5_data.energies, json_data.energies, atol=1e-4)
+
+    def test_collinear_projected_h5(self, band_dos_dir):
+        data, _, _ = read_band(band_dos_dir / "collinear_pband.h5", mode=1)
+
+        assert data.spins == ("up", "down")
+        assert data.channels == ["Ni", "O"]
+        assert "band24-O-down" in data
+
+
+class TestSelection:
+    """Test resolving selections against file axes."""
+
+    def test_atoms_and_elements_intersect(self):
+        selection = Selection.create(atoms=[1, 2, 3], elements=["O"])
+        positions = selection.atom_positions(4, ["Ni", "O", "O", "Ni"])
+        assert positions.tolist() == [1, 2]
+
+    def test_orbital_shells(self):
+        selection = Selection.create(orbitals=["s", "dxy"])
+        orbitals = ["s", "py", "pz", "px", "dxy", "dyz"]
+        assert selection.orbital_positions(orbitals).tolist() == [0, 4]
+
+    def test_energy_slice(self):
+        energies = np.linspace(-5, 5, 11)
+        window = Selection.create(energy_window=(-1, 2)).energy_slice(energies)
+        assert energies[window].tolist() == [-1.0, 0.0, 1.0, 2.0]
+
+    def test_invalid_window(self):
+        with pytest.raises(ValueError, match="energy_window"):
+            Selection.create(energy_window=(1, -1))
@@ -3,7 +3,7 @@
 import numpy as np
 import pytest
 
-from ddpc.data.dos import read_dos, read_dos_h5, read_dos_json
+from ddpc.data.dos import probe_dos, read_dos, read_dos_h5, read_dos_json
 
 
 class TestReadDos:
@@ -126,6 +126,15 @@ class TestReadDosH5:
         has_down = any("-down" in k for k in proj_keys)
         assert has_up or has_down, "Collinear projected DOS should have spin channels"
 
+    def test_read_dos_json_collinear_matches_h5(self, band_dos_dir):
+        """Test collinear JSON and HDF5 projected DOS share column order and values."""
+        h5_data, _, _ = read_dos_h5(str(band_dos_dir / "collinear_pdos.h5"), mode=4)
+        json_data, _, _ = read_dos_json(str(band_dos_dir / "collinear_pdos.json"), mode=4)
+
+        assert list(h5_data) == list(json_data)
+        for key in h5_data:
+            np.testing.assert_allclose(h5_data[key], json_data[key], atol=1e-4)
+
     def test_read_dos_h5_invalid_group(self, temp_output_dir):
         """Test error handling for H5 file without DosInfo group."""
         try:
@@ -301,3 +310,121 @@ class TestDosEdgeCases:
 
         # Array lengths should be consistent
         assert len(data_h5["energy"]) == len(data_json["energy"])
+
+
+class TestDosSelection:
+    """Test atom/orbital/energy selectors."""
+
+    @pytest.mark.parametrize("name", ["collinear_pdos.h5", "collinear_pdos.json"])
+    def test_select_atoms_orbitals(self, band_dos_dir, name):
+        """Test selected projections equal the same columns of a full read."""
+        full, _, _ = read_dos(band_dos_dir / name, mode=5)
+        data, _, _ = read_dos(band_dos_dir / name, mode=5, atoms=[1, 3], orbitals=["dz2", "s"])
+
+        assert list(data) == [
+            "energy",
+            "tdos-up",
+            "tdos-down",
+            "1s-up",
+            "1s-down",
+            "1dz2-up",
+            "1dz2-down",
+            "3s-up",
+            "3s-down",
+            "3dz2-up",
+            "3dz2-down",
+        ]
+        for key in data:
+            np.testing.assert_array_equal(data[key], full[key])
+
+    def test_select_energy_window(self, band_dos_dir):
+        """Test energy window reads only the matching energy points."""
+        full, _, _ = read_dos(band_dos_dir / "spinless_pdos.h5", mode=4)
+        data, _, _ = read_dos(band_dos_dir / "spinless_pdos.h5", mode=4, energy_window=(-2, 2))
+
+        inside = (full["energy"] >= -2) & (full["energy"] <= 2)
+        assert 0 < len(data["energy"]) == inside.sum()
+        for key in data:
+            np.testing.assert_array_equal(data[key], full[key][inside])
+
+    def test_select_elements(self, band_dos_dir):
+        """Test element selection in element mode."""
+        data, _, _ = read_dos(band_dos_dir / "collinear_pdos.h5", mode=3, elements=["Ni"])
+
+        assert [k for k in data if not k.startswith(("energy", "tdos"))] == ["Ni-up", "Ni-down"]
+
+
+class TestDosModes:
+    """Test reading several projection modes at once."""
+
+    @pytest.mark.parametrize("name", ["collinear_pdos.h5", "spinless_pdos.json"])
+    def test_modes_match_single_reads(self, band_dos_dir, name):
+        """Test every mode of a multi-mode read equals a single-mode read."""
+        modes = [0, 1, 2, 3, 4, 5, 6, 7]
+        results, _, _ = read_dos(band_dos_dir / name, modes=modes, atoms=[1, 2])
+
+        assert list(results) == modes
+        for mode, data in results.items():
+            expected, _, _ = read_dos(band_dos_dir / name, mode=mode, atoms=[1, 2])
+            assert list(data) == list(expected)
+            for key in expected:
+                np.testing.assert_array_equal(data[key], expected[key])
+
+    @pytest.mark.parametrize(
+        "name", ["collinear_pdos.h5", "collinear_pdos.json", "noncollinear_pdos.h5"]
+    )
+    @pytest.mark.parametrize("atom_block", [1, 3])
+    def test_atom_blocks_match_in_memory(self, band_dos_dir, name, atom_block):
+        """Test block-wise aggregation gives the same result as the in-memory path."""
+        modes = [1, 2, 3, 4, 5, 6, 7]
+        expected, _, _ = read_dos(band_dos_dir / name, modes=modes, orbitals=["s", "d"])
+
+        results, _, _ = read_dos(
+            band_dos_dir / name, modes=modes, orbitals=["s", "d"], atom_block=atom_block
+        )
+
+        assert list(results) == modes
+        for mode, data in results.items():
+            assert list(data) == list(expected[mode])
+            for key in data:
+                np.testing.assert_array_equal(data[key], expected[mode][key])
+
+    def test_atom_block_single_mode(self, band_dos_dir):
+        """Test a single mode is returned as the DOS dict itself."""
+        expected, _, _ = read_dos(band_dos_dir / "spinless_pdos.h5", mode=6, atoms=[2, 1])
+
+        data, _, _ = read_dos(band_dos_dir / "spinless_pdos.h5", mode=6, atoms=[2, 1], atom_block=1)
+
+        assert list(data) == list(expected)
+        for key in data:
+            np.testing.assert_array_equal(data[key], expected[key])
+
+    def test_atom_block_must_be_positive(self, band_dos_dir):
+        with pytest.raises(ValueError, match="atom_block"):
+            read_dos(band_dos_dir / "spinless_pdos.h5", atom_block=0)
+
+
+class TestProbeDos:
+    """Test header-only DOS file probing."""
+
+    @pytest.mark.parametrize(
+        "name", ["spinless_pdos.h5", "collinear_pdos.json", "noncollinear_dos.h5"]
+    )
+    def test_matches_read(self, band_dos_dir, name):
+        """Test the header agrees with a full read."""
+        data, efermi, isproj = read_dos(band_dos_dir / name, mode=0)
+
+        summary = probe_dos(band_dos_dir / name)
+
+        assert summary.efermi == pytest.approx(efermi)
+        assert summary.is_projected == isproj
+        assert summary.nenergy == len(data["energy"])
+        assert (summary.emin, summary.emax) == (data["energy"].min(), data["energy"].max())
+
+    def test_header_fields(self, band_dos_dir):
+        summary = probe_dos(band_dos_dir / "collinear_pdos.json")
+
+        assert summary.spin_type == "collinear"
+        assert summary.nspin == 2
+        assert summary.elements == ("Ni", "Ni", "O", "O")
+        assert len(summary.orbitals) == 9
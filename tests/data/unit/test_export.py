@@ -0,0 +1,132 @@
+"""Test CSV, Arrow and Parquet writers in export.py module."""
+
+import numpy as np
+import pytest
+
+from ddpc.data import export, read_band
+from ddpc.data.export import to_arrow, to_csv, to_parquet
+
+
+def _legacy_csv(data, delimiter=",", header=True):
+    """Build the CSV text the row-by-row writer produced."""
+    columns = {}
+    for key, arr in data.items():
+        if arr.ndim == 1:
+            columns[key] = arr
+        else:
+            for j in range(arr.shape[1]):
+                columns[f"{key}{j}"] = arr[:, j]
+    lines = [delimiter.join(columns)] if header else []
+    for i in range(len(next(iter(columns.values())))):
+        lines.append(delimiter.join(str(arr[i]) for arr in columns.values()))
+    return "\n".join(lines)
+
+
+@pytest.fixture
+def mixed_data():
+    rng = np.random.default_rng(0)
+    values = rng.standard_normal(40) * 10.0 ** rng.integers(-20, 20, 40)
+    values[:6] = [0.0, -0.0, np.nan, np.inf, 1e16, 1e-5]
+    return {
+        "label": np.array(["G", "", "X", ""] * 10),
+        "k": rng.random((40, 3)),
+        "value": values,
+        "rounded": np.round(rng.random(40), 3),
+        "index": np.arange(40),
+        "single": rng.random(40).astype(np.float32),
+        "flag": rng.random(40) > 0.5,
+    }
+
+
+class TestToCsv:
+    """Test CSV output against the row-by-row writer."""
+
+    @pytest.mark.parametrize("threads", [1, 3])
+    def test_byte_identical(self, tmp_path, mixed_data, monkeypatch, threads):
+        """Test default output is unchanged, across block boundaries."""
+        monkeypatch.setattr(export, "CSV_CHUNK_CELLS", 25)
+        path = tmp_path / "out.csv"
+
+        to_csv(mixed_data, path, threads=threads)
+
+        assert path.read_bytes() == _legacy_csv(mixed_data).encode()
+
+    def test_band_data(self, tmp_path, band_dos_dir):
+        """Test a projected band file with a string column."""
+        data, _, _ = read_band(band_dos_dir / "spinless_pband.h5", mode=5)
+        path = tmp_path / "band.csv"
+
+        to_csv(data, path, delimiter="\t", header=False)
+
+        assert path.read_text(encoding="utf-8") == _legacy_csv(data, "\t", header=False)
+
+    def test_float_format(self, tmp_path):
+        data = {"x": np.array([1.0, -0.00049, 2.5]), "n": np.array([1, 2, 3])}
+        path = tmp_path / "out.csv"
+
+        to_csv(data, path, float_format=".3f")
+
+        assert path.read_text(encoding="utf-8") == "x,n\n1.000,1\n-0.000,2\n2.500,3"
+
+    def test_invalid_float_format(self, tmp_path):
+        with pytest.raises(ValueError, match="Invalid float_format"):
+            to_csv({"x": np.zeros(2)}, tmp_path / "out.csv", float_format="q")
+
+    def test_empty_rows(self, tmp_path):
+        path = tmp_path / "out.csv"
+        to_csv({"energy": np.array([])}, path)
+        assert path.read_text(encoding="utf-8") == "energy"
+
+    def test_inconsistent_lengths(self, tmp_path):
+        with pytest.raises(ValueError, match="Inconsistent array lengths"):
+            to_csv({"a": np.zeros(2), "b": np.zeros(3)}, tmp_path / "out.csv")
+        assert not (tmp_path / "out.csv").exists()
+
+
+class TestArrow:
+    """Test Arrow and Parquet export."""
+
+    @pytest.fixture(autouse=True)
+    def pyarrow(self):
+        return pytest.importorskip("pyarrow")
+
+    def test_to_arrow_zero_copy(self):
+        data = {"energy": np.linspace(-5, 5, 11), "k": np.zeros((11, 3))}
+
+        table = to_arrow(data, metadata={"efermi": 1.5})
+
+        assert table.column_names == ["energy", "k0", "k1", "k2"]
+        assert np.shares_memory(table.column("energy").chunk(0).to_numpy(), data["energy"])
+        assert table.schema.metadata[b"efermi"] == b"1.5"
+
+    def test_band_metadata(self, band_dos_dir):
+        data, _, _ = read_band(band_dos_dir / "collinear_pband.h5", mode=3)
+
+        metadata = to_arrow(data).schema.metadata
+
+        assert metadata[b"mode"] == b"3"
+        assert metadata[b"spins"] == b'["up", "down"]'
+        assert metadata[b"elements"] == b'["Ni", "O"]'
+
+    def test_parquet_row_groups(self, tmp_path, band_dos_dir):
+        import pyarrow.parquet as pq
+
+        data, efermi, _ = read_band(band_dos_dir / "spinless_pband.h5", mode=5)
+        path = tmp_path / "band.parquet"
+
+        to_parquet(data, path, metadata={"efermi": efermi}, row_group_size=40)
+
+        parquet = pq.ParquetFile(path)
+        assert parquet.metadata.num_row_groups == 4
+        assert float(parquet.schema_arrow.metadata[b"efermi"]) == efermi
+        table = pq.read_table(path, columns=["label", "band3-1-s"])
+        assert table.column("label").to_pylist() == data["label"].tolist()
+        np.testing.assert_array_equal(table.column("band3-1-s").to_numpy(), data["band3-1-s"])
+
+    def test_parquet_empty_rows(self, tmp_path):
+        import pyarrow.parquet as pq
+
+        path = tmp_path / "empty.parquet"
+        to_parquet({"energy": np.array([]), "label": np.array([], dtype=str)}, path)
+
+        assert pq.read_table(path).num_rows == 0
@@ -1,9 +1,13 @@
 """Test projection processing logic in processors.py module."""
 
+from collections.abc import Mapping
+
 import numpy as np
 import pytest
 
 from ddpc.data.processors import (
+    DOS_MODES,
+    _aggregation_matrix,
     _band_atompxpy,
     _band_atomspdf,
     _band_ele,
@@ -15,8 +19,10 @@ from ddpc.data.processors import (
     _dos_element,
     _dos_spdf,
     _dos_spxpy,
+    _DosBlockAggregator,
     _refactor_band,
     _refactor_dos,
+    _refactor_dos_arrays,
 )
 
 
@@ -175,7 +181,7 @@ class TestRefactorBand:
 
         result = _refactor_band(data, nkpt, nband, elements, mode=1)
 
-        assert isinstance(result, dict)
+        assert isinstance(result, Mapping)
         assert "kx" in result
 
     def test_refactor_band_mode2(self, sample_data):
@@ -185,7 +191,7 @@ class TestRefactorBand:
 
         result = _refactor_band(data, nkpt, nband, elements, mode=2)
 
-        assert isinstance(result, dict)
+        assert isinstance(result, Mapping)
         assert "kx" in result
 
     def test_refactor_band_mode3(self, sample_data):
@@ -195,7 +201,7 @@ class TestRefactorBand:
 
         result = _refactor_band(data, nkpt, nband, elements, mode=3)
 
-        assert isinstance(result, dict)
+        assert isinstance(result, Mapping)
         assert "kx" in result
 
     def test_refactor_band_mode4(self, sample_data):
@@ -205,7 +211,7 @@ class TestRefactorBand:
 
         result = _refactor_band(data, nkpt, nband, elements, mode=4)
 
-        assert isinstance(result, dict)
+        assert isinstance(result, Mapping)
         assert "kx" in result
 
     def test_refactor_band_mode5(self, sample_data):
@@ -215,7 +221,7 @@ class TestRefactorBand:
 
         result = _refactor_band(data, nkpt, nband, elements, mode=5)
 
-        assert isinstance(result, dict)
+        assert isinstance(result, Mapping)
         assert "kx" in result
 
     def test_refactor_band_invalid_mode(self, sample_data):
@@ -476,3 +482,94 @@ class TestProcessorEdgeCases:
         result = _refactor_dos(energies, data, mode=1)
 
         assert len(result["energy"]) == 1
+
+
+class TestAggregationEngine:
+    """Test the sparse aggregation matrix shared by band and DOS modes."""
+
+    def test_matrix_groups_pairs(self):
+        channels, indices, indptr = _aggregation_matrix(
+            "dos", 6, (1, 2), ("Ni", "O"), ("s", "dxy", "dz2", "dxz")
+        )
+
+        assert channels == ("1t2g", "1eg", "2t2g", "2eg")
+        assert indices.tolist() == [1, 3, 2, 5, 7, 6]
+        assert indptr.tolist() == [0, 2, 3, 5, 6]
+
+    def test_matrix_is_cached(self):
+        args = ("band", 2, (1, 2), ("Si", "Si"), ("s", "px"))
+        assert _aggregation_matrix(*args) is _aggregation_matrix(*args)
+
+    def test_matches_sequential_sum(self):
+        rng = np.random.default_rng(0)
+        data = {f"{a}{o}": rng.random(20) for a in (1, 2, 3) for o in ("s", "py", "pz", "px")}
+
+        result = _refactor_dos(np.zeros(20), data, mode=1)
+
+        expected = data["1py"].copy()
+        for key in ("1pz", "1px", "2py", "2pz", "2px", "3py", "3pz", "3px"):
+            expected += data[key]
+        np.testing.assert_array_equal(result["p"], expected)
+
+    def test_missing_pairs_are_not_channels(self):
+        data = {"tdos": np.ones(5), "1s": np.ones(5), "2px": np.ones(5)}
+
+        result = _refactor_dos(np.zeros(5), data, mode=5)
+
+        assert list(result) == ["energy", "tdos", "1s", "2px"]
+
+
+class TestDosBlockAggregator:
+    """Test aggregating DOS projections one atom block at a time."""
+
+    orbitals = ("s", "py", "pz", "px", "dxy", "dyz", "dz2", "dxz", "dx2y2")
+
+    @pytest.mark.parametrize("block", [1, 2, 5])
+    def test_matches_in_memory(self, block):
+        rng = np.random.default_rng(1)
+        projections = rng.random((2, 5, len(self.orbitals), 30))
+        tdos = {"tdos-up": rng.random(30), "tdos-down": rng.random(30)}
+        energies = np.linspace(-5, 5, 30)
+        atoms = (2, 3, 5, 7, 8)
+        elements = ["Ni", "O", "Ni", "O", "Fe", "Ni", "O", "Fe"]
+
+        aggregator = _DosBlockAggregator(
+            DOS_MODES, ("up", "down"), self.orbitals, elements, atoms, 30
+        )
+        for start in range(0, 5, block):
+            aggregator.add(start, projections[:, start : start + block].copy())
+        results = aggregator.result(energies, tdos)
+
+        assert list(results) == list(DOS_MODES)
+        for mode, data in results.items():
+            expected = _refactor_dos_arrays(
+                energies,
+                tdos,
+                projections,
+                ("up", "down"),
+                self.orbitals,
+                mode,
+                elements if mode == 3 else [],
+                atoms,
+            )
+            assert list(data) == list(expected)
+            for key in expected:
+                assert data[key].tobytes() == expected[key].tobytes(), (mode, key)
+
+    def test_missing_pairs(self):
+        projections = np.ones((1, 2, 2, 4))
+        present = (True, False, False, True)
+
+        aggregator = _DosBlockAggregator((1, 5), ("",), ("s", "px"), [], (1, 2), 4, present)
+        aggregator.add(0, projections[:, :1])
+        aggregator.add(1, projections[:, 1:])
+        results = aggregator.result(np.zeros(4), {})
+
+        assert list(results[1]) == ["energy", "s", "p"]
+        assert list(results[5]) == ["energy", "1s", "2px"]
+
+    def test_invalid_mode(self):
+        with pytest.raises(RuntimeError, match="Unsupported mode"):
+            _DosBlockAggregator((1, 8), ("",), ("s",), [], (1,), 4)
+        with pytest.raises(ValueError, match="elements"):
+            _DosBlockAggregator((3,), ("",), ("s",), [], (1,), 4)
@@ -0,0 +1,104 @@
+"""Test bounded-memory JSON reader in streaming.py module."""
+
+import json
+
+import numpy as np
+import pytest
+
+from ddpc.data import streaming
+from ddpc.data.streaming import ArraySpan, find_tail_string, load_json, read_array
+
+
+def _materialize(value):
+    """Replace every ArraySpan by the list it stands for."""
+    if isinstance(value, ArraySpan):
+        return np.asarray(value).tolist()
+    if isinstance(value, dict):
+        return {k: _materialize(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_materialize(v) for v in value]
+    return value
+
+
+class TestLoadJson:
+    """Test load_json against json.load."""
+
+    @pytest.mark.parametrize(
+        "name", ["spinless_pband.json", "collinear_pdos.json", "collinear_band.json"]
+    )
+    def test_matches_json_load(self, band_dos_dir, name, monkeypatch):
+        """Test decoded documents are identical, across chunk boundaries."""
+        monkeypatch.setattr(streaming, "CHUNK_SIZE", 1000)
+        path = band_dos_dir / name
+
+        with open(path, encoding="utf-8") as fin:
+            expected = json.load(fin)
+        assert _materialize(load_json(path, threshold=256)) == expected
+
+    def test_large_arrays_stay_on_disk(self, band_dos_dir):
+        """Test large numeric arrays become spans and small ones stay lists."""
+        band = load_json(band_dos_dir / "spinless_pband.json")
+
+        assert isinstance(band["BandInfo"]["Spin1"]["ProjectBand"][0]["Contribution"], ArraySpan)
+        assert isinstance(band["BandInfo"]["SymmetryKPointsIndex"], list)
+        assert band["BandInfo"]["SpinType"] == "none"
+
+    def test_strings_and_literals(self, tmp_path):
+        """Test escaped strings, literals and nested containers."""
+        doc = {"a": 'x"y\\', "b": [True, False, None], "c": {"d": [], "e": {}}, "f": -1.5e-3}
+        path = tmp_path / "doc.json"
+        path.write_text(json.dumps(doc), encoding="utf-8")
+
+        assert load_json(path) == doc
+
+    def test_stop_at(self, tmp_path):
+        """Test scanning ends at a stop key, leaving the rest unparsed."""
+        path = tmp_path / "doc.json"
+        path.write_text('{"a": {"b": [1, 2], "stop": garbage, "c": 3}, "d": 4}', encoding="utf-8")
+
+        assert load_json(path, stop_at=("stop",)) == {"a": {"b": [1, 2]}}
+
+    def test_find_tail_string(self, tmp_path):
+        path = tmp_path / "doc.json"
+        path.write_text('{"x": [' + "1.0, " * 5000 + '2.0], "k": "v\\\\"}', encoding="utf-8")
+
+        assert find_tail_string(path, "k") == "v\\"
+        assert find_tail_string(path, "x") is None
+        assert find_tail_string(path, "k", size=4) is None
+
+
+class TestArraySpan:
+    """Test parsing spans into buffers."""
+
+    @pytest.fixture
+    def span(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(streaming, "CHUNK_SIZE", 64)
+        values = np.linspace(-1, 1, 500)
+        path = tmp_path / "arr.json"
+        path.write_text(json.dumps({"x": values.tolist()}), encoding="utf-8")
+        return load_json(path, threshold=16)["x"], values
+
+    def test_read_into_buffer(self, span):
+        arr, values = span
+        out = np.empty(500)
+
+        assert read_array(arr, out) is out
+        np.testing.assert_array_equal(out, values)
+
+    def test_slicing(self, span):
+        arr, values = span
+        np.testing.assert_array_equal(arr[10:20], values[10:20])
+
+    def test_length_mismatch(self, span):
+        arr, _ = span
+        with pytest.raises(ValueError, match="longer than 400"):
+            arr.read(np.empty(400))
+        with pytest.raises(ValueError, match="expected 600"):
+            arr.read(np.empty(600))
+
+    def test_malformed_array(self, tmp_path):
+        path = tmp_path / "bad.json"
+        path.write_text('{"x": [' + "1.0, " * 2000 + "(2.0, 3.0]}", encoding="utf-8")
+
+        with pytest.raises(ValueError, match="not a flat list of numbers"):
+            np.asarray(load_json(path)["x"])
@@ -1,5 +1,6 @@
 """CLI command tests: Test command line interface using Click CliRunner."""
 
+import json
 import tempfile
 from pathlib import Path
 
@@ -182,6 +183,33 @@ class TestInfoCommand:
             assert result.exit_code == 0
             assert "Space group" in result.output or "Warning" in result.output
 
+    def test_info_profile(self, runner, tmp_path):
+        """Test --profile-json reports the read and symmetry stages."""
+        input_file = tmp_path / "input.vasp"
+        ase_write(input_file, bulk("Cu", "fcc", a=3.6), format="vasp")
+        profile_file = tmp_path / "profile.json"
+
+        result = runner.invoke(
+            cli,
+            ["info", str(input_file), "--show-symmetry", "--profile-json", str(profile_file)],
+        )
+
+        assert result.exit_code == 0
+        stages = json.loads(profile_file.read_text(encoding="utf-8"))["stages"]
+        assert [s["stage"] for s in stages] == ["read", "symmetry"]
+        assert stages[0]["bytes_read"] == input_file.stat().st_size
+
+    def test_profile_json_dash_goes_to_stderr(self, runner, tmp_path):
+        """Test --profile-json - keeps stdout free for the command output."""
+        input_file = tmp_path / "input.vasp"
+        ase_write(input_file, bulk("Cu", "fcc", a=3.6), format="vasp")
+
+        result = runner.invoke(cli, ["info", str(input_file), "--profile-json", "-"])
+
+        assert result.exit_code == 0
+        assert '"stages"' not in result.stdout
+        assert [s["stage"] for s in json.loads(result.stderr)["stages"]] == ["read"]
+
     def test_info_custom_symprec(self, runner):
         """Test custom symmetry precision."""
         with tempfile.TemporaryDirectory() as tmpdir:
@@ -195,6 +223,18 @@ class TestInfoCommand:
 
             assert result.exit_code == 0
 
+    def test_info_symprec_scan(self, runner, tmp_path):
+        """Test the symmetry tolerance sweep table."""
+        input_file = tmp_path / "input.vasp"
+        ase_write(input_file, bulk("Si", "diamond", a=5.43), format="vasp")
+
+        result = runner.invoke(cli, ["info", str(input_file), "--symprec-scan"])
+
+        assert result.exit_code == 0
+        assert "Symmetry vs. Tolerance" in result.output
+        assert result.output.count("Fd-3m (227)") == 9
+        assert "0.0001" in result.output
+
     def test_info_no_cell(self, runner):
         """Test info with structure without cell."""
         from ase import Atoms
@@ -415,6 +455,40 @@ class TestOrthogonalCommand:
             assert result.exit_code == 0
             assert output_file.exists()
 
+    def test_orthogonal_hnf(self, runner, tmp_path):
+        """Test the exhaustive HNF search finds the 4-atom rectangular cell of graphene-like C2."""
+        from ase import Atoms
+        from ase.io import read as ase_read
+
+        cell = [[2.46, 0.0, 0.0], [-1.23, 2.130422, 0.0], [0.0, 0.0, 10.0]]
+        structure = Atoms(
+            "C2", scaled_positions=[[0, 0, 0], [1 / 3, 2 / 3, 0]], cell=cell, pbc=True
+        )
+        input_file = tmp_path / "input.vasp"
+        ase_write(input_file, structure, format="vasp")
+        output_file = tmp_path / "orthogonal.vasp"
+
+        result = runner.invoke(
+            cli,
+            [
+                "orthogonal",
+                str(input_file),
+                "-o",
+                str(output_file),
+                "--min-length",
+                "2.4",
+                "--max-length",
+                "11",
+                "--method",
+                "hnf",
+                "--angle-tolerance",
+                "0.01",
+            ],
+        )
+
+        assert result.exit_code == 0, result.output
+        assert len(ase_read(output_file)) == 4
+
 
 class TestScaleCommand:
     """Test scale command."""
@@ -446,6 +520,39 @@ class TestScaleCommand:
             assert output_file.exists()
 
 
+class TestDedupCommand:
+    """Test dedup command."""
+
+    @pytest.fixture
+    def runner(self):
+        return CliRunner()
+
+    def test_dedup(self, runner, tmp_path):
+        """Test duplicate groups and the saved index."""
+        si = bulk("Si", "diamond", a=5.43)
+        ase_write(tmp_path / "POSCAR", si, format="vasp")
+        ase_write(tmp_path / "si_super.vasp", si.repeat(2), format="vasp")
+        ase_write(tmp_path / "cu.vasp", bulk("Cu", "fcc", a=3.6), format="vasp")
+
+        result = runner.invoke(cli, ["dedup", str(tmp_path), "-j", "1"])
+
+        assert result.exit_code == 0
+        assert "Duplicate Structures" in result.output
+        assert "si_super.vasp" in result.output
+        assert "cu.vasp" not in result.output
+        assert "duplicate groups" in result.output
+        assert (tmp_path / ".ddpc-fingerprints.json").exists()
+
+    def test_dedup_no_index(self, runner, tmp_path):
+        ase_write(tmp_path / "cu.vasp", bulk("Cu", "fcc", a=3.6), format="vasp")
+
+        result = runner.invoke(cli, ["dedup", str(tmp_path), "--no-index"])
+
+        assert result.exit_code == 0
+        assert "Duplicate Structures" not in result.output
+        assert not (tmp_path / ".ddpc-fingerprints.json").exists()
+
+
 class TestCLIErrorHandling:
     """Test CLI error handling."""
 
@@ -0,0 +1,144 @@
+"""Test structure fingerprints and the duplicate index in dedup.py module."""
+
+import os
+
+import numpy as np
+import pytest
+from ase.build import bulk, make_supercell
+
+from ddpc.structure import dedup, fingerprint, write_structure
+
+
+def settings(atoms):
+    """Return the same crystal in other cells, orientations, origins and atom orders."""
+    rng = np.random.default_rng(0)
+    rotated = atoms.copy()
+    rotated.rotate(37, "x", rotate_cell=True)
+    rotated.rotate(11, "z", rotate_cell=True)
+    shuffled = atoms.repeat(2)
+    shuffled = shuffled[rng.permutation(len(shuffled))]
+    shuffled.translate([0.3, 0.7, -0.2])
+    shuffled.wrap()
+    noisy = atoms.repeat((1, 2, 1))
+    noisy.positions += rng.normal(0, 2e-5, noisy.positions.shape)
+    return [
+        atoms.repeat((2, 1, 3)),
+        rotated,
+        shuffled,
+        noisy,
+        make_supercell(atoms, [[1, 1, 0], [0, 1, 0], [0, 0, 1]]),
+        make_supercell(atoms, [[0, 1, 0], [1, 0, 0], [0, 0, -1]]),
+    ]
+
+
+class TestFingerprint:
+    """Test invariance and discrimination of fingerprints."""
+
+    @pytest.mark.parametrize(
+        "atoms",
+        [
+            bulk("Si", "diamond", a=5.43),
+            bulk("Mg", "hcp", a=3.2, c=5.2),
+            bulk("ZnO", "wurtzite", a=3.25, c=5.2, u=0.382),
+            bulk("Cu", "fcc", a=3.6, orthorhombic=True),
+        ],
+    )
+    def test_same_crystal_in_any_setting(self, atoms):
+        expected = fingerprint(atoms)
+
+        assert [fingerprint(other) for other in settings(atoms)] == [expected] * 6
+
+    def test_format(self):
+        assert fingerprint(bulk("Si", "diamond", a=5.43)).startswith("Si2-227-")
+        assert fingerprint(bulk("NaCl", "rocksalt", a=5.64)).startswith("ClNa-225-")
+
+    def test_different_crystals(self):
+        prints = {
+            fingerprint(bulk("ZnO", "wurtzite", a=3.25, c=5.2, u=0.382)),
+            fingerprint(bulk("ZnO", "wurtzite", a=3.25, c=5.2, u=0.37)),
+            fingerprint(bulk("ZnO", "wurtzite", a=3.25, c=5.3, u=0.382)),
+            fingerprint(bulk("ZnO", "zincblende", a=4.6)),
+            fingerprint(bulk("ZnO", "rocksalt", a=4.6)),
+        }
+
+        assert len(prints) == 5
+
+    def test_tolerance(self):
+        small = bulk("Cu", "fcc", a=3.6)
+        large = bulk("Cu", "fcc", a=3.7)
+
+        assert fingerprint(small) != fingerprint(large)
+        assert fingerprint(small, tol=0.2) == fingerprint(large, tol=0.2)
+
+
+@pytest.fixture
+def collection(tmp_path):
+    """Files of three crystals, two of them stored more than once."""
+    for sub in "abc":
+        (tmp_path / sub).mkdir()
+    si = bulk("Si", "diamond", a=5.43)
+    write_structure(str(tmp_path / "a" / "POSCAR"), si, format="vasp")
+    write_structure(str(tmp_path / "b" / "si.as"), si.repeat(2))
+    write_structure(str(tmp_path / "b" / "si_conv.cif"), bulk("Si", "diamond", a=5.43, cubic=True))
+    write_structure(str(tmp_path / "c" / "cu.vasp"), bulk("Cu", "fcc", a=3.6), format="vasp")
+    write_structure(str(tmp_path / "c" / "cu.cif"), bulk("Cu", "fcc", a=3.6).repeat((1, 1, 2)))
+    write_structure(str(tmp_path / "mg.vasp"), bulk("Mg", "hcp", a=3.2, c=5.2), format="vasp")
+    (tmp_path / "broken.cif").write_text("not a cif\n", encoding="utf-8")
+    (tmp_path / "notes.txt").write_text("ignored\n", encoding="utf-8")
+    return tmp_path
+
+
+class TestFingerprintIndex:
+    """Test directory indexing and duplicate groups."""
+
+    def test_duplicate_groups(self, collection):
+        entries = dedup.fingerprint_index(collection, workers=1)
+
+        assert list(entries) == [
+            "a/POSCAR",
+            "b/si.as",
+            "b/si_conv.cif",
+            "broken.cif",
+            "c/cu.cif",
+            "c/cu.vasp",
+            "mg.vasp",
+        ]
+        assert entries["broken.cif"].fingerprint is None
+        assert entries["broken.cif"].error is not None
+        assert dedup.duplicate_groups(entries) == [
+            ["a/POSCAR", "b/si.as", "b/si_conv.cif"],
+            ["c/cu.cif", "c/cu.vasp"],
+        ]
+
+    def test_process_pool(self, collection):
+        pooled = dedup.fingerprint_index(collection, workers=2, save=False)
+
+        assert pooled == dedup.fingerprint_index(collection, workers=1, save=False)
+
+    def test_index_is_reused_and_updated(self, collection, monkeypatch):
+        first = dedup.fingerprint_index(collection, workers=1)
+        assert (collection / dedup.INDEX_NAME).exists()
+
+        calls = []
+        worker = dedup._fingerprint_file
+        monkeypatch.setattr(dedup, "_fingerprint_file", lambda *a: calls.append(a[0]) or worker(*a))
+        assert dedup.fingerprint_index(collection, workers=1) == first
+        assert calls == []
+
+        mg = collection / "mg.vasp"
+        write_structure(str(mg), bulk("Cu", "fcc", a=3.6), format="vasp")
+        os.utime(mg, ns=(0, 0))
+        entries = dedup.fingerprint_index(collection, workers=1)
+
+        assert calls == [str(mg)]
+        assert dedup.duplicate_groups(entries)[1] == ["c/cu.cif", "c/cu.vasp", "mg.vasp"]
+
+    def test_index_with_other_settings_is_discarded(self, collection, monkeypatch):
+        dedup.fingerprint_index(collection, workers=1)
+
+        calls = []
+        worker = dedup._fingerprint_file
+        monkeypatch.setattr(dedup, "_fingerprint_file", lambda *a: calls.append(a[0]) or worker(*a))
+        dedup.fingerprint_index(collection, tol=0.05, workers=1)
+
+        assert len(calls) == 7
@@ -0,0 +1,111 @@
+"""Test DS-PAW .as format reader and writer."""
+
+import numpy as np
+import pytest
+from ase.atoms import Atoms
+
+from ddpc import _utils
+from ddpc.structure.readers import dspaw_as
+from ddpc.structure.writers import dspaw_as as dspaw_as_writer
+
+
+def test_read_constraints_and_vector_mag(structures_dir):
+    """Test lattice/atom constraints and vector moments are decoded."""
+    atoms = dspaw_as.read(structures_dir / "all.as")
+
+    assert atoms.info["lat"] == [False, True, True, False, False, True, True, True, True]
+    assert atoms.info["Fix_x"] == [True] * 6
+    assert atoms.info["Fix_z"] == [False] * 6
+    np.testing.assert_array_equal(atoms.get_initial_magnetic_moments()[0], [0.1, -0.1, 2.0])
+
+
+def test_read_scalar_mag(structures_dir):
+    atoms = dspaw_as.read(structures_dir / "mag.as")
+
+    assert atoms.get_chemical_symbols() == ["Ni", "Ni", "O", "O"]
+    np.testing.assert_array_equal(atoms.get_initial_magnetic_moments(), [2.0, -2.0, 0.0, 0.5])
+    np.testing.assert_array_equal(atoms.positions[1], [5.2105, 5.2105, 5.2105])
+
+
+def test_read_direct_fix_and_ragged_rows(temp_output_dir):
+    """Test Direct coordinates, a three-value Fix column, comments and extra values."""
+    as_file = temp_output_dir / "direct.as"
+    as_file.write_text(
+        """Total number of atoms
+2
+Lattice
+2.0 0.0 0.0
+0.0 2.0 0.0  # comment
+0.0 0.0 2.0
+
+Direct Fix Mag
+Fe_ 0.5 0.0 0.0 T F T 1.5 extra
+Fe  0.0 0.5 0.0 F F F -1.5
+""",
+        encoding="utf-8",
+    )
+
+    atoms = dspaw_as.read(as_file)
+
+    assert atoms.get_chemical_symbols() == ["Fe", "Fe"]
+    np.testing.assert_array_equal(atoms.positions, [[1.0, 0.0, 0.0], [0.0, 1.0, 0.0]])
+    assert atoms.info == {"Fix": [[True, False, True], [False, False, False]]}
+    np.testing.assert_array_equal(atoms.get_initial_magnetic_moments(), [1.5, -1.5])
+
+
+@pytest.mark.parametrize(
+    ("header", "row", "match"),
+    [
+        ("Cartesian Spin", "H 0 0 0 1", "Unknown atom column"),
+        ("Cartesian Mag", "H 0 0 0", "atom 2 has fewer than 5 values"),
+        ("Polar", "H 0 0 0", "format error"),
+    ],
+)
+def test_read_malformed(temp_output_dir, header, row, match):
+    as_file = temp_output_dir / "bad.as"
+    as_file.write_text(
+        f"Total\n2\nLattice\n1 0 0\n0 1 0\n0 0 1\n{header}\nH 0 0 0 1\n{row}\n", encoding="utf-8"
+    )
+
+    with pytest.raises(ValueError, match=match):
+        dspaw_as.read(as_file)
+
+
+def test_write_exact_lines_across_blocks(monkeypatch):
+    """Test line format is unchanged when rows are written in several blocks."""
+    monkeypatch.setattr(_utils, "ROW_BLOCK", 2)
+    atoms = Atoms(
+        "Fe2O",
+        positions=[[0, 0, 0], [1.5, -0.0, 12.34567], [0.1, 0.2, 0.3]],
+        cell=np.eye(3) * 3,
+        magmoms=[2.5, -0.0, -1.2345],
+        pbc=True,
+    )
+    atoms.info = {"lat": [True] * 3 + [False] * 6, "Fix_x": [True, False, True]}
+
+    assert dspaw_as_writer.write("", atoms) == (
+        "Total number of atoms\n3\n"
+        "Lattice Fix_x Fix_y Fix_z\n"
+        "    3.0000     0.0000     0.0000 T T T\n"
+        "    0.0000     3.0000     0.0000 F F F\n"
+        "    0.0000     0.0000     3.0000 F F F\n"
+        "Cartesian Fix_x Mag\n"
+        "Fe     0.0000     0.0000     0.0000 T   2.500\n"
+        "Fe     1.5000    -0.0000    12.3457 F   0.000\n"
+        "O      0.1000     0.2000     0.3000 T  -1.234\n"
+    )
+    assert "lat" in atoms.info
+
+
+def test_write_read_roundtrip(structures_dir, temp_output_dir):
+    atoms = dspaw_as.read(structures_dir / "all.as")
+    path = temp_output_dir / "out.as"
+
+    assert dspaw_as_writer.write(str(path), atoms) == ""
+    again = dspaw_as.read(path)
+
+    assert again.info == atoms.info
+    np.testing.assert_allclose(again.positions, atoms.positions, atol=1e-4)
+    np.testing.assert_allclose(
+        again.get_initial_magnetic_moments(), atoms.get_initial_magnetic_moments(), atol=1e-3
+    )
@@ -2,8 +2,10 @@
 
 import pytest
 from ase.atoms import Atoms
+from ase.build import bulk
+from ase.io import write
 
-from ddpc.structure import read_structure, write_structure
+from ddpc.structure import detect_format, read_structure, write_structure
 
 
 def test_read_as_format(structures_dir):
@@ -42,3 +44,66 @@ def test_write_read_roundtrip(structures_dir, temp_output_dir):
 
     assert len(atoms_read) == len(atoms_original)
     assert atoms_read.get_chemical_formula() == atoms_original.get_chemical_formula()
+
+
+@pytest.mark.parametrize(
+    ("name", "expected"),
+    [
+        ("all.as", "dspaw"),
+        ("Si.xyz", "rescu"),
+        ("BN.xyz", "xyz"),
+        ("POSCAR", "vasp"),
+        ("POSCAR_scaled", "vasp"),
+    ],
+)
+def test_detect_format_samples(structures_dir, name, expected):
+    assert detect_format(structures_dir / name) == expected
+
+
+@pytest.mark.parametrize(
+    ("name", "fmt", "expected"),
+    [
+        ("cell.cif", "cif", "cif"),
+        ("cell.xyz", "extxyz", "extxyz"),
+        ("cell.txt", "vasp", "vasp"),
+        ("cell.as", "dspaw", "dspaw"),
+    ],
+)
+def test_detect_format_ignores_extension(tmp_path, name, fmt, expected):
+    path = tmp_path / name
+    write_structure(str(path), bulk("Cu", "fcc", a=3.6), format=fmt)
+
+    assert detect_format(path) == expected
+
+
+def test_detect_format_rescu_comments(tmp_path):
+    path = tmp_path / "commented.xyz"
+    path.write_text("# made by hand\n2\nAtomType X Y Z\nH 0 0 0 % first\nH 0 0 0.7\n", "utf-8")
+
+    assert detect_format(path) == "rescu"
+    assert len(read_structure(path)) == 2
+
+
+def test_detect_format_unknown(tmp_path):
+    path = tmp_path / "notes.txt"
+    path.write_text("not a structure\n", encoding="utf-8")
+
+    assert detect_format(path) is None
+
+
+def test_rescu_is_parsed_once(structures_dir, monkeypatch):
+    """Test sniffed RESCU files skip the ASE parser and keep constraints."""
+    import ase.io
+
+    monkeypatch.setattr(ase.io, "read", pytest.fail)
+
+    atoms = read_structure(structures_dir / "Si.xyz")
+
+    assert atoms.info["atom_fix"].tolist() == [[0, 0, 0], [0, 1, 0]]
+
+
+def test_extxyz_keeps_cell(tmp_path):
+    path = tmp_path / "cell.xyz"
+    write(path, bulk("Cu", "fcc", a=3.6), format="extxyz")
+
+    assert read_structure(path).cell.volume == pytest.approx(3.6**3 / 4)
@@ -4,6 +4,7 @@ import numpy as np
 import pytest
 from ase.atoms import Atoms
 
+from ddpc import _utils
 from ddpc.structure.readers import rescu_xyz
 from ddpc.structure.writers import rescu_xyz as rescu_xyz_writer
 
@@ -357,3 +358,22 @@ def test_roundtrip_with_fix(temp_output_dir):
 
     assert len(atoms_read) == len(atoms_orig)
     assert np.allclose(atoms_read.info["atom_fix"], atoms_orig.info["atom_fix"])
+
+
+def test_write_exact_lines_across_blocks(monkeypatch):
+    """Test line format is unchanged when rows are written in several blocks."""
+    monkeypatch.setattr(_utils, "ROW_BLOCK", 2)
+    atoms = Atoms(
+        "Fe3",
+        positions=[[0, 0, 0], [1.435, 1.435, 1.435], [-0.0, 2.0, 1e-7]],
+        magmoms=[2.5, 0.0, -2.555],
+        pbc=True,
+    )
+    atoms.info["atom_fix"] = np.array([[0, 0, 0], [1, 1, 1], [0, 1, 0]])
+
+    assert rescu_xyz_writer.write("-", atoms) == (
+        "3\nAuto-generated xyz file\n"
+        "Fe 0.000000 0.000000 0.000000 2.50 0 0 0\n"
+        "Fe 1.435000 1.435000 1.435000 0.00 1 1 1\n"
+        "Fe -0.000000 2.000000 0.000000 -2.56 0 1 0\n"
+    )
@@ -1,10 +1,11 @@
 """Test symmetry analysis."""
 
+import numpy as np
 import pytest
 from ase import Atoms
 from ase.build import bulk
 
-from ddpc.structure import get_symmetry, read_structure
+from ddpc.structure import get_symmetry, read_structure, scan_symmetry
 
 
 def test_get_symmetry_returns_dict(structures_dir):
@@ -129,3 +130,160 @@ def test_get_symmetry_hexagonal():
     sym = get_symmetry(atoms)
 
     assert sym["crystal_system"] in ["hexagonal", "trigonal"]
+
+
+@pytest.fixture
+def spglib_calls(monkeypatch, tmp_path):
+    """Count dataset calls, with an empty memory and a temporary cache directory."""
+    import spglib
+
+    from ddpc.structure import symmetry
+
+    monkeypatch.setenv("DDPC_CACHE_DIR", str(tmp_path))
+    symmetry.clear_symmetry_cache()
+    calls = []
+    dataset = spglib.get_symmetry_dataset
+
+    def counting(*args, **kwargs):
+        calls.append(args)
+        return dataset(*args, **kwargs)
+
+    monkeypatch.setattr(spglib, "get_symmetry_dataset", counting)
+    monkeypatch.setattr(spglib, "get_spacegroup", pytest.fail)
+    yield calls
+    symmetry.clear_symmetry_cache()
+
+
+class TestMemoization:
+    """Test the in-memory LRU and the on-disk symmetry cache."""
+
+    def test_single_dataset_call_for_both_symbols(self, spglib_calls):
+        atoms = bulk("Si", "diamond", a=5.43)
+
+        international = get_symmetry(atoms)
+        schoenflies = get_symmetry(atoms, symbol_type=1)
+
+        assert international["spacegroup"] == "Fd-3m (227)"
+        assert schoenflies["spacegroup"] == "Oh^7 (227)"
+        assert len(spglib_calls) == 1
+
+    def test_key_ignores_atom_order_and_noise(self, spglib_calls):
+        from ddpc.structure.symmetry import structure_key
+
+        atoms = bulk("NaCl", "rocksalt", a=5.64).repeat((1, 1, 2))
+        shuffled = atoms[[3, 1, 0, 2]]
+        shuffled.positions += 1e-8
+        moved = atoms.copy()
+        moved.positions[0] += 0.01
+
+        assert structure_key(shuffled) == structure_key(atoms)
+        assert structure_key(moved) != structure_key(atoms)
+        assert structure_key(shuffled, ordered=True) != structure_key(atoms, ordered=True)
+        get_symmetry(atoms)
+        get_symmetry(shuffled)
+        assert len(spglib_calls) == 1
+
+    def test_results_are_copies(self, spglib_calls):
+        atoms = bulk("Cu", "fcc", a=3.6)
+
+        get_symmetry(atoms)["spacegroup"] = "changed"
+
+        assert get_symmetry(atoms)["spacegroup"] == "Fm-3m (225)"
+
+    def test_lru_bound(self, spglib_calls, monkeypatch):
+        from ddpc.structure import symmetry
+
+        monkeypatch.setattr(symmetry, "MEMORY_ENTRIES", 2)
+        cells = [bulk("Cu", "fcc", a=a) for a in (3.5, 3.6, 3.7)]
+
+        for atoms in (*cells, cells[2], cells[0]):
+            get_symmetry(atoms)
+
+        assert len(symmetry._memory) == 2
+        assert len(spglib_calls) == 4
+
+    def test_disk_cache_shared_between_processes(self, spglib_calls, tmp_path):
+        from ddpc.structure import find_primitive
+        from ddpc.structure.symmetry import clear_symmetry_cache
+
+        atoms = bulk("Mg", "hcp", a=3.2, c=5.2).repeat(2)
+        expected = get_symmetry(atoms, cache=True)
+        prim = find_primitive(atoms, cache=True)
+        clear_symmetry_cache()
+
+        assert get_symmetry(atoms, cache=True) == expected
+        assert len(find_primitive(atoms, cache=True)) == len(prim) == 2
+        assert len(spglib_calls) == 1
+        assert len(list((tmp_path / "symmetry").glob("*.json"))) == 2
+
+        clear_symmetry_cache(disk=True)
+        get_symmetry(atoms, cache=True)
+        assert len(spglib_calls) == 2
+
+    def test_hall_number_keeps_default_symbol(self, spglib_calls):
+        atoms = Atoms(
+            "CuAuAg",
+            scaled_positions=[[0, 0, 0], [0.5, 0.5, 0], [0.25, 0, 0.5]],
+            cell=[3, 4, 5],
+            pbc=True,
+        )
+
+        sym = get_symmetry(atoms, hall_number=126)
+
+        assert sym["spacegroup"] == "Pmm2 (25)"
+        assert sym["hall_number"] == 126
+
+
+@pytest.fixture
+def rattled_si():
+    """Diamond Si with 3 mA noise: P1 below symprec ~1e-2, Fd-3m above."""
+    atoms = bulk("Si", "diamond", a=5.43, cubic=True)
+    atoms.positions += np.random.default_rng(0).normal(0, 0.003, atoms.positions.shape)
+    return atoms
+
+
+class TestScanSymmetry:
+    """Test the symmetry tolerance sweep."""
+
+    def test_bisection_matches_exhaustive_scan(self, spglib_calls, rattled_si):
+        from ddpc.structure.symmetry import clear_symmetry_cache
+
+        symprecs = np.logspace(-5, -0.5, 40)
+
+        scan = scan_symmetry(rattled_si, symprecs)
+        bisected = len(spglib_calls)
+        clear_symmetry_cache()
+        full = scan_symmetry(rattled_si, symprecs[::-1], exhaustive=True)
+
+        assert [row[:5] for row in scan] == [row[:5] for row in full]
+        assert [row.symprec for row in scan] == sorted(symprecs)
+        assert bisected < 10
+        assert len(spglib_calls) == bisected + 40
+        assert sum(row.evaluated for row in scan) == bisected
+        assert (scan[0].spacegroup, scan[0].primitive_atoms) == ("P1 (1)", 8)
+        assert (scan[-1].spacegroup, scan[-1].hall_number, scan[-1].primitive_atoms) == (
+            "Fd-3m (227)",
+            525,
+            2,
+        )
+
+    def test_shares_memo_with_get_symmetry(self, spglib_calls):
+        atoms = bulk("Cu", "fcc", a=3.6)
+
+        scan = scan_symmetry(atoms, [1e-5, 1e-3, 1e-1])
+
+        assert len(spglib_calls) == 2
+        assert [row.evaluated for row in scan] == [True, False, True]
+        assert get_symmetry(atoms, symprec=1e-1)["primitive_atoms"] == 1
+        assert len(spglib_calls) == 2
+
+    def test_process_pool(self, spglib_calls, rattled_si):
+        symprecs = np.logspace(-5, -1, 9)
+
+        assert scan_symmetry(rattled_si, symprecs, workers=2) == scan_symmetry(rattled_si, symprecs)
+
+    def test_invalid(self):
+        with pytest.raises(ValueError, match="At least one symprec"):
+            scan_symmetry(bulk("Cu"), [])
+        with pytest.raises(ValueError, match="no cell"):
+            scan_symmetry(Atoms("H2", positions=[[0, 0, 0], [1, 0, 0]]), [1e-3])
@@ -0,0 +1,127 @@
+"""Test multi-frame reading in trajectory.py module."""
+
+import numpy as np
+import pytest
+from ase.atoms import Atoms
+from ase.io import write
+
+from ddpc.structure import iread_structures, read_structure, trajectory
+from ddpc.structure.readers import dspaw_as
+
+AS_FRAME = """Total number of atoms
+2
+Lattice
+4.0 0.0 0.0
+0.0 4.0 0.0
+0.0 0.0 4.0
+Cartesian Mag
+H {x} 0.0 0.0 1.0
+O 1.0 1.0 1.0 -1.0
+"""
+
+
+@pytest.fixture
+def as_file(tmp_path):
+    path = tmp_path / "traj.as"
+    frames = [AS_FRAME.format(x=f"{i}.5") for i in range(4)]
+    path.write_text("# relaxation\n" + "\n# step\n".join(frames), encoding="utf-8")
+    return path
+
+
+@pytest.fixture
+def xyz_file(tmp_path):
+    """Plain xyz with a blank title line in one frame."""
+    images = [Atoms("H2", positions=[[0, 0, i], [0, 0, i + 0.7]]) for i in range(5)]
+    path = tmp_path / "traj.xyz"
+    write(path, images, format="xyz")
+    text = path.read_text(encoding="utf-8").splitlines(keepends=True)
+    text[1] = "\n"
+    path.write_text("".join(text), encoding="utf-8")
+    return path
+
+
+class TestDspawFrames:
+    """Test .as trajectories."""
+
+    def test_frames_match_single_frame_reader(self, as_file, tmp_path):
+        frames = list(iread_structures(as_file))
+
+        assert len(frames) == trajectory.count_frames(as_file, "dspaw") == 4
+        single = tmp_path / "single.as"
+        single.write_text(AS_FRAME.format(x="2.5"), encoding="utf-8")
+        expected = dspaw_as.read(single)
+        np.testing.assert_array_equal(frames[2].positions, expected.positions)
+        np.testing.assert_array_equal(
+            frames[2].get_initial_magnetic_moments(), expected.get_initial_magnetic_moments()
+        )
+
+    @pytest.mark.parametrize(("index", "x"), [(1, 1.5), ("-1", 3.5)])
+    def test_read_structure_single_frame(self, as_file, index, x):
+        assert read_structure(as_file, index=index).positions[0, 0] == x
+
+    @pytest.mark.parametrize(("index", "xs"), [("::2", [0.5, 2.5]), (slice(1, 3), [1.5, 2.5])])
+    def test_read_structure_frame_slice(self, as_file, index, xs):
+        assert [a.positions[0, 0] for a in read_structure(as_file, index=index)] == xs
+
+    def test_incomplete_last_frame_is_ignored(self, as_file):
+        with open(as_file, "a", encoding="utf-8") as fout:
+            fout.write("\n" + "".join(AS_FRAME.splitlines(keepends=True)[:8]))
+
+        assert trajectory.count_frames(as_file, "dspaw") == 4
+        assert read_structure(as_file, index=-1).positions[0, 0] == 3.5
+
+    def test_bad_atom_count(self, tmp_path):
+        path = tmp_path / "bad.as"
+        path.write_text(AS_FRAME.format(x=0) + AS_FRAME.replace("\n2\n", "\ntwo\n"), "utf-8")
+
+        with pytest.raises(ValueError, match="Frame 1 does not start with an atom count"):
+            trajectory.count_frames(path, "dspaw")
+
+    def test_out_of_range(self, as_file):
+        with pytest.raises(IndexError):
+            read_structure(as_file, index=4)
+
+
+class TestXyzFrames:
+    """Test plain ASE and RESCU xyz trajectories."""
+
+    def test_blank_title_and_small_chunks(self, xyz_file, monkeypatch):
+        monkeypatch.setattr(trajectory, "SCAN_CHUNK", 16)
+
+        frames = read_structure(xyz_file, index=":")
+
+        assert [a.positions[0, 2] for a in frames] == [0, 1, 2, 3, 4]
+        assert all(a.get_chemical_symbols() == ["H", "H"] for a in frames)
+
+    def test_rescu_frames(self, structures_dir, tmp_path):
+        text = (structures_dir / "Si.xyz").read_text(encoding="utf-8")
+        path = tmp_path / "rescu.xyz"
+        path.write_text(text + "\n# next\n" + text, encoding="utf-8")
+
+        frames = list(iread_structures(path, format="rescu"))
+
+        expected = read_structure(structures_dir / "Si.xyz")
+        assert len(frames) == 2
+        for atoms in frames:
+            np.testing.assert_allclose(atoms.positions, expected.positions)
+            np.testing.assert_allclose(atoms.cell.array, expected.cell.array)
+
+
+class TestFrameIndex:
+    """Test persistence of the offset index."""
+
+    def test_index_is_saved_and_reused(self, as_file, monkeypatch):
+        offsets = trajectory.frame_offsets(as_file, "dspaw")
+
+        assert trajectory.index_path(as_file).exists()
+        monkeypatch.setattr(trajectory, "_scan", pytest.fail)
+        np.testing.assert_array_equal(trajectory.frame_offsets(as_file, "dspaw"), offsets)
+
+    def test_index_is_rebuilt_when_file_changes(self, as_file):
+        assert trajectory.count_frames(as_file, "dspaw") == 4
+
+        with open(as_file, "a", encoding="utf-8") as fout:
+            fout.write(AS_FRAME.format(x="4.5"))
+
+        assert trajectory.count_frames(as_file, "dspaw") == 5
+        assert read_structure(as_file, index=-1).positions[0, 0] == 4.5
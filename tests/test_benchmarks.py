@@ -0,0 +1,139 @@
+"""Test the benchmark generators and runner in benchmarks/."""
+
+import json
+
+import numpy as np
+import pytest
+
+from benchmarks import generators, run
+from ddpc.data import probe_band, probe_dos, read_band, read_dos
+from ddpc.structure import read_structure
+
+
+@pytest.mark.parametrize("spin", generators.SPIN_TYPES)
+@pytest.mark.parametrize("projected", [True, False])
+class TestDataGenerators:
+    """Generated band and DOS files read the same from HDF5 and JSON."""
+
+    def test_band(self, tmp_path, spin, projected):
+        sizes = {"natom": 3, "nband": 5, "nkpt": 7, "spin": spin, "projected": projected}
+        h5 = generators.band_file(tmp_path, fmt="h5", **sizes)
+        js = generators.band_file(tmp_path, fmt="json", **sizes)
+
+        # DS-PAW lists all 16 orbitals in HDF5 files, only the used ones in JSON
+        summary = probe_band(js)
+        assert summary._replace(orbitals=()) == probe_band(h5)._replace(orbitals=())
+        assert (summary.nband, summary.nkpt, summary.is_projected) == (5, 7, projected)
+        assert summary.nspin == (2 if spin == "collinear" else 1)
+        from_h5, _, _ = read_band(h5)
+        from_json, _, _ = read_band(js)
+        assert list(from_h5) == list(from_json)
+        for key in from_h5:
+            if key != "label":
+                np.testing.assert_allclose(from_json[key], from_h5[key], atol=1e-12)
+
+    def test_dos(self, tmp_path, spin, projected):
+        sizes = {"natom": 3, "nenergy": 11, "spin": spin, "projected": projected}
+        h5 = generators.dos_file(tmp_path, fmt="h5", **sizes)
+        js = generators.dos_file(tmp_path, fmt="json", **sizes)
+
+        assert probe_dos(js)._replace(orbitals=()) == probe_dos(h5)._replace(orbitals=())
+        if projected:
+            from_h5, _, _ = read_dos(h5, mode=3)
+            from_json, _, _ = read_dos(js, mode=3)
+            assert list(from_h5) == list(from_json)
+            for key in from_h5:
+                np.testing.assert_allclose(from_json[key], from_h5[key], atol=1e-12)
+
+
+def test_json_layout(tmp_path):
+    path = generators.dos_file(tmp_path, natom=1, nenergy=3, spin="spinless", fmt="json")
+    text = path.read_text(encoding="utf-8")
+
+    assert '        "DosEnergy": [\n            -20.000000000000,\n' in text
+    assert text.index('"Spin1"') < text.index('"SpinType"')
+    assert json.loads(text)["DosInfo"]["NumberOfDos"] == 3
+
+
+def test_generated_file_is_reused(tmp_path):
+    path = generators.dos_file(tmp_path, natom=1, nenergy=3)
+    path.write_text("kept", encoding="utf-8")
+
+    assert generators.dos_file(tmp_path, natom=1, nenergy=3) == path
+    assert path.read_text(encoding="utf-8") == "kept"
+
+
+@pytest.mark.parametrize("fmt", generators.STRUCTURE_FORMATS)
+def test_structure_trajectory(tmp_path, fmt):
+    path = generators.structure_file(tmp_path, natom=20, fmt=fmt, nframes=3)
+
+    frames = read_structure(path, index=":")
+    assert [len(atoms) for atoms in frames] == [20, 20, 20]
+    assert not np.allclose(frames[0].positions, frames[2].positions)
+    if fmt != "extxyz":
+        assert frames[1].get_initial_magnetic_moments().any()
+
+
+class TestRunner:
+    """Test discovery, measurement and comparison of results."""
+
+    def test_discover(self):
+        cases = run.discover(r"ReadDos\.time_read_dos\(h5", sizes=["small"])
+
+        assert [case.key for case in cases] == [
+            f"bench_data.ReadDos.time_read_dos(h5, {spin}, small)" for spin in generators.SPIN_TYPES
+        ]
+        assert {case.params.get("size", "small") for case in run.discover(sizes=["small"])} == {
+            "small"
+        }
+
+    def test_run_and_save(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("DDPC_BENCH_DATA", str(tmp_path / "data"))
+        cases = run.discover(r"ReadDos.*\(h5, spinless, small\)")
+        results = run.run_cases(cases, repeat=2)
+
+        assert len(results) == 2
+        result = results["bench_data.ReadDos.time_read_dos(h5, spinless, small)"]
+        assert result["params"] == {"fmt": "h5", "spin": "spinless", "size": "small"}
+        assert 0 < result["min"] <= result["median"]
+        assert result["peak_memory"] > 0
+
+        path = tmp_path / "results.json"
+        info = {"commit": "abc", "dirty": False}
+        run.save_results(path, info, results)
+        run.save_results(path, info, {"other": {"error": "x"}})
+        assert set(run.load_results(path)["results"]) == {*results, "other"}
+
+    def test_failures_are_recorded(self):
+        class Broken:
+            params = ((1,),)
+            param_names = ("n",)
+
+            def time_fails(self, n):
+                raise RuntimeError("boom")
+
+        case = run.Case("bench.Broken.time_fails", Broken, "time_fails", {"n": 1})
+
+        assert run.run_cases([case])[case.key]["error"] == "RuntimeError('boom')"
+
+    def test_compare(self):
+        old = {
+            "a": {"median": 1.0, "peak_memory": 100},
+            "b": {"median": 1.0, "peak_memory": 100},
+            "c": {"median": 1.0, "peak_memory": 100},
+            "d": {"median": 1.0, "peak_memory": 100},
+            "gone": {"median": 1.0, "peak_memory": 100},
+        }
+        new = {
+            "a": {"median": 1.5, "peak_memory": 100},
+            "b": {"median": 0.5, "peak_memory": 100},
+            "c": {"median": 1.05, "peak_memory": 300},
+            "d": {"error": "boom"},
+        }
+
+        assert run.compare_results(old, new) == [
+            ("a", "slower", 1.5, 1.0),
+            ("c", "more memory", 1.05, 3.0),
+            ("b", "faster", 0.5, 1.0),
+            ("d", "failed", None, None),
+        ]
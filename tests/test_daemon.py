@@ -0,0 +1,206 @@
+"""Test the ddpc serve daemon and the forwarding of command lines to it."""
+
+import io
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pytest
+from ase.build import bulk
+from ase.io import write as ase_write
+
+from ddpc import daemon
+
+pytestmark = pytest.mark.skipif(not daemon.supported(), reason="needs Unix sockets and fork")
+
+
+def run_ddpc(*args, cwd=None, **env):
+    """Run ``python -m ddpc`` with extra environment variables."""
+    return subprocess.run(
+        [sys.executable, "-m", "ddpc", *args],
+        capture_output=True,
+        text=True,
+        cwd=cwd,
+        env={**os.environ, **env},
+        check=False,
+    )
+
+
+def start_daemon(path):
+    """Start ``ddpc serve`` in the foreground and wait until it answers."""
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "ddpc", "serve", "--socket", str(path), "-j", "1"],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + daemon.START_TIMEOUT
+    while daemon.status(str(path)) is None:
+        if proc.poll() is not None or time.monotonic() > deadline:
+            proc.kill()
+            pytest.fail("ddpc serve did not start")
+        time.sleep(0.05)
+    return proc
+
+
+@pytest.fixture(scope="module")
+def socket_dir():
+    # socket paths are limited to about 100 characters, pytest's tmp_path may be longer
+    directory = Path(tempfile.mkdtemp(prefix="ddpc-test-"))
+    yield directory
+    shutil.rmtree(directory, ignore_errors=True)
+
+
+@pytest.fixture(scope="module")
+def server(socket_dir):
+    path = socket_dir / "serve.sock"
+    proc = start_daemon(path)
+    yield path
+    daemon.stop(str(path))
+    proc.wait(timeout=10)
+
+
+@pytest.fixture
+def structure(tmp_path):
+    ase_write(tmp_path / "si.vasp", bulk("Si", "diamond", a=5.43), format="vasp")
+    return tmp_path
+
+
+def test_forwarded_command_runs_in_daemon(server, structure):
+    # ASE cannot be imported by the client, only the daemon has it loaded
+    fake = structure / "fake"
+    (fake / "ase").mkdir(parents=True)
+    (fake / "ase" / "__init__.py").write_text("raise ImportError('no ase here')\n")
+    env = {"DDPC_SOCKET": str(server), "PYTHONPATH": str(fake)}
+
+    result = run_ddpc("structure", "convert", "si.vasp", "si.cif", cwd=structure, **env)
+
+    assert result.returncode == 0, result.stderr
+    assert "Converted to" in result.stdout
+    assert "\x1b[" not in result.stdout
+    assert (structure / "si.cif").exists()
+
+    result = run_ddpc(
+        "structure", "convert", "si.vasp", "si2.cif", cwd=structure, **env, DDPC_NO_DAEMON="1"
+    )
+    assert result.returncode == 1
+    assert "no ase here" in result.stdout
+
+
+@pytest.mark.parametrize(
+    "args",
+    [
+        ("--version",),
+        ("structure", "info", "si.vasp"),
+        ("structure", "info", "missing.vasp"),
+        ("data", "bogus"),
+    ],
+)
+def test_same_output_as_in_process(server, structure, args):
+    forwarded = run_ddpc(*args, cwd=structure, DDPC_SOCKET=str(server))
+    local = run_ddpc(*args, cwd=structure, DDPC_SOCKET=str(server), DDPC_NO_DAEMON="1")
+
+    assert forwarded.returncode == local.returncode
+    assert forwarded.stdout == local.stdout
+
+
+def test_forward_to_replaced_streams(server, monkeypatch):
+    out, err = io.StringIO(), io.StringIO()
+    monkeypatch.setattr(sys, "stdout", out)
+    monkeypatch.setattr(sys, "stderr", err)
+
+    assert daemon.forward(["--version"], str(server)) == 0
+    assert daemon.forward(["data", "bogus"], str(server)) == 2
+
+    assert "version" in out.getvalue()
+    assert "Usage:" in out.getvalue()
+    assert "lost the connection" not in err.getvalue()
+
+
+def test_status(server):
+    info = daemon.status(str(server))
+    assert info["workers"] == 1
+    assert info["socket"] == str(server)
+
+    result = run_ddpc("serve", "--status", "--socket", str(server))
+    assert result.returncode == 0
+    assert f"pid {info['pid']}" in result.stdout
+
+
+def test_other_installation_is_not_served(server, monkeypatch):
+    monkeypatch.setattr(daemon, "_identity", lambda: "/elsewhere/ddpc")
+
+    assert daemon.forward(["--version"], str(server)) is None
+    assert daemon.status(str(server)) is None
+
+
+@pytest.mark.parametrize("mode", [0o770, 0o707, 0o777])
+def test_open_directory_is_not_trusted(server, mode):
+    # another user could have created the socket in a directory open to others
+    directory = server.parent
+    directory.chmod(mode)
+    try:
+        assert daemon.forward(["--version"], str(server)) is None
+        assert daemon.status(str(server)) is None
+    finally:
+        directory.chmod(0o700)
+    assert daemon.status(str(server)) is not None
+
+
+@pytest.mark.skipif(not hasattr(os, "chown") or os.getuid() != 0, reason="needs root to chown")
+def test_directory_of_other_user_is_not_trusted(server):
+    directory = server.parent
+    os.chown(directory, 65534, -1)
+    try:
+        assert daemon.forward(["--version"], str(server)) is None
+    finally:
+        os.chown(directory, os.getuid(), -1)
+    assert daemon.forward(["--version"], str(server)) == 0
+
+
+def test_bind_refuses_untrusted_directory(tmp_path):
+    directory = tmp_path / "open"
+    directory.mkdir()
+    directory.chmod(0o777)
+    with pytest.raises(RuntimeError, match="accessible by other users"):
+        daemon._bind(str(directory / "ddpc.sock"))
+
+    directory.chmod(0o700)
+    (directory / "ddpc.sock").write_text("")
+    with pytest.raises(RuntimeError, match="not a socket"):
+        daemon._bind(str(directory / "ddpc.sock"))
+    assert (directory / "ddpc.sock").exists()
+
+
+def test_no_daemon(socket_dir, monkeypatch):
+    path = socket_dir / "stale.sock"
+    assert daemon.forward(["--version"], str(path)) is None
+
+    # a socket file left behind by a killed daemon
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.bind(str(path))
+    sock.close()
+    assert daemon.forward(["--version"], str(path)) is None
+    assert not daemon.stop(str(path))
+
+    monkeypatch.setenv("DDPC_NO_DAEMON", "1")
+    assert daemon.forward(["--version"]) is None
+
+
+def test_stop(socket_dir):
+    path = socket_dir / "stop.sock"
+    proc = start_daemon(path)
+
+    result = run_ddpc("serve", "--socket", str(path))
+    assert result.returncode == 1
+    assert "already listening" in result.stdout
+
+    result = run_ddpc("serve", "--stop", "--socket", str(path))
+    assert result.returncode == 0
+    assert proc.wait(timeout=10) == 0
+    assert not path.exists()
+    assert run_ddpc("serve", "--status", "--socket", str(path)).returncode == 1
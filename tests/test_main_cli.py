@@ -3,6 +3,8 @@
 This tests the main CLI that delegates to subpackages (data, structure).
 """
 
+import subprocess
+import sys
 import tempfile
 from pathlib import Path
 
@@ -153,6 +155,21 @@ class TestDataSubcommands:
         assert result.exit_code == 0
         assert "DOS Information" in result.output
 
+    def test_data_cache_stats(self, runner, tmp_path, monkeypatch):
+        """Test data cache stats command."""
+        monkeypatch.setenv("DDPC_CACHE_DIR", str(tmp_path))
+        result = runner.invoke(cli, ["data", "cache", "stats"])
+        assert result.exit_code == 0
+        assert "Cache Information" in result.output
+
+    def test_data_batch(self, runner, sample_dos_file, tmp_path):
+        """Test data batch command."""
+        result = runner.invoke(
+            cli, ["data", "batch", str(sample_dos_file), "-o", str(tmp_path), "-j", "1"]
+        )
+        assert result.exit_code == 0
+        assert (tmp_path / f"{sample_dos_file.stem}.csv").exists()
+
 
 class TestStructureSubcommands:
     """Test structure subcommands through unified CLI."""
@@ -280,6 +297,50 @@ class TestCLIErrorHandling:
         result = runner.invoke(cli, ["structure", "invalid_subcommand"])
         assert result.exit_code != 0
 
+    def test_missing_dependency_hint(self, runner, monkeypatch):
+        """Test an import error of a subpackage CLI suggests the optional dependencies."""
+        from ddpc._cli_base import LazyGroup
+
+        group = LazyGroup("broken", source="ddpc.missing_module:cli", extra="data")
+        result = runner.invoke(group, ["anything"])
+        assert result.exit_code == 1
+        assert "No module named" in result.output
+        assert "pip install ddpc[data]" in result.output
+
+
+class TestStartup:
+    """Test the unified CLI imports only what a command needs."""
+
+    def run(self, *args):
+        return subprocess.run(
+            [sys.executable, *args], capture_output=True, text=True, check=True
+        ).stdout
+
+    def test_import_does_not_load_subpackages(self):
+        code = (
+            "import sys, ddpc.cli; "
+            "print(' '.join(m for m in ('rich', 'numpy', 'ase', 'h5py', 'ddpc.data.cli', "
+            "'ddpc.structure.cli') if m in sys.modules))"
+        )
+        assert self.run("-c", code).strip() == ""
+
+    def test_help_does_not_load_subpackages(self):
+        code = (
+            "import sys, ddpc.cli\n"
+            "try:\n    ddpc.cli.cli(['--help'])\nexcept SystemExit:\n    pass\n"
+            "print([m for m in ('rich', 'numpy', 'ddpc.data.cli') if m in sys.modules])"
+        )
+        assert self.run("-c", code).strip().endswith("[]")
+
+    def test_plain_output_when_piped(self, tmp_path):
+        path = tmp_path / "si.vasp"
+        ase_write(path, bulk("Si", "diamond", a=5.43), format="vasp")
+
+        output = self.run("-m", "ddpc", "structure", "convert", str(path), str(tmp_path / "si.cif"))
+        assert "\x1b[" not in output
+        assert "[bold" not in output
+        assert "[green" not in output
+
 
 @pytest.mark.integration
 class TestCLIWorkflows:
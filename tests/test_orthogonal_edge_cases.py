@@ -6,8 +6,15 @@ from ase.build import bulk
 
 from ddpc.structure.orthogonal import (
     CubicSupercellTransformation,
+    _cell_angles,
+    _hnf,
+    _hnf_matrices,
+    _inscribed_length_vecs,
+    _lattice_point_group,
     _proj,
+    _reduce_bases,
     _round_and_make_arr_singular,
+    _symmetry_distinct,
     find_orthogonal,
 )
 
@@ -129,3 +136,151 @@ class TestCubicSupercellTransformationEdgeCases:
         transformer.apply_transformation(atoms)
         assert transformer.transformation_matrix is not None
         assert isinstance(transformer.transformation_matrix, np.ndarray)
+
+    def test_supercell_built_once(self, monkeypatch):
+        """Test candidates are judged from the matrix and only the result is built."""
+        import ase.build
+
+        built = []
+        make_supercell = ase.build.make_supercell
+
+        def counting_make_supercell(atoms, matrix):
+            built.append(matrix)
+            return make_supercell(atoms, matrix)
+
+        monkeypatch.setattr(ase.build, "make_supercell", counting_make_supercell)
+        atoms = bulk("Mg", "hcp", a=3.2, c=5.2)
+        transformer = CubicSupercellTransformation(
+            min_length=10.0, force_90_degrees=True, max_atoms=2000
+        )
+        result = transformer.apply_transformation(atoms)
+
+        assert len(built) == 1
+        np.testing.assert_array_equal(built[0], transformer.transformation_matrix)
+        assert len(result) == round(abs(np.linalg.det(built[0]))) * len(atoms)
+        assert np.allclose(result.cell.angles(), 90, atol=1e-3)
+
+    def test_get_possible_supercell_from_matrix(self):
+        """Test atom count and lattice come from the transformation matrix."""
+        lat = bulk("Cu", "fcc", a=3.6).cell.array
+        length_vecs, n_atoms, sc_lat, matrix = CubicSupercellTransformation.get_possible_supercell(
+            lat, 2, np.eye(3) * 3.6
+        )
+
+        np.testing.assert_array_equal(matrix, [[-1, 1, 1], [1, -1, 1], [1, 1, -1]])
+        assert n_atoms == 8
+        np.testing.assert_allclose(sc_lat, np.eye(3) * 3.6)
+        assert length_vecs.shape == (6, 3)
+
+
+class TestOrthorhombicSearch:
+    """Test the lazy orthorhombic candidate enumeration."""
+
+    def test_sizes_in_sorted_product_order(self):
+        """Test batches reproduce sorting the full product of sizes by their sum."""
+        transformer = CubicSupercellTransformation(
+            min_length=5.0, max_length=6.0, step_size=0.15, allow_orthorhombic=True
+        )
+        values = np.arange(5.0, 6.0, 0.15)
+        expected = sorted(([a, b, c] for a in values for b in values for c in values), key=sum)
+
+        batches = list(transformer._orthorhombic_sizes())
+
+        np.testing.assert_array_equal(np.concatenate(batches), expected)
+
+    def test_huge_range_is_not_enumerated(self):
+        """Test an early match does not depend on the size of the search range."""
+        atoms = bulk("Cu", "fcc", a=3.6)
+        transformer = CubicSupercellTransformation(
+            min_length=7.0, max_length=300.0, step_size=0.01, allow_orthorhombic=True
+        )
+
+        result = transformer.apply_transformation(atoms)
+
+        np.testing.assert_allclose(result.cell.array, np.eye(3) * 7.2, atol=1e-10)
+
+    def test_vectorized_geometry_matches_scalar(self):
+        """Test stacked lengths and angles agree with _proj and ase."""
+        from ase.geometry import cell_to_cellpar
+
+        cells = np.random.default_rng(0).normal(size=(20, 3, 3))
+        a, b, c = cells[3]
+
+        np.testing.assert_allclose(
+            _cell_angles(cells), [cell_to_cellpar(cell)[3:] for cell in cells]
+        )
+        pairs = [(c, a), (a, c), (b, a), (a, b), (b, c), (c, b)]
+        np.testing.assert_allclose(
+            _inscribed_length_vecs(cells)[3], [v - _proj(v, w) for v, w in pairs]
+        )
+
+
+class TestHNFSearch:
+    """Test the exhaustive Hermite-normal-form search."""
+
+    def test_fewer_atoms_than_rounding(self):
+        """Test HNF finds a smaller orthogonal Si cell than the rounding heuristic."""
+        atoms = bulk("Si", "diamond", a=5.43)
+        kwargs = {"min_length": 15.0, "max_atoms": 2000, "force_90_degrees": True}
+
+        rounded = find_orthogonal(atoms, **kwargs)
+        result = find_orthogonal(atoms, method="hnf", **kwargs)
+
+        assert (len(rounded), len(result)) == (216, 192)
+        assert np.allclose(result.cell.angles(), 90, atol=1e-3)
+        assert min(result.cell.lengths()) >= 15.0
+        assert np.linalg.det(result.cell.array) > 0
+
+    def test_deterministic(self):
+        atoms = bulk("Mg", "hcp", a=3.2, c=5.2)
+        transformer = CubicSupercellTransformation(min_length=10.0, max_atoms=500, method="hnf")
+
+        first = transformer.apply_transformation(atoms)
+        matrix = transformer.transformation_matrix.copy()
+        second = transformer.apply_transformation(atoms)
+
+        np.testing.assert_array_equal(transformer.transformation_matrix, matrix)
+        np.testing.assert_array_equal(first.positions, second.positions)
+        assert len(first) == 64
+
+    def test_requires_bound(self):
+        transformer = CubicSupercellTransformation(method="hnf")
+        with pytest.raises(AttributeError, match="max_atoms or max_length"):
+            transformer.apply_transformation(bulk("Cu", "fcc", a=3.6))
+
+    def test_unknown_method(self):
+        with pytest.raises(AttributeError, match="Unknown method"):
+            find_orthogonal(bulk("Cu", "fcc", a=3.6), method="random")
+
+    def test_no_cell_within_limits(self):
+        with pytest.raises(ValueError, match="No orthogonal supercell found"):
+            find_orthogonal(bulk("Cu", "fcc", a=3.6), min_length=10.0, max_atoms=20, method="hnf")
+
+    def test_hnf_of_equivalent_bases(self):
+        """Test the normal form is the same for every basis of a sublattice."""
+        hnfs = _hnf_matrices(12)
+        unimodular = np.array([[1, 2, 0], [0, 1, 0], [-1, 3, 1]]) @ np.array(
+            [[0, 1, 0], [1, 0, 0], [0, 0, -1]]
+        )
+
+        np.testing.assert_array_equal(_hnf(unimodular @ hnfs), hnfs)
+        assert len(hnfs) == len({h.tobytes() for h in hnfs}) == 455
+
+    def test_reduce_rectangular_lattice(self):
+        """Test a skewed basis of a rectangular lattice reduces to the orthogonal one."""
+        unimodular = np.array([[1, 2, 3], [0, 1, 5], [0, 0, 1]]) @ np.array(
+            [[1, 0, 0], [-3, 1, 0], [2, -1, 1]]
+        )
+        basis = unimodular @ np.diag([3.0, 4.0, 5.0])
+
+        unimodular, reduced = _reduce_bases(basis[None])
+
+        np.testing.assert_allclose(sorted(np.abs(reduced[0]).max(axis=1)), [3, 4, 5])
+        np.testing.assert_allclose(_cell_angles(reduced[0]), 90)
+        assert abs(round(np.linalg.det(unimodular[0]))) == 1
+
+    def test_symmetry_pruning(self):
+        """Test the 7 index-2 sublattices of a cubic lattice fall into 3 classes."""
+        rotations = _lattice_point_group(np.eye(3))
+        assert len(rotations) == 48
+        assert len(_symmetry_distinct(_hnf_matrices(2), rotations)) == 3
@@ -0,0 +1,128 @@
+"""Test stage profiling in ddpc.profiling and the instrumented readers."""
+
+import json
+
+import numpy as np
+import pytest
+
+from ddpc import profiling
+from ddpc.data import read_band, read_dos, to_npz
+from ddpc.profiling import add_hook, count_bytes, profile, remove_hook, stage
+
+
+def test_disabled_stage_is_shared_noop():
+    assert stage("a") is stage("b")
+    with stage("a") as s:
+        count_bytes(10)
+    assert s is None
+    assert not profiling._open
+
+
+def test_nested_stages():
+    with profile() as report:
+        with stage("outer"):
+            count_bytes(1)
+            with stage("inner"):
+                count_bytes(2)
+                np.ones(1 << 17)
+            with stage("inner"):
+                count_bytes(4)
+
+    assert [(r.path, r.bytes_read) for r in report.records] == [
+        (("outer", "inner"), 2),
+        (("outer", "inner"), 4),
+        (("outer",), 7),
+    ]
+    outer, inner = report.summary()
+    assert outer.path == ("outer",)
+    assert (inner.calls, inner.bytes_read) == (2, 6)
+    if profiling.MEMORY_SUPPORTED:
+        assert inner.peak_memory >= 1 << 20
+        assert outer.peak_memory >= inner.peak_memory
+    assert report.seconds >= outer.seconds >= inner.seconds
+    assert not profiling._open
+
+
+def test_without_memory():
+    with profile(memory=False) as report, stage("a"):
+        np.ones(1000)
+
+    assert report.records[0].peak_memory is None
+    assert report.summary()[0].peak_memory is None
+
+
+def test_stage_recorded_on_error():
+    with profile() as report:
+        with pytest.raises(ValueError, match="boom"), stage("fails"):
+            raise ValueError("boom")
+        with stage("after"):
+            pass
+
+    assert [r.path for r in report.records] == [("fails",), ("after",)]
+
+
+def test_hooks():
+    records = []
+    add_hook(records.append)
+    try:
+        with stage("hooked"):
+            count_bytes(3)
+    finally:
+        remove_hook(records.append)
+
+    assert [(r.name, r.bytes_read) for r in records] == [("hooked", 3)]
+    assert stage("a") is stage("b")
+    with pytest.raises(ValueError, match="not in list"):
+        remove_hook(records.append)
+
+
+def test_report_output():
+    with profile() as report:
+        with stage("read"):
+            count_bytes(2048)
+        with stage("export"):
+            pass
+
+    data = json.loads(report.to_json())
+    assert [s["stage"] for s in data["stages"]] == ["read", "export"]
+    assert data["stages"][0]["bytes_read"] == 2048
+    lines = report.format().splitlines()
+    assert lines[0].split() == ["stage", "time", "share", "read", "peak", "memory", "calls"]
+    assert [line.split()[0] for line in lines[1:]] == ["read", "export", "other", "total"]
+    assert "2 KiB" in lines[1]
+
+
+@pytest.mark.parametrize("ext", ["h5", "json"])
+def test_band_stages(band_dos_dir, tmp_path, ext):
+    with profile() as report:
+        data, _, _ = read_band(band_dos_dir / f"spinless_pband.{ext}")
+        to_npz(data, tmp_path / "band.npz")
+
+    stages = {"/".join(s.path): s for s in report.summary()}
+    assert list(stages) == [
+        "read-band",
+        "read-band/open",
+        "read-band/read-metadata",
+        "read-band/read-totals",
+        "read-band/read-projections",
+        "read-band/aggregate",
+        "export",
+    ]
+    projections = stages["read-band/read-projections"].bytes_read
+    assert projections > 0
+    assert stages["read-band"].bytes_read >= projections
+    assert stages["export"].bytes_read == 0
+
+
+@pytest.mark.parametrize("ext", ["h5", "json"])
+def test_dos_total_stages(band_dos_dir, ext):
+    with profile() as report:
+        read_dos(band_dos_dir / f"spinless_dos.{ext}")
+
+    assert [s.path[-1] for s in report.summary()] == [
+        "read-dos",
+        "open",
+        "read-metadata",
+        "read-totals",
+    ]
+    assert report.summary()[0].bytes_read > 0